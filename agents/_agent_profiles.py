@@ -7,6 +7,7 @@ files in the state folder.
 
 import json
 import logging
+import threading
 from pathlib import Path
 from uuid import uuid4
 
@@ -14,6 +15,7 @@ from pydantic import BaseModel, Field
 
 from config import load_config
 from settings import load_settings
+from utils.file_cache import WatchedValue, atomic_write_text
 
 logger = logging.getLogger(__name__)
 
@@ -52,24 +54,67 @@ def _profiles_dir() -> Path:
     return Path(cfg.settings.home_dir) / PROFILES_SUBDIR
 
 
-def _load_all() -> dict[str, AgentProfile]:
-    """Load all profiles from disk."""
-    profiles: dict[str, AgentProfile] = {}
-    d = _profiles_dir()
+def _read_profiles(
+    d: Path, previous: dict[str, dict[str, AgentProfile]] | None,
+) -> dict[str, dict[str, AgentProfile]]:
+    """Parse every profile file in *d*, keyed by file name, then profile ID.
+
+    A file that fails to parse but parsed on the previous load (typically a
+    non-atomic external edit caught mid-write) keeps its previous profile.
+    """
+    by_file: dict[str, dict[str, AgentProfile]] = {}
     if not d.is_dir():
-        return profiles
+        return by_file
     for f in sorted(d.glob("*.json")):
         try:
             data = json.loads(f.read_text())
             # Strip legacy 'system' field if present
             data.pop("system", None)
             profile = AgentProfile.model_validate(data)
-            profiles[profile.id] = profile
+            by_file[f.name] = {profile.id: profile}
         except Exception:
+            if previous is not None and f.name in previous:
+                by_file[f.name] = previous[f.name]
             logger.warning("Failed to load agent profile %s", f.name)
+    return by_file
+
+
+# Parsed profiles directory, reloaded only when its contents change on disk.
+_profiles_cache: WatchedValue[dict[str, dict[str, AgentProfile]]] = WatchedValue(
+    _read_profiles, directory=True,
+)
+
+# Serializes profile writes against each other.
+_write_lock = threading.Lock()
+
+
+def _cached_profiles() -> dict[str, AgentProfile]:
+    """The cached profiles by ID. Shared with other callers — do not mutate."""
+    profiles: dict[str, AgentProfile] = {}
+    for entry in _profiles_cache.get(_profiles_dir()).values():
+        profiles.update(entry)
     return profiles
 
 
+def _private_copy(profile: AgentProfile) -> AgentProfile:
+    # ``skills`` is the only mutable field; a shallow copy plus a fresh list
+    # is a fraction of the cost of ``model_copy(deep=True)``.
+    return profile.model_copy(update={"skills": list(profile.skills)})
+
+
+def _load_all() -> dict[str, AgentProfile]:
+    """Return all profiles, served from the in-process cache.
+
+    The dict is fresh on every call and the profiles are copies, so callers
+    may mutate either without touching the cache.
+    """
+    return {pid: _private_copy(p) for pid, p in _cached_profiles().items()}
+
+
+def _write_profile(d: Path, profile: AgentProfile) -> None:
+    atomic_write_text(d / f"{profile.id}.json", json.dumps(profile.model_dump(), indent=2))
+
+
 def list_agent_profiles(include_disabled: bool = False) -> list[AgentProfile]:
     """Return agent profiles.
 
@@ -93,8 +138,8 @@ def list_agent_profiles(include_disabled: bool = False) -> list[AgentProfile]:
 
 def get_agent_profile(profile_id: str) -> AgentProfile | None:
     """Look up a profile by ID."""
-    profiles = _load_all()
-    return profiles.get(profile_id)
+    profile = _cached_profiles().get(profile_id)
+    return _private_copy(profile) if profile is not None else None
 
 
 def get_default_profile() -> AgentProfile:
@@ -110,9 +155,9 @@ def get_default_profile() -> AgentProfile:
 def save_agent_profile(profile: AgentProfile) -> AgentProfile:
     """Save a profile to disk."""
     d = _profiles_dir()
-    d.mkdir(parents=True, exist_ok=True)
-    path = d / f"{profile.id}.json"
-    path.write_text(json.dumps(profile.model_dump(), indent=2))
+    with _write_lock:
+        _write_profile(d, profile)
+        _profiles_cache.invalidate()
     return profile
 
 
@@ -132,17 +177,18 @@ def apply_llm_config_to_profiles(
     """
     d = _profiles_dir()
     d.mkdir(parents=True, exist_ok=True)
-    for profile in _load_all().values():
-        if not profile.model:
-            updates: dict = {"model": model}
-            if provider is not None:
-                updates["provider"] = provider
-            if context_window is not None:
-                updates["context_window"] = context_window
-            updated = profile.model_copy(update=updates)
-            path = d / f"{updated.id}.json"
-            path.write_text(json.dumps(updated.model_dump(), indent=2))
-            logger.info("Applied model '%s' to profile '%s'", model, profile.id)
+    with _write_lock:
+        for profile in _load_all().values():
+            if not profile.model:
+                updates: dict = {"model": model}
+                if provider is not None:
+                    updates["provider"] = provider
+                if context_window is not None:
+                    updates["context_window"] = context_window
+                updated = profile.model_copy(update=updates)
+                _write_profile(d, updated)
+                logger.info("Applied model '%s' to profile '%s'", model, profile.id)
+        _profiles_cache.invalidate()
 
 
 def delete_agent_profile(profile_id: str) -> bool:
@@ -151,9 +197,11 @@ def delete_agent_profile(profile_id: str) -> bool:
     if profile is None:
         return False
     path = _profiles_dir() / f"{profile_id}.json"
-    if path.exists():
-        path.unlink()
-        return True
+    with _write_lock:
+        if path.exists():
+            path.unlink()
+            _profiles_cache.invalidate()
+            return True
     return False
 
 
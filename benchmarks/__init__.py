@@ -0,0 +1,15 @@
+"""Benchmarks for the agent runtime's hot paths.
+
+Each case times one path with no model or network involved: the
+``run_turn`` loop (driven by the synthetic ``replay`` provider, with its
+time subtracted), event fan-out, history persistence, context stats, file
+tools, the task runner tick and broker RPC.  Results are written as JSON
+and can be compared with a baseline recorded on the same machine::
+
+    PYTHONPATH=. python -m benchmarks --save-baseline
+    PYTHONPATH=. python -m benchmarks --compare
+"""
+
+from benchmarks._harness import Comparison, Report, Result, compare, registered_cases
+
+__all__ = ["Comparison", "Report", "Result", "compare", "registered_cases"]
@@ -0,0 +1,92 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks._harness import Comparison, Report, compare, registered_cases
+
+_DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def _format_table(report: Report, comparisons: list[Comparison]) -> str:
+    by_key = {c.key: c for c in comparisons}
+    rows = [("benchmark", "median", "p95", "unit", "vs baseline")]
+    for result in report.results:
+        comparison = by_key.get(result.key)
+        delta = ""
+        if comparison is not None:
+            flag = "  REGRESSION" if comparison.regressed else ""
+            delta = f"{comparison.change * 100:+.1f}%{flag}"
+        rows.append((result.key, f"{result.median:.3f}", f"{result.p95:.3f}", result.unit, delta))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)) for row in rows)
+
+
+async def _run(patterns: list[str], quick: bool) -> Report:
+    report = Report(quick=quick)
+    for name, bench in registered_cases().items():
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        report.results.extend(await bench(quick))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and return the process exit code (1 on regression)."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("cases", nargs="*", help="glob patterns of case names to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repetitions")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="write the report here")
+    parser.add_argument(
+        "--save-baseline", nargs="?", type=Path, const=_DEFAULT_BASELINE, metavar="PATH",
+        help=f"write the report as the baseline (default {_DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--compare", nargs="?", type=Path, const=_DEFAULT_BASELINE, metavar="PATH",
+        help=f"compare with a baseline report (default {_DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="relative slowdown that counts as a regression (default 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(registered_cases()))
+        return 0
+
+    # Keep library logging from interleaving with the report.
+    logging.basicConfig(level=logging.ERROR)
+    report = asyncio.run(_run(args.cases, args.quick))
+
+    comparisons: list[Comparison] = []
+    if args.compare:
+        if not args.compare.exists():
+            parser.error(f"baseline {args.compare} not found; record one with --save-baseline")
+        baseline = Report.model_validate_json(args.compare.read_text(encoding="utf-8"))
+        if baseline.quick != report.quick:
+            print("warning: baseline and current run differ in --quick", file=sys.stderr)
+        comparisons = compare(report, baseline, threshold=args.threshold)
+
+    print(_format_table(report, comparisons))
+    for path in (args.json, args.save_baseline):
+        if path:
+            path.write_text(report.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Broker RPC round-trip benchmark over real Unix sockets."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from integrations._rpc import serve_rpc
+from integrations.broker_client import call
+
+from ._harness import Result, case, latency, time_samples
+
+
+@case("broker.rpc")
+async def bench_broker_rpc(quick: bool) -> list[Result]:
+    """``broker_client.call`` latency: supervisor resolve plus broker verb.
+
+    Both hops go through ``serve_rpc`` on sockets in a temporary directory,
+    with handlers that do no work, so the numbers are the framing and
+    connection cost alone.
+    """
+    results = []
+    # Short prefix: Unix socket paths are limited to about 100 bytes.
+    with tempfile.TemporaryDirectory(prefix="cbench") as tmp:
+        app_sock = Path(tmp) / "app.sock"
+        broker_sock = Path(tmp) / "broker.sock"
+
+        async def _supervisor(verb: str, args: dict[str, Any]) -> dict[str, Any]:
+            return {"socket": str(broker_sock)}
+
+        async def _broker(verb: str, args: dict[str, Any]) -> dict[str, Any]:
+            return {"echo": args}
+
+        supervisor = await serve_rpc(app_sock, _supervisor)
+        broker = await serve_rpc(broker_sock, _broker)
+        try:
+            for payload_bytes in (64, 64_000):
+                args = {"body": "x" * payload_bytes}
+                samples = await time_samples(
+                    lambda args=args: call("bench", "echo", args, app_sock_path=app_sock),
+                    repeat=20 if quick else 500,
+                )
+                results.append(latency("broker.rpc.call", samples, payload_bytes=payload_bytes))
+        finally:
+            for server in (supervisor, broker):
+                server.close()
+                await server.wait_closed()
+    return results
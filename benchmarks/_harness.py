@@ -0,0 +1,226 @@
+"""Timing, result models and baseline comparison for the benchmark suite."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import inspect
+import math
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+# Multipliers from seconds to each reported time unit.
+_TIME_UNITS = {"s": 1.0, "ms": 1e3, "us": 1e6}
+
+BenchCase = Callable[[bool], Awaitable[list["Result"]]]
+_CASES: dict[str, BenchCase] = {}
+
+
+class Result(BaseModel):
+    """One measured quantity.
+
+    Attributes:
+        name: Dotted benchmark name, e.g. ``"persistence.save"``.
+        params: The size or shape the measurement was taken at.
+        unit: Unit of ``median`` and ``p95`` (``"us"``, ``"ms"``, ``"MB/s"``...).
+        median: Median over all samples.
+        p95: The slow tail: 95th-percentile latency, or 5th-percentile
+            throughput.
+        samples: Number of timed repetitions.
+        higher_is_better: True for throughputs, False for latencies.
+    """
+
+    name: str
+    params: dict[str, int | str] = Field(default_factory=dict)
+    unit: str
+    median: float
+    p95: float
+    samples: int
+    higher_is_better: bool = False
+
+    @property
+    def key(self) -> str:
+        """Name and params, unique within a report."""
+        if not self.params:
+            return self.name
+        params = ",".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.name}[{params}]"
+
+
+class Report(BaseModel):
+    """A full benchmark run, as written to and read from JSON."""
+
+    created_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    python: str = Field(default_factory=platform.python_version)
+    machine: str = Field(default_factory=lambda: f"{platform.system()} {platform.machine()}")
+    quick: bool = False
+    results: list[Result] = Field(default_factory=list)
+
+
+class Comparison(BaseModel):
+    """A result next to its baseline.
+
+    Attributes:
+        change: Relative change, signed so that positive is worse (slower,
+            or lower throughput).
+    """
+
+    key: str
+    unit: str
+    baseline: float
+    current: float
+    change: float
+    regressed: bool
+
+
+def case(name: str) -> Callable[[BenchCase], BenchCase]:
+    """Register a benchmark case under *name*.
+
+    A case is an async function taking ``quick`` (smaller sizes and fewer
+    repetitions) and returning its results.
+    """
+
+    def decorator(fn: BenchCase) -> BenchCase:
+        _CASES[name] = fn
+        return fn
+
+    return decorator
+
+
+def registered_cases() -> dict[str, BenchCase]:
+    """Return the registered cases, importing the benchmark modules first."""
+    from benchmarks import _broker, _logging, _runtime, _storage, _workspace  # noqa: F401
+
+    return dict(_CASES)
+
+
+async def time_samples(
+    fn: Callable[[], Any],
+    *,
+    repeat: int,
+    warmup: int = 1,
+) -> list[float]:
+    """Time *repeat* calls of *fn* (sync or async) after *warmup* untimed calls.
+
+    The garbage collector is disabled while timing so a collection
+    triggered by earlier allocations doesn't land in one sample.
+
+    Returns:
+        Durations in seconds.
+    """
+
+    async def _call() -> None:
+        result = fn()
+        if inspect.isawaitable(result):
+            await result
+
+    for _ in range(warmup):
+        await _call()
+    samples: list[float] = []
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await _call()
+            samples.append(time.perf_counter() - start)
+            # Let callbacks scheduled by the call run outside the timed window.
+            await asyncio.sleep(0)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency(name: str, samples: list[float], *, unit: str = "us", per: int = 1, **params: int | str) -> Result:
+    """Build a latency result from durations in seconds.
+
+    Args:
+        name: Benchmark case name.
+        samples: Measured durations in seconds.
+        unit: Time unit to report in (a key of ``_TIME_UNITS``).
+        per: Divide each sample by this count, e.g. iterations or tokens
+            per timed call.
+        **params: Case parameters recorded with the result.
+    """
+    scaled = [s * _TIME_UNITS[unit] / per for s in samples]
+    return Result(
+        name=name,
+        params=params,
+        unit=unit,
+        median=statistics.median(scaled),
+        p95=_percentile(scaled, 0.95),
+        samples=len(scaled),
+    )
+
+
+def throughput(name: str, samples: list[float], *, amount: float, unit: str, **params: int | str) -> Result:
+    """Build a throughput result: *amount* (in *unit* numerator) per sample duration."""
+    rates = [amount / s for s in samples if s > 0]
+    return Result(
+        name=name,
+        params=params,
+        unit=unit,
+        median=statistics.median(rates),
+        # The slow tail of a throughput is its low percentile.
+        p95=_percentile(rates, 0.05),
+        samples=len(rates),
+        higher_is_better=True,
+    )
+
+
+def compare(current: Report, baseline: Report, *, threshold: float) -> list[Comparison]:
+    """Compare medians in *current* with *baseline*.
+
+    Results missing from either report are skipped.
+
+    Args:
+        current: Report from this run.
+        baseline: Report to compare against.
+        threshold: Relative change beyond which a result counts as a
+            regression (``0.2`` = 20% slower or lower throughput).
+    """
+    base = {r.key: r for r in baseline.results}
+    comparisons: list[Comparison] = []
+    for result in current.results:
+        previous = base.get(result.key)
+        if previous is None or previous.unit != result.unit or previous.median <= 0:
+            continue
+        change = (result.median - previous.median) / previous.median
+        if result.higher_is_better:
+            change = -change
+        comparisons.append(Comparison(
+            key=result.key,
+            unit=result.unit,
+            baseline=previous.median,
+            current=result.median,
+            change=change,
+            regressed=change > threshold,
+        ))
+    return comparisons
+
+
+__all__ = [
+    "Comparison",
+    "Report",
+    "Result",
+    "case",
+    "compare",
+    "latency",
+    "registered_cases",
+    "throughput",
+    "time_samples",
+]
@@ -0,0 +1,81 @@
+"""Logging benchmarks: per-iteration cost of the display events in each log mode."""
+
+from __future__ import annotations
+
+import logging
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+from logging_config import create_handler
+from sdk.context import ContextStats
+from sdk.context._manager import _log_context_bar
+from sdk.hooks import LoggingHook
+from sdk.providers import ChatMessage, ChatResponse, TokenUsage, ToolCall, ToolCallFunction
+
+from ._harness import Result, case, latency, time_samples
+
+# "rich-sync" is the console sink on the calling thread, as every panel was
+# rendered before the background handler.
+_MODES = (("json", "json", True), ("rich", "rich", True), ("rich-sync", "rich", False))
+
+
+def _response() -> ChatResponse:
+    return ChatResponse(
+        message=ChatMessage(
+            content="Reading the file to find the failing assertion. " * 4,
+            thinking="The test fails on line 42, so check the fixture first. " * 4,
+            tool_calls=[ToolCall(
+                id="call_1",
+                function=ToolCallFunction(name="read_file", arguments={"path": "tests/test_app.py", "limit": 200}),
+            )],
+        ),
+        usage=TokenUsage(prompt_tokens=1200, completion_tokens=80),
+    )
+
+
+@case("logging.iteration")
+async def bench_logging_iteration(quick: bool) -> list[Result]:
+    """Caller-side cost of one loop iteration's logging, per log mode.
+
+    An iteration logs the LoggingHook's request and response events and the
+    context-usage event.  Only time on the calling thread (the event loop)
+    is measured; with the background handler, rendering and writing happen
+    on the listener thread.
+    """
+    results = []
+    repeat = 200 if quick else 2000
+    agent = SimpleNamespace(name="Bench", model="bench", options={"num_ctx": 32768}, think=True)
+    hook = LoggingHook(agent)
+    history = SimpleNamespace(messages=[
+        {"role": "system", "content": "x"},
+        *({"role": "user" if i % 2 else "assistant", "content": "x"} for i in range(40)),
+    ])
+    response = _response()
+    stats = ContextStats(context_used=12000, context_limit=32768)
+
+    async def _iteration() -> None:
+        await hook.before_model(history, 3, "Bench")
+        await hook.after_model(response, history, 3, "Bench")
+        _log_context_bar(stats, "Bench")
+
+    events = logging.getLogger("events")
+    sdk_logger = logging.getLogger("sdk")
+    with open(os.devnull, "w") as devnull:
+        for label, mode, background in _MODES:
+            handler, listener = create_handler(mode, stream=devnull, background=background)
+            saved = events.handlers, events.propagate, events.level, sdk_logger.level
+            events.handlers, events.propagate = [handler], False
+            events.setLevel(logging.INFO)
+            sdk_logger.setLevel(logging.DEBUG)
+            try:
+                with mock.patch("logging_config._mode", mode):
+                    samples = await time_samples(_iteration, repeat=repeat, warmup=10)
+            finally:
+                events.handlers, events.propagate = saved[0], saved[1]
+                events.setLevel(saved[2])
+                sdk_logger.setLevel(saved[3])
+                if listener is not None:
+                    listener.stop()
+            results.append(latency("logging.iteration", samples, mode=label))
+    return results
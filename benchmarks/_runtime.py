@@ -0,0 +1,156 @@
+"""Agent loop benchmarks: ``run_turn`` overhead and event fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from agents.types import Agent
+from config import ReplayConfig
+from sdk.context import ConversationHistory
+from sdk.events import AgentEvent, ContentPayload, agent_span, get_current_dispatcher, publish_event
+from sdk.providers._replay import ReplayProvider
+from sdk.skills import AgentState
+from sdk.turn import run_turn, turn_scope
+
+from ._harness import Result, case, latency, time_samples
+
+
+def bench_echo(text: str) -> str:
+    """Return *text* unchanged.
+
+    Args:
+        text: Any text.
+    """
+    return text
+
+
+class _TimedProvider:
+    """Wraps a provider and adds up the time spent inside its stream."""
+
+    def __init__(self, inner: Any) -> None:
+        self._inner = inner
+        self.elapsed = 0.0
+
+    async def chat_stream(self, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        stream = self._inner.chat_stream(**kwargs)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await anext(stream)
+            except StopAsyncIteration:
+                self.elapsed += time.perf_counter() - start
+                return
+            self.elapsed += time.perf_counter() - start
+            yield item
+
+
+@case("runtime.run_turn")
+async def bench_run_turn(quick: bool) -> list[Result]:
+    """Per-iteration cost of the tool loop, with model time subtracted.
+
+    The synthetic replay provider drives each turn through ``tool_rounds``
+    tool calls and a short streamed reply, so every iteration exercises the
+    hooks, history, event publication and tool dispatch.
+    """
+    results = []
+    repeat = 5 if quick else 30
+    for tool_rounds in (4, 16):
+        settings = ReplayConfig(
+            mode="synthetic",
+            ttft_ms=0,
+            tokens_per_second=0,
+            synthetic_tool_calls=tool_rounds,
+            synthetic_reply_tokens=16,
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            provider = _TimedProvider(ReplayProvider(settings, cassette_dir=Path(tmp)))
+        agent = Agent(
+            name="Bench", description="benchmark", instruction="x", provider="replay", model="bench",
+            options={}, tools=[bench_echo],
+        )
+        overheads: list[float] = []
+
+        async def _turn(
+            agent: Agent = agent, provider: _TimedProvider = provider, overheads: list[float] = overheads,
+        ) -> None:
+            history = ConversationHistory([
+                {"role": "system", "content": "You are a benchmark."},
+                {"role": "user", "content": "Run the benchmark."},
+            ])
+            provider.elapsed = 0.0
+            start = time.perf_counter()
+            async with (
+                turn_scope(handler=lambda _event: None, conversation_id="bench"),
+                agent_span("Bench", agent_state=AgentState(agent.tools)),
+            ):
+                await run_turn(history, agent=agent)
+            overheads.append(time.perf_counter() - start - provider.elapsed)
+
+        with mock.patch("sdk.turn._execution.get_provider", lambda *_a, _provider=provider, **_k: _provider):
+            await time_samples(_turn, repeat=repeat)
+        # Drop the warmup turn: only the timed turns' overheads count.
+        results.append(latency(
+            "runtime.run_turn.iteration", overheads[1:], per=tool_rounds + 1, tool_rounds=tool_rounds,
+        ))
+    return results
+
+
+@case("runtime.events")
+async def bench_event_fanout(quick: bool) -> list[Result]:
+    """Cost per streamed token of publishing a delta event to subscribers.
+
+    Covers ``publish_event`` (event copy and attribution) plus scheduling
+    and running each subscriber, sync ones via ``call_soon`` and async ones
+    as tasks.
+    """
+    results = []
+    tokens = 200 if quick else 2000
+    repeat = 5 if quick else 20
+    for sync_subs, async_subs in ((1, 0), (4, 0), (2, 2)):
+        received = 0
+
+        def _sync_handler() -> Any:
+            def _on_event(_event: AgentEvent) -> None:
+                nonlocal received
+                received += 1
+
+            return _on_event
+
+        def _async_handler() -> Any:
+            async def _on_event(_event: AgentEvent) -> None:
+                nonlocal received
+                received += 1
+
+            return _on_event
+
+        async def _stream(sync_subs: int = sync_subs, async_subs: int = async_subs) -> None:
+            nonlocal received
+            received = 0
+            expected = tokens * (sync_subs + async_subs)
+            async with turn_scope(conversation_id="bench"):
+                dispatcher = get_current_dispatcher()
+                assert dispatcher is not None
+                # A new function per subscriber, since the dispatcher ignores duplicates.
+                for _ in range(sync_subs):
+                    dispatcher.subscribe(_sync_handler())
+                for _ in range(async_subs):
+                    dispatcher.subscribe(_async_handler())
+                for index in range(tokens):
+                    publish_event(AgentEvent(payload=ContentPayload(
+                        type="content", content=f" tok{index}", delta=True,
+                    )))
+                await dispatcher.drain()
+                while received < expected:
+                    await asyncio.sleep(0)
+
+        samples = await time_samples(_stream, repeat=repeat)
+        results.append(latency(
+            "runtime.events.per_token", samples, per=tokens, sync_subscribers=sync_subs, async_subscribers=async_subs,
+        ))
+    return results
@@ -0,0 +1,117 @@
+"""Persistence and bookkeeping benchmarks that grow with history size."""
+
+from __future__ import annotations
+
+import contextlib
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from config import GoalsConfig, load_config
+from sdk.context import ContextManager, ConversationHistory
+from sdk.hooks import PersistenceHook
+from sdk.skills import AgentState
+from tasks._file_store import FileTaskStore
+from tasks._runner import TaskRunner
+
+from ._harness import Result, case, latency, time_samples
+
+_PARAGRAPH = (
+    "The quick brown fox jumps over the lazy dog while the agent reads the page, "
+    "writes a file, runs the tests and reports what changed. "
+)
+
+
+def synthetic_messages(count: int) -> list[dict[str, Any]]:
+    """Build *count* messages cycling through user, tool-calling assistant and tool turns."""
+    messages: list[dict[str, Any]] = []
+    for index in range(count):
+        role = ("user", "assistant", "tool")[index % 3]
+        message: dict[str, Any] = {"role": role, "content": f"{index}: " + _PARAGRAPH * 3}
+        if role == "assistant":
+            message["tool_calls"] = [{
+                "id": f"call_{index}",
+                "function": {"name": "read_file", "arguments": {"path": f"src/module_{index}.py"}},
+            }]
+            message["thinking"] = _PARAGRAPH
+        elif role == "tool":
+            message["tool_name"] = "read_file"
+        messages.append(message)
+    return messages
+
+
+@contextlib.contextmanager
+def _temporary_home() -> Iterator[Path]:
+    """Point ``settings.home_dir`` at a temporary directory."""
+    settings = load_config().settings
+    previous = settings.home_dir
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.home_dir = tmp
+        try:
+            yield Path(tmp)
+        finally:
+            settings.home_dir = previous
+
+
+def _history(count: int) -> ConversationHistory:
+    return ConversationHistory([{"role": "system", "content": "You are a benchmark."}, *synthetic_messages(count)])
+
+
+@case("persistence.save")
+async def bench_persistence_save(quick: bool) -> list[Result]:
+    """``PersistenceHook.on_turn_end`` latency as the history grows."""
+    results = []
+    with _temporary_home():
+        for count in (100, 1000) if quick else (100, 1000, 5000):
+            hook = PersistenceHook(conversation_id=f"bench-{count}", history=_history(count))
+            samples = await time_samples(
+                lambda hook=hook: hook.on_turn_end("done", "Bench"), repeat=5 if quick else 20,
+            )
+            results.append(latency("persistence.save", samples, unit="ms", messages=count))
+    return results
+
+
+@case("context.stats")
+async def bench_context_stats(quick: bool) -> list[Result]:
+    """``ContextManager.stats`` cost as the history grows."""
+    from ._runtime import bench_echo
+
+    results = []
+    for count in (100, 1000) if quick else (100, 1000, 5000):
+        manager = ContextManager(_history(count), AgentState([bench_echo]), context_limit=128_000)
+        samples = await time_samples(lambda manager=manager: manager.stats, repeat=5 if quick else 50)
+        results.append(latency("context.stats", samples, unit="ms", messages=count))
+    return results
+
+
+class _IdleExecutor:
+    """Executor for a runner whose store has nothing ready."""
+
+    async def run(self, task_result: Any, task: Any) -> tuple[str, list[str]]:
+        return "", []
+
+
+def _populate_goals(store: FileTaskStore, count: int) -> None:
+    """Create *count* one-task goals, each with one completed run."""
+    for index in range(count):
+        goal = store.create_goal(f"Goal {index}", auto_run=False)
+        store.create_task(goal.id, f"Task {index}", _PARAGRAPH)
+        run = store.queue_run(goal.id)
+        for task_result in store.get_task_results(run.id):
+            store.mark_task_result_completed(task_result.id, _PARAGRAPH)
+        store.update_run_status(run.id)
+
+
+@case("tasks.tick")
+async def bench_task_tick(quick: bool) -> list[Result]:
+    """``TaskRunner`` tick latency against a ``FileTaskStore`` as goal history grows."""
+    results = []
+    for count in (10, 50) if quick else (10, 100, 500):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileTaskStore(Path(tmp))
+            _populate_goals(store, count)
+            runner = TaskRunner(store, _IdleExecutor(), GoalsConfig())  # type: ignore[arg-type]
+            samples = await time_samples(runner._tick, repeat=5 if quick else 20)
+        results.append(latency("tasks.tick", samples, unit="ms", goals=count))
+    return results
@@ -0,0 +1,81 @@
+"""File tool benchmarks: ``grep`` and ``read_file`` on a synthetic workspace."""
+
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+
+from tools.virtual_computer.read_ops import read_file
+from tools.virtual_computer.search_ops import grep
+
+from ._harness import Result, case, throughput, time_samples
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "value", "result", "config", "handler", "return", "self")
+
+
+def build_workspace(root: Path, *, files: int, lines: int, seed: int = 0) -> int:
+    """Write a source tree of *files* files of *lines* lines under *root*.
+
+    About one line in a hundred contains ``NEEDLE``.  A ``node_modules``
+    directory of the same size is added so default excludes are exercised.
+
+    Returns:
+        Total bytes written outside ``node_modules``.
+    """
+    rng = random.Random(seed)
+    total = 0
+    for directory in ("src", "node_modules/dep"):
+        for index in range(files):
+            path = root / directory / f"pkg_{index % 10}" / f"module_{index}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            body = []
+            for line_no in range(lines):
+                words = " ".join(rng.choice(_WORDS) for _ in range(8))
+                marker = " # NEEDLE" if rng.random() < 0.01 else ""
+                body.append(f"    {words} = {line_no}{marker}")
+            text = "\n".join(body) + "\n"
+            path.write_text(text, encoding="utf-8")
+            if directory == "src":
+                total += len(text.encode())
+    return total
+
+
+@case("workspace.grep")
+async def bench_grep(quick: bool) -> list[Result]:
+    """``grep`` throughput over the workspace, in source MB scanned per second."""
+    results = []
+    for files in (20, 100) if quick else (100, 500):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            size = build_workspace(root, files=files, lines=400)
+            for mode, kwargs in (("literal", {"regex": False}), ("regex", {"regex": True})):
+                pattern = "NEEDLE" if mode == "literal" else r"gamma\s+delta = \d+"
+                samples = await time_samples(
+                    lambda pattern=pattern, kwargs=kwargs: grep(pattern, path=tmp, context=2, **kwargs),
+                    repeat=3 if quick else 10,
+                )
+                results.append(throughput(
+                    "workspace.grep", samples, amount=size / 1e6, unit="MB/s", files=files, mode=mode,
+                ))
+    return results
+
+
+@case("workspace.read_file")
+async def bench_read_file(quick: bool) -> list[Result]:
+    """``read_file`` throughput for whole files and for a line range near the end."""
+    results = []
+    lines = 5_000 if quick else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_workspace(root, files=1, lines=lines)
+        path = str(root / "src" / "pkg_0" / "module_0.py")
+        size = Path(path).stat().st_size
+        repeat = 5 if quick else 20
+        samples = await time_samples(lambda: read_file(path), repeat=repeat)
+        results.append(throughput("workspace.read_file", samples, amount=size / 1e6, unit="MB/s", span="whole"))
+        samples = await time_samples(lambda: read_file(path, lines - 200, lines), repeat=repeat)
+        results.append(throughput(
+            "workspace.read_file", samples, amount=size / 1e6, unit="MB/s", span="tail_range",
+        ))
+    return results
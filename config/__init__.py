@@ -5,7 +5,7 @@ import os
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from dotenv import load_dotenv
@@ -51,6 +51,10 @@ class BrowserHumanConfig(BaseModel):
 
     pointer: HumanPointerConfig = Field(default_factory=HumanPointerConfig)
     typing: HumanTypingConfig = Field(default_factory=HumanTypingConfig)
+    # "human" = paced Bezier moves and per-key delays; "fast" = precomputed moves sent
+    # as one CDP batch with no pauses
+    mode: Literal["human", "fast"] = "human"
+    stealth: bool = True  # fast mode: type with real key events (False = insertText chunks)
 
 
 class BrowserToolsConfig(BaseModel):
@@ -59,8 +63,11 @@ class BrowserToolsConfig(BaseModel):
     headless: bool = False  # False = visible window, True = no GUI
     human: BrowserHumanConfig = Field(default_factory=BrowserHumanConfig)
     waits: "BrowserWaitConfig" = Field(default_factory=lambda: BrowserWaitConfig())
+    network: "BrowserNetworkConfig" = Field(default_factory=lambda: BrowserNetworkConfig())
     scroll_warn_threshold: int = 5
     scroll_hard_limit: int = 10
+    incremental_snapshots: bool = False  # True = diff-based DOM snapshots after interactions
+    context_pool_size: int = 2  # warm ephemeral contexts kept ready for agents (0 = off)
 
 
 class BrowserWaitConfig(BaseModel):
@@ -71,9 +78,22 @@ class BrowserWaitConfig(BaseModel):
     dom_mutation_timeout_ms: int = 1500
     dom_quiet_window_ms: int = 150
     animation_timeout_ms: int = 1000
+    skip_font_phase: bool = False
+    skip_animation_phase: bool = False
 
 
-# Note: BrowserWaitConfig is referenced as a forward-ref above to avoid
+class BrowserNetworkConfig(BaseModel):
+    """Request blocking and response caching for agent browser contexts."""
+
+    block_resource_types: list[str] = Field(default_factory=list)  # Playwright resource types, e.g. media, font
+    block_domains: list[str] = Field(default_factory=list)  # host suffixes, e.g. doubleclick.net
+    cache_enabled: bool = False  # shared on-disk cache for static assets
+    cache_max_mb: int = 256
+    cache_max_age_s: int = 86400
+    fast_settle: bool = True  # skip settle phases for resource types that are blocked
+
+
+# Note: BrowserWaitConfig and BrowserNetworkConfig are referenced as forward-refs above to avoid
 # reordering issues; Pydantic will resolve it when models are used.
 
 
@@ -90,6 +110,22 @@ class DesktopConfig(BaseModel):
     agent_display_base: int = 100
     resolution: str = "1280x720"
     websocket_port: int = 6080
+    # Screenshots sent to the vision model by describe_screen.
+    vision_image_format: Literal["png", "jpeg", "webp"] = "jpeg"
+    vision_image_quality: int = 80
+    vision_image_max_side: int | None = 1280
+
+
+class MediaConfig(BaseModel):
+    """Images sent to models: encoding and how long they stay in context."""
+
+    image_format: Literal["png", "jpeg", "webp"] = "jpeg"
+    image_quality: int = 80
+    # Longer side in pixels; larger images are downscaled before sending.
+    image_max_side: int | None = 1568
+    # Images on messages older than this many model iterations are replaced by
+    # a placeholder in outbound requests.  None keeps every image.
+    keep_image_iterations: int | None = 2
 
 
 class FeaturesConfig(BaseModel):
@@ -151,6 +187,91 @@ class IntegrationsConfig(BaseModel):
     sockets_dir: str = "/run/cvault"
 
 
+class ProviderHTTPConfig(BaseModel):
+    """Connection pools of the HTTP clients used by cloud LLM providers.
+
+    One pool is shared by every provider instance that talks to the same
+    broker socket or base URL, so concurrent agents reuse warm connections.
+    """
+
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    # Seconds an idle connection is kept open for reuse.
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 10.0
+    # HTTP/2 for direct https base URLs; needs the optional ``h2`` package.
+    http2: bool = True
+
+
+class RateLimitConfig(BaseModel):
+    """Client-side limits on model calls, shared per provider/model across conversations."""
+
+    enabled: bool = True
+    # Adaptive concurrency starts at the max, halves on 429/overload and
+    # climbs back by about one per round of successful calls.
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    # Token bucket per provider name; providers not listed are limited only
+    # by server signals (429s, Retry-After and rate-limit headers).
+    requests_per_minute: dict[str, float] = Field(default_factory=dict)
+    burst: int = 4
+    # Pause after a 429 that does not say how long to wait.
+    default_retry_after: float = 2.0
+
+
+class ModelRoutingConfig(BaseModel):
+    """Hedging and fallback for the small model calls (titles, vision, compaction).
+
+    Each role tries its configured model first and the role's fallbacks
+    (``{role}_fallbacks`` in settings) after it.
+    """
+
+    # Send the request to a second candidate when the first has produced no
+    # token within its p95 time-to-first-token.
+    hedge: bool = True
+    # Hedge delay used until a candidate has min_samples latency samples.
+    hedge_default_delay: float = 5.0
+    hedge_min_delay: float = 0.5
+    min_samples: int = 10
+    # Latency samples kept per candidate.
+    window: int = 100
+    # Consecutive failures that take a candidate out of rotation, and for how long.
+    failure_threshold: int = 3
+    cooldown: float = 60.0
+
+
+class ReplayConfig(BaseModel):
+    """Settings for the offline ``replay`` LLM provider (load testing without a model)."""
+
+    # "replay" serves recorded exchanges, "record" proxies record_provider and saves
+    # its exchanges, "synthetic" generates tool-calling scripts from the request.
+    mode: Literal["replay", "record", "synthetic"] = "replay"
+    cassette_dir: str = ""  # empty = <settings.home_dir>/replay/
+    record_provider: str = "ollama"
+    ttft_ms: float | None = None  # None = recorded time-to-first-token
+    tokens_per_second: float | None = None  # None = recorded pacing, 0 = no delay
+    synthetic_tool_calls: int = 2  # tool rounds per user message before the final reply
+    synthetic_tools: list[str] = Field(default_factory=list)  # tools synthetic mode may call (empty = any)
+    synthetic_reply_tokens: int = 64
+    seed: int = 0
+
+
+class TracingConfig(BaseModel):
+    """Per-turn latency tracing kept in memory (see ``sdk.tracing``)."""
+
+    enabled: bool = True
+    max_spans: int = 5000  # finished spans kept per conversation
+    max_conversations: int = 20  # least recently traced conversations are dropped
+
+
+class LoggingConfig(BaseModel):
+    """Log output (see ``logging_config``)."""
+
+    # "json": compact JSON lines written by a background thread.
+    # "rich": developer console with Rich panels (also written in the background).
+    mode: Literal["json", "rich"] = "json"
+
+
 class AppConfig(BaseModel):
     """Application level configuration."""
 
@@ -159,9 +280,16 @@ class AppConfig(BaseModel):
     features: FeaturesConfig = Field(default_factory=FeaturesConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     desktop: DesktopConfig = Field(default_factory=DesktopConfig)
+    media: MediaConfig = Field(default_factory=MediaConfig)
     parallel: ParallelConfig = Field(default_factory=ParallelConfig)
     goals: GoalsConfig = Field(default_factory=GoalsConfig)
     integrations: IntegrationsConfig = Field(default_factory=IntegrationsConfig)
+    replay: ReplayConfig = Field(default_factory=ReplayConfig)
+    provider_http: ProviderHTTPConfig = Field(default_factory=ProviderHTTPConfig)
+    rate_limits: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    model_routing: ModelRoutingConfig = Field(default_factory=ModelRoutingConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
 
 logger = logging.getLogger(__name__)
@@ -1,12 +1,21 @@
 """Walk the AT-SPI accessibility tree and return visible interactive elements.
 
-Runs inside the container. Outputs JSON to stdout.
+Runs inside the container. By default walks the tree once and outputs JSON
+to stdout. With ``--serve SOCKET`` it stays running for the display in
+``$DISPLAY``, keeps the AT-SPI bus connection open, caches the walked
+elements per application and serves them over a Unix socket (see
+``_serve``).
 Requires: python3-pyatspi2, at-spi2-core, libatk-adaptor
 """
 
+import argparse
+import contextlib
 import json
+import os
 import re
+import socket
 import sys
+import time
 
 import pyatspi
 
@@ -237,7 +246,7 @@ def _disambiguate_windows(elements):
     return elements
 
 
-def main():
+def _walk_desktop():
     desktop = pyatspi.Registry.getDesktop(0)
     elements = []
     for i in range(desktop.childCount):
@@ -247,8 +256,223 @@ def main():
                 elements.extend(_walk(app, depth=1))
         except Exception:
             continue
-    elements = _disambiguate_windows(elements)
-    print(json.dumps(elements))
+    return _disambiguate_windows(elements)
+
+
+# ── Daemon mode ──────────────────────────────────────────────────────────────
+#
+# Clients connect to the socket, send one JSON line and read one JSON line:
+#
+#   {"op": "snapshot", "since": "<rev>"}  ->  {"rev": "<rev>", "unchanged": true}
+#                                         or  {"rev": "<rev2>", "elements": [...]}
+#
+# Revisions embed the daemon's pid and start time, so a client holding a
+# revision from an earlier daemon on the same socket always gets a full reply.
+
+# Events that can change what _walk reports for the emitting application.
+_WATCHED_EVENTS = (
+    "object:state-changed",
+    "object:children-changed",
+    "object:property-change:accessible-name",
+    "object:text-changed",
+    "object:bounds-changed",
+    "window",
+)
+
+# Re-walk every application at least this often, in case a toolkit does
+# not emit an event for a change we report.
+_MAX_CACHE_AGE_S = 10.0
+_CLIENT_TIMEOUT_S = 2.0
+_MAX_REQUEST_BYTES = 65536
+_DISPLAY_CHECK_INTERVAL_S = 5
+
+# What AT-SPI calls raise for a vanished or misbehaving accessible: D-Bus
+# failures surface as GLib.GError (a RuntimeError), missing interfaces as
+# NotImplementedError (also a RuntimeError), a dropped source as None.
+_ATSPI_ERRORS = (RuntimeError, AttributeError, LookupError)
+
+
+def _app_key(app):
+    try:
+        return (app.name, app.get_process_id())
+    except _ATSPI_ERRORS:
+        return (app.name, None)
+
+
+class _TreeCache:
+    """Per-application element lists, re-walked only after an app changes."""
+
+    def __init__(self):
+        self._epoch = f"{os.getpid()}-{time.time_ns()}"
+        self._counter = 0
+        self._apps = {}
+        self._dirty = set()
+        self._all_dirty = True
+        self._walked_at = 0.0
+        self._elements = []
+
+    @property
+    def rev(self):
+        return f"{self._epoch}:{self._counter}"
+
+    def on_event(self, event):
+        """AT-SPI listener: mark the emitting application for a re-walk."""
+        try:
+            app = event.host_application or event.source.getApplication()
+        except _ATSPI_ERRORS:
+            app = None
+        if app is None:
+            self._all_dirty = True
+        else:
+            self._dirty.add(_app_key(app))
+
+    def snapshot(self):
+        """Return ``(rev, elements)``, re-walking changed applications."""
+        if time.monotonic() - self._walked_at > _MAX_CACHE_AGE_S:
+            self._all_dirty = True
+        if not self._all_dirty and not self._dirty:
+            return self.rev, self._elements
+
+        full = self._all_dirty
+        dirty = self._dirty
+        self._all_dirty = False
+        self._dirty = set()
+        desktop = pyatspi.Registry.getDesktop(0)
+        apps = {}
+        for i in range(desktop.childCount):
+            try:
+                app = desktop[i]
+                if app is None:
+                    continue
+                key = _app_key(app)
+                if full or key in dirty or key not in self._apps:
+                    apps[key] = list(_walk(app, depth=1))
+                else:
+                    apps[key] = self._apps[key]
+            except _ATSPI_ERRORS:
+                continue
+        self._apps = apps
+        if full:
+            self._walked_at = time.monotonic()
+
+        # _disambiguate_windows edits elements in place; keep the cached
+        # per-app lists pristine for the next partial walk.
+        elements = _disambiguate_windows(
+            [dict(el) for app_elements in apps.values() for el in app_elements],
+        )
+        if elements != self._elements:
+            self._elements = elements
+            self._counter += 1
+        return self.rev, self._elements
+
+    def handle(self, request):
+        """Answer one client request."""
+        if request.get("op") != "snapshot":
+            return {"error": f"unknown op {request.get('op')!r}"}
+        rev, elements = self.snapshot()
+        if request.get("since") == rev:
+            return {"rev": rev, "unchanged": True}
+        return {"rev": rev, "elements": elements}
+
+
+def _bind(socket_path):
+    """Listen on *socket_path*, or return ``None`` if a daemon already does."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return None
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    os.umask(0o077)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.listen(8)
+    return sock
+
+
+def _read_request(conn):
+    conn.settimeout(_CLIENT_TIMEOUT_S)
+    buf = b""
+    while b"\n" not in buf and len(buf) < _MAX_REQUEST_BYTES:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        buf += chunk
+    return json.loads(buf.split(b"\n", 1)[0] or b"{}")
+
+
+def _x_socket_exists():
+    display = os.environ.get("DISPLAY", "")
+    number = display.rpartition(":")[2].split(".")[0]
+    return not number or os.path.exists(f"/tmp/.X11-unix/X{number}")
+
+
+def _serve(socket_path):
+    """Serve cached snapshots on *socket_path* until the display goes away.
+
+    Event delivery and client handling share the GLib main loop that
+    ``pyatspi.Registry.start`` runs, so the tree is only touched from one
+    thread.
+    """
+    from gi.repository import GLib
+
+    sock = _bind(socket_path)
+    if sock is None:
+        return
+    stat = os.stat(socket_path)
+    cache = _TreeCache()
+    pyatspi.Registry.registerEventListener(cache.on_event, *_WATCHED_EVENTS)
+
+    def _on_client(_fd, _condition):
+        try:
+            conn, _ = sock.accept()
+        except OSError:
+            return True
+        with conn:
+            try:
+                reply = cache.handle(_read_request(conn))
+            except (OSError, ValueError, *_ATSPI_ERRORS) as exc:
+                reply = {"error": str(exc)}
+            with contextlib.suppress(OSError):
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+        return True
+
+    def _check_alive():
+        try:
+            ours = os.stat(socket_path).st_ino == stat.st_ino
+        except OSError:
+            ours = False
+        if ours and _x_socket_exists():
+            return True
+        pyatspi.Registry.stop()
+        return False
+
+    GLib.io_add_watch(sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, _on_client)
+    GLib.timeout_add_seconds(_DISPLAY_CHECK_INTERVAL_S, _check_alive)
+    try:
+        pyatspi.Registry.start()
+    finally:
+        sock.close()
+        try:
+            if os.stat(socket_path).st_ino == stat.st_ino:
+                os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def main():
+    """Print one snapshot as JSON, or serve snapshots with ``--serve``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--serve", metavar="SOCKET", help="run as a daemon on this Unix socket")
+    args = parser.parse_args()
+    if args.serve:
+        _serve(args.serve)
+        return
+    print(json.dumps(_walk_desktop()))
 
 
 if __name__ == "__main__":
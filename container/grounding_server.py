@@ -1,7 +1,8 @@
 """Persistent grounding server for desktop UI element location.
 
-Keeps UI-TARS loaded in VRAM between requests. Auto-shuts down after
-3 minutes of inactivity to free VRAM for other workloads.
+Keeps UI-TARS loaded in VRAM between requests. Shuts down to free VRAM
+for other workloads when the shared residency coordinator
+(``model_residency.py``) evicts it or its idle TTL runs out.
 
 Usage (inside container):
     python3 /opt/inference/grounding_server.py &
@@ -25,6 +26,8 @@ import threading
 import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import model_residency
+
 os.environ["TRANSFORMERS_VERBOSITY"] = "error"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 os.environ["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
@@ -40,7 +43,9 @@ if not os.environ.get("HF_TOKEN"):
 
 PORT = 18902
 PID_FILE = "/tmp/grounding_server.pid"
-IDLE_TIMEOUT = 180  # 3 minutes
+IDLE_TIMEOUT = 180  # fallback when the residency registry is unavailable
+_RESIDENCY_NAME = "grounding"
+_RESIDENCY_ESTIMATE_MB = 17_000  # 7B in bfloat16, before the first measurement
 
 MODEL_ID = "ByteDance-Seed/UI-TARS-1.5-7B"
 
@@ -113,6 +118,16 @@ _model = None
 _processor = None
 _lock = threading.Lock()
 _last_request_time = time.time()
+_residency = model_residency.Registry()
+
+
+def _residency_call(method, *args, **kwargs):
+    """Call a residency registry method; the server works without the registry."""
+    try:
+        return getattr(_residency, method)(*args, **kwargs)
+    except OSError:
+        log.warning("Residency registry unavailable", exc_info=True)
+        return None
 
 
 def _select_gpu():
@@ -143,12 +158,17 @@ def _load_model():
     import torch
     from transformers import AutoProcessor, Qwen2_5_VLForConditionalGeneration
 
+    t0 = time.time()
+    evicted = _residency_call("acquire", _RESIDENCY_NAME, footprint_mb=_RESIDENCY_ESTIMATE_MB)
+    if evicted:
+        log.info("Evicted %s to make room", ", ".join(r.name for r in evicted))
+        time.sleep(3)  # let the driver reclaim VRAM
+
     gpu_idx = _select_gpu()
     torch.cuda.set_device(gpu_idx)
     device = "cuda:%d" % gpu_idx
 
     log.info("Loading %s onto %s (bfloat16) ...", MODEL_ID, device)
-    t0 = time.time()
 
     _model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
         MODEL_ID,
@@ -157,6 +177,11 @@ def _load_model():
     )
     _processor = AutoProcessor.from_pretrained(MODEL_ID)
     log.info("Model loaded in %.1fs (bfloat16, single GPU)", time.time() - t0)
+    _residency_call(
+        "touch", _RESIDENCY_NAME,
+        load_cost_s=time.time() - t0,
+        footprint_mb=torch.cuda.memory_reserved(gpu_idx) / 2**20 or None,
+    )
 
 
 def _run_inference(image_bytes, task):
@@ -324,6 +349,7 @@ class _Handler(BaseHTTPRequestHandler):
             return
 
         with _lock:
+            _residency_call("touch", _RESIDENCY_NAME, busy=True)
             try:
                 raw_output, orig_w, orig_h = _run_inference(image_bytes, task)
                 result = _parse_action(raw_output, orig_w, orig_h)
@@ -332,17 +358,25 @@ class _Handler(BaseHTTPRequestHandler):
             except Exception as exc:
                 log.exception("Inference failed")
                 self._json_response({"error": str(exc)}, 500)
+            finally:
+                _residency_call("touch", _RESIDENCY_NAME, busy=False)
 
 
 # ── Idle watchdog ─────────────────────────────────────────────────────
 
 def _idle_watchdog():
-    """Shut down if no requests received within IDLE_TIMEOUT."""
+    """Shut down once the residency coordinator releases the model."""
     while True:
         time.sleep(30)
-        idle = time.time() - _last_request_time
-        if idle > IDLE_TIMEOUT:
-            log.info("Idle for %.0fs, shutting down to free VRAM", idle)
+        if _lock.locked():
+            continue
+        _residency_call("sweep", exclude={_RESIDENCY_NAME})
+        release = _residency_call("should_release", _RESIDENCY_NAME)
+        if release is None:
+            release = time.time() - _last_request_time > IDLE_TIMEOUT
+        if release:
+            log.info("Released by the residency coordinator, shutting down to free VRAM")
+            _residency_call("release", _RESIDENCY_NAME)
             os._exit(0)
 
 
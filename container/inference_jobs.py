@@ -0,0 +1,332 @@
+"""Job scheduler for the persistent inference server.
+
+A single worker thread runs one job at a time (the GPU holds one
+pipeline). Queued jobs are ordered by:
+
+1. priority (higher first);
+2. affinity with the loaded model: the same model first, then the same
+   base model (a cheap LoRA swap), then anything else;
+3. submission order.
+
+A job that has been passed over ``_MAX_BYPASS`` times for affinity runs
+next, so one request for a different model cannot starve behind a stream
+of requests for the loaded one.
+
+The scheduler knows nothing about pipelines: the server hands it a
+``runner(job)`` that generates while reporting progress through
+``job.emit``, and an ``affinity(gen_type, body)`` that returns the
+``(base, variant)`` a job needs loaded.  Stdlib only, so it can be tested
+with a stub runner.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_MAX_BYPASS = 3
+_HISTORY = 200  # finished jobs kept for /jobs/{id}
+
+# Statuses that end a job's event stream.
+TERMINAL_STATUSES = frozenset({"complete", "failed", "restart_required"})
+
+
+class JobCancelled(Exception):
+    """Raised from ``Job.emit`` once the running job has been cancelled."""
+
+
+class Job:
+    """One generation request and its progress."""
+
+    def __init__(self, gen_type, body, *, priority, affinity, seq, stream):
+        """Initialize a queued job.
+
+        Args:
+            gen_type: Kind of generation (e.g. ``"image"``).
+            body: The request body.
+            priority: Higher runs first.
+            affinity: ``(base, variant)`` model the job needs loaded.
+            seq: Submission order, for ties.
+            stream: Whether the client reads progress events.
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.gen_type = gen_type
+        self.body = body
+        self.priority = priority
+        self.affinity = affinity
+        self.seq = seq
+        self.stream = stream
+        self.state = "queued"
+        self.events = queue.Queue()
+        self.result = None
+        self.error = None
+        self.bypassed = 0
+        self.last_event = None
+        self.cancel_requested = threading.Event()
+        self.done = threading.Event()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def emit(self, event):
+        """Report progress; raises ``JobCancelled`` if the job was cancelled."""
+        if self.cancel_requested.is_set():
+            raise JobCancelled(self.id)
+        self._record(event)
+
+    def _record(self, event):
+        self.last_event = {k: v for k, v in event.items() if k != "preview"}
+        self.events.put(event)
+
+    def info(self, position=None):
+        """Return a JSON-ready summary, with *position* in the queue if known."""
+        return {
+            "id": self.id,
+            "type": self.gen_type,
+            "model": self.body.get("model"),
+            "state": self.state,
+            "priority": self.priority,
+            "position": position,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.last_event,
+            "error": self.error,
+        }
+
+
+class JobScheduler:
+    """Priority queue with model affinity, run by one worker thread.
+
+    Args:
+        runner: ``runner(job)`` generates for *job*, reporting progress via
+            ``job.emit``; its return value becomes ``job.result``.
+        affinity: ``affinity(gen_type, body)`` returns the ``(base, variant)``
+            model the job needs.
+    """
+
+    def __init__(self, runner, affinity):
+        """Initialize with the job runner and affinity function; see the class docstring."""
+        self._runner = runner
+        self._affinity = affinity
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queued = []
+        self._running = None
+        self._loaded = None
+        self._finished = OrderedDict()
+        self._closed = False
+        self._thread = None
+
+    # ── Submission and lookup ─────────────────────────────────────────
+
+    def submit(self, gen_type, body, *, priority=0, stream=True):
+        """Queue a job and return it.
+
+        Raises:
+            RuntimeError: If the scheduler no longer accepts jobs.
+        """
+        job = Job(
+            gen_type, body,
+            priority=priority,
+            affinity=self._affinity(gen_type, body),
+            seq=next(self._seq),
+            stream=stream,
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("inference server is shutting down")
+            self._queued.append(job)
+            self._cond.notify_all()
+        return job
+
+    def get(self, job_id):
+        """Return the running, queued or recently finished job *job_id*, or ``None``."""
+        with self._cond:
+            if self._running is not None and self._running.id == job_id:
+                return self._running
+            for job in self._queued:
+                if job.id == job_id:
+                    return job
+            return self._finished.get(job_id)
+
+    def position(self, job):
+        """Return how many queued jobs run before *job*, or ``None`` if not queued."""
+        with self._cond:
+            for i, queued in enumerate(self._order()):
+                if queued is job:
+                    return i
+        return None
+
+    def jobs(self):
+        """Info for the running job, then queued jobs in run order."""
+        with self._cond:
+            infos = [self._running.info()] if self._running is not None else []
+            infos += [job.info(i) for i, job in enumerate(self._order())]
+        return infos
+
+    def busy(self):
+        """Whether a job is running or queued."""
+        with self._cond:
+            return self._running is not None or bool(self._queued)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job.
+
+        A queued job is dropped immediately; a running job stops at its next
+        ``emit``.  Returns the job, or ``None`` if it is unknown or finished.
+        """
+        with self._cond:
+            job = self.get(job_id)
+            if job is None or job.done.is_set():
+                return None
+            job.cancel_requested.set()
+            if job.state == "queued":
+                self._queued.remove(job)
+                self._finish(job, "cancelled")
+                job._record({"status": "failed", "message": "Job cancelled", "cancelled": True})
+            self._cond.notify_all()
+        return job
+
+    def close(self, event_for=None):
+        """Stop accepting jobs and end every queued job.
+
+        Args:
+            event_for: ``event_for(job)`` gives the final event for each
+                queued job (e.g. ``restart_required``); defaults to failed.
+        """
+        with self._cond:
+            self._closed = True
+            queued, self._queued = self._queued, []
+            for job in queued:
+                event = event_for(job) if event_for else {"status": "failed", "message": "Server shutting down"}
+                self._finish(job, event["status"])
+                job._record(event)
+            self._cond.notify_all()
+
+    # ── Ordering ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def _select(queued, loaded, bypassed):
+        top = max(job.priority for job in queued)
+        candidates = [job for job in queued if job.priority == top]
+        oldest = min(candidates, key=lambda job: job.seq)
+        if bypassed[oldest.id] >= _MAX_BYPASS:
+            return oldest
+
+        def _rank(job):
+            if loaded is not None and job.affinity == loaded:
+                return 0, job.seq
+            if loaded is not None and job.affinity[0] == loaded[0]:
+                return 1, job.seq
+            return 2, job.seq
+
+        chosen = min(candidates, key=_rank)
+        for job in candidates:
+            if job.seq < chosen.seq:
+                bypassed[job.id] += 1
+        return chosen
+
+    def _order(self):
+        """Queued jobs in the order they will run (caller holds the lock)."""
+        remaining = list(self._queued)
+        bypassed = {job.id: job.bypassed for job in remaining}
+        loaded = self._loaded
+        order = []
+        while remaining:
+            job = self._select(remaining, loaded, bypassed)
+            remaining.remove(job)
+            order.append(job)
+            loaded = job.affinity
+        return order
+
+    # ── Worker ────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start the worker thread."""
+        self._thread = threading.Thread(target=self._work, name="inference-jobs", daemon=True)
+        self._thread.start()
+
+    def _next(self):
+        with self._cond:
+            while not self._queued:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            bypassed = {job.id: job.bypassed for job in self._queued}
+            job = self._select(self._queued, self._loaded, bypassed)
+            for queued in self._queued:
+                queued.bypassed = bypassed[queued.id]
+            self._queued.remove(job)
+            job.state = "running"
+            job.started_at = time.time()
+            self._running = job
+            self._loaded = job.affinity
+            self._cond.notify_all()
+            return job
+
+    def _work(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            try:
+                job.result = self._runner(job)
+                status = (job.last_event or {}).get("status")
+                state = status if status in ("failed", "restart_required") else "complete"
+            except JobCancelled:
+                state = "cancelled"
+                job._record({"status": "failed", "message": "Job cancelled", "cancelled": True})
+            except Exception as exc:
+                logger.exception("Job %s (%s) failed", job.id, job.gen_type)
+                state = "failed"
+                job.error = str(exc)
+                job._record({"status": "failed", "message": str(exc)})
+            with self._cond:
+                self._running = None
+                self._finish(job, state)
+                self._cond.notify_all()
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished_at = time.time()
+        self._finished[job.id] = job
+        while len(self._finished) > _HISTORY:
+            self._finished.popitem(last=False)
+        job.done.set()
+
+    # ── Streaming ─────────────────────────────────────────────────────
+
+    def stream(self, job, write_line, *, poll_s=0.5):
+        """Forward *job*'s events to *write_line* until it finishes.
+
+        While the job waits, ``loading`` events carrying ``job_id`` and
+        ``queue_position`` are sent whenever its position changes.  If
+        *write_line* fails (the client went away), the job is cancelled.
+        """
+        last_position = -1
+        try:
+            while True:
+                try:
+                    event = job.events.get(timeout=poll_s if last_position >= 0 else 0)
+                except queue.Empty:
+                    position = self.position(job)
+                    if position is not None and position != last_position:
+                        write_line({
+                            "status": "loading",
+                            "job_id": job.id,
+                            "queue_position": position,
+                            "message": f"Queued ({position} ahead)" if position else "Queued (next)",
+                        })
+                    last_position = max(position or 0, 0)
+                    continue
+                write_line(event)
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+        except OSError:
+            self.cancel(job.id)
@@ -1,8 +1,9 @@
 """Persistent inference server for image/video/audio generation.
 
 Keeps ML models loaded in VRAM between requests so custom tools don't
-pay the ~30s model-loading cost on every call.  Auto-shuts down after
-10 minutes of inactivity to free VRAM for other workloads (e.g. Ollama).
+pay the ~30s model-loading cost on every call.  Shuts down to free VRAM
+for other workloads (e.g. Ollama) when the shared residency coordinator
+(``model_residency.py``) evicts it or its idle TTL runs out.
 
 Usage (inside container):
     python3 /opt/inference/inference_server.py &
@@ -10,8 +11,15 @@ Usage (inside container):
 Protocol:
     POST /generate         — JSON body, blocks until done, returns {"path": ...}
     POST /generate-stream  — JSON body, chunked JSONL with progress + previews
-    GET  /health           — returns {"status": "ok", "model": ...}
+    GET  /health           — returns {"status": "ok", "model": ..., "queue": ...}
+    GET  /jobs             — running and queued jobs, in run order
+    GET  /jobs/{id}        — one job's state and latest progress
+    POST /jobs/{id}/cancel — cancel a queued or running job (also DELETE /jobs/{id})
     POST /shutdown         — graceful shutdown
+
+Requests are queued and run one at a time by ``inference_jobs.JobScheduler``;
+an optional integer ``priority`` in the body (default 0) jumps the queue,
+and requests for the loaded model run before ones that need a model switch.
 """
 
 import base64
@@ -26,6 +34,9 @@ import time
 import warnings
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import model_residency
+from inference_jobs import JobScheduler
+
 # Suppress noisy library output
 os.environ["TRANSFORMERS_VERBOSITY"] = "error"
 os.environ["DIFFUSERS_VERBOSITY"] = "error"
@@ -49,7 +60,7 @@ if not os.environ.get("HF_TOKEN"):
 
 PORT = 18901
 PID_FILE = "/tmp/inference_server.pid"
-IDLE_TIMEOUT = 180  # 3 minutes
+IDLE_TIMEOUT = 180  # 3 minutes, while no model is loaded
 
 logging.basicConfig(
     level=logging.INFO,
@@ -202,12 +213,53 @@ _loaded_gpu = -1  # which physical GPU the model is currently on
 _loaded_model = None  # name key from _MODELS (e.g. "schnell", "klein-4b")
 _taesd = None  # AutoencoderTiny for Flux preview (loaded lazily)
 _last_request = time.time()
-_lock = threading.Lock()
+
+# VRAM residency shared with the grounding server and Ollama: a loaded
+# model stays until the coordinator's idle TTL or another load evicts it.
+_RESIDENCY_NAME = "inference"
+# Footprint assumed before the first load has been measured.
+_RESIDENCY_ESTIMATE_MB = {"image": 12_000, "video": 10_000, "audio": 8_000}
+_residency = model_residency.Registry()
+_load_started = 0.0
 
 # Steps at which to emit a first-frame preview for video generation.
 _VIDEO_PREVIEW_STEPS = {5, 10, 15, 20}
 
 
+def _residency_call(method, *args, **kwargs):
+    """Call a residency registry method; the server works without the registry."""
+    try:
+        return getattr(_residency, method)(*args, **kwargs)
+    except OSError:
+        log.warning("Residency registry unavailable", exc_info=True)
+        return None
+
+
+def _make_room(kind: str):
+    """Ask the residency coordinator to evict idle models before loading *kind*.
+
+    Models load lazily inside a job, whose busy mark is lost if the server was
+    not registered yet, so a first registration is made busy.
+    """
+    global _load_started
+    _load_started = time.time()
+    evicted = _residency_call("acquire", _RESIDENCY_NAME, footprint_mb=_RESIDENCY_ESTIMATE_MB[kind], busy=True)
+    if evicted:
+        log.info("Evicted %s to make room for %s", ", ".join(r.name for r in evicted), kind)
+        time.sleep(3)  # let the driver reclaim VRAM, as the client does after a kill
+
+
+def _record_load():
+    """Report the measured load time and VRAM footprint of the new model."""
+    footprint = None
+    try:
+        import torch
+        footprint = torch.cuda.memory_reserved() / 2**20 or None
+    except (ImportError, RuntimeError):
+        log.debug("Could not measure the VRAM footprint", exc_info=True)
+    _residency_call("touch", _RESIDENCY_NAME, load_cost_s=time.time() - _load_started, footprint_mb=footprint)
+
+
 def _unload():
     """Unload the current model.
 
@@ -662,6 +714,7 @@ def _load_image_model(model_name: str, gpu_id: int, free_mb: float,
     _pipe_type = "image"
     _loaded_gpu = gpu_id
     _loaded_model = model_name
+    _record_load()
     _emit(f"{model_name} ready on GPU {gpu_id} ({strategy})")
 
 
@@ -817,6 +870,7 @@ def _ensure_image_model(model_name: str | None = None, on_progress=None):
     if _pipe is not None and _loaded_model and _loaded_model != model_name:
         raise _ModelSwitchRequired(_loaded_model, model_name)
 
+    _make_room("image")
     gpu_id, free_mb, total_mb = _select_gpu(on_progress=on_progress)
     _load_image_model(model_name, gpu_id, free_mb, total_mb, on_progress=on_progress)
 
@@ -848,6 +902,7 @@ def _load_video_model(on_progress=None):
             on_progress(msg)
 
     _unload()
+    _make_room("video")
     _emit("Loading Wan2.1-T2V-1.3B (video)...")
     import torch
     from diffusers import AutoencoderKLWan, WanPipeline
@@ -872,6 +927,7 @@ def _load_video_model(on_progress=None):
     _pipe_type = "video"
     _loaded_gpu = gpu_id
     _loaded_model = "wan2.1-t2v"
+    _record_load()
     log.info("Wan2.1-T2V-1.3B ready on GPU %d", gpu_id)
 
 
@@ -885,6 +941,7 @@ def _load_audio_model(on_progress=None):
             on_progress(msg)
 
     _unload()
+    _make_room("audio")
     _emit("Loading ACE-Step 1.5 audio model...")
 
     # Pick the best GPU via nvidia-smi BEFORE initializing CUDA.
@@ -943,6 +1000,7 @@ def _load_audio_model(on_progress=None):
     _pipe_type = "audio"
     _loaded_gpu = gpu_id
     _loaded_model = "ace-step-1.5"
+    _record_load()
     log.info("ACE-Step 1.5 ready on GPU %d", gpu_id)
 
 
@@ -1239,6 +1297,57 @@ def _generate_audio_stream(body, write_line):
                 "sample_rate": _AUDIO_MODEL["sample_rate"]})
 
 
+# ── Job queue ─────────────────────────────────────────────────────────
+def _job_affinity(gen_type: str, body: dict) -> tuple[str, str]:
+    """Return the ``(base, variant)`` model a request needs loaded.
+
+    Image models sharing a base differ only in LoRAs, which swap in place;
+    anything else needs a server restart.
+    """
+    if gen_type == "image":
+        name = body.get("model") or _DEFAULT_MODEL
+        if name not in _MODELS:
+            name = _DEFAULT_MODEL
+        return _MODELS[name]["model_id"], name
+    return gen_type, gen_type
+
+
+def _restart_event(requested: str) -> dict:
+    # The pid lets clients that share the restart kill this server only once.
+    return {"status": "restart_required", "model": requested, "pid": os.getpid()}
+
+
+def _run_job(job):
+    """Run one job on the loaded pipeline (called by the scheduler worker)."""
+    global _last_request
+    gen = _GENERATORS[job.gen_type]
+    _residency_call("touch", _RESIDENCY_NAME, busy=True)
+    try:
+        if job.stream:
+            gen.generate_stream(job.body, job.emit)
+            restart = job.last_event if (job.last_event or {}).get("status") == "restart_required" else None
+            result = None
+        else:
+            result = gen.generate(job.body)
+            restart = None
+    except _ModelSwitchRequired as exc:
+        restart = _restart_event(exc.requested)
+        job._record(restart)
+        result = None
+    finally:
+        _last_request = time.time()
+        _residency_call("touch", _RESIDENCY_NAME, busy=False)
+    if restart is not None:
+        # Queued jobs can't run on this process either: hand them back to
+        # their clients, which resubmit once the server has restarted.
+        _scheduler.close(lambda queued: _restart_event(queued.body.get("model") or queued.gen_type))
+        threading.Thread(target=_shutdown, daemon=True).start()
+    return result
+
+
+_scheduler = JobScheduler(_run_job, _job_affinity)
+
+
 # ── HTTP handler ──────────────────────────────────────────────────────
 class _ReusableHTTPServer(ThreadingHTTPServer):
     allow_reuse_address = True
@@ -1252,16 +1361,42 @@ class _Handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         if self.path == "/health":
+            jobs = _scheduler.jobs()
             self._json_response(200, {
                 "status": "ok",
                 "model": _pipe_type,
                 "model_name": _loaded_model,
                 "available_models": list(_MODELS.keys()),
                 "available_gen_types": list(_GENERATORS.keys()),
+                "queue": {
+                    "running": next((j["id"] for j in jobs if j["state"] == "running"), None),
+                    "queued": sum(j["state"] == "queued" for j in jobs),
+                },
             })
+        elif self.path == "/jobs":
+            self._json_response(200, {"jobs": _scheduler.jobs()})
+        elif self.path.startswith("/jobs/"):
+            job = _scheduler.get(self.path[len("/jobs/"):])
+            if job is None:
+                self._json_response(404, {"error": "unknown job"})
+            else:
+                self._json_response(200, job.info(_scheduler.position(job)))
+        else:
+            self.send_error(404)
+
+    def do_DELETE(self):
+        if self.path.startswith("/jobs/"):
+            self._cancel(self.path[len("/jobs/"):])
         else:
             self.send_error(404)
 
+    def _cancel(self, job_id):
+        job = _scheduler.cancel(job_id)
+        if job is None:
+            self._json_response(404, {"error": "unknown or finished job"})
+        else:
+            self._json_response(200, {"id": job.id, "state": job.state, "cancel_requested": True})
+
     def do_POST(self):
         global _last_request
         _last_request = time.time()
@@ -1279,48 +1414,55 @@ class _Handler(BaseHTTPRequestHandler):
             self._handle_generate_stream()
             return
 
+        if self.path.startswith("/jobs/") and self.path.endswith("/cancel"):
+            self._cancel(self.path[len("/jobs/"):-len("/cancel")])
+            return
+
         self.send_error(404)
 
-    def _handle_generate(self):
-        """Non-streaming generation (backward-compatible)."""
+    def _submit(self, *, stream):
+        """Parse the request body and queue it; returns the job or ``None``."""
         try:
             length = int(self.headers.get("Content-Length", 0))
             body = json.loads(self.rfile.read(length))
-        except (json.JSONDecodeError, ValueError) as exc:
+            priority = int(body.pop("priority", 0) or 0)
+        except (json.JSONDecodeError, ValueError, TypeError) as exc:
             self._json_response(400, {"error": str(exc)})
-            return
+            return None
 
         gen_type = body.get("type")
-        gen = _GENERATORS.get(gen_type)
-        if gen is None:
+        if gen_type not in _GENERATORS:
             self._json_response(400, {"error": f"type must be one of {list(_GENERATORS)}"})
-            return
+            return None
 
-        with _lock:
-            try:
-                result = gen.generate(body)
-                self._json_response(200, result)
-            except _ModelSwitchRequired:
-                self._json_response(409, {"restart_required": True,
-                                          "model": body.get("model")})
-                threading.Thread(target=_shutdown, daemon=True).start()
-            except Exception as exc:
-                log.exception("Generation failed")
-                self._json_response(500, {"error": str(exc)})
-
-    def _handle_generate_stream(self):
-        """Streaming generation with progress and previews via chunked JSONL."""
         try:
-            length = int(self.headers.get("Content-Length", 0))
-            body = json.loads(self.rfile.read(length))
-        except (json.JSONDecodeError, ValueError) as exc:
-            self._json_response(400, {"error": str(exc)})
+            return _scheduler.submit(gen_type, body, priority=priority, stream=stream)
+        except RuntimeError:
+            # Shutting down for a model switch; the client resubmits after restarting us.
+            self._json_response(409, {"restart_required": True, "model": body.get("model"),
+                                      "pid": os.getpid()})
+            return None
+
+    def _handle_generate(self):
+        """Non-streaming generation (backward-compatible)."""
+        job = self._submit(stream=False)
+        if job is None:
             return
+        job.done.wait()
+        if job.state == "complete":
+            self._json_response(200, job.result)
+        elif job.state == "restart_required":
+            self._json_response(409, {"restart_required": True,
+                                      "model": job.body.get("model"), "pid": os.getpid()})
+        else:
+            if job.error:
+                log.error("Generation failed: %s", job.error)
+            self._json_response(500, {"error": job.error or job.state})
 
-        gen_type = body.get("type")
-        gen = _GENERATORS.get(gen_type)
-        if gen is None:
-            self._json_response(400, {"error": f"type must be one of {list(_GENERATORS)}"})
+    def _handle_generate_stream(self):
+        """Streaming generation with progress and previews via chunked JSONL."""
+        job = self._submit(stream=True)
+        if job is None:
             return
 
         # Start chunked response
@@ -1340,16 +1482,11 @@ class _Handler(BaseHTTPRequestHandler):
             self.wfile.write(b"\r\n")
             self.wfile.flush()
 
-        with _lock:
-            try:
-                gen.generate_stream(body, write_line)
-            except _ModelSwitchRequired as exc:
-                write_line({"status": "restart_required",
-                            "model": exc.requested})
-                threading.Thread(target=_shutdown, daemon=True).start()
-            except Exception as exc:
-                log.exception("Streaming generation failed")
-                write_line({"status": "failed", "message": str(exc)})
+        # Queue position updates, then the job's own progress events;
+        # a client that disconnects cancels its job.
+        _scheduler.stream(job, write_line)
+        if job.error:
+            log.error("Streaming generation failed: %s", job.error)
 
         # Terminate chunked transfer
         self.wfile.write(b"0\r\n\r\n")
@@ -1373,6 +1510,7 @@ def _shutdown():
     time.sleep(0.2)  # let response flush
     log.info("Shutting down...")
     _unload()
+    _residency_call("release", _RESIDENCY_NAME)
     if _server:
         _server.shutdown()
     _cleanup_pid()
@@ -1387,11 +1525,27 @@ def _cleanup_pid():
 
 
 def _idle_watchdog():
-    """Background thread that shuts down the server after IDLE_TIMEOUT."""
+    """Background thread that shuts down the server once it should free VRAM.
+
+    With a model loaded, the residency coordinator decides: the server
+    exits when another load evicted it or its idle TTL ran out.  Without
+    one, it exits after IDLE_TIMEOUT.
+    """
     while True:
         time.sleep(30)
-        if time.time() - _last_request > IDLE_TIMEOUT:
-            log.info("Idle timeout reached (%ds), shutting down", IDLE_TIMEOUT)
+        if _scheduler.busy():
+            continue
+        if _pipe is None:
+            if time.time() - _last_request > IDLE_TIMEOUT:
+                log.info("Idle timeout reached (%ds), shutting down", IDLE_TIMEOUT)
+                _shutdown()
+            continue
+        _residency_call("sweep", exclude={_RESIDENCY_NAME})
+        release = _residency_call("should_release", _RESIDENCY_NAME)
+        if release is None:
+            release = time.time() - _last_request > IDLE_TIMEOUT
+        if release:
+            log.info("Residency coordinator released %s model, shutting down", _pipe_type)
             _shutdown()
 
 
@@ -1413,6 +1567,7 @@ def main():
     # Start idle watchdog
     watchdog = threading.Thread(target=_idle_watchdog, daemon=True)
     watchdog.start()
+    _scheduler.start()
 
     _server = _ReusableHTTPServer(("127.0.0.1", PORT), _Handler)
     log.info("Inference server listening on port %d (PID %d)", PORT, os.getpid())
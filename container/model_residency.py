@@ -0,0 +1,382 @@
+"""Shared GPU model residency coordinator.
+
+The inference server, the grounding server and compaction's Ollama
+summarizer all hold models in VRAM.  Rather than each unloading on its own
+fixed timer, they record what they hold in one registry file and consult
+the same policy:
+
+- Before loading, a process calls :meth:`Registry.acquire` with the
+  memory it needs.  If the budget can't fit it, idle residents are evicted
+  in order of :func:`keep_value` (cheapest to lose first).
+- While idle, a resident stays loaded for :func:`idle_ttl`, which grows with
+  how often it is used and how long it takes to reload.  Anyone calling
+  :meth:`Registry.sweep` evicts residents whose TTL has run out; a server
+  checks :meth:`Registry.should_release` to notice its own turn.
+
+Eviction stops a server with SIGTERM or runs ``ollama stop``.  The policy
+functions are pure, so decisions can be tested against a simulated budget.
+
+Ollama unloads models on its own keep-alive timer and loads whatever a
+client asks for, so the registry is reconciled with Ollama's list of
+loaded models (``/api/ps``) on every access: Ollama residents it no
+longer holds are dropped, and models loaded by someone that never
+registered them (such as the main agent model) are added as *external*
+residents.  External residents count against the budget but are never
+evicted; Ollama's keep-alive decides when they go.
+Stdlib only: this module is imported by the container servers (as a
+sibling script) and by the app.
+"""
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+
+log = logging.getLogger("residency")
+
+REGISTRY_PATH = "/tmp/computron-residency.json"
+
+# Use counts halve every this many seconds, so "frequent" means "recently frequent".
+_HALF_LIFE_S = 600.0
+_MIN_IDLE_S = 120.0
+_MAX_IDLE_S = 1800.0
+# Seconds of extra idle time per (decayed use x second of reload cost).
+_IDLE_PER_USE_COST = 10.0
+_DEFAULT_LOAD_COST_S = 10.0
+# Assumed footprint for a resident that hasn't reported one (e.g. an Ollama model).
+_DEFAULT_FOOTPRINT_MB = 8_000.0
+# Ollama's loaded-model list is fetched at most this often.
+_OLLAMA_POLL_S = 5.0
+_OLLAMA_TIMEOUT_S = 1.0
+# An Ollama resident missing from that list is kept this long after its last
+# use, since it is registered before the request that loads it.
+_OLLAMA_GRACE_S = 30.0
+
+
+@dataclass
+class Resident:
+    """One model held in VRAM by some process."""
+
+    name: str
+    footprint_mb: float
+    kind: str = "process"  # "process" (stopped with SIGTERM) or "ollama"
+    pid: int | None = None
+    model: str | None = None  # Ollama model name for kind="ollama"
+    load_cost_s: float = _DEFAULT_LOAD_COST_S
+    uses: float = 0.0
+    last_used: float = 0.0
+    busy: int = 0
+    external: bool = False  # loaded by an Ollama client that never registered it
+
+
+# ── Policy ────────────────────────────────────────────────────────────
+
+def decayed_uses(resident, now):
+    """Use count with older uses discounted by ``_HALF_LIFE_S``."""
+    age = max(0.0, now - resident.last_used)
+    return resident.uses * 0.5 ** (age / _HALF_LIFE_S)
+
+
+def keep_value(resident, now):
+    """Reload seconds saved per MB by keeping *resident*; higher stays longer."""
+    return (1.0 + decayed_uses(resident, now)) * max(resident.load_cost_s, 1.0) / max(resident.footprint_mb, 1.0)
+
+
+def idle_ttl(resident, now):
+    """How long *resident* may stay loaded with no use."""
+    extra = decayed_uses(resident, now) * resident.load_cost_s * _IDLE_PER_USE_COST
+    return min(_MAX_IDLE_S, _MIN_IDLE_S + extra)
+
+
+def plan_evictions(residents, *, budget_mb, need_mb, now, exclude=()):
+    """Choose which residents to evict so *need_mb* more fits in *budget_mb*.
+
+    Busy and external residents and names in *exclude* are never chosen.  The least
+    valuable go first (see :func:`keep_value`); if even evicting every
+    candidate isn't enough, all of them are returned and the caller loads
+    anyway.
+    """
+    if budget_mb is None:
+        return []
+    others = [r for r in residents if r.name not in exclude]
+    free = budget_mb - sum(r.footprint_mb for r in others)
+    if need_mb <= free:
+        return []
+    evict = []
+    candidates = (r for r in others if not r.busy and not r.external)
+    for resident in sorted(candidates, key=lambda r: keep_value(r, now)):
+        evict.append(resident)
+        free += resident.footprint_mb
+        if need_mb <= free:
+            break
+    return evict
+
+
+def expired(residents, now):
+    """Idle, non-external residents whose :func:`idle_ttl` has run out."""
+    return [r for r in residents if not r.busy and not r.external and now - r.last_used > idle_ttl(r, now)]
+
+
+# ── Budget and eviction ───────────────────────────────────────────────
+
+_budget_cache = []
+
+
+def budget_mb():
+    """VRAM budget in MB: ``COMPUTRON_VRAM_BUDGET_MB`` or the largest GPU, else ``None``."""
+    env = os.environ.get("COMPUTRON_VRAM_BUDGET_MB")
+    if env:
+        return float(env)
+    if not _budget_cache:
+        try:
+            out = subprocess.run(
+                ["nvidia-smi", "--query-gpu=memory.total", "--format=csv,noheader,nounits"],
+                capture_output=True, text=True, timeout=10, check=True,
+            ).stdout
+            _budget_cache.append(max(float(line) for line in out.split()) if out.split() else None)
+        except (OSError, subprocess.SubprocessError, ValueError):
+            _budget_cache.append(None)
+    return _budget_cache[0]
+
+
+_ollama_cache = {"at": float("-inf"), "models": None}
+
+
+def _ollama_tag(model):
+    """Ollama's name for *model*: an untagged name means ``:latest``."""
+    return model if ":" in model else model + ":latest"
+
+
+def ollama_loaded():
+    """Models Ollama holds in memory as ``{name: MB}``, or ``None`` if it can't be asked.
+
+    Reads ``/api/ps`` on ``OLLAMA_HOST`` (default ``127.0.0.1:11434``); the
+    answer is reused for ``_OLLAMA_POLL_S``.
+    """
+    now = time.monotonic()
+    if now - _ollama_cache["at"] < _OLLAMA_POLL_S:
+        return _ollama_cache["models"]
+    host = os.environ.get("OLLAMA_HOST") or "127.0.0.1:11434"
+    if "://" not in host:
+        host = "http://" + host
+    try:
+        with urllib.request.urlopen(host.rstrip("/") + "/api/ps", timeout=_OLLAMA_TIMEOUT_S) as resp:
+            raw = json.load(resp)
+        models = {
+            m["name"]: (m.get("size_vram") or m.get("size") or 0) / 1e6
+            for m in raw.get("models", [])
+            if m.get("name")
+        }
+    except (OSError, ValueError):
+        models = None
+    _ollama_cache["at"], _ollama_cache["models"] = now, models
+    return models
+
+
+def evict(resident):
+    """Unload *resident*: SIGTERM its server, or ``ollama stop`` its model."""
+    log.info("Evicting %s (%.0f MB)", resident.name, resident.footprint_mb)
+    try:
+        if resident.kind == "ollama" and resident.model:
+            subprocess.run(["ollama", "stop", resident.model], capture_output=True, timeout=30, check=False)
+        elif resident.pid and resident.pid != os.getpid():
+            os.kill(resident.pid, signal.SIGTERM)
+    except (OSError, subprocess.SubprocessError):
+        log.debug("Failed to evict %s", resident.name, exc_info=True)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ── Registry ──────────────────────────────────────────────────────────
+
+class Registry:
+    """Residents shared through a JSON file under an exclusive ``flock``.
+
+    Args:
+        path: Registry file; the lock file sits next to it.
+        budget: VRAM budget in MB, or a callable returning it (``None``
+            disables budget evictions).
+        evictor: Called for every resident chosen for eviction.
+        clock: Time source, for tests.
+        ollama: Returns the models Ollama holds as ``{name: MB}``, or
+            ``None`` when unknown (Ollama residents are then left as they are).
+    """
+
+    def __init__(
+        self, path=REGISTRY_PATH, *, budget=budget_mb, evictor=evict, clock=time.time, ollama=ollama_loaded,
+    ):
+        """Initialize the registry; see the class docstring for the arguments."""
+        self._path = path
+        self._budget = budget
+        self._evictor = evictor
+        self._clock = clock
+        self._ollama = ollama
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(self._path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                residents = self._read()
+                yield residents
+                self._write(residents)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self._path) as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        residents = {}
+        for item in raw.get("residents", []):
+            resident = Resident(**item)
+            # Drop servers that died without deregistering.
+            if resident.kind == "process" and resident.pid and not _pid_alive(resident.pid):
+                continue
+            residents[resident.name] = resident
+        self._sync_ollama(residents)
+        return residents
+
+    def _sync_ollama(self, residents):
+        """Reconcile Ollama residents with the models Ollama actually holds."""
+        loaded = self._ollama()
+        if loaded is None:
+            return
+        now = self._clock()
+        for name, resident in list(residents.items()):
+            if resident.kind != "ollama":
+                continue
+            size = loaded.get(_ollama_tag(resident.model or ""))
+            if size is not None:
+                if size > 0:
+                    resident.footprint_mb = size
+            elif resident.external or (not resident.busy and now - resident.last_used > _OLLAMA_GRACE_S):
+                # Unloaded by Ollama's keep-alive (or never loaded).
+                del residents[name]
+        known = {_ollama_tag(r.model or "") for r in residents.values() if r.kind == "ollama"}
+        for model, size in loaded.items():
+            if model not in known:
+                residents["ollama:" + model] = Resident(
+                    name="ollama:" + model, footprint_mb=size or _DEFAULT_FOOTPRINT_MB,
+                    kind="ollama", model=model, last_used=now, external=True,
+                )
+
+    def _write(self, residents):
+        tmp = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"residents": [asdict(r) for r in residents.values()]}, f)
+        os.replace(tmp, self._path)
+
+    def residents(self):
+        """Return every registered resident."""
+        with self._locked() as residents:
+            return list(residents.values())
+
+    def acquire(self, name, *, footprint_mb=None, kind="process", pid=None, model=None, busy=False):
+        """Make room for *name* and register it as loaded.
+
+        Args:
+            name: Resident name, unique across processes.
+            footprint_mb: Expected VRAM use; ``None`` keeps the size already
+                recorded for *name*, if any.
+            kind: ``"process"`` for a server or ``"ollama"`` for an Ollama
+                *model*.
+            pid: Server process to signal on eviction; defaults to this
+                process for ``kind="process"``.
+            model: Ollama model name for ``kind="ollama"``.
+            busy: Register a new resident as busy, for a load made inside a
+                request whose ``touch(busy=True)`` came before *name* was
+                registered (and so was not recorded).
+
+        Returns:
+            The residents that were evicted.
+        """
+        budget = self._budget() if callable(self._budget) else self._budget
+        now = self._clock()
+        with self._locked() as residents:
+            previous = residents.get(name)
+            if footprint_mb is None:
+                footprint_mb = previous.footprint_mb if previous else _DEFAULT_FOOTPRINT_MB
+            victims = plan_evictions(
+                list(residents.values()), budget_mb=budget, need_mb=footprint_mb, now=now, exclude={name},
+            )
+            for victim in victims:
+                del residents[victim.name]
+            resident = previous or Resident(name=name, footprint_mb=footprint_mb, kind=kind, busy=int(busy))
+            resident.footprint_mb = footprint_mb
+            resident.kind, resident.model = kind, model
+            resident.external = False
+            resident.pid = os.getpid() if pid is None and kind == "process" else pid
+            resident.last_used = now
+            residents[name] = resident
+        for victim in victims:
+            self._evictor(victim)
+        return victims
+
+    def touch(self, name, *, load_cost_s=None, footprint_mb=None, busy=None):
+        """Record a use of *name* and optionally its measured cost and size.
+
+        Args:
+            name: Resident name.
+            load_cost_s: Measured seconds to load the model.
+            footprint_mb: Measured VRAM use.
+            busy: ``True`` when a request starts (busy residents are never
+                evicted), ``False`` when it ends.
+        """
+        now = self._clock()
+        with self._locked() as residents:
+            resident = residents.get(name)
+            if resident is None:
+                return
+            if busy is not False:
+                resident.uses = decayed_uses(resident, now) + 1.0
+            resident.last_used = now
+            if load_cost_s is not None:
+                resident.load_cost_s = load_cost_s
+            if footprint_mb is not None:
+                resident.footprint_mb = footprint_mb
+            if busy is not None:
+                resident.busy = max(0, resident.busy + (1 if busy else -1))
+
+    def release(self, name):
+        """Deregister *name* (it unloaded itself)."""
+        with self._locked() as residents:
+            residents.pop(name, None)
+
+    def should_release(self, name):
+        """Whether *name* has been evicted or has outlived its idle TTL."""
+        now = self._clock()
+        with self._locked() as residents:
+            resident = residents.get(name)
+            return resident is None or resident in expired([resident], now)
+
+    def sweep(self, *, exclude=()):
+        """Evict every other resident whose idle TTL has run out.
+
+        Returns:
+            The residents that were evicted.
+        """
+        now = self._clock()
+        with self._locked() as residents:
+            victims = [r for r in expired(list(residents.values()), now) if r.name not in exclude]
+            for victim in victims:
+                del residents[victim.name]
+        for victim in victims:
+            self._evictor(victim)
+        return victims
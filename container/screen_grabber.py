@@ -0,0 +1,320 @@
+"""Persistent screen grabber for one X display.
+
+Runs inside the container, one process per display in ``$DISPLAY``. Keeps
+the X connection and an MIT-SHM segment open so a frame is a server-side
+copy into shared memory instead of a scrot process, a PNG encode and a
+round-trip through /tmp. Frames are only encoded when a caller needs the
+pixels: a request carrying the digest of the last frame it saw gets a
+header-only "unchanged" reply when the screen is identical.
+
+Protocol (stdin/stdout): on start, one JSON line ``{"ready": true, ...}``
+or ``{"error": "..."}``. Then, per request line
+
+    {"region": [x, y, w, h] | null, "format": "png" | "jpeg" | "webp",
+     "quality": 80, "max_side": 1280 | null, "since": "<digest>" | null}
+
+one JSON header line ``{"digest", "unchanged", "format", "width",
+"height", "size"}`` followed by ``size`` bytes of encoded image. Exits when
+stdin closes.
+
+Pillow is used for JPEG/WebP and downscaling when installed; without it
+frames are always full-size PNG.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import json
+import struct
+import sys
+import zlib
+
+_ZPIXMAP = 2
+_ALL_PLANES = 0xFFFFFFFFFFFFFFFF
+_LSB_FIRST = 0
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+
+class _XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; only these are read.
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class _ShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+def _load(name):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise OSError(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+class XScreen:
+    """Root window of the display in ``$DISPLAY``, read via MIT-SHM if possible."""
+
+    def __init__(self):
+        """Open the display and attach a shared-memory image when available."""
+        x11 = _load("X11")
+        self._x11 = x11
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XGetImage.restype = ctypes.POINTER(_XImage)
+        x11.XGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_int,
+        ]
+        x11.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+
+        self._dpy = x11.XOpenDisplay(None)
+        if not self._dpy:
+            raise RuntimeError("cannot open display")
+        screen = x11.XDefaultScreen(self._dpy)
+        self._root = x11.XRootWindow(self._dpy, screen)
+        self.width = x11.XDisplayWidth(self._dpy, screen)
+        self.height = x11.XDisplayHeight(self._dpy, screen)
+        self._shm_image = None
+        try:
+            self._attach_shm(screen)
+        except (OSError, RuntimeError) as exc:
+            print(f"MIT-SHM unavailable, using XGetImage: {exc}", file=sys.stderr)
+
+    @property
+    def uses_shm(self):
+        """Whether frames are read through MIT-SHM rather than XGetImage."""
+        return self._shm_image is not None
+
+    def _attach_shm(self, screen):
+        xext = _load("Xext")
+        libc = _load("c")
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_void_p, ctypes.POINTER(_ShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_ShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+            ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        if not xext.XShmQueryExtension(self._dpy):
+            raise RuntimeError("server lacks MIT-SHM")
+
+        x11 = self._x11
+        self._shm_info = _ShmSegmentInfo()
+        image = xext.XShmCreateImage(
+            self._dpy,
+            x11.XDefaultVisual(self._dpy, screen),
+            x11.XDefaultDepth(self._dpy, screen),
+            _ZPIXMAP, None, ctypes.byref(self._shm_info), self.width, self.height,
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage failed")
+        shmid = libc.shmget(_IPC_PRIVATE, image.contents.bytes_per_line * self.height, _IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise OSError("shmget failed")
+        addr = libc.shmat(shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(shmid, _IPC_RMID, None)
+            raise OSError("shmat failed")
+        self._shm_info.shmid = shmid
+        self._shm_info.shmaddr = addr
+        self._shm_info.readOnly = 0
+        image.contents.data = addr
+        ok = xext.XShmAttach(self._dpy, ctypes.byref(self._shm_info))
+        x11.XSync(self._dpy, 0)
+        # Marked for removal now so the segment goes away with this process.
+        libc.shmctl(shmid, _IPC_RMID, None)
+        if not ok:
+            raise RuntimeError("XShmAttach failed")
+        _check_layout(image.contents)
+        self._xext = xext
+        self._shm_image = image
+
+    def grab(self):
+        """Return ``(raw, stride)`` for the whole screen as 32-bit BGRX rows."""
+        if self._shm_image is not None:
+            if not self._xext.XShmGetImage(self._dpy, self._root, self._shm_image, 0, 0, _ALL_PLANES):
+                raise RuntimeError("XShmGetImage failed")
+            image = self._shm_image.contents
+            return ctypes.string_at(image.data, image.bytes_per_line * self.height), image.bytes_per_line
+        image_p = self._x11.XGetImage(
+            self._dpy, self._root, 0, 0, self.width, self.height, _ALL_PLANES, _ZPIXMAP,
+        )
+        if not image_p:
+            raise RuntimeError("XGetImage failed")
+        try:
+            image = image_p.contents
+            _check_layout(image)
+            return ctypes.string_at(image.data, image.bytes_per_line * self.height), image.bytes_per_line
+        finally:
+            self._x11.XDestroyImage(image_p)
+
+
+def _check_layout(image):
+    if image.bits_per_pixel != 32 or image.byte_order != _LSB_FIRST:
+        raise RuntimeError(
+            f"unsupported pixel layout: {image.bits_per_pixel} bpp, byte order {image.byte_order}",
+        )
+
+
+def crop(raw, stride, region, screen_size):
+    """Cut *region* (clamped to the screen) out of BGRX rows.
+
+    Returns ``(raw, stride, width, height)`` of the cropped rows.
+    """
+    screen_w, screen_h = screen_size
+    if region is None:
+        return raw, stride, screen_w, screen_h
+    x, y, w, h = region
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(screen_w, x + w), min(screen_h, y + h)
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"region {region!r} is outside the {screen_w}x{screen_h} screen")
+    row = (x1 - x0) * 4
+    rows = [raw[r * stride + x0 * 4:r * stride + x0 * 4 + row] for r in range(y0, y1)]
+    return b"".join(rows), row, x1 - x0, y1 - y0
+
+
+def _png_chunk(tag, body):
+    return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body))
+
+
+def png_from_bgrx(raw, stride, width, height):
+    """Encode BGRX rows as an RGB PNG using only the standard library."""
+    if stride != width * 4:
+        raw = b"".join(raw[r * stride:r * stride + width * 4] for r in range(height))
+    rgb = bytearray(width * height * 3)
+    rgb[0::3] = raw[2::4]
+    rgb[1::3] = raw[1::4]
+    rgb[2::3] = raw[0::4]
+    row = width * 3
+    view = memoryview(rgb)
+    scanlines = b"".join(b"\0" + view[r * row:(r + 1) * row] for r in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(scanlines, 1))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def encode(raw, stride, width, height, fmt="png", quality=80, max_side=None):
+    """Encode BGRX rows; returns ``(data, format, width, height)``.
+
+    Falls back to full-size PNG when Pillow is missing or cannot write *fmt*.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return png_from_bgrx(raw, stride, width, height), "png", width, height
+
+    image = Image.frombuffer("RGB", (width, height), raw, "raw", "BGRX", stride, 1)
+    if max_side and max(width, height) > max_side:
+        scale = max_side / max(width, height)
+        image = image.resize(
+            (max(1, round(width * scale)), max(1, round(height * scale))), Image.Resampling.BILINEAR,
+        )
+    buf = io.BytesIO()
+    try:
+        if fmt == "jpeg":
+            image.save(buf, "JPEG", quality=quality)
+        elif fmt == "webp":
+            image.save(buf, "WEBP", quality=quality, method=2)
+        else:
+            fmt = "png"
+            image.save(buf, "PNG", compress_level=1)
+    except (KeyError, OSError):
+        buf = io.BytesIO()
+        fmt = "png"
+        image.save(buf, "PNG", compress_level=1)
+    return buf.getvalue(), fmt, image.width, image.height
+
+
+def handle(screen, request):
+    """Grab a frame for *request*; returns ``(header, data)``."""
+    raw, stride = screen.grab()
+    raw, stride, width, height = crop(raw, stride, request.get("region"), (screen.width, screen.height))
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if request.get("since") == digest:
+        return {"digest": digest, "unchanged": True, "width": width, "height": height, "size": 0}, b""
+    data, fmt, out_w, out_h = encode(
+        raw, stride, width, height,
+        fmt=request.get("format") or "png",
+        quality=int(request.get("quality") or 80),
+        max_side=request.get("max_side"),
+    )
+    header = {
+        "digest": digest, "unchanged": False, "format": fmt,
+        "width": out_w, "height": out_h, "size": len(data),
+    }
+    return header, data
+
+
+def _reply(out, header, data=b""):
+    out.write(json.dumps(header).encode() + b"\n")
+    if data:
+        out.write(data)
+    out.flush()
+
+
+def serve(screen, stdin, stdout):
+    """Answer request lines from *stdin* until it closes."""
+    _reply(stdout, {"ready": True, "width": screen.width, "height": screen.height, "shm": screen.uses_shm})
+    for line in stdin:
+        try:
+            header, data = handle(screen, json.loads(line))
+        except (ValueError, RuntimeError) as exc:
+            header, data = {"error": str(exc)}, b""
+        _reply(stdout, header, data)
+
+
+def main():
+    """Serve grab requests on stdin/stdout; return the exit status."""
+    try:
+        screen = XScreen()
+    except (OSError, RuntimeError) as exc:
+        _reply(sys.stdout.buffer, {"error": str(exc)})
+        return 1
+    serve(screen, sys.stdin.buffer, sys.stdout.buffer)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
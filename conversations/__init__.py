@@ -6,6 +6,7 @@ from ._models import (
 )
 from ._store import (
     delete_conversation,
+    get_blob_dir,
     list_conversations,
     list_summary_records,
     load_agent_events,
@@ -29,6 +30,7 @@ __all__ = [
     "SummaryRecord",
     "delete_conversation",
     "generate_conversation_title",
+    "get_blob_dir",
     "list_conversations",
     "list_summary_records",
     "load_agent_events",
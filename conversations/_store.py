@@ -9,6 +9,8 @@ All conversation data is stored under per-conversation subdirectories::
             {NAME}_{hex}.json # sub-agent message histories
         summaries/
             {id}.json         # compaction records
+        blobs/
+            {sha256}.{ext}    # images referenced by hash from model messages
 """
 
 from __future__ import annotations
@@ -36,18 +38,27 @@ def _get_conv_dir(conversation_id: str) -> Path:
     return _get_conversations_dir() / conversation_id
 
 
+def get_blob_dir(conversation_id: str) -> Path:
+    """Directory of a conversation's content-addressed media blobs."""
+    return _get_conv_dir(conversation_id) / "blobs"
+
+
 # -- Conversation history persistence ------------------------------------------
 
 
 def save_conversation_history(conversation_id: str, messages: list[dict[str, Any]]) -> None:
     """Save raw ConversationHistory messages for a conversation."""
-    conv_dir = _get_conv_dir(conversation_id)
-    conv_dir.mkdir(parents=True, exist_ok=True)
+    # Lazy import: the sdk package imports this module.
+    from sdk.tracing import trace_span
 
-    path = conv_dir / "history.json"
-    tmp = path.with_suffix(".tmp")
-    tmp.write_text(json.dumps(messages, indent=2), encoding="utf-8")
-    tmp.replace(path)
+    with trace_span("persist.history", messages=len(messages)):
+        conv_dir = _get_conv_dir(conversation_id)
+        conv_dir.mkdir(parents=True, exist_ok=True)
+
+        path = conv_dir / "history.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(messages, indent=2), encoding="utf-8")
+        tmp.replace(path)
 
 
 def load_conversation_history(conversation_id: str) -> list[dict[str, Any]] | None:
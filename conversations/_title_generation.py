@@ -8,7 +8,7 @@ to generate concise titles (3-5 words) that capture the essence of the conversat
 import logging
 
 from settings import load_settings
-from sdk.providers import get_provider
+from sdk.providers import StopCondition, role_candidates, routed_chat
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,12 @@ Given a user's first message, generate a concise title (3-5 words max) that capt
 Return ONLY the title text, with no quotes, no formatting, and no explanation.
 """
 
+_MAX_TITLE_CHARS = 80
+
+# A title is one short line: stop reading at the first newline, or just past
+# the length limit so an over-long title still gets its ellipsis below.
+_TITLE_STOP = StopCondition(max_chars=_MAX_TITLE_CHARS + 1, stop_sequences=("\n",))
+
 
 async def generate_conversation_title(first_message: str) -> str:
     """Generate a descriptive title for a conversation based on the first message.
@@ -39,8 +45,6 @@ async def generate_conversation_title(first_message: str) -> str:
             logger.debug("No title model/provider configured, skipping title generation")
             return _truncate_for_title(first_message)
 
-        provider = get_provider(title_provider)
-
         messages = [
             {"role": "system", "content": _TITLE_GENERATION_PROMPT},
             {"role": "user", "content": f"Generate a title for this conversation: {first_message}"}
@@ -49,11 +53,13 @@ async def generate_conversation_title(first_message: str) -> str:
         # Titles are tiny — cap output and keep sampling focused.
         options = {"num_predict": 50, "temperature": 0.3}
 
-        response = await provider.chat(
-            model=title_model,
+        response, _candidate = await routed_chat(
+            "title",
+            role_candidates(settings, "title", title_provider, title_model),
             messages=messages,
             options=options,
             think=False,
+            stop=_TITLE_STOP,
         )
         
         if response and response.message and response.message.content:
@@ -62,8 +68,8 @@ async def generate_conversation_title(first_message: str) -> str:
             # Remove surrounding quotes if present
             title = title.strip('"\'').strip()
             # Limit length
-            if len(title) > 80:
-                title = title[:77] + "..."
+            if len(title) > _MAX_TITLE_CHARS:
+                title = title[:_MAX_TITLE_CHARS - 3] + "..."
             
             if title:
                 logger.info("Generated title: %r", title)
@@ -19,6 +19,7 @@ touching callers.
 from __future__ import annotations
 
 import asyncio
+import time
 from pathlib import Path
 from typing import Any
 
@@ -29,6 +30,12 @@ from integrations.broker_client._errors import (
     IntegrationNotConnected,
     IntegrationPermissionDenied,
 )
+from utils.metrics import Counter, Histogram
+
+_RPC_SECONDS = Histogram(
+    "computron_broker_rpc_duration_seconds", "Broker call latency (resolve + invoke), per verb.", ("verb",),
+)
+_RPC_ERRORS = Counter("computron_broker_rpc_errors", "Failed broker calls by verb and error type.", ("verb", "error"))
 
 
 async def call(
@@ -59,6 +66,18 @@ async def call(
         IntegrationWriteDenied: broker returned ``WRITE_DENIED``.
         IntegrationError: any other protocol-level or broker-side failure.
     """
+    started_at = time.perf_counter()
+    try:
+        return await _call(integration_id, verb, args, app_sock_path)
+    except Exception as exc:
+        _RPC_ERRORS.inc(verb, type(exc).__name__)
+        raise
+    finally:
+        _RPC_SECONDS.observe(time.perf_counter() - started_at, verb)
+
+
+async def _call(integration_id: str, verb: str, args: dict[str, Any], app_sock_path: Path) -> Any:
+    """Both hops of :func:`call`, untimed."""
     # --- Hop 1: resolve integration_id -> broker socket via the supervisor.
     resolve_response = await _rpc_one_shot(
         app_sock_path,
@@ -12,6 +12,12 @@ Exit codes (see :mod:`integrations.brokers._common._exit_codes`):
   ``auth_failed`` and stops respawning; recovery is delete + re-add.
 - 1: anything else (env-parse failure, network unreachable, internal error).
   Supervisor backoff applies.
+
+Optional environment:
+
+- ``MIRROR_DIR``: directory for the per-integration metadata mirror
+  (``<INTEGRATION_ID>.sqlite3``).  When unset, list/search verbs always
+  call Google.  See :mod:`._mirror`.
 """
 
 from __future__ import annotations
@@ -113,8 +119,15 @@ async def _run() -> int:
         return GENERIC_ERROR
 
     downloads_dir = Path(env_required("DOWNLOADS_DIR"))
+    mirror_path: Path | None = None
+    if mirror_dir := os.environ.get("MIRROR_DIR"):
+        # Mirrored subjects and file names are as private as the tokens:
+        # keep them out of the agent-readable downloads tree.
+        Path(mirror_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
+        mirror_path = Path(mirror_dir) / f"{integration_id}.sqlite3"
     dispatcher = VerbDispatcher(
         creds, permissions=permissions, downloads_dir=downloads_dir,
+        mirror_path=mirror_path,
     )
 
     async def handler(verb: str, args: dict[str, Any]) -> dict[str, Any]:
@@ -130,12 +143,20 @@ async def _run() -> int:
     # flips the integration from ``pending`` to ``running`` on seeing it.
     print_ready()
 
+    mirror_task: asyncio.Task[None] | None = None
+    if dispatcher.mirror is not None:
+        mirror_task = asyncio.create_task(dispatcher.mirror.run())
+        log.info("metadata mirror at %s", mirror_path)
+
     async with server:
         try:
             await server.serve_forever()
         except asyncio.CancelledError:
             # Normal shutdown path: SIGTERM -> asyncio.run cancels the task.
             log.info("shutting down")
+        finally:
+            if mirror_task is not None:
+                mirror_task.cancel()
     return CLEAN_SHUTDOWN
 
 
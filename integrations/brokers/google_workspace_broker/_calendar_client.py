@@ -7,7 +7,8 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+
+from integrations.brokers.google_workspace_broker._service import ServiceFactory
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +16,12 @@ logger = logging.getLogger(__name__)
 class CalendarClient:
     """Thin wrapper around the Calendar v3 API."""
 
-    def __init__(self, creds: Credentials) -> None:
+    def __init__(self, creds: Credentials, *, root_url: str | None = None) -> None:
         self._creds = creds
+        self._services = ServiceFactory("calendar", "v3", creds, root_url=root_url)
 
     def _service(self):  # noqa: ANN202
-        return build("calendar", "v3", credentials=self._creds, cache_discovery=False)
+        return self._services.get()
 
     def list_calendars(self) -> list[dict[str, Any]]:
         """List all calendar entries visible to the user."""
@@ -80,6 +82,41 @@ class CalendarClient:
                 break
         return results[:limit], cal_name
 
+    def sync_events(
+        self,
+        calendar_id: str,
+        *,
+        sync_token: str | None = None,
+        time_min: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str, str | None]:
+        """Fetch events changed since *sync_token*, or all events from *time_min*.
+
+        Recurring events are expanded.  Incremental results include
+        cancelled events (``status == "cancelled"``) so callers can drop
+        them.  An expired token raises ``HttpError`` with status 410; the
+        caller must then start over without a token.
+
+        Returns:
+            (events, next_sync_token, calendar_name)
+        """
+        kwargs: dict[str, Any] = {"calendarId": calendar_id, "singleEvents": True, "maxResults": 2500}
+        if sync_token:
+            kwargs["syncToken"] = sync_token
+        elif time_min:
+            kwargs["timeMin"] = time_min
+
+        results: list[dict[str, Any]] = []
+        cal_name: str | None = None
+        page_token: str | None = None
+        while True:
+            resp = self._service().events().list(pageToken=page_token, **kwargs).execute()
+            if cal_name is None:
+                cal_name = resp.get("summary")
+            results.extend(resp.get("items", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return results, resp["nextSyncToken"], cal_name
+
     def create_event(
         self,
         calendar_id: str,
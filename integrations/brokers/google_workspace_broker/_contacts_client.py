@@ -6,7 +6,8 @@ import logging
 from typing import Any
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+
+from integrations.brokers.google_workspace_broker._service import ServiceFactory
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +17,12 @@ _PERSON_FIELDS = "names,emailAddresses,phoneNumbers,organizations"
 class ContactsClient:
     """Thin wrapper around the People API v1."""
 
-    def __init__(self, creds: Credentials) -> None:
+    def __init__(self, creds: Credentials, *, root_url: str | None = None) -> None:
         self._creds = creds
+        self._services = ServiceFactory("people", "v1", creds, root_url=root_url)
 
     def _service(self):  # noqa: ANN202
-        return build("people", "v1", credentials=self._creds, cache_discovery=False)
+        return self._services.get()
 
     def list_contacts(self, limit: int = 50) -> list[dict[str, Any]]:
         """List the user's contacts."""
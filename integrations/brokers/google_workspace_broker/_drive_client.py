@@ -8,13 +8,15 @@ import logging
 from typing import Any
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseDownload
 
+from integrations.brokers.google_workspace_broker._service import ServiceFactory
+
 logger = logging.getLogger(__name__)
 
 _FILE_FIELDS = "id, name, mimeType, size, createdTime, modifiedTime, parents, webViewLink"
 _LIST_FIELDS = f"nextPageToken, files({_FILE_FIELDS})"
+_CHANGES_FIELDS = f"nextPageToken, newStartPageToken, changes(fileId, removed, file({_FILE_FIELDS}, trashed))"
 
 _GOOGLE_DOC_EXPORTS: dict[str, tuple[str, str]] = {
     "application/vnd.google-apps.document": ("text/plain", ".txt"),
@@ -27,11 +29,12 @@ _GOOGLE_DOC_EXPORTS: dict[str, tuple[str, str]] = {
 class DriveClient:
     """Thin wrapper around the Drive v3 API."""
 
-    def __init__(self, creds: Credentials) -> None:
+    def __init__(self, creds: Credentials, *, root_url: str | None = None) -> None:
         self._creds = creds
+        self._services = ServiceFactory("drive", "v3", creds, root_url=root_url)
 
     def _service(self):  # noqa: ANN202
-        return build("drive", "v3", credentials=self._creds, cache_discovery=False)
+        return self._services.get()
 
     def list_files(
         self,
@@ -88,6 +91,53 @@ class DriveClient:
                 break
         return results[:limit]
 
+    def list_all_files(self) -> list[dict[str, Any]]:
+        """List every non-trashed file the user can see, for a full mirror sync."""
+        results: list[dict[str, Any]] = []
+        page_token: str | None = None
+        while True:
+            resp = (
+                self._service().files()
+                .list(
+                    q="trashed = false",
+                    fields=_LIST_FIELDS,
+                    pageSize=1000,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            results.extend(resp.get("files", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return results
+
+    def get_root_folder_id(self) -> str:
+        """Resolve the ``root`` alias to the ID of the user's My Drive folder."""
+        return self._service().files().get(fileId="root", fields="id").execute()["id"]
+
+    def get_start_page_token(self) -> str:
+        """Return the change-feed cursor for "now"."""
+        return self._service().changes().getStartPageToken().execute()["startPageToken"]
+
+    def list_changes(self, page_token: str) -> tuple[list[dict[str, Any]], str]:
+        """Drain the change feed from *page_token*.
+
+        Returns:
+            (changes, new_start_page_token) — the raw change resources and the
+            cursor to pass on the next call.
+        """
+        changes: list[dict[str, Any]] = []
+        while True:
+            resp = (
+                self._service().changes()
+                .list(pageToken=page_token, fields=_CHANGES_FIELDS, pageSize=1000)
+                .execute()
+            )
+            changes.extend(resp.get("changes", []))
+            if "newStartPageToken" in resp:
+                return changes, resp["newStartPageToken"]
+            page_token = resp["nextPageToken"]
+
     def get_file_metadata(self, file_id: str) -> dict[str, Any]:
         """Get metadata for a single file."""
         return (
@@ -8,38 +8,74 @@ import email.mime.base
 import email.mime.multipart
 import email.mime.text
 import logging
+import threading
+import time
 from typing import Any
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from integrations.brokers.google_workspace_broker._service import ServiceFactory
 
 logger = logging.getLogger(__name__)
 
+_METADATA_HEADERS = ["From", "To", "Subject", "Date"]
+
+# Gmail accepts up to 100 calls per batch but starts rate-limiting
+# individual parts well before that; 50 is the documented sweet spot.
+_METADATA_BATCH_SIZE = 50
+
+# Label names rarely change; re-list at most this often, or on a miss.
+_LABEL_CACHE_TTL_S = 300.0
+
 
 class GmailClient:
     """Thin wrapper around the Gmail v1 API."""
 
-    def __init__(self, creds: Credentials) -> None:
+    def __init__(self, creds: Credentials, *, root_url: str | None = None) -> None:
         self._creds = creds
+        self._services = ServiceFactory("gmail", "v1", creds, root_url=root_url)
         self._label_cache: dict[str, str] | None = None
+        self._label_cache_at = 0.0
+        self._label_misses: set[str] = set()
+        self._label_lock = threading.Lock()
 
-    def _service(self):  # noqa: ANN202
-        return build("gmail", "v1", credentials=self._creds, cache_discovery=False)
+    def _service(self):
+        return self._services.get()
 
     def list_labels(self) -> list[dict[str, Any]]:
         """List all labels visible to the user."""
         resp = self._service().users().labels().list(userId="me").execute()
         labels = resp.get("labels", [])
-        self._label_cache = {l["name"]: l["id"] for l in labels if "name" in l and "id" in l}
+        with self._label_lock:
+            self._label_cache = {lbl["name"]: lbl["id"] for lbl in labels if "name" in lbl and "id" in lbl}
+            self._label_cache_at = time.monotonic()
+            self._label_misses = set()
         return labels
 
-    def _resolve_label_id(self, name: str) -> str:
-        """Map a human-readable label name to its Gmail label ID."""
-        if self._label_cache is None:
+    def invalidate_labels(self) -> None:
+        """Drop the label name → ID cache so the next lookup re-lists."""
+        with self._label_lock:
+            self._label_cache = None
+
+    def resolve_label_id(self, name: str) -> str:
+        """Map a human-readable label name to its Gmail label ID.
+
+        The name → ID map is cached for ``_LABEL_CACHE_TTL_S``.  An unknown
+        name forces one re-list in case the label was created since; names
+        still unknown afterwards (e.g. raw label IDs) are remembered so they
+        don't trigger a re-list on every call.
+        """
+        cache = self._label_cache
+        fresh = cache is not None and time.monotonic() - self._label_cache_at < _LABEL_CACHE_TTL_S
+        if not fresh or (name not in cache and name not in self._label_misses):
             self.list_labels()
-        label_id = self._label_cache.get(name)
+            cache = self._label_cache or {}
+        label_id = cache.get(name)
         if label_id is None:
-            logger.warning("Gmail label %r not found, passing as-is", name)
+            if name not in self._label_misses:
+                logger.warning("Gmail label %r not found, passing as-is", name)
+                self._label_misses.add(name)
             return name
         return label_id
 
@@ -49,9 +85,9 @@ class GmailClient:
         limit: int = 20,
     ) -> list[dict[str, Any]]:
         """List recent messages under a label, with headers."""
-        label_id = self._resolve_label_id(label_name)
+        label_id = self.resolve_label_id(label_name)
         message_ids = self._list_message_ids(label_ids=[label_id], limit=limit)
-        return [self._get_metadata(mid) for mid in message_ids]
+        return self._get_metadata_batch(message_ids)
 
     def search_messages(
         self,
@@ -60,11 +96,11 @@ class GmailClient:
         limit: int = 20,
     ) -> list[dict[str, Any]]:
         """Search messages with Gmail query syntax."""
-        label_id = self._resolve_label_id(label_name)
+        label_id = self.resolve_label_id(label_name)
         message_ids = self._list_message_ids(
             label_ids=[label_id], query=query, limit=limit,
         )
-        return [self._get_metadata(mid) for mid in message_ids]
+        return self._get_metadata_batch(message_ids)
 
     def get_message(self, message_id: str) -> dict[str, Any]:
         """Fetch a full message with body and attachment metadata."""
@@ -120,6 +156,37 @@ class GmailClient:
                 )
         return ("", "application/octet-stream")
 
+    def get_history_id(self) -> str:
+        """Return the mailbox's current history ID (the ``history.list`` cursor)."""
+        return self._service().users().getProfile(userId="me").execute()["historyId"]
+
+    def list_recent_message_ids(self, limit: int) -> list[str]:
+        """IDs of the newest *limit* messages outside spam and trash."""
+        return self._list_message_ids(limit=limit)
+
+    def list_history(self, start_history_id: str) -> tuple[list[dict[str, Any]], str]:
+        """Drain the mailbox history since *start_history_id*.
+
+        A cursor older than Gmail keeps history for raises ``HttpError``
+        with status 404; the caller must then start over.
+
+        Returns:
+            (history_records, latest_history_id)
+        """
+        records: list[dict[str, Any]] = []
+        page_token: str | None = None
+        latest = start_history_id
+        while True:
+            kwargs: dict[str, Any] = {"userId": "me", "startHistoryId": start_history_id, "maxResults": 500}
+            if page_token:
+                kwargs["pageToken"] = page_token
+            resp = self._service().users().history().list(**kwargs).execute()
+            records.extend(resp.get("history", []))
+            latest = resp.get("historyId", latest)
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return records, latest
+
     # --- write operations -----------------------------------------------------
 
     def send_message(
@@ -174,17 +241,22 @@ class GmailClient:
         Translates the IMAP-style folder/move semantics into Gmail
         label add/remove operations.
         """
-        remove_id = self._resolve_label_id(folder)
-        add_id = self._resolve_label_id(dest_folder)
-        for uid in uids:
-            self._service().users().messages().modify(
+        remove_id = self.resolve_label_id(folder)
+        add_id = self.resolve_label_id(dest_folder)
+        try:
+            self._service().users().messages().batchModify(
                 userId="me",
-                id=uid,
                 body={
+                    "ids": uids,
                     "addLabelIds": [add_id],
                     "removeLabelIds": [remove_id],
                 },
             ).execute()
+        except HttpError as exc:
+            # A stale label ID (label renamed or deleted) surfaces as 400/404.
+            if exc.resp is not None and exc.resp.status in (400, 404):
+                self.invalidate_labels()
+            raise
 
     # --- internal helpers ----------------------------------------------------
 
@@ -219,26 +291,72 @@ class GmailClient:
                 break
         return results[:limit]
 
+    def _metadata_request(self, message_id: str):
+        return self._service().users().messages().get(
+            userId="me",
+            id=message_id,
+            format="metadata",
+            metadataHeaders=_METADATA_HEADERS,
+        )
+
     def _get_metadata(self, message_id: str) -> dict[str, Any]:
         """Fetch just the envelope headers for one message."""
-        msg = (
-            self._service().users().messages()
-            .get(
-                userId="me",
-                id=message_id,
-                format="metadata",
-                metadataHeaders=["From", "To", "Subject", "Date"],
-            )
-            .execute()
-        )
-        headers = _headers_dict(msg.get("payload", {}))
-        return {
-            "uid": msg["id"],
-            "from_": headers.get("From", ""),
-            "to": headers.get("To", ""),
-            "subject": headers.get("Subject", ""),
-            "date": headers.get("Date", ""),
-        }
+        return _envelope(self._metadata_request(message_id).execute())
+
+    def _get_metadata_batch(self, message_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch envelope headers for many messages in batch HTTP requests."""
+        return [_envelope(msg) for msg in self.fetch_metadata(message_ids)]
+
+    def fetch_metadata(self, message_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch ``format=metadata`` messages in batch HTTP requests.
+
+        One round-trip per ``_METADATA_BATCH_SIZE`` messages instead of one
+        per message.  Parts that fail inside a batch (typically per-part
+        rate limiting) are retried individually; messages deleted between
+        the listing and the fetch (404) are skipped.  Order follows
+        *message_ids*.
+        """
+        unique_ids = list(dict.fromkeys(message_ids))
+        messages: dict[str, dict[str, Any]] = {}
+        failed: list[str] = []
+
+        def _on_part(request_id: str, response: Any, exception: Exception | None) -> None:
+            if exception is not None:
+                failed.append(request_id)
+            else:
+                messages[request_id] = response
+
+        for start in range(0, len(unique_ids), _METADATA_BATCH_SIZE):
+            chunk = unique_ids[start:start + _METADATA_BATCH_SIZE]
+            if len(chunk) == 1:
+                failed.append(chunk[0])
+                continue
+            batch = self._services.new_batch(_on_part)
+            for mid in chunk:
+                batch.add(self._metadata_request(mid), request_id=mid)
+            batch.execute()
+
+        for mid in failed:
+            try:
+                messages[mid] = self._metadata_request(mid).execute()
+            except HttpError as exc:
+                if exc.resp is None or exc.resp.status != 404:
+                    raise
+                logger.debug("Gmail message %s disappeared before metadata fetch", mid)
+
+        return [messages[mid] for mid in unique_ids if mid in messages]
+
+
+def _envelope(msg: dict[str, Any]) -> dict[str, Any]:
+    """Build the header summary dict for a ``format=metadata`` message."""
+    headers = _headers_dict(msg.get("payload", {}))
+    return {
+        "uid": msg["id"],
+        "from_": headers.get("From", ""),
+        "to": headers.get("To", ""),
+        "subject": headers.get("Subject", ""),
+        "date": headers.get("Date", ""),
+    }
 
 
 def _headers_dict(payload: dict[str, Any]) -> dict[str, str]:
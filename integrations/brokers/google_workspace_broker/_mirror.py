@@ -0,0 +1,369 @@
+"""Local, incrementally synced mirror of Drive, Gmail and Calendar metadata.
+
+Listing and searching used to cost one or more Google round-trips per verb
+call.  With a mirror enabled (``MIRROR_DIR`` in the broker environment), a
+background loop keeps a SQLite copy of the metadata current through each
+API's change feed:
+
+- Drive: ``changes.list`` from a start page token.
+- Gmail: ``history.list`` from the mailbox history ID.  Only the newest
+  ``_GMAIL_WINDOW`` messages are mirrored.
+- Calendar: ``events.list`` with a sync token, per calendar, starting the
+  first time a calendar is listed.  Events from ``_CALENDAR_HORIZON_DAYS``
+  back onwards are mirrored.
+
+Verb handlers ask the mirror first.  Each query returns ``None`` — and the
+handler makes the live call — when the scope's cursor is older than
+``_MAX_STALENESS_S`` (failed syncs, or a write the broker just made), or
+when the question falls outside what the mirror can answer exactly:
+
+- Drive searches are answered for ``name contains``/``name =``,
+  ``mimeType =``/``!=``, ``'<id>' in parents`` and ``trashed = false``
+  clauses joined by ``and``; anything else (``fullText``, ``or``,
+  dates) goes to Google.
+- Gmail searches are answered when every term is ``subject:<word>`` or
+  ``from:<word>`` — the only fields the mirror indexes.  Free text (which
+  Gmail also matches against message bodies) and other operators go to
+  Google.  A Gmail listing is answered only when the mirror holds at least
+  *limit* matches, or holds the whole mailbox — otherwise older unmirrored
+  messages could belong in the result.
+- Calendar listings are answered when the window starts inside the
+  mirrored horizon.
+
+An expired cursor (Drive 410, Gmail 404, Calendar 410) triggers a full
+resync of that scope on the next pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import re
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from googleapiclient.errors import HttpError
+
+from integrations.brokers.google_workspace_broker._calendar_client import CalendarClient
+from integrations.brokers.google_workspace_broker._drive_client import DriveClient, _run_sync
+from integrations.brokers.google_workspace_broker._gmail_client import GmailClient, _envelope
+from integrations.brokers.google_workspace_broker._mirror_db import (
+    Cursor,
+    DriveQuery,
+    GmailMessage,
+    MirrorDB,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["MetadataMirror"]
+
+_SYNC_INTERVAL_S = 60.0
+_MAX_STALENESS_S = 300.0
+_GMAIL_WINDOW = 2000
+_CALENDAR_HORIZON_DAYS = 365
+
+# Statuses meaning "your cursor is no longer valid, start over".
+_EXPIRED_CURSOR = frozenset({404, 410})
+
+# Labels ``messages.list`` excludes by default; a message gaining one
+# leaves the mirror so listings agree with the live API.
+_HIDDEN_LABELS = frozenset({"SPAM", "TRASH"})
+
+_QUOTED = r"'((?:[^'\\]|\\.)*)'"
+_DRIVE_CLAUSES: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(rf"name\s+contains\s+{_QUOTED}", re.I), "name_prefix"),
+    (re.compile(rf"name\s*=\s*{_QUOTED}", re.I), "name_equals"),
+    (re.compile(rf"mimeType\s*=\s*{_QUOTED}"), "mime_equals"),
+    (re.compile(rf"mimeType\s*!=\s*{_QUOTED}"), "mime_not_equals"),
+    (re.compile(rf"{_QUOTED}\s+in\s+parents", re.I), "parents"),
+]
+_TRASHED_FALSE = re.compile(r"trashed\s*=\s*false", re.I)
+_AND = re.compile(r"\s+and\s+(?=(?:[^']*'[^']*')*[^']*$)", re.I)
+_GMAIL_FIELD_TERM = re.compile(r"(subject|from):([\w@.]+)")
+_GMAIL_FIELD_COLUMNS = {"subject": "subject", "from": "sender"}
+
+
+def _parse_drive_query(query: str) -> DriveQuery | None:
+    """Translate a Drive ``q`` string into a ``DriveQuery``, or ``None`` if unsupported."""
+    parsed = DriveQuery()
+    for clause in _AND.split(query.strip()):
+        clause = clause.strip()
+        if _TRASHED_FALSE.fullmatch(clause):
+            continue
+        for pattern, attr in _DRIVE_CLAUSES:
+            match = pattern.fullmatch(clause)
+            if match:
+                getattr(parsed, attr).append(re.sub(r"\\(.)", r"\1", match.group(1)))
+                break
+        else:
+            return None
+    return parsed
+
+
+def _gmail_field_terms(query: str) -> list[tuple[str, str]] | None:
+    """Parse a Gmail query of ``subject:``/``from:`` terms into ``(column, word)`` pairs.
+
+    Returns ``None`` for anything else, including free text, which Gmail
+    matches against message bodies the mirror does not hold.
+    """
+    terms: list[tuple[str, str]] = []
+    for term in query.split():
+        match = _GMAIL_FIELD_TERM.fullmatch(term)
+        if match is None:
+            return None
+        terms.append((_GMAIL_FIELD_COLUMNS[match.group(1)], match.group(2)))
+    return terms or None
+
+
+def _event_bounds(event: dict[str, Any]) -> tuple[float, float]:
+    """Epoch start/end of an event; all-day dates count from UTC midnight."""
+
+    def _ts(block: dict[str, Any]) -> float:
+        if "dateTime" in block:
+            return datetime.fromisoformat(block["dateTime"]).timestamp()
+        return datetime.combine(date.fromisoformat(block["date"]), datetime.min.time(), UTC).timestamp()
+
+    start = _ts(event["start"])
+    end = _ts(event["end"]) if "end" in event else start
+    return start, end
+
+
+def _mirrored(message: dict[str, Any]) -> GmailMessage:
+    return GmailMessage(
+        id=message["id"],
+        internal_date=int(message.get("internalDate", 0)),
+        label_ids=list(message.get("labelIds", [])),
+        envelope=_envelope(message),
+    )
+
+
+class MetadataMirror:
+    """Keeps a ``MirrorDB`` in sync and answers list/search queries from it.
+
+    Args:
+        db: The mirror database.
+        drive: Drive client, or ``None`` when the integration lacks Drive scopes.
+        gmail: Gmail client, or ``None``.
+        calendar: Calendar client, or ``None``.
+    """
+
+    def __init__(
+        self,
+        db: MirrorDB,
+        *,
+        drive: DriveClient | None = None,
+        gmail: GmailClient | None = None,
+        calendar: CalendarClient | None = None,
+    ) -> None:
+        self._db = db
+        self._drive = drive
+        self._gmail = gmail
+        self._calendar = calendar
+        self._calendars: set[str] = {s.split(":", 1)[1] for s in db.scopes("calendar:")}
+        self._wake = asyncio.Event()
+
+    # --- sync ----------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Sync every scope every ``_SYNC_INTERVAL_S``, or sooner when woken."""
+        while True:
+            await self.sync_all()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), _SYNC_INTERVAL_S)
+            self._wake.clear()
+
+    async def sync_all(self) -> None:
+        """Run one sync pass over every enabled scope."""
+        passes: list[tuple[str, Any]] = []
+        if self._drive is not None:
+            passes.append(("drive", self._sync_drive))
+        if self._gmail is not None:
+            passes.append(("gmail", self._sync_gmail))
+        if self._calendar is not None:
+            passes.extend((f"calendar:{c}", lambda c=c: self._sync_calendar(c)) for c in sorted(self._calendars))
+        for scope, fn in passes:
+            t0 = time.perf_counter()
+            try:
+                await _run_sync(fn)
+            except HttpError as exc:
+                logger.warning("Mirror sync of %s failed: %s", scope, exc)
+            except Exception:
+                logger.exception("Mirror sync of %s failed", scope)
+            else:
+                logger.debug("Mirror sync of %s took %.0f ms", scope, (time.perf_counter() - t0) * 1000)
+
+    def invalidate(self, scope: str) -> None:
+        """Stop answering *scope* locally until the next sync, and sync soon."""
+        self._db.invalidate(scope)
+        self._wake.set()
+
+    def _sync_drive(self) -> None:
+        cursor = self._db.get_cursor("drive")
+        if cursor is not None:
+            try:
+                changes, token = self._drive.list_changes(cursor.value)
+            except HttpError as exc:
+                if exc.resp is None or exc.resp.status not in _EXPIRED_CURSOR:
+                    raise
+                logger.info("Drive change token expired, resyncing")
+            else:
+                upserts: list[dict[str, Any]] = []
+                removed: list[str] = []
+                for change in changes:
+                    file = change.get("file")
+                    if change.get("removed") or file is None or file.pop("trashed", False):
+                        removed.append(change["fileId"])
+                    else:
+                        upserts.append(file)
+                self._db.apply_drive_changes(upserts, removed, token)
+                return
+
+        token = self._drive.get_start_page_token()
+        root_id = self._drive.get_root_folder_id()
+        files = self._drive.list_all_files()
+        self._db.replace_drive(files, token, {"root_id": root_id})
+        logger.info("Mirrored %d Drive files", len(files))
+
+    def _sync_gmail(self) -> None:
+        cursor = self._db.get_cursor("gmail")
+        if cursor is not None:
+            try:
+                records, history_id = self._gmail.list_history(cursor.value)
+            except HttpError as exc:
+                if exc.resp is None or exc.resp.status not in _EXPIRED_CURSOR:
+                    raise
+                logger.info("Gmail history ID expired, resyncing")
+            else:
+                self._apply_gmail_history(records, history_id)
+                return
+
+        history_id = self._gmail.get_history_id()
+        ids = self._gmail.list_recent_message_ids(_GMAIL_WINDOW)
+        messages = [_mirrored(m) for m in self._gmail.fetch_metadata(ids)]
+        self._db.replace_gmail(messages, history_id, {"complete": len(ids) < _GMAIL_WINDOW})
+        logger.info("Mirrored %d Gmail messages", len(messages))
+
+    def _apply_gmail_history(self, records: list[dict[str, Any]], history_id: str) -> None:
+        added: dict[str, None] = {}
+        relabels: dict[str, list[str]] = {}
+        removed: set[str] = set()
+        for record in records:
+            for item in record.get("messagesAdded", []):
+                added[item["message"]["id"]] = None
+            for key in ("labelsAdded", "labelsRemoved"):
+                for item in record.get(key, []):
+                    message = item["message"]
+                    relabels[message["id"]] = list(message.get("labelIds", []))
+            for item in record.get("messagesDeleted", []):
+                removed.add(item["message"]["id"])
+
+        upserts = [_mirrored(m) for m in self._gmail.fetch_metadata([m for m in added if m not in removed])]
+        for message in upserts:
+            relabels.pop(message.id, None)
+        removed |= {m.id for m in upserts if _HIDDEN_LABELS & set(m.label_ids)}
+        removed |= {mid for mid, labels in relabels.items() if _HIDDEN_LABELS & set(labels)}
+        upserts = [m for m in upserts if m.id not in removed]
+        relabels = {mid: labels for mid, labels in relabels.items() if mid not in removed}
+        self._db.apply_gmail_changes(upserts, relabels, sorted(removed), history_id)
+
+    def _sync_calendar(self, calendar_id: str) -> None:
+        scope = f"calendar:{calendar_id}"
+        cursor = self._db.get_cursor(scope)
+        if cursor is not None:
+            try:
+                events, token, _name = self._calendar.sync_events(calendar_id, sync_token=cursor.value)
+            except HttpError as exc:
+                if exc.resp is None or exc.resp.status not in _EXPIRED_CURSOR:
+                    raise
+                logger.info("Calendar sync token for %s expired, resyncing", calendar_id)
+            else:
+                removed = [e["id"] for e in events if e.get("status") == "cancelled"]
+                upserts = [(e, *_event_bounds(e)) for e in events if e.get("status") != "cancelled"]
+                self._db.apply_event_changes(calendar_id, upserts, removed, token)
+                return
+
+        horizon = datetime.now(UTC) - timedelta(days=_CALENDAR_HORIZON_DAYS)
+        events, token, name = self._calendar.sync_events(calendar_id, time_min=horizon.isoformat())
+        rows = [(e, *_event_bounds(e)) for e in events if e.get("status") != "cancelled"]
+        self._db.replace_events(calendar_id, rows, token, {"horizon": horizon.timestamp(), "name": name})
+        logger.info("Mirrored %d events from calendar %s", len(rows), calendar_id)
+
+    # --- queries -------------------------------------------------------------
+
+    def _fresh_cursor(self, scope: str) -> Cursor | None:
+        cursor = self._db.get_cursor(scope)
+        if cursor is None or time.time() - cursor.synced_at > _MAX_STALENESS_S:
+            return None
+        return cursor
+
+    async def list_drive_files(self, folder_id: str, limit: int) -> list[dict[str, Any]] | None:
+        """Answer ``list_drive_files`` locally, or ``None`` to go live."""
+        cursor = self._fresh_cursor("drive")
+        if cursor is None:
+            return None
+        if folder_id == "root":
+            folder_id = cursor.meta["root_id"]
+        return await _run_sync(self._db.drive_children, folder_id, limit)
+
+    async def search_drive_files(self, query: str, limit: int) -> list[dict[str, Any]] | None:
+        """Answer ``search_drive_files`` locally, or ``None`` to go live."""
+        cursor = self._fresh_cursor("drive")
+        parsed = _parse_drive_query(query)
+        if cursor is None or parsed is None:
+            return None
+        parsed.parents = [cursor.meta["root_id"] if p == "root" else p for p in parsed.parents]
+        return await _run_sync(self._db.drive_search, parsed, limit)
+
+    async def _gmail_query(
+        self,
+        label: str,
+        limit: int,
+        terms: list[tuple[str, str]] | None,
+    ) -> list[dict[str, Any]] | None:
+        cursor = self._fresh_cursor("gmail")
+        if cursor is None:
+            return None
+        label_id = await _run_sync(self._gmail.resolve_label_id, label)
+        headers = await _run_sync(self._db.gmail_messages, label_id, limit, terms=terms)
+        if len(headers) < limit and not cursor.meta.get("complete"):
+            return None
+        return headers
+
+    async def list_messages(self, label: str, limit: int) -> list[dict[str, Any]] | None:
+        """Answer ``list_messages`` locally, or ``None`` to go live."""
+        return await self._gmail_query(label, limit, None)
+
+    async def search_messages(self, query: str, label: str, limit: int) -> list[dict[str, Any]] | None:
+        """Answer ``search_messages`` locally, or ``None`` to go live."""
+        terms = _gmail_field_terms(query)
+        if terms is None:
+            return None
+        return await self._gmail_query(label, limit, terms)
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        *,
+        days_forward: int,
+        days_back: int,
+        limit: int,
+    ) -> tuple[list[dict[str, Any]], str | None] | None:
+        """Answer ``list_events`` locally, or ``None`` to go live.
+
+        The first call for a calendar registers it for syncing.
+        """
+        if calendar_id not in self._calendars:
+            self._calendars.add(calendar_id)
+            self._wake.set()
+            return None
+        cursor = self._fresh_cursor(f"calendar:{calendar_id}")
+        now = datetime.now(UTC)
+        time_min = (now - timedelta(days=days_back)).timestamp()
+        if cursor is None or time_min < cursor.meta["horizon"]:
+            return None
+        time_max = (now + timedelta(days=days_forward)).timestamp()
+        events = await _run_sync(self._db.events_between, calendar_id, time_min, time_max, limit)
+        return events, cursor.meta.get("name")
@@ -0,0 +1,387 @@
+"""SQLite storage for the broker's metadata mirror.
+
+One database file per integration holds Drive file, Gmail message and
+Calendar event metadata plus a sync cursor per *scope* (``"drive"``,
+``"gmail"``, ``"calendar:<id>"``).  Drive names and Gmail subjects/senders
+are indexed with FTS5 external-content tables kept in step by triggers.
+
+All access goes through one connection guarded by a lock: sync passes run
+on executor threads while queries come from verb handlers, and a single
+writer keeps SQLite's locking out of the picture.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    scope TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS drive_files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mime_type TEXT NOT NULL,
+    is_folder INTEGER NOT NULL,
+    modified_time TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS drive_parents (
+    parent_id TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    PRIMARY KEY (parent_id, file_id)
+);
+CREATE INDEX IF NOT EXISTS drive_parents_file ON drive_parents (file_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS drive_fts USING fts5(
+    name, content='drive_files', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS drive_files_ai AFTER INSERT ON drive_files BEGIN
+    INSERT INTO drive_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS drive_files_ad AFTER DELETE ON drive_files BEGIN
+    INSERT INTO drive_fts (drive_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    DELETE FROM drive_parents WHERE file_id = old.id;
+END;
+
+CREATE TABLE IF NOT EXISTS gmail_messages (
+    id TEXT PRIMARY KEY,
+    internal_date INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gmail_messages_date ON gmail_messages (internal_date);
+CREATE TABLE IF NOT EXISTS gmail_labels (
+    label_id TEXT NOT NULL,
+    message_id TEXT NOT NULL,
+    PRIMARY KEY (label_id, message_id)
+);
+CREATE INDEX IF NOT EXISTS gmail_labels_message ON gmail_labels (message_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS gmail_fts USING fts5(
+    subject, sender, content='gmail_messages', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS gmail_messages_ai AFTER INSERT ON gmail_messages BEGIN
+    INSERT INTO gmail_fts (rowid, subject, sender) VALUES (new.rowid, new.subject, new.sender);
+END;
+CREATE TRIGGER IF NOT EXISTS gmail_messages_ad AFTER DELETE ON gmail_messages BEGIN
+    INSERT INTO gmail_fts (gmail_fts, rowid, subject, sender)
+        VALUES ('delete', old.rowid, old.subject, old.sender);
+    DELETE FROM gmail_labels WHERE message_id = old.id;
+END;
+
+CREATE TABLE IF NOT EXISTS calendar_events (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS calendar_events_start ON calendar_events (calendar_id, start_ts);
+"""
+
+
+@dataclass(slots=True)
+class Cursor:
+    """Sync position for one scope."""
+
+    value: str
+    synced_at: float
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class DriveQuery:
+    """The subset of a Drive ``q`` string the mirror can answer.
+
+    All populated conditions are ANDed together.
+    """
+
+    name_prefix: list[str] = field(default_factory=list)
+    name_equals: list[str] = field(default_factory=list)
+    mime_equals: list[str] = field(default_factory=list)
+    mime_not_equals: list[str] = field(default_factory=list)
+    parents: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class GmailMessage:
+    """Mirrored metadata for one Gmail message."""
+
+    id: str
+    internal_date: int
+    label_ids: list[str]
+    envelope: dict[str, Any]
+
+
+def _fts_phrase(text: str, *, prefix: bool) -> str:
+    """Quote *text* as one FTS5 phrase, optionally prefix-matching its last token."""
+    quoted = '"' + text.replace('"', '""') + '"'
+    return quoted + "*" if prefix else quoted
+
+
+class MirrorDB:
+    """The mirror's SQLite database.
+
+    Args:
+        path: Database file, created (owner-only, via the process umask)
+            if missing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: list[tuple[str, tuple[Any, ...] | list[tuple[Any, ...]]]]) -> None:
+        """Run *statements* in one transaction; list params mean ``executemany``."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _read(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- cursors -------------------------------------------------------------
+
+    def get_cursor(self, scope: str) -> Cursor | None:
+        """Return the cursor for *scope*, or ``None`` before its first full sync."""
+        rows = self._read("SELECT cursor, synced_at, meta FROM cursors WHERE scope = ?", (scope,))
+        if not rows:
+            return None
+        value, synced_at, meta = rows[0]
+        return Cursor(value, synced_at, json.loads(meta))
+
+    def scopes(self, prefix: str) -> list[str]:
+        """Scopes starting with *prefix* that have a cursor."""
+        return [r[0] for r in self._read("SELECT scope FROM cursors WHERE scope LIKE ? || '%'", (prefix,))]
+
+    def invalidate(self, scope: str) -> None:
+        """Mark *scope* stale so queries fall back to live calls until the next sync."""
+        self._write([("UPDATE cursors SET synced_at = 0 WHERE scope = ?", (scope,))])
+
+    @staticmethod
+    def _cursor_stmt(scope: str, value: str, meta: dict[str, Any] | None) -> tuple[str, tuple[Any, ...]]:
+        if meta is None:
+            return (
+                "UPDATE cursors SET cursor = ?, synced_at = ? WHERE scope = ?",
+                (value, time.time(), scope),
+            )
+        return (
+            "INSERT OR REPLACE INTO cursors (scope, cursor, synced_at, meta) VALUES (?, ?, ?, ?)",
+            (scope, value, time.time(), json.dumps(meta)),
+        )
+
+    # --- Drive ---------------------------------------------------------------
+
+    @staticmethod
+    def _drive_upserts(files: list[dict[str, Any]]) -> list[tuple[str, Any]]:
+        ids = [(f["id"],) for f in files]
+        rows = [
+            (
+                f["id"], f.get("name", ""), f.get("mimeType", ""),
+                int(f.get("mimeType") == "application/vnd.google-apps.folder"),
+                f.get("modifiedTime", ""), json.dumps(f),
+            )
+            for f in files
+        ]
+        parents = [(p, f["id"]) for f in files for p in f.get("parents", [])]
+        return [
+            ("DELETE FROM drive_files WHERE id = ?", ids),
+            ("INSERT INTO drive_files VALUES (?, ?, ?, ?, ?, ?)", rows),
+            ("INSERT OR IGNORE INTO drive_parents VALUES (?, ?)", parents),
+        ]
+
+    def replace_drive(self, files: list[dict[str, Any]], cursor: str, meta: dict[str, Any]) -> None:
+        """Replace every mirrored Drive file after a full listing."""
+        self._write([
+            ("DELETE FROM drive_files", ()),
+            *self._drive_upserts(files),
+            self._cursor_stmt("drive", cursor, meta),
+        ])
+
+    def apply_drive_changes(self, upserts: list[dict[str, Any]], removed: list[str], cursor: str) -> None:
+        """Apply one drained change feed and advance the cursor."""
+        self._write([
+            ("DELETE FROM drive_files WHERE id = ?", [(fid,) for fid in removed]),
+            *self._drive_upserts(upserts),
+            self._cursor_stmt("drive", cursor, None),
+        ])
+
+    def drive_children(self, parent_id: str, limit: int) -> list[dict[str, Any]]:
+        """Files in a folder, folders first, then most recently modified."""
+        rows = self._read(
+            "SELECT f.data FROM drive_files f JOIN drive_parents p ON p.file_id = f.id "
+            "WHERE p.parent_id = ? ORDER BY f.is_folder DESC, f.modified_time DESC LIMIT ?",
+            (parent_id, limit),
+        )
+        return [json.loads(r[0]) for r in rows]
+
+    def drive_search(self, query: DriveQuery, limit: int) -> list[dict[str, Any]]:
+        """Files matching *query*, most recently modified first."""
+        where: list[str] = []
+        params: list[Any] = []
+        if query.name_prefix:
+            where.append("f.rowid IN (SELECT rowid FROM drive_fts WHERE drive_fts MATCH ?)")
+            params.append(" ".join(_fts_phrase(t, prefix=True) for t in query.name_prefix))
+        for name in query.name_equals:
+            where.append("f.name = ?")
+            params.append(name)
+        for mime in query.mime_equals:
+            where.append("f.mime_type = ?")
+            params.append(mime)
+        for mime in query.mime_not_equals:
+            where.append("f.mime_type != ?")
+            params.append(mime)
+        for parent in query.parents:
+            where.append("f.id IN (SELECT file_id FROM drive_parents WHERE parent_id = ?)")
+            params.append(parent)
+        sql = "SELECT f.data FROM drive_files f"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY f.modified_time DESC LIMIT ?"
+        return [json.loads(r[0]) for r in self._read(sql, (*params, limit))]
+
+    # --- Gmail ---------------------------------------------------------------
+
+    @staticmethod
+    def _gmail_upserts(messages: list[GmailMessage]) -> list[tuple[str, Any]]:
+        rows = [
+            (m.id, m.internal_date, m.envelope.get("subject", ""), m.envelope.get("from_", ""), json.dumps(m.envelope))
+            for m in messages
+        ]
+        labels = [(label, m.id) for m in messages for label in m.label_ids]
+        return [
+            ("DELETE FROM gmail_messages WHERE id = ?", [(m.id,) for m in messages]),
+            ("INSERT INTO gmail_messages VALUES (?, ?, ?, ?, ?)", rows),
+            ("INSERT OR IGNORE INTO gmail_labels VALUES (?, ?)", labels),
+        ]
+
+    def replace_gmail(self, messages: list[GmailMessage], cursor: str, meta: dict[str, Any]) -> None:
+        """Replace every mirrored message after a full listing."""
+        self._write([
+            ("DELETE FROM gmail_messages", ()),
+            *self._gmail_upserts(messages),
+            self._cursor_stmt("gmail", cursor, meta),
+        ])
+
+    def apply_gmail_changes(
+        self,
+        upserts: list[GmailMessage],
+        relabels: dict[str, list[str]],
+        removed: list[str],
+        cursor: str,
+    ) -> None:
+        """Apply one drained history feed and advance the cursor.
+
+        *relabels* maps message IDs to their complete new label list;
+        messages not in the mirror are ignored.
+        """
+        label_rows = [(label, mid) for mid, labels in relabels.items() for label in labels]
+        self._write([
+            ("DELETE FROM gmail_messages WHERE id = ?", [(mid,) for mid in removed]),
+            *self._gmail_upserts(upserts),
+            ("DELETE FROM gmail_labels WHERE message_id = ?", [(mid,) for mid in relabels]),
+            (
+                "INSERT OR IGNORE INTO gmail_labels SELECT ?, id FROM gmail_messages WHERE id = ?",
+                label_rows,
+            ),
+            self._cursor_stmt("gmail", cursor, None),
+        ])
+
+    def gmail_messages(
+        self,
+        label_id: str,
+        limit: int,
+        *,
+        terms: list[tuple[str, str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Newest envelopes under *label_id*, optionally full-text filtered.
+
+        *terms* are ``(column, word)`` pairs (``subject`` or ``sender``);
+        every word must appear in its column.
+        """
+        sql = (
+            "SELECT m.data FROM gmail_messages m JOIN gmail_labels l ON l.message_id = m.id "
+            "WHERE l.label_id = ?"
+        )
+        params: list[Any] = [label_id]
+        if terms:
+            sql += " AND m.rowid IN (SELECT rowid FROM gmail_fts WHERE gmail_fts MATCH ?)"
+            params.append(" ".join(f"{column} : {_fts_phrase(word, prefix=False)}" for column, word in terms))
+        sql += " ORDER BY m.internal_date DESC LIMIT ?"
+        return [json.loads(r[0]) for r in self._read(sql, (*params, limit))]
+
+    # --- Calendar ------------------------------------------------------------
+
+    @staticmethod
+    def _event_upserts(calendar_id: str, events: list[tuple[dict[str, Any], float, float]]) -> list[tuple[str, Any]]:
+        return [(
+            "INSERT OR REPLACE INTO calendar_events VALUES (?, ?, ?, ?, ?)",
+            [(calendar_id, e["id"], start, end, json.dumps(e)) for e, start, end in events],
+        )]
+
+    def replace_events(
+        self,
+        calendar_id: str,
+        events: list[tuple[dict[str, Any], float, float]],
+        cursor: str,
+        meta: dict[str, Any],
+    ) -> None:
+        """Replace a calendar's mirrored events; entries are ``(event, start_ts, end_ts)``."""
+        self._write([
+            ("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,)),
+            *self._event_upserts(calendar_id, events),
+            self._cursor_stmt(f"calendar:{calendar_id}", cursor, meta),
+        ])
+
+    def apply_event_changes(
+        self,
+        calendar_id: str,
+        upserts: list[tuple[dict[str, Any], float, float]],
+        removed: list[str],
+        cursor: str,
+    ) -> None:
+        """Apply one incremental event sync and advance the cursor."""
+        self._write([
+            ("DELETE FROM calendar_events WHERE calendar_id = ? AND id = ?", [(calendar_id, i) for i in removed]),
+            *self._event_upserts(calendar_id, upserts),
+            self._cursor_stmt(f"calendar:{calendar_id}", cursor, None),
+        ])
+
+    def events_between(self, calendar_id: str, time_min: float, time_max: float, limit: int) -> list[dict[str, Any]]:
+        """Events overlapping ``(time_min, time_max)``, earliest start first."""
+        rows = self._read(
+            "SELECT data FROM calendar_events WHERE calendar_id = ? AND end_ts > ? AND start_ts < ? "
+            "ORDER BY start_ts LIMIT ?",
+            (calendar_id, time_min, time_max, limit),
+        )
+        return [json.loads(r[0]) for r in rows]
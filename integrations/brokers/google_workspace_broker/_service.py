@@ -0,0 +1,68 @@
+"""Long-lived googleapiclient service objects for the broker's API clients.
+
+``build()`` parses the discovery document and wires up an authorized
+``httplib2`` transport — tens of milliseconds per call, and the clients used
+to pay it on every operation.  ``ServiceFactory`` builds each service once
+per worker thread and reuses it: verbs run on the default executor via
+``asyncio.to_thread``, and ``httplib2.Http`` is not thread-safe, so one
+shared object per broker is not an option.  The executor's threads are
+long-lived, so in steady state no verb builds a service.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.http import BatchHttpRequest
+
+
+class ServiceFactory:
+    """Per-thread cache of one Google API service.
+
+    Args:
+        api: API name, e.g. ``"gmail"``.
+        version: API version, e.g. ``"v1"``.
+        creds: OAuth credentials shared by every thread.
+        root_url: Optional API endpoint override (``https://host/``) used
+            instead of the discovery document's root URL.
+    """
+
+    def __init__(
+        self,
+        api: str,
+        version: str,
+        creds: Credentials,
+        *,
+        root_url: str | None = None,
+    ) -> None:
+        self._api = api
+        self._version = version
+        self._creds = creds
+        self._root_url = root_url
+        self._local = threading.local()
+
+    def get(self) -> Any:
+        """Return this thread's service object, building it on first use."""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            client_options = {"api_endpoint": self._root_url} if self._root_url else None
+            service = build(
+                self._api, self._version,
+                credentials=self._creds,
+                cache_discovery=False,
+                client_options=client_options,
+            )
+            self._local.service = service
+        return service
+
+    def new_batch(self, callback: Callable[[str, Any, Exception | None], None]) -> BatchHttpRequest:
+        """Create a batch request that honours the endpoint override."""
+        service = self.get()
+        if self._root_url is None:
+            return service.new_batch_http_request(callback=callback)
+        batch_path = service._rootDesc.get("batchPath", "batch")
+        return BatchHttpRequest(callback=callback, batch_uri=self._root_url + batch_path)
@@ -18,6 +18,8 @@ from integrations.brokers.google_workspace_broker._calendar_client import Calend
 from integrations.brokers.google_workspace_broker._contacts_client import ContactsClient
 from integrations.brokers.google_workspace_broker._drive_client import DriveClient, _run_sync
 from integrations.brokers.google_workspace_broker._gmail_client import GmailClient
+from integrations.brokers.google_workspace_broker._mirror import MetadataMirror
+from integrations.brokers.google_workspace_broker._mirror_db import MirrorDB
 from integrations.permissions import Access, Capability, Permissions
 
 logger = logging.getLogger(__name__)
@@ -61,7 +63,17 @@ _Handler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
 
 
 class VerbDispatcher:
-    """Route one RPC verb call to the right Google API client method."""
+    """Route one RPC verb call to the right Google API client method.
+
+    Args:
+        creds: OAuth credentials; their scopes decide which clients exist.
+        permissions: Capability grants checked before every verb.
+        downloads_dir: Where exported files and attachments are written.
+        mirror_path: SQLite file for the metadata mirror, or ``None`` to
+            answer every list/search verb live.  When set, ``mirror.run()``
+            must be scheduled to keep it current.
+        root_url: Optional API endpoint override passed to every client.
+    """
 
     def __init__(
         self,
@@ -69,6 +81,8 @@ class VerbDispatcher:
         *,
         permissions: Permissions,
         downloads_dir: Path,
+        mirror_path: Path | None = None,
+        root_url: str | None = None,
     ) -> None:
         self._creds = creds
         self._permissions = permissions
@@ -84,19 +98,26 @@ class VerbDispatcher:
             "https://www.googleapis.com/auth/drive.readonly",
             "https://www.googleapis.com/auth/drive.file",
         }:
-            self._drive = DriveClient(creds)
+            self._drive = DriveClient(creds, root_url=root_url)
         if scopes & {
             "https://www.googleapis.com/auth/calendar.readonly",
             "https://www.googleapis.com/auth/calendar.events",
         }:
-            self._calendar = CalendarClient(creds)
+            self._calendar = CalendarClient(creds, root_url=root_url)
         if scopes & {
             "https://www.googleapis.com/auth/gmail.readonly",
             "https://www.googleapis.com/auth/gmail.modify",
         }:
-            self._gmail = GmailClient(creds)
+            self._gmail = GmailClient(creds, root_url=root_url)
         if "https://www.googleapis.com/auth/contacts.readonly" in scopes:
-            self._contacts = ContactsClient(creds)
+            self._contacts = ContactsClient(creds, root_url=root_url)
+
+        self.mirror: MetadataMirror | None = None
+        if mirror_path is not None:
+            self.mirror = MetadataMirror(
+                MirrorDB(mirror_path),
+                drive=self._drive, gmail=self._gmail, calendar=self._calendar,
+            )
 
         self._handlers: dict[str, _Handler] = {}
         if self._drive is not None:
@@ -149,11 +170,20 @@ class VerbDispatcher:
             raise RpcError("BAD_REQUEST", msg)
         return await handler(args)
 
+    def _invalidate_mirror(self, scope: str) -> None:
+        """Serve *scope* live until the mirror has synced the write just made."""
+        if self.mirror is not None:
+            self.mirror.invalidate(scope)
+
     # --- Drive handlers ------------------------------------------------------
 
     async def _handle_list_drive_files(self, args: dict[str, Any]) -> dict[str, Any]:
         folder_id = args.get("folder_id") or "root"
         limit = _require_int(args, "limit", default=50)
+        if self.mirror is not None:
+            files = await self.mirror.list_drive_files(folder_id, limit)
+            if files is not None:
+                return {"files": files}
         try:
             files = await _run_sync(self._drive.list_files, folder_id, limit)
         except HttpError as exc:
@@ -163,6 +193,10 @@ class VerbDispatcher:
     async def _handle_search_drive_files(self, args: dict[str, Any]) -> dict[str, Any]:
         query = _require_str(args, "query")
         limit = _require_int(args, "limit", default=30)
+        if self.mirror is not None:
+            files = await self.mirror.search_drive_files(query, limit)
+            if files is not None:
+                return {"files": files}
         try:
             files = await _run_sync(self._drive.search_files, query, limit)
         except HttpError as exc:
@@ -209,6 +243,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("drive")
         return {"file": result}
 
     async def _handle_create_drive_folder(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -220,6 +255,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("drive")
         return {"file": result}
 
     async def _handle_update_drive_file(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -241,6 +277,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("drive")
         return {"file": result}
 
     async def _handle_trash_drive_file(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -249,6 +286,7 @@ class VerbDispatcher:
             result = await _run_sync(self._drive.trash_file, file_id)
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("drive")
         return {"file": result}
 
     async def _handle_share_drive_file(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -290,16 +328,24 @@ class VerbDispatcher:
         days_forward = _require_int(args, "days_forward", default=30)
         days_back = _require_int(args, "days_back", default=0)
         limit = _require_int(args, "limit", default=50)
-        try:
-            items, cal_name = await _run_sync(
-                self._calendar.list_events,
-                calendar_id,
-                days_forward=days_forward,
-                days_back=days_back,
-                limit=limit,
+        local = None
+        if self.mirror is not None:
+            local = await self.mirror.list_events(
+                calendar_id, days_forward=days_forward, days_back=days_back, limit=limit,
             )
-        except HttpError as exc:
-            raise _wrap_http_error(exc) from exc
+        if local is not None:
+            items, cal_name = local
+        else:
+            try:
+                items, cal_name = await _run_sync(
+                    self._calendar.list_events,
+                    calendar_id,
+                    days_forward=days_forward,
+                    days_back=days_back,
+                    limit=limit,
+                )
+            except HttpError as exc:
+                raise _wrap_http_error(exc) from exc
 
         events = [_flatten_event(e) for e in items]
         result: dict[str, Any] = {"events": events}
@@ -327,6 +373,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror(f"calendar:{calendar_id}")
         return {"event": _flatten_event(event)}
 
     async def _handle_update_event(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -359,6 +406,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror(f"calendar:{calendar_id}")
         return {"event": _flatten_event(event)}
 
     async def _handle_delete_event(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -370,6 +418,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror(f"calendar:{calendar_id}")
         return {"deleted": True}
 
     # --- Gmail handlers ------------------------------------------------------
@@ -390,10 +439,14 @@ class VerbDispatcher:
     async def _handle_list_messages(self, args: dict[str, Any]) -> dict[str, Any]:
         folder = _require_str(args, "folder")
         limit = _require_int(args, "limit", default=20)
-        try:
-            headers = await _run_sync(self._gmail.list_messages, folder, limit)
-        except HttpError as exc:
-            raise _wrap_http_error(exc) from exc
+        headers = None
+        if self.mirror is not None:
+            headers = await self.mirror.list_messages(folder, limit)
+        if headers is None:
+            try:
+                headers = await _run_sync(self._gmail.list_messages, folder, limit)
+            except HttpError as exc:
+                raise _wrap_http_error(exc) from exc
 
         for h in headers:
             h["folder"] = folder
@@ -403,12 +456,16 @@ class VerbDispatcher:
         folder = _require_str(args, "folder")
         query = _require_str(args, "query")
         limit = _require_int(args, "limit", default=20)
-        try:
-            headers = await _run_sync(
-                self._gmail.search_messages, query, folder, limit,
-            )
-        except HttpError as exc:
-            raise _wrap_http_error(exc) from exc
+        headers = None
+        if self.mirror is not None:
+            headers = await self.mirror.search_messages(query, folder, limit)
+        if headers is None:
+            try:
+                headers = await _run_sync(
+                    self._gmail.search_messages, query, folder, limit,
+                )
+            except HttpError as exc:
+                raise _wrap_http_error(exc) from exc
 
         for h in headers:
             h["folder"] = folder
@@ -458,6 +515,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("gmail")
         return {"sent": True, "message_id": message_id}
 
     async def _handle_move_messages(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -477,6 +535,7 @@ class VerbDispatcher:
             )
         except HttpError as exc:
             raise _wrap_http_error(exc) from exc
+        self._invalidate_mirror("gmail")
         return {"moved": True}
 
     # --- Contacts handlers ---------------------------------------------------
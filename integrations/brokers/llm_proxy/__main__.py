@@ -7,7 +7,8 @@ that injects the real auth header on every forwarded request.
 
 Streaming responses (SSE / chunked transfer encoding) pass through
 unmodified — the proxy writes chunks to the SDK client as they arrive
-from the upstream API.
+from the upstream API; request bodies stream upstream the same way (see
+``_proxy``).
 
 Exit codes (same contract as email_broker):
 - 0: clean shutdown
@@ -23,44 +24,19 @@ import os
 import sys
 from pathlib import Path
 
-import aiohttp
 from aiohttp import web
 
 from integrations._env import env_required
 from integrations._perms import PROCESS_UMASK, SOCKET_MODE, disable_core_dumps
 from integrations.brokers._common._exit_codes import CLEAN_SHUTDOWN
 from integrations.brokers._common._ready import print_ready
+from integrations.brokers.llm_proxy._proxy import build_app, create_upstream_session
 
 os.umask(PROCESS_UMASK)
 disable_core_dumps()
 
 logger = logging.getLogger("llm_proxy")
 
-# Headers that must not be forwarded; they're hop-by-hop and meaningful
-# only for the immediate transport layer, not the end-to-end exchange.
-_HOP_BY_HOP = frozenset({
-    "connection",
-    "keep-alive",
-    "proxy-authenticate",
-    "proxy-authorization",
-    "te",
-    "trailers",
-    "transfer-encoding",
-    "upgrade",
-})
-
-# Auth headers each provider expects; we strip these from the SDK client
-# request (which carries a placeholder) and inject the real key.
-_AUTH_HEADERS_TO_STRIP = frozenset({"authorization", "x-api-key"})
-
-
-def _make_auth_headers(provider: str, api_key: str) -> dict[str, str]:
-    """Return the auth header(s) to inject for this provider."""
-    if provider == "anthropic":
-        return {"x-api-key": api_key}
-    return {"Authorization": f"Bearer {api_key}"}
-
-
 
 async def _run() -> int:
     integration_id = env_required("INTEGRATION_ID")
@@ -81,68 +57,14 @@ async def _run() -> int:
     # exercises the real SDK path and gives the user immediate feedback. The
     # broker just proxies; it doesn't need to second-guess the key.
 
-    # One persistent upstream session for all proxied requests. Reusing a session
-    # keeps the TCP connection pool warm and avoids per-request TLS handshake overhead.
-    # auto_decompress=False: the proxy must forward raw bytes with their original
-    # Content-Encoding intact — the SDK client handles decompression itself.
-    upstream_session = aiohttp.ClientSession(auto_decompress=False)
-
-    async def proxy_handler(request: web.Request) -> web.StreamResponse:
-        # Reconstruct the full upstream URL from the base plus the request's
-        # relative URL (path + query string).
-        url = upstream_base + str(request.rel_url)
-
-        # Forward all request headers except hop-by-hop and auth placeholders;
-        # then inject the real credentials.
-        headers: dict[str, str] = {}
-        for k, v in request.headers.items():
-            kl = k.lower()
-            if kl in _HOP_BY_HOP or kl in _AUTH_HEADERS_TO_STRIP or kl == "host":
-                continue
-            headers[k] = v
-        headers.update(_make_auth_headers(provider, api_key))
-
-        body = await request.read()
-
-        try:
-            async with upstream_session.request(
-                request.method,
-                url,
-                headers=headers,
-                data=body or None,
-                # Long timeout to accommodate streaming completions that may
-                # run for many seconds (or minutes for long generation tasks).
-                timeout=aiohttp.ClientTimeout(total=600),
-                allow_redirects=False,
-            ) as upstream_resp:
-                response = web.StreamResponse(
-                    status=upstream_resp.status,
-                    reason=upstream_resp.reason,
-                )
-                for k, v in upstream_resp.headers.items():
-                    kl = k.lower()
-                    # Drop content-length so the response can stream as chunked
-                    # encoding without a mismatch if the upstream sends a length.
-                    if kl in _HOP_BY_HOP or kl == "content-length":
-                        continue
-                    response.headers[k] = v
-
-                await response.prepare(request)
-                async for chunk in upstream_resp.content.iter_any():
-                    await response.write(chunk)
-                await response.write_eof()
-                return response
-        except aiohttp.ClientError as exc:
-            log.error("upstream request failed: %s", exc)
-            return web.Response(status=502, text=f"Bad Gateway: {exc}")
+    upstream_session = create_upstream_session()
 
     # Remove stale socket from a crashed or previous run. The supervisor
     # un-links sockets on clean shutdown; a SIGKILL leaves them behind.
     if socket_path.exists() or socket_path.is_symlink():
         socket_path.unlink()
 
-    app = web.Application()
-    app.router.add_route("*", "/{path_info:.*}", proxy_handler)
+    app = build_app(upstream_session, upstream_base, provider, api_key, log)
 
     runner = web.AppRunner(app, access_log=None)
     await runner.setup()
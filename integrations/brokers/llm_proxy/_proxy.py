@@ -0,0 +1,129 @@
+"""HTTP forwarding for the LLM proxy broker.
+
+Request bodies are streamed upstream as they are read, and response chunks
+are written back as they arrive, so neither direction is buffered whole.
+All requests share one upstream session whose keep-alive pool stays warm;
+concurrent agents reuse TLS connections instead of handshaking per call.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import aiohttp
+from aiohttp import web
+
+# Headers that must not be forwarded; they're hop-by-hop and meaningful
+# only for the immediate transport layer, not the end-to-end exchange.
+_HOP_BY_HOP = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+})
+
+# Auth headers each provider expects; we strip these from the SDK client
+# request (which carries a placeholder) and inject the real key.
+_AUTH_HEADERS_TO_STRIP = frozenset({"authorization", "x-api-key"})
+
+# Upstream keep-alive pool.  Provider APIs are a single host, so the
+# per-host limit is the one that matters.
+_POOL_LIMIT = 64
+_KEEPALIVE_TIMEOUT_S = 120.0
+_DNS_CACHE_TTL_S = 300
+_CONNECT_TIMEOUT_S = 10.0
+# Longest silence allowed while waiting for response bytes. Generation can
+# pause for minutes before the first token, but a stream that is still
+# producing is never cut off.
+_READ_TIMEOUT_S = 600.0
+
+
+def _make_auth_headers(provider: str, api_key: str) -> dict[str, str]:
+    """Return the auth header(s) to inject for this provider."""
+    if provider == "anthropic":
+        return {"x-api-key": api_key}
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+def create_upstream_session() -> aiohttp.ClientSession:
+    """Return the session shared by all proxied requests.
+
+    auto_decompress=False: the proxy must forward raw bytes with their
+    original Content-Encoding intact — the SDK client handles decompression
+    itself.  The timeout is set once here rather than per request.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=_POOL_LIMIT,
+        limit_per_host=_POOL_LIMIT,
+        keepalive_timeout=_KEEPALIVE_TIMEOUT_S,
+        ttl_dns_cache=_DNS_CACHE_TTL_S,
+    )
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=_CONNECT_TIMEOUT_S, sock_read=_READ_TIMEOUT_S)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, auto_decompress=False)
+
+
+def build_app(
+    upstream_session: aiohttp.ClientSession,
+    upstream_base: str,
+    provider: str,
+    api_key: str,
+    log: logging.Logger,
+) -> web.Application:
+    """Build the proxy application forwarding every path to *upstream_base*."""
+
+    async def proxy_handler(request: web.Request) -> web.StreamResponse:
+        # Reconstruct the full upstream URL from the base plus the request's
+        # relative URL (path + query string).
+        url = upstream_base + str(request.rel_url)
+
+        # Forward all request headers except hop-by-hop and auth placeholders;
+        # then inject the real credentials.
+        headers: dict[str, str] = {}
+        for k, v in request.headers.items():
+            kl = k.lower()
+            if kl in _HOP_BY_HOP or kl in _AUTH_HEADERS_TO_STRIP or kl == "host":
+                continue
+            headers[k] = v
+        headers.update(_make_auth_headers(provider, api_key))
+
+        try:
+            async with upstream_session.request(
+                request.method,
+                url,
+                headers=headers,
+                # Stream the body through; Content-Length is forwarded when
+                # the client sent one, otherwise it goes out chunked.
+                data=request.content if request.body_exists else None,
+                allow_redirects=False,
+            ) as upstream_resp:
+                response = web.StreamResponse(
+                    status=upstream_resp.status,
+                    reason=upstream_resp.reason,
+                )
+                for k, v in upstream_resp.headers.items():
+                    kl = k.lower()
+                    # Drop content-length so the response can stream as chunked
+                    # encoding without a mismatch if the upstream sends a length.
+                    if kl in _HOP_BY_HOP or kl == "content-length":
+                        continue
+                    response.headers[k] = v
+
+                await response.prepare(request)
+                async for chunk in upstream_resp.content.iter_any():
+                    await response.write(chunk)
+                await response.write_eof()
+                return response
+        except aiohttp.ClientError as exc:
+            log.error("upstream request failed: %s", exc)
+            return web.Response(status=502, text=f"Bad Gateway: {exc}")
+
+    app = web.Application()
+    app.router.add_route("*", "/{path_info:.*}", proxy_handler)
+    return app
+
+
+__all__ = ["build_app", "create_upstream_session"]
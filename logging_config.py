@@ -1,29 +1,154 @@
-"""Utility functions for configuring application logging."""
+"""Utility functions for configuring application logging.
 
+Records are put on an in-memory queue by the handler on the root logger and
+written out by a :class:`~logging.handlers.QueueListener` thread, so a log
+call on the event loop never waits on terminal I/O.  The listener's sink
+depends on the mode (``logging.mode`` in ``config.yaml``):
+
+* ``json`` (default): one compact JSON object per line.
+* ``rich``: the developer console — colored lines, rich tracebacks and the
+  Rich panels attached to :func:`log_event` records.
+
+Display-oriented events (model calls, tool panels, compaction summaries...)
+go through :func:`log_event`, which carries both structured fields for the
+JSON sink and an optional Rich renderable for the console sink.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import queue
+import sys
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Literal, TextIO
 
+from rich.console import Console, RenderableType
 from rich.logging import RichHandler
 
+LogMode = Literal["json", "rich"]
+
+# Logger for display events; kept at INFO regardless of the emitting module's
+# level so panels that were always shown stay visible.
+_events_logger = logging.getLogger("events")
+
+_listener: QueueListener | None = None
+_mode: LogMode = "json"
+
+# LogRecord attributes that are not user-supplied ``extra`` fields.
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "panel", "fields",
+}
+
+
+class _JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object: time, level, logger, message and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _RichConsoleHandler(RichHandler):
+    """RichHandler that prints a record's ``panel`` renderable instead of its message line."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        panel = getattr(record, "panel", None)
+        if panel is None:
+            super().emit(record)
+            return
+        try:
+            self.console.print(panel)
+        except Exception:  # noqa: BLE001 - a log handler reports its own failures via handleError
+            self.handleError(record)
+
+
+class _BackgroundQueueHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread.
+
+    The stock ``prepare`` formats the message and drops ``exc_info`` on the
+    calling thread; here only the ``%`` arguments are merged (so later
+    mutation of an argument can't change the message), leaving tracebacks
+    and attached panels for the sink.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def create_handler(
+    mode: LogMode,
+    *,
+    stream: TextIO | None = None,
+    background: bool = True,
+) -> tuple[logging.Handler, QueueListener | None]:
+    """Build the handler for *mode*.
 
-def setup_logging() -> None:
-    """Configure loggers with rich console output.
+    Args:
+        mode: ``"json"`` or ``"rich"``.
+        stream: Where the sink writes; stderr by default.
+        background: Put records on a queue drained by a listener thread
+            (started here) instead of writing on the calling thread.
 
-    Sets the root logger to use Rich for colored, formatted console output
-    and adjusts log levels for specific libraries and application modules.
+    Returns:
+        The handler to attach and, when *background*, its running listener.
     """
-    handler = RichHandler(
-        rich_tracebacks=True,
-        tracebacks_show_locals=True,
-        show_time=True,
-        show_path=True,
-        markup=True,
-    )
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[handler],
-    )
+    stream = stream if stream is not None else sys.stderr
+    sink: logging.Handler
+    if mode == "rich":
+        sink = _RichConsoleHandler(
+            console=Console(file=stream),
+            rich_tracebacks=True,
+            tracebacks_show_locals=True,
+            show_time=True,
+            show_path=True,
+            markup=True,
+        )
+        sink.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    else:
+        sink = logging.StreamHandler(stream)
+        sink.setFormatter(_JsonFormatter())
+    if not background:
+        return sink, None
+    listener = QueueListener(queue.SimpleQueue(), sink, respect_handler_level=True)
+    listener.start()
+    return _BackgroundQueueHandler(listener.queue), listener
+
+
+def setup_logging(mode: LogMode | None = None) -> None:
+    """Configure the root logger with a background handler and set module levels.
+
+    Args:
+        mode: Overrides ``logging.mode`` from ``config.yaml``.
+    """
+    global _listener, _mode
+    if mode is None:
+        from config import load_config
+
+        mode = load_config().logging.mode
+    stop_logging()
+    handler, _listener = create_handler(mode)
+    _mode = mode
+    logging.basicConfig(level=logging.DEBUG, handlers=[handler], force=True)
+
+    _events_logger.setLevel(logging.INFO)
     # Default 'tools' namespace to WARNING so normal runs are not overly verbose.
     # Individual tools can raise their own logger levels when deeper diagnostics are needed.
     logging.getLogger("tools").setLevel(logging.WARNING)
@@ -43,3 +168,54 @@ def setup_logging() -> None:
     # REPLs default to INFO so users see helpful output without increasing
     # global verbosity. Individual REPL modules can still override as needed.
     logging.getLogger("repls").setLevel(logging.INFO)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Registered once at import; a no-op unless setup_logging started a listener.
+atexit.register(stop_logging)
+
+
+def rich_panels_enabled() -> bool:
+    """True when the console sink renders panels, so building one is worthwhile."""
+    return _mode == "rich"
+
+
+def log_event(
+    event: str,
+    message: str,
+    *args: Any,
+    panel: RenderableType | None = None,
+    level: int = logging.INFO,
+    **fields: Any,
+) -> None:
+    """Log a display event with structured fields and an optional Rich panel.
+
+    Args:
+        event: Dotted event name, e.g. ``"model.response"``.
+        message: ``%``-style message for plain-text output.
+        *args: Arguments for the ``%`` placeholders in *message*.
+        panel: Shown in place of the message by the ``rich`` sink; ignored
+            by the ``json`` sink.
+        level: Log level.
+        **fields: Extra keys on the JSON record.
+    """
+    if not _events_logger.isEnabledFor(level):
+        return
+    _events_logger.log(level, message, *args, extra={"event": event, "panel": panel, "fields": fields})
+
+
+__all__ = [
+    "LogMode",
+    "create_handler",
+    "log_event",
+    "rich_panels_enabled",
+    "setup_logging",
+    "stop_logging",
+]
@@ -2,9 +2,9 @@
 
 import logging
 
-from rich.console import Console
 from rich.text import Text
 
+from logging_config import log_event, rich_panels_enabled
 from sdk.events import AgentEvent, ContextUsagePayload, publish_event
 from sdk.skills import AgentState
 
@@ -14,7 +14,6 @@ from ._models import ContextStats
 from ._strategy import ContextStrategy, TriggerPoint
 
 logger = logging.getLogger(__name__)
-_console = Console(stderr=True)
 
 
 class ContextManager:
@@ -95,7 +94,16 @@ class ContextManager:
 
 
 def _log_context_bar(stats: ContextStats, agent_name: str = "") -> None:
-    """Render a visual context-usage bar to the console."""
+    """Log a ``context.usage`` event, drawn as a usage bar in rich mode."""
+    pct = stats.fill_ratio * 100
+    log_event(
+        "context.usage", "%s context %d / %d (%.1f%%)", agent_name, stats.context_used, stats.context_limit, pct,
+        agent=agent_name, context_used=stats.context_used, context_limit=stats.context_limit,
+        panel=_context_bar(stats, agent_name) if rich_panels_enabled() else None,
+    )
+
+
+def _context_bar(stats: ContextStats, agent_name: str) -> Text:
     pct = stats.fill_ratio * 100
     if pct < 50:
         bar_style = "green"
@@ -120,5 +128,4 @@ def _log_context_bar(stats: ContextStats, agent_name: str = "") -> None:
     line.append(f"  {stats.context_used:,}", style="bold")
     line.append(f" / {stats.context_limit:,}", style="dim")
     line.append(f"  ({pct:.1f}%)", style=bar_style)
-
-    _console.print(line)
+    return line
@@ -1,28 +1,40 @@
 """Pluggable context management strategies."""
 
 import asyncio
+import functools
+import importlib.util
 import logging
+import sys
 import uuid
 from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Protocol
+from pathlib import Path
+from typing import Any, Protocol
 
-from rich.console import Console
-
-from sdk.providers import get_provider
 from rich.panel import Panel
 from rich.text import Text
 
 from conversations import SummaryRecord, save_summary_record
+from logging_config import log_event
 from sdk.events import get_current_agent_name
+from sdk.providers import Candidate, StopCondition, line_complete, role_candidates, routed_chat
+from sdk.tracing import annotate, traced
 from sdk.turn import get_conversation_id
 from settings import load_settings
+from utils.metrics import Counter, Histogram
 
 from ._history import ConversationHistory
 from ._models import ContextStats
 
 logger = logging.getLogger(__name__)
-_console = Console(stderr=True)
+
+_COMPACTIONS = Counter("computron_compactions", "LLM compaction attempts by outcome.", ("outcome",))
+_COMPACTION_SECONDS = Histogram(
+    "computron_compaction_duration_seconds", "Time to summarize and apply a compaction.",
+)
+_COMPACTION_TOKENS_SAVED = Counter(
+    "computron_compaction_tokens_saved", "Estimated context tokens removed by compaction.",
+)
 
 # Default cap on tool result chars in serialized summarization input.
 # Overridden per tool type below — code tools need more content since
@@ -41,6 +53,7 @@ _TOOL_RESULT_CAPS: dict[str, int] = {
     # file contents, so the tool result is supplementary context. 1500 chars
     # captures the module docstring, imports, and first class definition.
     "read_file": 1500,
+    "read_files": 1500,
     "grep": 1500,
     "run_bash_cmd": 1500,
     "list_dir": 800,
@@ -172,9 +185,12 @@ _INTENT_EXTRACTION_PROMPT = (
     "intent. Use a compact format — one line per phase. Mark the current "
     "active request clearly with [CURRENT] prefix.\n\n"
     "Output ONLY the history. Be concise — each line should be one "
-    "sentence max."
+    "sentence max. End with the [CURRENT] line and write nothing after it."
 )
 
+# The prompt asks for the [CURRENT] line last, so the answer is complete once it ends.
+_INTENT_STOP = StopCondition(complete=line_complete("[CURRENT]"))
+
 
 class TriggerPoint(StrEnum):
     """When a strategy should be evaluated."""
@@ -236,6 +252,7 @@ class LLMCompactionStrategy:
     def should_apply(self, history: ConversationHistory, stats: ContextStats) -> bool:
         return stats.fill_ratio >= self._threshold
 
+    @traced("context.compaction")
     async def apply(self, history: ConversationHistory, stats: ContextStats) -> None:
         """Summarize old messages and replace them with a compact summary."""
         non_system = history.non_system_messages
@@ -255,6 +272,7 @@ class LLMCompactionStrategy:
         compactable = body[:-keep_count] if keep_count > 0 else body
         if not compactable:
             return
+        annotate(messages_compacted=len(compactable), fill_ratio=round(stats.fill_ratio, 3))
 
         # Collect all user messages before history mutation for intent
         # extraction.  Includes the pinned message, compactable, and kept.
@@ -272,107 +290,126 @@ class LLMCompactionStrategy:
         resolved = self._resolve_model()
         if resolved is None:
             return
-        _resolved_provider, resolved_model, resolved_options = resolved
+        resolved_provider, resolved_model, resolved_options = resolved
+        summarizer = Candidate(resolved_provider, resolved_model)
 
         import time as _time
         t0 = _time.monotonic()
+        await _claim_model(summarizer)
+        # Candidates that answered; a fallback may have stood in for the summarizer.
+        answered: set[Candidate] = set()
         try:
-            summary, model_name = await self._summarize(
-                compactable, prior_summary,
-            )
-        except TimeoutError:
-            logger.warning(
-                "LLMCompactionStrategy: compaction timed out after %ds, skipping",
-                _CALL_TIMEOUT,
-            )
-            await _unload_model(resolved_model)
-            return
-        except Exception:
-            logger.exception("LLMCompactionStrategy: LLM call failed, skipping compaction")
-            await _unload_model(resolved_model)
-            return
-        elapsed = _time.monotonic() - t0
-
-        # Extract user intent if multiple user messages exist (experiment 29).
-        # When the user changes topics mid-conversation, the pinned first
-        # message becomes stale.  Replace it with an LLM-extracted intent
-        # history that tracks how the user's requests evolved.
-        intent_history = None
-        if has_pinned and len(all_user_contents) > 1:
             try:
-                intent_history = await self._extract_intent(all_user_contents)
-                logger.info(
-                    "LLMCompactionStrategy: extracted intent from %d user messages",
-                    len(all_user_contents),
+                summary, answered_by = await self._summarize(
+                    compactable, prior_summary,
                 )
-            except Exception:
-                logger.exception(
-                    "Intent extraction failed, keeping original pinned message",
+                answered.add(answered_by)
+            except TimeoutError:
+                logger.warning(
+                    "LLMCompactionStrategy: compaction timed out after %ds, skipping",
+                    _CALL_TIMEOUT,
                 )
+                _COMPACTIONS.inc("timeout")
+                return
+            except Exception:
+                logger.exception("LLMCompactionStrategy: LLM call failed, skipping compaction")
+                _COMPACTIONS.inc("error")
+                return
+            elapsed = _time.monotonic() - t0
+
+            # Extract user intent if multiple user messages exist (experiment 29).
+            # When the user changes topics mid-conversation, the pinned first
+            # message becomes stale.  Replace it with an LLM-extracted intent
+            # history that tracks how the user's requests evolved.
+            intent_history = None
+            if has_pinned and len(all_user_contents) > 1:
+                try:
+                    intent_history, intent_by = await self._extract_intent(all_user_contents)
+                    answered.add(intent_by)
+                    logger.info(
+                        "LLMCompactionStrategy: extracted intent from %d user messages",
+                        len(all_user_contents),
+                    )
+                except Exception:
+                    logger.exception(
+                        "Intent extraction failed, keeping original pinned message",
+                    )
 
-        # Persist the summarization event for quality evaluation.
-        record = SummaryRecord(
-            id=str(uuid.uuid4()),
-            created_at=datetime.now(UTC).isoformat(),
-            model=model_name,
-            input_messages=compactable,
-            input_char_count=sum(len(m.get("content") or "") for m in compactable),
-            prior_summary=prior_summary,
-            summary_text=summary,
-            summary_char_count=len(summary),
-            messages_compacted=len(compactable),
-            fill_ratio=stats.fill_ratio,
-            conversation_id=get_conversation_id() or "default",
-            agent_name=get_current_agent_name() or "",
-            options=resolved_options if isinstance(resolved_options, dict) else {},
-            elapsed_seconds=round(elapsed, 1),
-            source_history=history.instance_id,
-            user_message_post_compaction=intent_history,
-        )
-
-        # Save the pinned user message content before mutation. On the first
-        # compaction this is the user's real original message; on subsequent
-        # compactions it's the previous intent history. The true original is
-        # in the earliest summary record (by created_at).
-        if has_pinned:
-            pinned_idx = 1 if history.system_message is not None else 0
-            record.user_message_pre_compaction = (
-                history.get_mutable(pinned_idx).get("content") or ""
+            # Persist the summarization event for quality evaluation.
+            record = SummaryRecord(
+                id=str(uuid.uuid4()),
+                created_at=datetime.now(UTC).isoformat(),
+                model=answered_by.model,
+                input_messages=compactable,
+                input_char_count=sum(len(m.get("content") or "") for m in compactable),
+                prior_summary=prior_summary,
+                summary_text=summary,
+                summary_char_count=len(summary),
+                messages_compacted=len(compactable),
+                fill_ratio=stats.fill_ratio,
+                conversation_id=get_conversation_id() or "default",
+                agent_name=get_current_agent_name() or "",
+                options=resolved_options if isinstance(resolved_options, dict) else {},
+                elapsed_seconds=round(elapsed, 1),
+                source_history=history.instance_id,
+                user_message_post_compaction=intent_history,
             )
 
-        save_summary_record(record)
-
-        # Determine the range to drop within the full history list.
-        # Skip system message (if any) and the pinned first user message.
-        start = (1 if history.system_message is not None else 0) + pin_offset
-        end = start + len(compactable)
-
-        _log_compaction(stats, len(compactable), summary)
-
-        # Replace compactable messages with summary.
-        history.drop_range(start, end)
-        history.insert(start, {
-            "role": "assistant",
-            "content": _SUMMARY_PREFIX + summary,
-        })
-
-        # Update the pinned first user message with the extracted intent
-        # history so the agent sees the current objective, not the stale
-        # original request.
-        if intent_history is not None and has_pinned:
-            pinned_idx = 1 if history.system_message is not None else 0
-            pinned_msg = history.get_mutable(pinned_idx)
-            pinned_msg["content"] = _INTENT_PREFIX + intent_history
+            # Save the pinned user message content before mutation. On the first
+            # compaction this is the user's real original message; on subsequent
+            # compactions it's the previous intent history. The true original is
+            # in the earliest summary record (by created_at).
+            if has_pinned:
+                pinned_idx = 1 if history.system_message is not None else 0
+                record.user_message_pre_compaction = (
+                    history.get_mutable(pinned_idx).get("content") or ""
+                )
 
-        # Unload the summarizer model to free VRAM for the main agent.
-        await _unload_model(model_name)
+            save_summary_record(record)
+
+            # Determine the range to drop within the full history list.
+            # Skip system message (if any) and the pinned first user message.
+            start = (1 if history.system_message is not None else 0) + pin_offset
+            end = start + len(compactable)
+
+            _log_compaction(stats, len(compactable), summary)
+
+            # Replace compactable messages with summary.
+            history.drop_range(start, end)
+            history.insert(start, {
+                "role": "assistant",
+                "content": _SUMMARY_PREFIX + summary,
+            })
+
+            # Update the pinned first user message with the extracted intent
+            # history so the agent sees the current objective, not the stale
+            # original request.
+            if intent_history is not None and has_pinned:
+                pinned_idx = 1 if history.system_message is not None else 0
+                pinned_msg = history.get_mutable(pinned_idx)
+                pinned_msg["content"] = _INTENT_PREFIX + intent_history
+
+            _COMPACTIONS.inc("ok")
+            _COMPACTION_SECONDS.observe(_time.monotonic() - t0)
+            saved_chars = record.input_char_count - record.summary_char_count
+            if saved_chars > 0:
+                _COMPACTION_TOKENS_SAVED.inc(amount=saved_chars / _CHARS_PER_TOKEN)
+        finally:
+            # Let the residency coordinator decide when the summarizer's VRAM
+            # is worth more to someone else than a reload on the next compaction.
+            await _release_model(summarizer)
+            # A fallback was loaded by the call that used it; register it so the
+            # coordinator can account for and evict it like the summarizer.
+            for fallback in sorted(answered - {summarizer}, key=lambda c: (c.provider, c.model)):
+                await _claim_model(fallback)
+                await _release_model(fallback)
 
     async def _summarize(
         self,
         messages: list[dict],
         prior_summary: str | None = None,
         objective: str = "",
-    ) -> tuple[str, str]:
+    ) -> tuple[str, Candidate]:
         """Summarize messages, chunking if necessary.
 
         For short conversations, serializes and summarizes in a single call.
@@ -402,12 +439,11 @@ class LLMCompactionStrategy:
         )
 
         chunk_summaries: list[str] = []
-        model_name = ""
         for i, chunk in enumerate(chunks):
             chunk_text = _serialize_messages(copy.deepcopy(chunk))
             # Include prior summary context only in the first chunk.
             ps = prior_summary if i == 0 else None
-            summary, model_name = await self._call_summarizer(
+            summary, _candidate = await self._call_summarizer(
                 chunk_text, ps, objective,
             )
             chunk_summaries.append(summary)
@@ -417,20 +453,23 @@ class LLMCompactionStrategy:
             f"[Summary of part {i + 1}/{len(chunk_summaries)}]\n{s}"
             for i, s in enumerate(chunk_summaries)
         )
-        final_summary, model_name = await self._call_summarizer(
+        return await self._call_summarizer(
             merged_input, prior_summary=None, objective=objective,
         )
-        return final_summary, model_name
 
     async def _call_summarizer(
         self,
         conversation_text: str,
         prior_summary: str | None = None,
         objective: str = "",
-    ) -> tuple[str, str]:
-        """Call the summarization LLM and return (summary_text, model_name)."""
+    ) -> tuple[str, Candidate]:
+        """Call the summarization LLM and return (summary_text, candidate).
+
+        Runs across the compaction model and ``compaction_fallbacks`` (see
+        ``sdk.providers.routed_chat``); *candidate* is the one that answered.
+        """
         provider_name, model, options = self._resolve_model()
-        provider = get_provider(provider_name)
+        candidates = role_candidates(load_settings(), "compaction", provider_name, model)
 
         user_content = ""
         if prior_summary:
@@ -443,9 +482,10 @@ class LLMCompactionStrategy:
         user_content += conversation_text
 
         system_prompt = _build_summarize_prompt(objective)
-        response = await asyncio.wait_for(
-            provider.chat(
-                model=model,
+        response, candidate = await asyncio.wait_for(
+            routed_chat(
+                "compaction",
+                candidates,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_content},
@@ -455,17 +495,17 @@ class LLMCompactionStrategy:
             ),
             timeout=_CALL_TIMEOUT,
         )
-        return response.message.content or "", model
+        return response.message.content or "", candidate
 
-    async def _extract_intent(self, user_messages: list[str]) -> str:
-        """Extract the user's current intent from multiple user messages.
+    async def _extract_intent(self, user_messages: list[str]) -> tuple[str, Candidate]:
+        """Extract the user's current intent and return (intent_history, candidate).
 
         Called during compaction when the conversation has more than one
         user message, indicating the user may have changed topics.  Uses
-        the same model as the summarizer.
+        the same models as the summarizer; *candidate* is the one that answered.
         """
         provider_name, model, options = self._resolve_model()
-        provider = get_provider(provider_name)
+        candidates = role_candidates(load_settings(), "compaction", provider_name, model)
 
         # Build the user content with numbered messages.
         # Truncate individual messages to keep the input focused.
@@ -474,9 +514,10 @@ class LLMCompactionStrategy:
             text = msg[:500] + "..." if len(msg) > 500 else msg
             user_content += f"\n--- Message {i + 1} ---\n{text}\n"
 
-        response = await asyncio.wait_for(
-            provider.chat(
-                model=model,
+        response, candidate = await asyncio.wait_for(
+            routed_chat(
+                "compaction",
+                candidates,
                 messages=[
                     {"role": "system", "content": _INTENT_EXTRACTION_PROMPT},
                     {"role": "user", "content": user_content},
@@ -486,10 +527,11 @@ class LLMCompactionStrategy:
                     **(options if isinstance(options, dict) else {}),
                     "temperature": 0,
                 },
+                stop=_INTENT_STOP,
             ),
             timeout=60,
         )
-        return response.message.content or ""
+        return response.message.content or "", candidate
 
     def _resolve_model(self) -> tuple[str, str, dict] | None:
         """Determine the (provider, model, options) to use for summarization.
@@ -511,6 +553,82 @@ class LLMCompactionStrategy:
         return None
 
 
+@functools.cache
+def _residency_registry() -> Any | None:
+    """Return the shared model residency registry, or ``None`` if unavailable.
+
+    The coordinator lives in ``container/model_residency.py`` (stdlib only,
+    shared with the inference and grounding servers), so it is loaded by
+    path — once per process: the module is registered in ``sys.modules``
+    and the registry is cached.
+    """
+    module = sys.modules.get("model_residency")
+    try:
+        if module is None:
+            path = Path(__file__).resolve().parents[2] / "container" / "model_residency.py"
+            spec = importlib.util.spec_from_file_location("model_residency", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            sys.modules["model_residency"] = module
+        return module.Registry()
+    except (OSError, ImportError, AttributeError):
+        logger.debug("Model residency coordinator unavailable", exc_info=True)
+        return None
+
+
+def _residency_name(model: str) -> str:
+    return f"ollama:{model}"
+
+
+async def _claim_model(candidate: Candidate) -> None:
+    """Register the summarizer as loaded (and busy), evicting others if VRAM is short.
+
+    Only Ollama models use local VRAM; other providers are skipped.
+    """
+    if candidate.provider != "ollama":
+        return
+    registry = _residency_registry()
+    if registry is None:
+        return
+    model = candidate.model
+    name = _residency_name(model)
+
+    def _claim() -> None:
+        registry.acquire(name, kind="ollama", model=model)
+        registry.touch(name, busy=True)
+
+    try:
+        await asyncio.to_thread(_claim)
+    except OSError:
+        logger.debug("Failed to register model %s", model, exc_info=True)
+
+
+async def _release_model(candidate: Candidate) -> None:
+    """Mark the summarizer idle and let the coordinator evict what has expired.
+
+    Falls back to unloading it right away when no coordinator is available.
+    Skipped, like :func:`_claim_model`, for providers other than Ollama.
+    """
+    if candidate.provider != "ollama":
+        return
+    model = candidate.model
+    registry = _residency_registry()
+    if registry is None:
+        await _unload_model(model)
+        return
+    name = _residency_name(model)
+
+    def _release() -> None:
+        registry.touch(name, busy=False)
+        registry.sweep(exclude={name})
+
+    try:
+        await asyncio.to_thread(_release)
+    except OSError:
+        logger.debug("Failed to release model %s", model, exc_info=True)
+        await _unload_model(model)
+
+
 async def _unload_model(model: str) -> None:
     """Unload a model from Ollama to free VRAM."""
     try:
@@ -534,19 +652,24 @@ def _log_compaction(
     msg_count: int,
     summary: str,
 ) -> None:
-    """Render a Rich panel showing the context summarization result."""
+    """Log a ``context.compaction`` event with the summary (as a panel in rich mode)."""
     header = Text()
     header.append(f"Compacted {msg_count} messages", style="bold")
     header.append(f"  fill={stats.fill_ratio:.0%}", style="yellow")
     header.append(f"  → {len(summary):,} chars", style="green")
 
-    _console.print(Panel(
-        Text(summary),
-        title="[bold magenta]Context Summary[/bold magenta]",
-        subtitle=header,
-        border_style="magenta",
-        expand=False,
-    ))
+    log_event(
+        "context.compaction", "Compacted %d messages at %.0f%% fill into %d chars",
+        msg_count, stats.fill_ratio * 100, len(summary),
+        messages=msg_count, fill_ratio=round(stats.fill_ratio, 3), summary_chars=len(summary),
+        panel=Panel(
+            Text(summary),
+            title="[bold magenta]Context Summary[/bold magenta]",
+            subtitle=header,
+            border_style="magenta",
+            expand=False,
+        ),
+    )
 
 
 def _count_kept_by_assistant_groups(
@@ -589,6 +712,7 @@ def _count_kept_by_assistant_groups(
 _TOOL_ARG_KEYS: dict[str, list[str]] = {
     "write_file": ["path"],
     "read_file": ["path"],
+    "read_files": ["paths"],
     "apply_text_patch": ["path"],
     "replace_in_file": ["path"],
     "run_bash_cmd": ["cmd", "command"],
@@ -30,8 +30,10 @@ from ._models import (
     ContentPayload,
     ContextUsagePayload,
     DesktopActivePayload,
+    DownloadProgressPayload,
     FileOutputPayload,
     GenerationPreviewPayload,
+    ModelQueuePayload,
     TerminalOutputPayload,
     ToolCallPayload,
     ToolCreatedPayload,
@@ -49,10 +51,12 @@ __all__ = [
     "ContentPayload",
     "ContextUsagePayload",
     "DesktopActivePayload",
+    "DownloadProgressPayload",
     "EventDispatcher",
     "EventHandler",
     "FileOutputPayload",
     "GenerationPreviewPayload",
+    "ModelQueuePayload",
     "TerminalOutputPayload",
     "ToolCallPayload",
     "ToolCreatedPayload",
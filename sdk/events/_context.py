@@ -26,6 +26,7 @@ if TYPE_CHECKING:  # Avoid runtime import cycles; only needed for typing
     from collections.abc import AsyncGenerator
 
 from sdk.skills.agent_state import AgentState, _active_agent_state
+from sdk.tracing import trace_span
 
 from ._dispatcher import EventDispatcher
 from ._models import AgentCompletedPayload, AgentEvent, AgentStartedPayload, ContentPayload
@@ -146,7 +147,8 @@ async def agent_span(
 
     status = "success"
     try:
-        yield context_id
+        with trace_span("agent", agent_name=agent_name or "", agent_id=context_id, depth=depth):
+            yield context_id
     except Exception as exc:
         # Import here to avoid circular dependency with sdk.turn
         from sdk.turn._turn import StopRequestedError
@@ -21,10 +21,20 @@ from contextlib import asynccontextmanager, suppress
 from inspect import iscoroutinefunction
 from typing import Any
 
+from utils.metrics import Gauge
+
 from ._models import AgentEvent
 
 logger = logging.getLogger(__name__)
 
+_PENDING_HANDLERS = Gauge(
+    "computron_event_handlers_pending", "Async event-handler tasks scheduled but not yet finished, across dispatchers.",
+)
+
+
+def _handler_task_done(_task: asyncio.Task[Any]) -> None:
+    _PENDING_HANDLERS.dec()
+
 
 EventHandler = Callable[[AgentEvent], Any]
 
@@ -83,7 +93,9 @@ class EventDispatcher:
                 if iscoroutinefunction(handler):
                     task = asyncio.create_task(self._run_async_handler(handler, event))
                     self._tasks.add(task)
+                    _PENDING_HANDLERS.inc()
                     task.add_done_callback(self._tasks.discard)
+                    task.add_done_callback(_handler_task_done)
                 else:
                     loop.call_soon(self._run_sync_handler, handler, event)
             except Exception:  # pragma: no cover - defensive path
@@ -210,6 +210,55 @@ class GenerationPreviewPayload(BaseModel):
     output_path: str | None = None
 
 
+class DownloadProgressPayload(BaseModel):
+    """Emitted while a browser download is written and when it finishes.
+
+    Multiple events share the same ``download_id``; the last one has
+    ``status`` "complete" or "failed".
+
+    Attributes:
+        type: Discriminator; always "download_progress".
+        download_id: Identifier correlating progress events.
+        filename: Suggested (or final) filename.
+        url: Source URL.
+        status: Current download phase.
+        bytes_received: Bytes written so far.
+        total_bytes: Expected size, when the server announced one.
+        content_type: MIME type sniffed from the first bytes.
+        path: Final saved path on completion.
+    """
+
+    type: Literal["download_progress"]
+    download_id: str
+    filename: str
+    url: str = ""
+    status: Literal["in_progress", "complete", "failed"]
+    bytes_received: int = 0
+    total_bytes: int | None = None
+    content_type: str | None = None
+    path: str | None = None
+
+
+class ModelQueuePayload(BaseModel):
+    """Emitted when a model call waits on the client-side rate limiter, and when it leaves the queue.
+
+    Attributes:
+        type: Discriminator; always "model_queue".
+        provider: Provider the call is queued for.
+        model: Model the call is queued for.
+        queued: True while waiting, False once the call is sent.
+        position: Place in the queue when it started waiting.
+        waited_ms: Time spent queued, on the ``queued=False`` event.
+    """
+
+    type: Literal["model_queue"]
+    provider: str
+    model: str
+    queued: bool
+    position: int | None = None
+    waited_ms: float | None = None
+
+
 class AgentStartedPayload(BaseModel):
     """Emitted when an agent begins execution.
 
@@ -256,8 +305,10 @@ AgentEventPayload = Annotated[
     | AudioPlaybackPayload
     | TerminalOutputPayload
     | GenerationPreviewPayload
+    | DownloadProgressPayload
     | ContextUsagePayload
     | DesktopActivePayload
+    | ModelQueuePayload
     | AgentStartedPayload
     | AgentCompletedPayload,
     Field(discriminator="type"),
@@ -295,8 +346,10 @@ __all__ = [
     "ContentPayload",
     "ContextUsagePayload",
     "DesktopActivePayload",
+    "DownloadProgressPayload",
     "FileOutputPayload",
     "GenerationPreviewPayload",
+    "ModelQueuePayload",
     "TerminalOutputPayload",
     "ToolCallPayload",
     "ToolCreatedPayload",
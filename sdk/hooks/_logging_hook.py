@@ -1,4 +1,7 @@
-"""LoggingHook — logs model inputs and outputs using Rich panels and tables."""
+"""LoggingHook — logs model inputs and outputs as structured events.
+
+With the ``rich`` log mode the events carry Rich panels and tables.
+"""
 
 from __future__ import annotations
 
@@ -6,16 +9,18 @@ import json
 import logging
 from typing import Any
 
-from rich.console import Console, Group
+from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from logging_config import log_event, rich_panels_enabled
+
 logger = logging.getLogger(__name__)
 
 
 class LoggingHook:
-    """Logs model inputs and outputs using Rich panels and tables."""
+    """Logs model inputs and outputs as ``model.request`` / ``model.response`` events."""
 
     def __init__(self, agent: Any) -> None:
         """Initialize with the agent whose name is used in log lines."""
@@ -23,7 +28,6 @@ class LoggingHook:
         self._model: str = getattr(agent, "model", "?")
         self._options: dict = getattr(agent, "options", {}) or {}
         self._think: bool = getattr(agent, "think", False)
-        self._console = Console(stderr=True)
 
     async def before_model(self, history: Any, iteration: int, agent_name: str) -> None:
         """Log the chat history being sent to the model."""
@@ -34,8 +38,16 @@ class LoggingHook:
         for msg in history.messages:
             role = msg.get("role", "unknown")
             roles[role] = roles.get(role, 0) + 1
-        role_summary = "  ".join(f"{r}: {c}" for r, c in sorted(roles.items()))
 
+        log_event(
+            "model.request", "%s before_model iteration %d: %d messages",
+            self._agent_name, iteration, msg_count,
+            agent=self._agent_name, model=self._model, iteration=iteration, roles=roles,
+            panel=self._request_panel(msg_count, roles, iteration) if rich_panels_enabled() else None,
+        )
+
+    def _request_panel(self, msg_count: int, roles: dict[str, int], iteration: int) -> Panel:
+        role_summary = "  ".join(f"{r}: {c}" for r, c in sorted(roles.items()))
         body = Text()
         body.append(f"{msg_count}", style="bold")
         body.append(f" messages  ({role_summary})")
@@ -47,12 +59,12 @@ class LoggingHook:
                 parts.append(f"{k}={v}")
             body.append(f"\noptions: {', '.join(parts)}", style="dim")
 
-        self._console.print(Panel(
+        return Panel(
             body,
             title=f"[bold cyan]{self._agent_name}[/bold cyan]  before_model  iteration {iteration}",
             border_style="cyan",
             expand=False,
-        ))
+        )
 
     async def after_model(
         self, response: Any, history: Any, iteration: int, agent_name: str
@@ -61,35 +73,24 @@ class LoggingHook:
         if not logger.isEnabledFor(logging.DEBUG):
             return response
 
-        # Build stats table if available (check raw for Ollama-specific timing)
-        stats_table = None
+        # Runtime stats if available (check raw for Ollama-specific timing)
+        stats: dict[str, float] = {}
         raw = getattr(response, "raw", None)
         if raw is not None and hasattr(raw, "done") and getattr(raw, "done", False):
             from sdk.providers import llm_runtime_stats
 
-            stats = llm_runtime_stats(raw)
-            stats_table = Table(show_header=False, expand=False, padding=(0, 1))
-            stats_table.add_column("Metric", style="bold")
-            stats_table.add_column("Value", justify="right")
-
-            total = getattr(stats, "total_duration", 0) or 0
-            load = getattr(stats, "load_duration", 0) or 0
-            prompt_count = getattr(stats, "prompt_eval_count", 0) or 0
-            prompt_dur = getattr(stats, "prompt_eval_duration", 0) or 0
-            prompt_tps = getattr(stats, "prompt_tokens_per_sec", 0) or 0
-            eval_count = getattr(stats, "eval_count", 0) or 0
-            eval_dur = getattr(stats, "eval_duration", 0) or 0
-            eval_tps = getattr(stats, "eval_tokens_per_sec", 0) or 0
-
-            stats_table.add_row("Total duration", f"{total:.3f}s")
-            stats_table.add_row("Model load", f"{load:.3f}s")
-            stats_table.add_row("Prompt tokens", f"{prompt_count}  ({prompt_dur:.3f}s, {prompt_tps:.1f} tok/s)")
-            stats_table.add_row("Eval tokens", f"{eval_count}  ({eval_dur:.3f}s, {eval_tps:.1f} tok/s)")
+            runtime = llm_runtime_stats(raw)
+            for key in (
+                "total_duration", "load_duration",
+                "prompt_eval_count", "prompt_eval_duration", "prompt_tokens_per_sec",
+                "eval_count", "eval_duration", "eval_tokens_per_sec",
+            ):
+                stats[key] = getattr(runtime, key, 0) or 0
 
         # Extract response content summary
         thinking_text = ""
         content_text = ""
-        tool_calls_text = ""
+        tool_calls: list[str] = []
         if hasattr(response, "message"):
             msg = response.message
             if hasattr(msg, "thinking") and msg.thinking:
@@ -103,7 +104,6 @@ class LoggingHook:
                     content = content[:500] + "..."
                 content_text = content
             if hasattr(msg, "tool_calls") and msg.tool_calls:
-                tool_calls_parts = []
                 for tc in msg.tool_calls:
                     func = getattr(tc, "function", tc)
                     name = getattr(func, "name", "?")
@@ -119,14 +119,44 @@ class LoggingHook:
                         if len(v_str) > 120:
                             v_str = v_str[:120] + "…"
                         arg_parts.append(f"{k}={v_str}")
-                    tool_calls_parts.append(
-                        f"{name}({', '.join(arg_parts)})"
-                    )
-                tool_calls_text = "\n".join(tool_calls_parts)
-
-        # Compose output
-        parts = []
-        if stats_table:
+                    tool_calls.append(f"{name}({', '.join(arg_parts)})")
+
+        panel = None
+        if rich_panels_enabled():
+            panel = self._response_panel(stats, thinking_text, content_text, tool_calls, iteration)
+        log_event(
+            "model.response", "%s after_model iteration %d: %d chars, %d tool calls",
+            self._agent_name, iteration, len(content_text), len(tool_calls),
+            agent=self._agent_name, model=self._model, iteration=iteration,
+            content=content_text, tool_calls=tool_calls, stats=stats,
+            panel=panel,
+        )
+        return response
+
+    def _response_panel(
+        self,
+        stats: dict[str, float],
+        thinking_text: str,
+        content_text: str,
+        tool_calls: list[str],
+        iteration: int,
+    ) -> Panel:
+        parts: list[Any] = []
+        if stats:
+            stats_table = Table(show_header=False, expand=False, padding=(0, 1))
+            stats_table.add_column("Metric", style="bold")
+            stats_table.add_column("Value", justify="right")
+            stats_table.add_row("Total duration", f"{stats['total_duration']:.3f}s")
+            stats_table.add_row("Model load", f"{stats['load_duration']:.3f}s")
+            stats_table.add_row(
+                "Prompt tokens",
+                f"{stats['prompt_eval_count']}  "
+                f"({stats['prompt_eval_duration']:.3f}s, {stats['prompt_tokens_per_sec']:.1f} tok/s)",
+            )
+            stats_table.add_row(
+                "Eval tokens",
+                f"{stats['eval_count']}  ({stats['eval_duration']:.3f}s, {stats['eval_tokens_per_sec']:.1f} tok/s)",
+            )
             parts.append(stats_table)
         if thinking_text:
             label = Text("Thinking: ", style="bold dim")
@@ -136,15 +166,14 @@ class LoggingHook:
             label = Text("Response: ", style="bold")
             label.append(content_text)
             parts.append(label)
-        if tool_calls_text:
+        if tool_calls:
             label = Text("Tool calls:\n", style="bold magenta")
-            label.append(tool_calls_text, style="magenta")
+            label.append("\n".join(tool_calls), style="magenta")
             parts.append(label)
 
-        self._console.print(Panel(
+        return Panel(
             Group(*parts) if parts else Text("(empty response)", style="dim"),
             title=f"[bold yellow]{self._agent_name}[/bold yellow]  after_model  iteration {iteration}",
             border_style="yellow",
             expand=False,
-        ))
-        return response
+        )
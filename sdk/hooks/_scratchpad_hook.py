@@ -1,4 +1,4 @@
-"""ScratchpadHook — logs Rich panels when the agent reads or writes the scratchpad."""
+"""ScratchpadHook — logs an event (with a Rich panel) when the agent reads or writes the scratchpad."""
 
 from __future__ import annotations
 
@@ -6,20 +6,18 @@ import json
 import logging
 from typing import Any
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from logging_config import log_event
+
 logger = logging.getLogger(__name__)
 
 _SCRATCHPAD_TOOLS = frozenset({"save_to_scratchpad", "recall_from_scratchpad"})
 
 
 class ScratchpadHook:
-    """Displays a Rich panel whenever the agent uses a scratchpad tool."""
-
-    def __init__(self) -> None:
-        self._console = Console(stderr=True)
+    """Logs a ``scratchpad.write`` / ``scratchpad.read`` event whenever the agent uses a scratchpad tool."""
 
     def after_tool(
         self, tool_name: str | None, tool_arguments: dict[str, Any], tool_result: str
@@ -46,12 +44,16 @@ class ScratchpadHook:
             body.append("\nvalue: ", style="bold")
             body.append(value, style="green")
 
-            self._console.print(Panel(
-                body,
-                title="[bold green]📝 Scratchpad Write[/bold green]",
-                border_style="green",
-                expand=False,
-            ))
+            log_event(
+                "scratchpad.write", "Scratchpad write %s", key,
+                key=key,
+                panel=Panel(
+                    body,
+                    title="[bold green]📝 Scratchpad Write[/bold green]",
+                    border_style="green",
+                    expand=False,
+                ),
+            )
 
         elif tool_name == "recall_from_scratchpad":
             key = tool_arguments.get("key")
@@ -87,11 +89,16 @@ class ScratchpadHook:
             else:
                 body.append(tool_result)
 
-            self._console.print(Panel(
-                body,
-                title="[bold cyan]🔍 Scratchpad Read[/bold cyan]",
-                border_style="cyan",
-                expand=False,
-            ))
+            log_event(
+                "scratchpad.read", "Scratchpad read %s", key if key is not None else "(all)",
+                key=key,
+                found=bool(result_data and result_data.get("status") == "ok"),
+                panel=Panel(
+                    body,
+                    title="[bold cyan]🔍 Scratchpad Read[/bold cyan]",
+                    border_style="cyan",
+                    expand=False,
+                ),
+            )
 
         return tool_result
@@ -0,0 +1,22 @@
+"""Images for model requests.
+
+Images are downscaled and re-encoded to the configured size and format
+(``media`` in ``config.yaml``), stored once per conversation in a
+content-addressed :class:`BlobStore` and referenced from messages by hash.
+Providers inline references with :func:`inline_images` (reading blobs off
+the event loop) and read images with :func:`image_base64` when building a
+request; :func:`drop_stale_images` keeps old images out of it.
+"""
+
+from ._blobs import BlobStore, blob_store
+from ._images import drop_stale_images, fit_image, image_base64, inline_images, prepare_image
+
+__all__ = [
+    "BlobStore",
+    "blob_store",
+    "drop_stale_images",
+    "fit_image",
+    "image_base64",
+    "inline_images",
+    "prepare_image",
+]
@@ -0,0 +1,92 @@
+"""Content-addressed blob storage for images referenced from model messages."""
+
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+_MEDIA_TYPES = {ext: media_type for media_type, ext in _EXTENSIONS.items()}
+
+
+class BlobStore:
+    """Files named by the SHA-256 of their content, so each image is stored once.
+
+    Args:
+        root: Directory holding the blobs; created on first write.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def put(self, data: bytes, media_type: str) -> str:
+        """Store *data* and return its digest; storing the same bytes again is a no-op."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, media_type)
+        if path.exists():
+            return digest
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a reader never sees a partial blob.
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            Path(tmp).replace(path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        logger.debug("Stored blob %s (%d bytes) in %s", digest[:12], len(data), self.root)
+        return digest
+
+    def path(self, digest: str) -> Path | None:
+        """Return the file holding *digest*, or ``None`` if it isn't stored."""
+        for candidate in self.root.glob(f"{digest}.*"):
+            return candidate
+        return None
+
+    def get(self, digest: str) -> tuple[bytes, str]:
+        """Return the bytes and media type stored under *digest*.
+
+        Raises:
+            FileNotFoundError: If no blob has that digest.
+        """
+        path = self.path(digest)
+        if path is None:
+            msg = f"No blob {digest} in {self.root}"
+            raise FileNotFoundError(msg)
+        return path.read_bytes(), _MEDIA_TYPES.get(path.suffix[1:], "application/octet-stream")
+
+    def base64(self, digest: str) -> str:
+        """Return the blob as base64, cached since blobs never change."""
+        path = self.path(digest)
+        if path is None:
+            msg = f"No blob {digest} in {self.root}"
+            raise FileNotFoundError(msg)
+        return _read_base64(str(path))
+
+    def _path(self, digest: str, media_type: str) -> Path:
+        return self.root / f"{digest}.{_EXTENSIONS.get(media_type, 'bin')}"
+
+
+@functools.lru_cache(maxsize=32)
+def _read_base64(path: str) -> str:
+    return base64.b64encode(Path(path).read_bytes()).decode("ascii")
+
+
+def blob_store(conversation_id: str) -> BlobStore:
+    """Return the blob store under *conversation_id*'s directory."""
+    from conversations import get_blob_dir
+
+    return BlobStore(get_blob_dir(conversation_id))
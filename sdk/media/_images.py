@@ -0,0 +1,184 @@
+"""Image preparation for model requests: downscale, re-encode, store and expire.
+
+Message images are dicts in a message's ``images`` list.  Two forms exist:
+
+* ``{"data": <base64>, "media_type": ...}`` — inline bytes.
+* ``{"ref": <sha256>, "media_type": ...}`` — a blob in the current
+  conversation's :class:`~sdk.media.BlobStore`, so history carries the hash
+  and the bytes are read (and base64-encoded once) only when a provider
+  builds its request.
+
+Provider converters read either form through :func:`image_base64`; the
+providers first call :func:`inline_images` so blob reads happen off the
+event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+import logging
+from typing import Any
+
+from ._blobs import blob_store
+
+logger = logging.getLogger(__name__)
+
+_FORMATS = {"png": ("PNG", "image/png"), "jpeg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}
+
+# Replaces the images of a message that has aged out of the request.
+_STALE_NOTE = "[%d image(s) from an earlier step omitted]"
+
+
+def fit_image(
+    data: bytes,
+    media_type: str,
+    *,
+    max_side: int | None,
+    fmt: str,
+    quality: int = 80,
+) -> tuple[bytes, str]:
+    """Downscale *data* so its longer side is at most *max_side* and encode it as *fmt*.
+
+    Needs Pillow; without it the image is returned unchanged.  The original is
+    also kept when it is already small enough and re-encoding would not make
+    it smaller.
+
+    Args:
+        data: Encoded image.
+        media_type: MIME type of *data*.
+        max_side: Longest side in pixels; ``None`` keeps the size.
+        fmt: ``"png"``, ``"jpeg"`` or ``"webp"``.
+        quality: JPEG/WebP quality.
+
+    Returns:
+        The encoded image and its MIME type.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.debug("Pillow not installed; sending image as captured")
+        return data, media_type
+
+    pil_format, target_type = _FORMATS[fmt]
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            resized = max_side is not None and max(img.size) > max_side
+            if not resized and target_type == media_type:
+                return data, media_type
+            out = img.copy()
+    except (OSError, ValueError):
+        logger.warning("Could not decode %s image; sending as captured", media_type)
+        return data, media_type
+
+    if resized:
+        out.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    if pil_format == "JPEG" and out.mode not in ("RGB", "L"):
+        out = out.convert("RGB")
+    buf = io.BytesIO()
+    options = {"quality": quality} if pil_format in ("JPEG", "WEBP") else {"optimize": True}
+    out.save(buf, format=pil_format, **options)
+    encoded = buf.getvalue()
+    if not resized and len(encoded) >= len(data):
+        return data, media_type
+    return encoded, target_type
+
+
+def prepare_image(data: bytes, media_type: str) -> dict[str, str]:
+    """Fit *data* to the configured size and format and store it for the current conversation.
+
+    Returns:
+        A message image: a ``ref`` to the stored blob, or inline ``data``
+        when no conversation is active.
+    """
+    from config import load_config
+    from sdk.turn import get_conversation_id
+
+    cfg = load_config().media
+    fitted, fitted_type = fit_image(
+        data, media_type, max_side=cfg.image_max_side, fmt=cfg.image_format, quality=cfg.image_quality,
+    )
+    if len(fitted) != len(data):
+        logger.debug("Image re-encoded: %d -> %d bytes (%s)", len(data), len(fitted), fitted_type)
+
+    conversation_id = get_conversation_id()
+    if conversation_id is not None:
+        try:
+            digest = blob_store(conversation_id).put(fitted, fitted_type)
+        except OSError:
+            logger.exception("Failed to store image blob; sending it inline")
+        else:
+            return {"ref": digest, "media_type": fitted_type}
+    return {"data": base64.b64encode(fitted).decode("ascii"), "media_type": fitted_type}
+
+
+def image_base64(image: dict[str, Any]) -> str:
+    """Return a message image's bytes as base64, reading ``ref`` images from the blob store.
+
+    Raises:
+        FileNotFoundError: If a referenced blob is missing.
+    """
+    data = image.get("data")
+    if data is not None:
+        return data
+    from sdk.turn import get_conversation_id
+
+    conversation_id = get_conversation_id()
+    if conversation_id is None:
+        msg = f"Image {image.get('ref')} is a blob reference but no conversation is active"
+        raise FileNotFoundError(msg)
+    return blob_store(conversation_id).base64(image["ref"])
+
+
+async def inline_images(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return *messages* with blob-reference images replaced by inline data.
+
+    The blobs are read in a worker thread.  The input is not modified; it is
+    returned as is when no message holds a reference.
+    """
+    if not any(img.get("data") is None for m in messages for img in m.get("images") or ()):
+        return messages
+    return await asyncio.to_thread(_inline_images, messages)
+
+
+def _inline_images(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for message in messages:
+        images = message.get("images")
+        if images and any(img.get("data") is None for img in images):
+            message = {**message, "images": [{**img, "data": image_base64(img)} for img in images]}
+        out.append(message)
+    return out
+
+
+def drop_stale_images(messages: list[dict[str, Any]], keep_iterations: int | None) -> list[dict[str, Any]]:
+    """Strip images the model has already seen for *keep_iterations* replies.
+
+    A message's images are kept while fewer than *keep_iterations* assistant
+    messages follow it; after that they are replaced by a short note in the
+    message content.  The input is not modified.
+
+    Returns:
+        *messages* itself when nothing is dropped, otherwise a new list
+        sharing the unchanged messages.
+    """
+    if keep_iterations is None:
+        return messages
+    out: list[dict[str, Any]] | None = None
+    replies_after = 0
+    for i in range(len(messages) - 1, -1, -1):
+        msg = messages[i]
+        if msg.get("role") == "assistant":
+            replies_after += 1
+        images = msg.get("images")
+        if not images or replies_after < keep_iterations:
+            continue
+        if out is None:
+            out = list(messages)
+        note = _STALE_NOTE % len(images)
+        content = msg.get("content") or ""
+        stripped = {key: value for key, value in msg.items() if key != "images"}
+        stripped["content"] = f"{content}\n{note}" if content else note
+        out[i] = stripped
+    return out if out is not None else messages
@@ -9,7 +9,10 @@ from settings import load_settings
 
 from ._models import ChatDelta, ChatMessage, ChatResponse, LLMConfig, ModelInfo, ProviderError, TokenUsage, ToolCall, ToolCallFunction
 from ._protocol import Provider
+from ._ratelimit import AdaptiveLimiter, get_limiter
+from ._routing import Candidate, role_candidates, routed_chat
 from ._runtime_stats import LLMRuntimeStats, llm_runtime_stats
+from ._stop import StopCondition, chat_until, json_complete, line_complete
 from ._vision import vision_generate
 
 logger = logging.getLogger(__name__)
@@ -20,6 +23,7 @@ _PROVIDER_PATHS: dict[str, str] = {
     "openai_compat": "sdk.providers._openai:OpenAIProvider",
     "openrouter": "sdk.providers._openai:OpenAIProvider",
     "anthropic": "sdk.providers._anthropic:AnthropicProvider",
+    "replay": "sdk.providers._replay:ReplayProvider",
 }
 
 _provider_cache: dict[str, Provider] = {}
@@ -52,10 +56,17 @@ def _create_provider(provider_name: str) -> Provider:
     Direct providers (Ollama, no-auth OpenAI-compatible) are configured in
     ``settings.direct_providers`` and connect straight to their base URL.
     Everything else is a brokered integration reached through a Unix socket.
-    A name with neither is not configured.
+    A name with neither is not configured.  Providers that set
+    ``requires_endpoint = False`` (the offline ``replay`` provider) need
+    neither.
     """
     cls = _provider_class(provider_name)
 
+    if not getattr(cls, "requires_endpoint", True):
+        instance = cls.from_config(LLMConfig(provider=provider_name))
+        logger.info("Initialized LLM provider: %s (local)", provider_name)
+        return instance
+
     direct = load_settings().get("direct_providers", {}).get(provider_name)
     if direct and direct.get("base_url"):
         instance = cls.from_config(LLMConfig(provider=provider_name, base_url=direct["base_url"]))
@@ -99,6 +110,8 @@ def reset_provider(provider_name: str | None = None) -> None:
 
 
 __all__ = [
+    "AdaptiveLimiter",
+    "Candidate",
     "ChatDelta",
     "ChatMessage",
     "ChatResponse",
@@ -106,11 +119,18 @@ __all__ = [
     "ModelInfo",
     "Provider",
     "ProviderError",
+    "StopCondition",
     "TokenUsage",
     "ToolCall",
     "ToolCallFunction",
+    "chat_until",
+    "get_limiter",
     "get_provider",
+    "json_complete",
+    "line_complete",
     "llm_runtime_stats",
     "reset_provider",
+    "role_candidates",
+    "routed_chat",
     "vision_generate",
 ]
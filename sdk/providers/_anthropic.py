@@ -8,7 +8,10 @@ from pathlib import Path
 from typing import Any
 
 from ._base import BaseAPIProvider
+from ._http import direct_http_client, proxy_http_client
 from ._models import ChatDelta, ChatMessage, ChatResponse, ModelInfo, ProviderError, TokenUsage, ToolCall, ToolCallFunction
+from ._ratelimit import retry_after_from_headers
+from sdk.media import image_base64, inline_images
 from sdk.tools import callable_to_json_schema
 
 logger = logging.getLogger(__name__)
@@ -42,9 +45,7 @@ class AnthropicProvider(BaseAPIProvider):
             # The Anthropic SDK adds /v1/messages paths relative to base_url;
             # using "http://localhost" means it sends to http://localhost/v1/...
             # which the proxy receives and forwards to the real upstream.
-            import httpx
-            transport = httpx.AsyncHTTPTransport(uds=str(proxy_socket))
-            http_client = httpx.AsyncClient(transport=transport)
+            http_client = proxy_http_client(proxy_socket)
             self._client = anthropic.AsyncAnthropic(
                 http_client=http_client,
                 base_url="http://localhost",
@@ -56,6 +57,7 @@ class AnthropicProvider(BaseAPIProvider):
                 kwargs["api_key"] = api_key
             if base_url:
                 kwargs["base_url"] = base_url
+                kwargs["http_client"] = direct_http_client(base_url)
             self._client = anthropic.AsyncAnthropic(**kwargs)
 
         self._model_cache: list[ModelInfo] | None = None
@@ -115,6 +117,7 @@ class AnthropicProvider(BaseAPIProvider):
         think: bool = False,
     ) -> ChatResponse:
         """Send a chat request via Anthropic and normalize the response."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
 
         try:
@@ -134,6 +137,7 @@ class AnthropicProvider(BaseAPIProvider):
         think: bool = False,
     ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
         """Stream token deltas followed by a final ChatResponse."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
 
         try:
@@ -254,7 +258,7 @@ def _convert_messages(
                     "source": {
                         "type": "base64",
                         "media_type": img.get("media_type", "image/png"),
-                        "data": img["data"],
+                        "data": image_base64(img),
                     },
                 })
             converted.append({"role": "user", "content": content_blocks})
@@ -310,6 +314,7 @@ def _wrap_error(exc: Exception) -> ProviderError:
             msg,
             retryable=retryable,
             status_code=exc.status_code,
+            retry_after=retry_after_from_headers(exc.response.headers),
             cause=exc,
         )
     if isinstance(exc, anthropic.APIConnectionError):
@@ -0,0 +1,175 @@
+"""Shared, pooled HTTP clients for the SDK-backed providers.
+
+The OpenAI and Anthropic SDKs accept an ``httpx.AsyncClient``.  Instead of
+each provider instance building its own with default limits, they ask for
+the client of their endpoint here: one per broker socket or base URL, with
+keep-alive limits from ``provider_http`` in ``config.yaml``.  Provider
+instances re-created after a settings change (``reset_provider``) keep
+using the warm pool.
+
+Pool use is exported as metrics: requests in flight per pool and the
+pool's connections by state.  Responses through a broker socket also feed
+their rate-limit headers to the provider's limiters (see ``_ratelimit``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from utils.metrics import Counter, Gauge
+
+from ._ratelimit import note_response_headers
+
+logger = logging.getLogger(__name__)
+
+_IN_FLIGHT = Gauge(
+    "computron_provider_http_in_flight", "Provider HTTP requests awaiting or streaming a response.", ("pool",),
+)
+_REQUESTS = Counter("computron_provider_http_requests", "Provider HTTP requests sent.", ("pool",))
+_CONNECTIONS = Gauge(
+    "computron_provider_http_connections", "Provider HTTP pool connections by state.", ("pool", "state"),
+)
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_transports: dict[str, _PooledTransport] = {}
+
+
+class _CountedStream(httpx.AsyncByteStream):
+    """Response body that lowers the pool's in-flight gauge once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, pool: str) -> None:
+        self._stream = stream
+        self._pool = pool
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            _IN_FLIGHT.dec(self._pool)
+        await self._stream.aclose()
+
+
+class _PooledTransport(httpx.AsyncHTTPTransport):
+    """Transport that counts requests in flight for the pool metrics.
+
+    Args:
+        pool: Pool name for the metric labels.
+        provider: Provider whose limiters should see the response headers.
+    """
+
+    def __init__(self, pool: str, provider: str | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.pool = pool
+        self.provider = provider
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _REQUESTS.inc(self.pool)
+        _IN_FLIGHT.inc(self.pool)
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            _IN_FLIGHT.dec(self.pool)
+            raise
+        response.stream = _CountedStream(response.stream, self.pool)
+        if self.provider is not None:
+            note_response_headers(self.provider, response.headers)
+        return response
+
+    def connection_states(self) -> dict[str, int]:
+        """Count the pool's connections as ``active`` or ``idle``."""
+        states = {"active": 0, "idle": 0}
+        for conn in getattr(self._pool, "connections", ()):
+            states["idle" if conn.is_idle() else "active"] += 1
+        return states
+
+
+def _collect_connections() -> dict[tuple[str, ...], float]:
+    return {
+        (pool, state): float(count)
+        for pool, transport in list(_transports.items())
+        for state, count in transport.connection_states().items()
+    }
+
+
+_CONNECTIONS.set_function(_collect_connections)
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client(
+    pool: str,
+    *,
+    provider: str | None = None,
+    uds: str | None = None,
+    http2: bool = False,
+    follow_redirects: bool = False,
+) -> httpx.AsyncClient:
+    from config import load_config
+
+    cfg = load_config().provider_http
+    limits = httpx.Limits(
+        max_connections=cfg.max_connections,
+        max_keepalive_connections=cfg.max_keepalive_connections,
+        keepalive_expiry=cfg.keepalive_expiry,
+    )
+    transport = _PooledTransport(pool, provider, uds=uds, limits=limits, http2=http2)
+    _transports[pool] = transport
+    # Only the connect phase is bounded here; the SDKs set per-request
+    # timeouts, and streamed completions may run for minutes.
+    timeout = httpx.Timeout(None, connect=cfg.connect_timeout)
+    logger.debug("Created provider HTTP pool %s (http2=%s, limits=%s)", pool, http2, limits)
+    return httpx.AsyncClient(transport=transport, timeout=timeout, follow_redirects=follow_redirects)
+
+
+def proxy_http_client(proxy_socket: Path) -> httpx.AsyncClient:
+    """Return the shared client for an ``llm_proxy`` broker socket.
+
+    The broker speaks HTTP/1.1 over the Unix socket; it keeps its own
+    keep-alive pool to the upstream API.
+    """
+    pool = proxy_socket.stem
+    client = _clients.get(pool)
+    if client is None or client.is_closed:
+        provider = pool.removeprefix("llm_")
+        client = _clients[pool] = _build_client(pool, provider=provider, uds=str(proxy_socket))
+    return client
+
+
+def direct_http_client(base_url: str) -> httpx.AsyncClient:
+    """Return the shared client for a direct (unbrokered) provider base URL.
+
+    HTTP/2 is negotiated for ``https`` URLs when enabled and ``h2`` is
+    installed, so concurrent streams share one connection.
+    """
+    from config import load_config
+
+    pool = httpx.URL(base_url).netloc.decode("ascii") or base_url
+    client = _clients.get(pool)
+    if client is None or client.is_closed:
+        http2 = (
+            load_config().provider_http.http2 and base_url.startswith("https://") and _http2_available()
+        )
+        # Matches the SDKs' own default client.
+        client = _clients[pool] = _build_client(pool, http2=http2, follow_redirects=True)
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client (used on shutdown and in tests)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    _transports.clear()
+    for client in clients:
+        await client.aclose()
@@ -26,6 +26,7 @@ class ProviderError(Exception):
     Attributes:
         retryable: Whether the caller should retry the request.
         status_code: HTTP status code if applicable.
+        retry_after: Seconds the server asked the caller to wait, if it said.
     """
 
     def __init__(
@@ -34,11 +35,13 @@ class ProviderError(Exception):
         *,
         retryable: bool = False,
         status_code: int | None = None,
+        retry_after: float | None = None,
         cause: Exception | None = None,
     ) -> None:
         super().__init__(message)
         self.retryable = retryable
         self.status_code = status_code
+        self.retry_after = retry_after
         if cause is not None:
             self.__cause__ = cause
 
@@ -4,18 +4,20 @@ import asyncio
 import logging
 import time
 from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
 from typing import Any
 
 import httpx
 from ollama import AsyncClient
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from logging_config import log_event
+from sdk.media import image_base64, inline_images
+
 from ._models import ChatDelta, ChatMessage, ChatResponse, LLMConfig, ModelInfo, ProviderError, TokenUsage, ToolCall, ToolCallFunction
 
 logger = logging.getLogger(__name__)
-_console = Console(stderr=True)
 
 # No read timeout — once streaming starts, never interrupt active generation.
 # Connect timeout catches "Ollama is down"; first-token timeout is handled
@@ -55,7 +57,7 @@ def _convert_messages_for_ollama(messages: list[dict[str, Any]]) -> list[dict[st
     for msg in messages:
         images = msg.get("images")
         if images:
-            ollama_images = [img["data"] for img in images]
+            ollama_images = [image_base64(img) for img in images]
             converted.append({**msg, "images": ollama_images})
         else:
             converted.append(msg)
@@ -85,6 +87,7 @@ class OllamaProvider:
         think: bool = False,
     ) -> ChatResponse:
         """Send a chat request via Ollama and normalize the response."""
+        messages = await inline_images(messages)
         kwargs = _build_ollama_kwargs(model, messages, tools, options, think)
 
         try:
@@ -143,6 +146,7 @@ class OllamaProvider:
         think: bool = False,
     ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
         """Stream token deltas followed by a final ChatResponse."""
+        messages = await inline_images(messages)
         kwargs = _build_ollama_kwargs(model, messages, tools, options, think)
 
         try:
@@ -154,26 +158,28 @@ class OllamaProvider:
             thinking_parts: list[str] = []
             tool_calls: list[Any] = []
             stream = await self._client.chat(**kwargs)
-            async for chunk in _first_token_guard(stream, _FIRST_TOKEN_TIMEOUT):
-                if first_chunk_at is None:
-                    first_chunk_at = time.monotonic()
-                    _log_first_chunk(model, first_chunk_at - t0)
-                chunk_count += 1
-                raw = chunk
-
-                chunk_content = chunk.message.content or None
-                chunk_thinking = getattr(chunk.message, "thinking", None) or None
-
-                if chunk_content:
-                    content_parts.append(chunk_content)
-                if chunk_thinking:
-                    thinking_parts.append(chunk_thinking)
-                if getattr(chunk.message, "tool_calls", None):
-                    tool_calls.extend(chunk.message.tool_calls)
-
-                # Yield delta for non-empty content/thinking tokens
-                if chunk_content or chunk_thinking:
-                    yield ChatDelta(content=chunk_content, thinking=chunk_thinking)
+            # Closed on exit, also when the consumer stops reading early.
+            async with aclosing(_first_token_guard(stream, _FIRST_TOKEN_TIMEOUT)) as chunks:
+                async for chunk in chunks:
+                    if first_chunk_at is None:
+                        first_chunk_at = time.monotonic()
+                        _log_first_chunk(model, first_chunk_at - t0)
+                    chunk_count += 1
+                    raw = chunk
+
+                    chunk_content = chunk.message.content or None
+                    chunk_thinking = getattr(chunk.message, "thinking", None) or None
+
+                    if chunk_content:
+                        content_parts.append(chunk_content)
+                    if chunk_thinking:
+                        thinking_parts.append(chunk_thinking)
+                    if getattr(chunk.message, "tool_calls", None):
+                        tool_calls.extend(chunk.message.tool_calls)
+
+                    # Yield delta for non-empty content/thinking tokens
+                    if chunk_content or chunk_thinking:
+                        yield ChatDelta(content=chunk_content, thinking=chunk_thinking)
 
             if raw is None:
                 raise ProviderError("Ollama returned empty stream", retryable=True)
@@ -264,21 +270,27 @@ async def _first_token_guard(stream: Any, timeout: float) -> Any:
     """Wrap an async iterator with a timeout on the first item only.
 
     After the first chunk arrives, remaining chunks are yielded without any
-    timeout so active generation is never interrupted.
+    timeout so active generation is never interrupted.  Closing the guard
+    closes *stream*, which drops the HTTP response and stops generation.
     """
     aiter = stream.__aiter__()
     try:
-        first = await asyncio.wait_for(aiter.__anext__(), timeout=timeout)
-    except StopAsyncIteration:
-        return
-    except asyncio.TimeoutError:
-        raise ProviderError(
-            f"No response from Ollama within {timeout:.0f}s",
-            retryable=True,
-        )
-    yield first
-    async for chunk in aiter:
-        yield chunk
+        try:
+            first = await asyncio.wait_for(aiter.__anext__(), timeout=timeout)
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            raise ProviderError(
+                f"No response from Ollama within {timeout:.0f}s",
+                retryable=True,
+            )
+        yield first
+        async for chunk in aiter:
+            yield chunk
+    finally:
+        aclose = getattr(aiter, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 
 # ---------------------------------------------------------------------------
@@ -292,12 +304,16 @@ def _log_first_chunk(model: str, wait_secs: float) -> None:
     text = Text()
     text.append("first chunk ", style="bold")
     text.append(f"{wait_secs:.1f}s", style="green" if wait_secs < 10 else "yellow")
-    _console.print(Panel(
-        text,
-        title=f"[bold cyan]{model}[/bold cyan]  streaming",
-        border_style="cyan",
-        expand=False,
-    ))
+    log_event(
+        "model.first_chunk", "%s first chunk after %.1fs", model, wait_secs,
+        model=model, wait_secs=round(wait_secs, 3),
+        panel=Panel(
+            text,
+            title=f"[bold cyan]{model}[/bold cyan]  streaming",
+            border_style="cyan",
+            expand=False,
+        ),
+    )
 
 
 def _log_stream_complete(
@@ -313,12 +329,17 @@ def _log_stream_complete(
     text.append(str(usage.prompt_tokens))
     text.append("  eval=", style="dim")
     text.append(str(usage.completion_tokens))
-    _console.print(Panel(
-        text,
-        title=f"[bold cyan]{model}[/bold cyan]  stream complete",
-        border_style="green",
-        expand=False,
-    ))
+    log_event(
+        "model.stream_complete", "%s stream complete: %d chunks in %.1fs", model, chunks, elapsed,
+        model=model, chunks=chunks, elapsed_secs=round(elapsed, 3),
+        prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+        panel=Panel(
+            text,
+            title=f"[bold cyan]{model}[/bold cyan]  stream complete",
+            border_style="green",
+            expand=False,
+        ),
+    )
 
 
 def _log_stream_error(model: str, elapsed: float, chunks_received: int) -> None:
@@ -329,12 +350,17 @@ def _log_stream_error(model: str, elapsed: float, chunks_received: int) -> None:
     text = Text()
     text.append(f"failed while {phase} ", style="bold red")
     text.append(f"after {elapsed:.1f}s", style="red")
-    _console.print(Panel(
-        text,
-        title=f"[bold cyan]{model}[/bold cyan]  stream error",
-        border_style="red",
-        expand=False,
-    ))
+    log_event(
+        "model.stream_error", "%s stream failed while %s after %.1fs", model, phase, elapsed,
+        level=logging.WARNING,
+        model=model, chunks=chunks_received, elapsed_secs=round(elapsed, 3),
+        panel=Panel(
+            text,
+            title=f"[bold cyan]{model}[/bold cyan]  stream error",
+            border_style="red",
+            expand=False,
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -8,7 +8,10 @@ from pathlib import Path
 from typing import Any
 
 from ._base import BaseAPIProvider
+from ._http import direct_http_client, proxy_http_client
 from ._models import ChatDelta, ChatMessage, ChatResponse, LLMConfig, ModelInfo, ProviderError, TokenUsage, ToolCall, ToolCallFunction
+from ._ratelimit import retry_after_from_headers
+from sdk.media import image_base64, inline_images
 from sdk.tools import callable_to_json_schema
 
 logger = logging.getLogger(__name__)
@@ -44,9 +47,7 @@ class OpenAIProvider(BaseAPIProvider):
             # Route all SDK traffic through the llm_proxy broker's UDS.
             # The broker injects the real API key; we pass a placeholder so
             # the SDK doesn't complain about a missing key.
-            import httpx
-            transport = httpx.AsyncHTTPTransport(uds=str(proxy_socket))
-            http_client = httpx.AsyncClient(transport=transport)
+            http_client = proxy_http_client(proxy_socket)
             self._client = openai.AsyncOpenAI(
                 http_client=http_client,
                 base_url="http://localhost/v1",
@@ -56,6 +57,7 @@ class OpenAIProvider(BaseAPIProvider):
             kwargs: dict[str, Any] = {}
             if base_url:
                 kwargs["base_url"] = base_url
+                kwargs["http_client"] = direct_http_client(base_url)
             # Many OpenAI-compatible servers require a non-empty api_key even when
             # auth is disabled; use a placeholder so the SDK doesn't complain.
             kwargs["api_key"] = api_key or "not-required"
@@ -108,6 +110,7 @@ class OpenAIProvider(BaseAPIProvider):
         think: bool = False,
     ) -> ChatResponse:
         """Send a chat request via OpenAI and return a normalized response."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
         try:
             response = await self._client.chat.completions.create(**kwargs, stream=False)
@@ -125,6 +128,7 @@ class OpenAIProvider(BaseAPIProvider):
         think: bool = False,
     ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
         """Stream token deltas followed by a final ChatResponse."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
         kwargs["stream"] = True
         # Request usage in the last chunk; some compat servers silently ignore this.
@@ -138,42 +142,45 @@ class OpenAIProvider(BaseAPIProvider):
         finish_reason: str | None = None
 
         try:
-            stream = await self._client.chat.completions.create(**kwargs)
-            async for chunk in stream:
-                # Some providers send usage on a dedicated empty-choices chunk;
-                # others attach it to the final chunk alongside finish_reason.
-                if chunk.usage:
-                    usage_data = chunk.usage
-                if not chunk.choices:
-                    continue
-
-                choice = chunk.choices[0]
-                if choice.finish_reason:
-                    finish_reason = choice.finish_reason
-
-                delta = choice.delta
-                chunk_content = delta.content or None
-                chunk_thinking = getattr(delta, "reasoning", None) or getattr(delta, "reasoning_content", None) or None
-
-                if chunk_content:
-                    content_parts.append(chunk_content)
-                if chunk_thinking:
-                    thinking_parts.append(chunk_thinking)
-                if chunk_content or chunk_thinking:
-                    yield ChatDelta(content=chunk_content, thinking=chunk_thinking)
-
-                if delta.tool_calls:
-                    for tc_delta in delta.tool_calls:
-                        idx = tc_delta.index
-                        if idx not in tc_accum:
-                            tc_accum[idx] = {"id": "", "name": "", "arguments": ""}
-                        if tc_delta.id:
-                            tc_accum[idx]["id"] = tc_delta.id
-                        if tc_delta.function:
-                            if tc_delta.function.name:
-                                tc_accum[idx]["name"] += tc_delta.function.name
-                            if tc_delta.function.arguments:
-                                tc_accum[idx]["arguments"] += tc_delta.function.arguments
+            # Closing the stream (also when the consumer stops early) ends the upstream request.
+            async with await self._client.chat.completions.create(**kwargs) as stream:
+                async for chunk in stream:
+                    # Some providers send usage on a dedicated empty-choices chunk;
+                    # others attach it to the final chunk alongside finish_reason.
+                    if chunk.usage:
+                        usage_data = chunk.usage
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+
+                    delta = choice.delta
+                    chunk_content = delta.content or None
+                    chunk_thinking = (
+                        getattr(delta, "reasoning", None) or getattr(delta, "reasoning_content", None) or None
+                    )
+
+                    if chunk_content:
+                        content_parts.append(chunk_content)
+                    if chunk_thinking:
+                        thinking_parts.append(chunk_thinking)
+                    if chunk_content or chunk_thinking:
+                        yield ChatDelta(content=chunk_content, thinking=chunk_thinking)
+
+                    if delta.tool_calls:
+                        for tc_delta in delta.tool_calls:
+                            idx = tc_delta.index
+                            if idx not in tc_accum:
+                                tc_accum[idx] = {"id": "", "name": "", "arguments": ""}
+                            if tc_delta.id:
+                                tc_accum[idx]["id"] = tc_delta.id
+                            if tc_delta.function:
+                                if tc_delta.function.name:
+                                    tc_accum[idx]["name"] += tc_delta.function.name
+                                if tc_delta.function.arguments:
+                                    tc_accum[idx]["arguments"] += tc_delta.function.arguments
         except Exception as exc:
             raise _wrap_error(exc) from exc
 
@@ -304,7 +311,7 @@ def _convert_messages_for_openai(messages: list[dict[str, Any]]) -> list[dict[st
                 media_type = img.get("media_type", "image/png")
                 content_parts.append({
                     "type": "image_url",
-                    "image_url": {"url": f"data:{media_type};base64,{img['data']}"},
+                    "image_url": {"url": f"data:{media_type};base64,{image_base64(img)}"},
                 })
             converted.append({"role": msg.get("role", "user"), "content": content_parts})
         else:
@@ -434,7 +441,13 @@ def _wrap_error(exc: Exception) -> ProviderError:
     if isinstance(exc, openai.APIStatusError):
         retryable = exc.status_code in _RETRYABLE_STATUS_CODES
         msg = _extract_api_message(exc)
-        return ProviderError(msg, retryable=retryable, status_code=exc.status_code, cause=exc)
+        return ProviderError(
+            msg,
+            retryable=retryable,
+            status_code=exc.status_code,
+            retry_after=retry_after_from_headers(exc.response.headers),
+            cause=exc,
+        )
     if isinstance(exc, openai.APIConnectionError):
         return ProviderError(str(exc), retryable=True, cause=exc)
     return ProviderError(str(exc), retryable=False, cause=exc)
@@ -12,7 +12,10 @@ from pathlib import Path
 from typing import Any
 
 from ._base import BaseAPIProvider
+from ._http import direct_http_client, proxy_http_client
 from ._models import ChatDelta, ChatMessage, ChatResponse, LLMConfig, ModelInfo, ProviderError, TokenUsage, ToolCall, ToolCallFunction
+from ._ratelimit import retry_after_from_headers
+from sdk.media import image_base64, inline_images
 from sdk.tools import callable_to_json_schema
 
 logger = logging.getLogger(__name__)
@@ -75,9 +78,7 @@ class OpenAIResponsesProvider(BaseAPIProvider):
         import openai
 
         if proxy_socket is not None:
-            import httpx
-            transport = httpx.AsyncHTTPTransport(uds=str(proxy_socket))
-            http_client = httpx.AsyncClient(transport=transport)
+            http_client = proxy_http_client(proxy_socket)
             self._client = openai.AsyncOpenAI(
                 http_client=http_client,
                 base_url="http://localhost/v1",
@@ -87,6 +88,7 @@ class OpenAIResponsesProvider(BaseAPIProvider):
             kwargs: dict[str, Any] = {}
             if base_url:
                 kwargs["base_url"] = base_url
+                kwargs["http_client"] = direct_http_client(base_url)
             kwargs["api_key"] = api_key or "not-required"
             self._client = openai.AsyncOpenAI(**kwargs)
 
@@ -142,6 +144,7 @@ class OpenAIResponsesProvider(BaseAPIProvider):
         think: bool = False,
     ) -> ChatResponse:
         """Send a request via the Responses API and return a normalized response."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
         try:
             response = await self._client.responses.create(**kwargs)
@@ -159,6 +162,7 @@ class OpenAIResponsesProvider(BaseAPIProvider):
         think: bool = False,
     ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
         """Stream token deltas followed by a final ChatResponse."""
+        messages = await inline_images(messages)
         kwargs = self._build_kwargs(model, messages, tools, options, think)
         kwargs["stream"] = True
 
@@ -169,35 +173,36 @@ class OpenAIResponsesProvider(BaseAPIProvider):
         final_response: Any = None
 
         try:
-            stream = await self._client.responses.create(**kwargs)
-            async for event in stream:
-                if event.type == "response.output_text.delta":
-                    content_parts.append(event.delta)
-                    yield ChatDelta(content=event.delta)
-
-                elif event.type == "response.reasoning_summary_text.delta":
-                    thinking_parts.append(event.delta)
-                    yield ChatDelta(thinking=event.delta)
-
-                elif event.type == "response.function_call_arguments.delta":
-                    idx = event.output_index
-                    if idx not in tc_accum:
-                        tc_accum[idx] = {"id": "", "call_id": "", "name": "", "arguments": ""}
-                    tc_accum[idx]["arguments"] += event.delta
-
-                elif event.type == "response.output_item.added":
-                    item = event.item
-                    if getattr(item, "type", None) == "function_call":
+            # Closing the stream (also when the consumer stops early) ends the upstream request.
+            async with await self._client.responses.create(**kwargs) as stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        content_parts.append(event.delta)
+                        yield ChatDelta(content=event.delta)
+
+                    elif event.type == "response.reasoning_summary_text.delta":
+                        thinking_parts.append(event.delta)
+                        yield ChatDelta(thinking=event.delta)
+
+                    elif event.type == "response.function_call_arguments.delta":
                         idx = event.output_index
-                        tc_accum[idx] = {
-                            "id": getattr(item, "id", "") or "",
-                            "call_id": getattr(item, "call_id", "") or "",
-                            "name": getattr(item, "name", "") or "",
-                            "arguments": "",
-                        }
-
-                elif event.type == "response.completed":
-                    final_response = event.response
+                        if idx not in tc_accum:
+                            tc_accum[idx] = {"id": "", "call_id": "", "name": "", "arguments": ""}
+                        tc_accum[idx]["arguments"] += event.delta
+
+                    elif event.type == "response.output_item.added":
+                        item = event.item
+                        if getattr(item, "type", None) == "function_call":
+                            idx = event.output_index
+                            tc_accum[idx] = {
+                                "id": getattr(item, "id", "") or "",
+                                "call_id": getattr(item, "call_id", "") or "",
+                                "name": getattr(item, "name", "") or "",
+                                "arguments": "",
+                            }
+
+                    elif event.type == "response.completed":
+                        final_response = event.response
 
         except Exception as exc:
             raise _wrap_error(exc) from exc
@@ -280,7 +285,7 @@ def _convert_messages(
                     media_type = img.get("media_type", "image/png")
                     content_parts.append({
                         "type": "input_image",
-                        "image_url": f"data:{media_type};base64,{img['data']}",
+                        "image_url": f"data:{media_type};base64,{image_base64(img)}",
                     })
                 items.append({"role": "user", "content": content_parts})
             else:
@@ -472,7 +477,13 @@ def _wrap_error(exc: Exception) -> ProviderError:
     if isinstance(exc, openai.APIStatusError):
         retryable = exc.status_code in _RETRYABLE_STATUS_CODES
         msg = _extract_api_message(exc)
-        return ProviderError(msg, retryable=retryable, status_code=exc.status_code, cause=exc)
+        return ProviderError(
+            msg,
+            retryable=retryable,
+            status_code=exc.status_code,
+            retry_after=retry_after_from_headers(exc.response.headers),
+            cause=exc,
+        )
     if isinstance(exc, openai.APIConnectionError):
         return ProviderError(str(exc), retryable=True, cause=exc)
     return ProviderError(str(exc), retryable=False, cause=exc)
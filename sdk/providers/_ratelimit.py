@@ -0,0 +1,341 @@
+"""Client-side rate limiting and adaptive concurrency for model calls.
+
+One :class:`AdaptiveLimiter` per provider/model is shared by every
+conversation in the process.  It combines:
+
+* a token bucket (``rate_limits.requests_per_minute`` per provider), so a
+  burst of sub-agents is spread out instead of stampeding the API;
+* an AIMD concurrency limit: each successful call raises the limit by
+  ``1/limit`` (about one per round of calls), each rate-limit or overload
+  response halves it — at most once per round, since calls that started
+  before the cut report the same congestion;
+* pauses from the server: ``Retry-After`` on an error, or a zero
+  "remaining" rate-limit header with its reset time on any response that
+  passes through the ``llm_proxy`` broker.
+
+Waiters are served first come, first served.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from utils.metrics import Counter, Gauge, Histogram
+
+from ._models import ProviderError
+
+logger = logging.getLogger(__name__)
+
+_WAIT_SECONDS = Histogram(
+    "computron_llm_limiter_wait_seconds", "Time model calls spent queued by the client-side limiter.", ("provider",),
+)
+_THROTTLED = Counter(
+    "computron_llm_throttled", "Rate-limit or overload responses from providers.", ("provider", "model"),
+)
+_CONCURRENCY = Gauge(
+    "computron_llm_limiter_concurrency", "Current adaptive concurrency limit.", ("provider", "model"),
+)
+
+# Status codes that mean "slow down" rather than "this request is broken".
+_CONGESTION_STATUS_CODES = frozenset({429, 503, 529})
+
+# (remaining, reset) header pairs; a remaining of 0 pauses until the reset.
+_RATE_LIMIT_HEADERS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+    ("anthropic-ratelimit-input-tokens-remaining", "anthropic-ratelimit-input-tokens-reset"),
+    ("anthropic-ratelimit-output-tokens-remaining", "anthropic-ratelimit-output-tokens-reset"),
+    ("x-ratelimit-remaining", "x-ratelimit-reset"),
+)
+# Ignore resets further out than this; a bad header must not stall a provider.
+_MAX_PAUSE_S = 300.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset(value: str) -> float | None:
+    """Seconds until a rate-limit reset given as seconds, a duration, an epoch or a timestamp."""
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        pass
+    else:
+        if number > 1e12:  # epoch milliseconds
+            return number / 1000 - time.time()
+        if number > 1e9:  # epoch seconds
+            return number - time.time()
+        return number
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:  # "1m30s", "250ms"
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() - time.time()
+    except ValueError:
+        return None
+
+
+def retry_after_from_headers(headers: Mapping[str, str] | None) -> float | None:
+    """Seconds to wait per ``Retry-After`` / ``retry-after-ms``, if the response says."""
+    if not headers:
+        return None
+    if (ms := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(0.0, float(ms) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def pause_from_headers(headers: Mapping[str, str]) -> float | None:
+    """Seconds until capacity returns when a rate-limit header reports none left."""
+    pause: float | None = None
+    for remaining_name, reset_name in _RATE_LIMIT_HEADERS:
+        remaining = headers.get(remaining_name)
+        reset = headers.get(reset_name)
+        if remaining is None or reset is None:
+            continue
+        try:
+            if float(remaining) > 0:
+                continue
+        except ValueError:
+            continue
+        seconds = _parse_reset(reset)
+        if seconds is not None and 0 < seconds <= _MAX_PAUSE_S:
+            pause = max(pause or 0.0, seconds)
+    return pause
+
+
+class AdaptiveLimiter:
+    """Token bucket plus AIMD concurrency limit for one provider/model, served FIFO.
+
+    Args:
+        provider: Provider name (metric label and header routing).
+        model: Model name.
+        requests_per_minute: Token bucket refill rate; ``None`` disables
+            the bucket.
+        burst: Bucket capacity.
+        max_concurrency: Upper bound, and starting value, of the
+            concurrency limit.
+        min_concurrency: Lower bound of the concurrency limit.
+        default_retry_after: Pause after a rate-limit response that does
+            not say how long to wait.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        *,
+        requests_per_minute: float | None = None,
+        burst: int = 4,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        default_retry_after: float = 2.0,
+    ) -> None:
+        self.provider = provider
+        self.model = model
+        self._rate = requests_per_minute / 60 if requests_per_minute else None
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._refilled_at = time.monotonic()
+        self._max = max(1, max_concurrency)
+        self._min = max(1, min(min_concurrency, self._max))
+        self.limit = float(self._max)
+        self.in_flight = 0
+        self._default_retry_after = default_retry_after
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def queued(self) -> int:
+        """Callers waiting for a slot."""
+        return len(self._waiters)
+
+    def _refill(self, now: float) -> None:
+        if self._rate is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def _ready_in(self, now: float) -> float:
+        """Seconds until a slot could be granted; 0 when it can be now, inf when a release is needed."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= int(self.limit):
+            return float("inf")
+        if self._rate is not None and self._tokens < 1:
+            return (1 - self._tokens) / self._rate
+        return 0.0
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        if self._rate is not None:
+            self._tokens -= 1
+
+    def _wake(self) -> None:
+        """Grant slots to waiters in order; arm a timer if the head must wait for time to pass."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters:
+            head = self._waiters[0]
+            if head.done():  # cancelled while queued
+                self._waiters.popleft()
+                continue
+            now = time.monotonic()
+            self._refill(now)
+            delay = self._ready_in(now)
+            if delay > 0:
+                if delay != float("inf"):
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                return
+            self._waiters.popleft()
+            self._take()
+            head.set_result(None)
+
+    async def acquire(self, on_queued: Callable[[int], None] | None = None) -> float:
+        """Wait for a slot.
+
+        Args:
+            on_queued: Called with the caller's queue position when it has
+                to wait.
+
+        Returns:
+            Monotonic time the slot was granted (pass to :meth:`release`).
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and self._ready_in(now) == 0:
+            self._take()
+            return now
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if on_queued is not None:
+            on_queued(len(self._waiters))
+        if self._timer is None:
+            self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled: hand the slot back.
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        granted = time.monotonic()
+        _WAIT_SECONDS.observe(granted - now, self.provider)
+        return granted
+
+    def release(self, started: float, error: BaseException | None = None) -> None:
+        """Return a slot and adjust the limit from the call's outcome.
+
+        Args:
+            started: Value returned by :meth:`acquire`.
+            error: The exception the call ended with, if any.
+        """
+        self.in_flight -= 1
+        if error is None:
+            self.limit = min(self._max, self.limit + 1 / self.limit)
+        elif isinstance(error, ProviderError) and error.status_code in _CONGESTION_STATUS_CODES:
+            _THROTTLED.inc(self.provider, self.model)
+            # Calls that began before the last cut saw the old limit; don't cut twice.
+            if started >= self._last_decrease:
+                self.limit = max(self._min, self.limit / 2)
+                self._last_decrease = time.monotonic()
+                logger.info(
+                    "Rate limited by %s (%s): concurrency limit now %d", self.provider, self.model, int(self.limit),
+                )
+            retry_after = getattr(error, "retry_after", None)
+            self.pause(retry_after if retry_after is not None else self._default_retry_after)
+        self._wake()
+
+    def pause(self, seconds: float) -> None:
+        """Hold new calls for *seconds* (extends, never shortens, a current pause)."""
+        until = time.monotonic() + min(seconds, _MAX_PAUSE_S)
+        if until > self._paused_until:
+            self._paused_until = until
+            if self._waiters:
+                self._wake()  # re-arm the timer for the new end
+
+    @asynccontextmanager
+    async def slot(self, on_queued: Callable[[int], None] | None = None) -> AsyncIterator[None]:
+        """Hold a slot for the enclosed call, reporting its outcome on exit."""
+        started = await self.acquire(on_queued)
+        try:
+            yield
+        except BaseException as exc:
+            self.release(started, exc)
+            raise
+        self.release(started)
+
+
+_limiters: dict[tuple[str, str], AdaptiveLimiter] = {}
+
+
+def get_limiter(provider: str, model: str) -> AdaptiveLimiter | None:
+    """Return the shared limiter for *provider*/*model*, or ``None`` when limiting is off."""
+    from config import load_config
+
+    cfg = load_config().rate_limits
+    if not cfg.enabled:
+        return None
+    limiter = _limiters.get((provider, model))
+    if limiter is None:
+        limiter = _limiters[(provider, model)] = AdaptiveLimiter(
+            provider,
+            model,
+            requests_per_minute=cfg.requests_per_minute.get(provider),
+            burst=cfg.burst,
+            max_concurrency=cfg.max_concurrency,
+            min_concurrency=cfg.min_concurrency,
+            default_retry_after=cfg.default_retry_after,
+        )
+    return limiter
+
+
+def note_response_headers(provider: str, headers: Mapping[str, str]) -> None:
+    """Pause *provider*'s limiters when a response reports its rate limit exhausted."""
+    seconds = pause_from_headers(headers)
+    if seconds is None:
+        return
+    logger.info("%s rate limit exhausted; pausing new calls for %.1fs", provider, seconds)
+    for (name, _model), limiter in list(_limiters.items()):
+        if name == provider:
+            limiter.pause(seconds)
+
+
+def reset_limiters() -> None:
+    """Forget every limiter (for tests and config reloads)."""
+    _limiters.clear()
+
+
+def _collect_concurrency() -> dict[tuple[str, ...], float]:
+    return {key: limiter.limit for key, limiter in list(_limiters.items())}
+
+
+_CONCURRENCY.set_function(_collect_concurrency)
@@ -0,0 +1,393 @@
+"""Offline record/replay provider for load testing the agent loop.
+
+The ``replay`` provider lets ``run_turn``, hooks, context management,
+persistence and event streaming be exercised at scale with no model and no
+network.  It has three modes (``config.replay.mode``):
+
+- ``record`` proxies ``config.replay.record_provider`` and appends every
+  ``chat_stream`` exchange (deltas with their timing, tool calls, usage) to
+  a JSONL cassette.
+- ``replay`` serves exchanges from the cassette, paced by the recorded
+  timing or by ``ttft_ms`` / ``tokens_per_second``.
+- ``synthetic`` needs no cassette: it answers each user message with
+  ``synthetic_tool_calls`` tool calls (arguments generated from the tool
+  schemas), then a streamed text reply.
+
+Replay looks an exchange up by an exact request key first, then by the
+request's shape (available tools and the tool round within the current
+user message), so recordings of a few conversations can drive many
+conversations with different text.  Tool calls are executed for real by
+the agent loop, so load tests should use agents whose tools are safe to
+call (``synthetic_tools`` restricts which ones synthetic mode picks).
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from config import ReplayConfig, load_config
+from sdk.tools import callable_to_json_schema
+
+from ._models import (
+    ChatDelta,
+    ChatMessage,
+    ChatResponse,
+    LLMConfig,
+    ModelInfo,
+    ProviderError,
+    TokenUsage,
+    ToolCall,
+    ToolCallFunction,
+)
+
+logger = logging.getLogger(__name__)
+
+_CASSETTE_FILE = "exchanges.jsonl"
+_CHARS_PER_TOKEN = 4
+_SYNTHETIC_MODEL = "synthetic"
+_WORDS = (
+    "the", "agent", "checked", "results", "and", "found", "that", "page", "data", "file",
+    "was", "updated", "with", "new", "values", "for", "each", "item", "in", "list",
+)
+
+
+class RecordedChunk(BaseModel):
+    """One streamed delta and when it arrived, relative to the request."""
+
+    t_ms: float
+    content: str | None = None
+    thinking: str | None = None
+
+
+class Exchange(BaseModel):
+    """One recorded ``chat_stream`` call."""
+
+    key: str
+    shape: str
+    model: str
+    ttft_ms: float = 0.0
+    total_ms: float = 0.0
+    chunks: list[RecordedChunk] = Field(default_factory=list)
+    response: ChatResponse
+
+
+def _tool_names(tools: list[Callable[..., Any]] | None) -> list[str]:
+    return sorted(getattr(func, "__name__", str(func)) for func in tools or [])
+
+
+def _tool_round(messages: list[dict[str, Any]]) -> int:
+    """Number of assistant tool-call messages since the last user message."""
+    rounds = 0
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            break
+        if message.get("role") == "assistant" and message.get("tool_calls"):
+            rounds += 1
+    return rounds
+
+
+def request_key(model: str, messages: list[dict[str, Any]], tools: list[Callable[..., Any]] | None) -> str:
+    """Stable hash of a request's model, messages and tool names."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "tools": _tool_names(tools)},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def request_shape(messages: list[dict[str, Any]], tools: list[Callable[..., Any]] | None) -> str:
+    """Coarse request identity: tool set and tool round, ignoring message text."""
+    return f"{','.join(_tool_names(tools))}#{_tool_round(messages)}"
+
+
+def _estimate_tokens(text: str | None) -> int:
+    return max(1, len(text) // _CHARS_PER_TOKEN) if text else 0
+
+
+def _prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    return sum(_estimate_tokens(str(message.get("content") or "")) for message in messages)
+
+
+class Cassette:
+    """Recorded exchanges on disk, indexed for lookup.
+
+    Args:
+        path: The JSONL file; created on the first append.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._exchanges: list[Exchange] = []
+        self._by_key: dict[str, list[Exchange]] = {}
+        self._by_shape: dict[str, list[Exchange]] = {}
+        self._cursors: dict[str, itertools.count] = {}
+        if path.exists():
+            for line_no, line in enumerate(path.read_text().splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    self._index(Exchange.model_validate_json(line))
+                except ValueError:
+                    logger.warning("Skipping unreadable exchange at %s:%d", path, line_no)
+        logger.info("Loaded %d recorded exchanges from %s", len(self._exchanges), path)
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    @property
+    def models(self) -> list[str]:
+        return sorted({exchange.model for exchange in self._exchanges})
+
+    def _index(self, exchange: Exchange) -> None:
+        self._exchanges.append(exchange)
+        self._by_key.setdefault(exchange.key, []).append(exchange)
+        self._by_shape.setdefault(exchange.shape, []).append(exchange)
+
+    def _next(self, name: str, candidates: list[Exchange]) -> Exchange:
+        cursor = self._cursors.setdefault(name, itertools.count())
+        return candidates[next(cursor) % len(candidates)]
+
+    def find(self, key: str, shape: str) -> Exchange | None:
+        """Return an exchange for *key*, else one with the same *shape*, else any.
+
+        Repeated lookups rotate through the candidates.
+        """
+        with self._lock:
+            for name, index in ((key, self._by_key), (shape, self._by_shape)):
+                if name in index:
+                    return self._next(name, index[name])
+            if self._exchanges:
+                return self._next("", self._exchanges)
+        return None
+
+    def append(self, exchange: Exchange) -> None:
+        """Write *exchange* to disk and index it (blocking)."""
+        line = exchange.model_dump_json() + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+            self._index(exchange)
+
+
+def _sample_value(schema: dict[str, Any], rng: random.Random) -> Any:
+    """A plausible value for a JSON-schema property."""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    for option in schema.get("anyOf", []):
+        if option.get("type") != "null":
+            return _sample_value(option, rng)
+    kind = schema.get("type")
+    if kind == "integer":
+        return rng.randint(1, 5)
+    if kind == "number":
+        return round(rng.uniform(0, 1), 2)
+    if kind == "boolean":
+        return False
+    if kind == "array":
+        return [_sample_value(schema.get("items", {}), rng)]
+    if kind == "object":
+        return {}
+    return " ".join(rng.choice(_WORDS) for _ in range(3))
+
+
+def synthetic_exchange(
+    messages: list[dict[str, Any]],
+    tools: list[Callable[..., Any]] | None,
+    settings: ReplayConfig,
+) -> tuple[list[str], ChatResponse]:
+    """Generate the next step of a deterministic tool-calling script.
+
+    Returns:
+        The content deltas to stream and the final response.
+    """
+    first_user = next((str(m.get("content") or "") for m in messages if m.get("role") == "user"), "")
+    tool_round = _tool_round(messages)
+    rng = random.Random(f"{settings.seed}:{first_user}:{tool_round}")
+    usage = TokenUsage(prompt_tokens=_prompt_tokens(messages))
+
+    callable_tools = [
+        func for func in tools or []
+        if not settings.synthetic_tools or getattr(func, "__name__", "") in settings.synthetic_tools
+    ]
+    if callable_tools and tool_round < settings.synthetic_tool_calls:
+        schema = callable_to_json_schema(rng.choice(callable_tools))["function"]
+        params = schema["parameters"]
+        arguments = {name: _sample_value(params["properties"][name], rng) for name in params["required"]}
+        call = ToolCall(
+            id=f"call_{rng.getrandbits(48):012x}",
+            function=ToolCallFunction(name=schema["name"], arguments=arguments),
+        )
+        usage.completion_tokens = _estimate_tokens(json.dumps(arguments)) + 1
+        message = ChatMessage(content="", tool_calls=[call])
+        return [], ChatResponse(message=message, usage=usage, done_reason="tool_calls")
+
+    words = [rng.choice(_WORDS) for _ in range(max(1, settings.synthetic_reply_tokens))]
+    deltas = [words[0]] + [f" {word}" for word in words[1:]]
+    usage.completion_tokens = len(deltas)
+    return deltas, ChatResponse(message=ChatMessage(content="".join(deltas)), usage=usage, done_reason="stop")
+
+
+class ReplayProvider:
+    """Provider that records, replays or synthesizes chat exchanges offline.
+
+    Args:
+        settings: The ``replay`` config section.
+        cassette_dir: Directory holding the cassette file.
+    """
+
+    # Needs no base URL or broker socket; see ``_create_provider``.
+    requires_endpoint = False
+
+    def __init__(self, settings: ReplayConfig, *, cassette_dir: Path) -> None:
+        self._settings = settings
+        self._cassette = Cassette(cassette_dir / _CASSETTE_FILE)
+        self._upstream: Any = None
+
+    @classmethod
+    def from_config(cls, llm_config: LLMConfig) -> "ReplayProvider":
+        """Construct from the app config's ``replay`` section."""
+        config = load_config()
+        settings = config.replay
+        cassette_dir = Path(settings.cassette_dir).expanduser() if settings.cassette_dir else (
+            Path(config.settings.home_dir) / "replay"
+        )
+        return cls(settings, cassette_dir=cassette_dir)
+
+    def _upstream_provider(self) -> Any:
+        if self._upstream is None:
+            from sdk.providers import get_provider
+
+            self._upstream = get_provider(self._settings.record_provider)
+        return self._upstream
+
+    async def chat(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[Callable[..., Any]] | None = None,
+        options: dict[str, Any] | None = None,
+        think: bool = False,
+    ) -> ChatResponse:
+        """Return the final response of :meth:`chat_stream`."""
+        response: ChatResponse | None = None
+        async for item in self.chat_stream(model=model, messages=messages, tools=tools, options=options, think=think):
+            if isinstance(item, ChatResponse):
+                response = item
+        if response is None:
+            raise ProviderError("Replay stream ended without a response")
+        return response
+
+    async def chat_stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[Callable[..., Any]] | None = None,
+        options: dict[str, Any] | None = None,
+        think: bool = False,
+    ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
+        """Stream token deltas followed by a final ChatResponse."""
+        mode = self._settings.mode
+        if mode == "record":
+            async for item in self._record(model, messages, tools, options, think):
+                yield item
+            return
+
+        if mode == "synthetic":
+            deltas, response = synthetic_exchange(messages, tools, self._settings)
+            chunks = [RecordedChunk(t_ms=0.0, content=delta) for delta in deltas]
+            ttft_ms = 0.0
+        else:
+            exchange = self._cassette.find(request_key(model, messages, tools), request_shape(messages, tools))
+            if exchange is None:
+                msg = f"No recorded exchanges in {self._cassette.path}; record some with replay.mode=record"
+                raise ProviderError(msg)
+            chunks, response, ttft_ms = exchange.chunks, exchange.response, exchange.ttft_ms
+
+        async for delta in self._paced(chunks, ttft_ms):
+            yield delta
+        yield response.model_copy(deep=True)
+
+    async def _paced(self, chunks: list[RecordedChunk], recorded_ttft_ms: float) -> AsyncGenerator[ChatDelta, None]:
+        """Yield *chunks* with the configured (or recorded) timing."""
+        settings = self._settings
+        ttft_ms = settings.ttft_ms if settings.ttft_ms is not None else recorded_ttft_ms
+        if ttft_ms > 0:
+            await asyncio.sleep(ttft_ms / 1000)
+        previous_ms = chunks[0].t_ms if chunks else 0.0
+        for index, chunk in enumerate(chunks):
+            if index:
+                if settings.tokens_per_second is None:
+                    gap_ms = chunk.t_ms - previous_ms
+                elif settings.tokens_per_second > 0:
+                    tokens = _estimate_tokens(chunk.content) + _estimate_tokens(chunk.thinking)
+                    gap_ms = tokens * 1000 / settings.tokens_per_second
+                else:
+                    gap_ms = 0.0
+                if gap_ms > 0:
+                    await asyncio.sleep(gap_ms / 1000)
+            previous_ms = chunk.t_ms
+            yield ChatDelta(content=chunk.content, thinking=chunk.thinking)
+
+    async def _record(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[Callable[..., Any]] | None,
+        options: dict[str, Any] | None,
+        think: bool,
+    ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
+        """Proxy the upstream provider and save the exchange once it completes."""
+        t0 = time.monotonic()
+        chunks: list[RecordedChunk] = []
+        response: ChatResponse | None = None
+        stream = self._upstream_provider().chat_stream(
+            model=model, messages=messages, tools=tools, options=options, think=think,
+        )
+        async for item in stream:
+            if isinstance(item, ChatDelta):
+                chunks.append(RecordedChunk(
+                    t_ms=(time.monotonic() - t0) * 1000, content=item.content, thinking=item.thinking,
+                ))
+            else:
+                response = item
+            yield item
+        if response is None:
+            return
+
+        total_ms = (time.monotonic() - t0) * 1000
+        exchange = Exchange(
+            key=request_key(model, messages, tools),
+            shape=request_shape(messages, tools),
+            model=model,
+            ttft_ms=chunks[0].t_ms if chunks else total_ms,
+            total_ms=total_ms,
+            chunks=chunks,
+            response=response.model_copy(update={"raw": None}),
+        )
+        await asyncio.to_thread(self._cassette.append, exchange)
+
+    async def list_models(self) -> list[ModelInfo]:
+        """Return the recorded models (or the upstream's while recording)."""
+        if self._settings.mode == "record":
+            return await self._upstream_provider().list_models()
+        names = self._cassette.models
+        if self._settings.mode == "synthetic":
+            names = [_SYNTHETIC_MODEL, *names]
+        return [ModelInfo(name=name, capabilities=["tools"]) for name in names]
+
+    def invalidate_model_cache(self) -> None:
+        """No model cache to clear."""
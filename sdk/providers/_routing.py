@@ -0,0 +1,260 @@
+"""Routing of small, latency-sensitive model calls across candidate models.
+
+Title generation, vision descriptions and compaction (summaries and intent
+extraction) each use one provider/model from settings.  A role may also
+list ``{role}_fallbacks``; :func:`routed_chat` then runs the call across
+those candidates:
+
+* **Fallback** — candidates are tried in order; when an attempt fails the
+  next one starts.  A candidate that fails ``model_routing.failure_threshold``
+  times in a row is moved to the back for ``cooldown`` seconds.
+* **Hedging** — if the running attempt has produced no token within its
+  p95 time-to-first-token, the fastest remaining healthy candidate is
+  started as well.  The first to finish wins; the other is cancelled.
+
+With a :class:`~sdk.providers._stop.StopCondition`, an attempt finishes as
+soon as its content meets it.
+
+Time-to-first-token samples are kept per candidate and drive the hedge
+delay and the choice of hedge target.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from utils.metrics import Counter
+
+from ._models import ChatResponse
+from ._stop import StopCondition, chat_until
+
+if TYPE_CHECKING:
+    from config import ModelRoutingConfig
+
+logger = logging.getLogger(__name__)
+
+_HEDGES = Counter("computron_llm_hedged_requests", "Routed model calls that started a hedge request.", ("role",))
+_FALLBACKS = Counter("computron_llm_fallbacks", "Routed model calls retried on another candidate.", ("role",))
+_ANSWERED = Counter(
+    "computron_llm_routed_calls", "Routed model calls by the candidate that answered.", ("role", "provider", "model"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """A provider/model pair a role can be served by."""
+
+    provider: str
+    model: str
+
+
+class _CandidateStats:
+    """Recent time-to-first-token samples and failure streak of one candidate."""
+
+    def __init__(self, window: int) -> None:
+        self.ttft: deque[float] = deque(maxlen=max(1, window))
+        self.failures = 0
+        self.down_until = 0.0
+
+    def percentile(self, q: float, min_samples: int) -> float | None:
+        if len(self.ttft) < max(1, min_samples):
+            return None
+        ordered = sorted(self.ttft)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_stats: dict[Candidate, _CandidateStats] = {}
+
+
+def _stats_for(candidate: Candidate, cfg: ModelRoutingConfig) -> _CandidateStats:
+    stats = _stats.get(candidate)
+    if stats is None:
+        stats = _stats[candidate] = _CandidateStats(cfg.window)
+    return stats
+
+
+def role_candidates(settings: dict[str, Any], role: str, provider: str, model: str) -> list[Candidate]:
+    """Return the configured *provider*/*model* followed by the role's fallbacks.
+
+    Args:
+        settings: Loaded settings (``{role}_fallbacks`` is read from it).
+        role: ``"title"``, ``"vision"`` or ``"compaction"``.
+        provider: Provider configured for the role (may be empty).
+        model: Model configured for the role (may be empty).
+    """
+    candidates: list[Candidate] = []
+    if provider and model:
+        candidates.append(Candidate(provider, model))
+    for entry in settings.get(f"{role}_fallbacks") or ():
+        candidate = Candidate(entry.get("provider") or "", entry.get("model") or "")
+        if candidate.provider and candidate.model and candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+
+def _hedge_delay(candidate: Candidate, cfg: ModelRoutingConfig) -> float:
+    p95 = _stats_for(candidate, cfg).percentile(0.95, cfg.min_samples)
+    return max(cfg.hedge_min_delay, cfg.hedge_default_delay if p95 is None else p95)
+
+
+def _pick_hedge(waiting: list[Candidate], cfg: ModelRoutingConfig) -> Candidate | None:
+    """Healthy waiting candidate with the lowest median TTFT (unmeasured ones count as the default delay)."""
+    now = time.monotonic()
+    healthy = [c for c in waiting if _stats_for(c, cfg).down_until <= now]
+    if not healthy:
+        return None
+
+    def _expected(c: Candidate) -> float:
+        p50 = _stats_for(c, cfg).percentile(0.5, cfg.min_samples)
+        return cfg.hedge_default_delay if p50 is None else p50
+
+    return min(healthy, key=_expected)
+
+
+def _record_failure(candidate: Candidate, cfg: ModelRoutingConfig, exc: BaseException) -> None:
+    stats = _stats_for(candidate, cfg)
+    stats.failures += 1
+    logger.warning("%s/%s failed (%d in a row): %s", candidate.provider, candidate.model, stats.failures, exc)
+    if stats.failures >= cfg.failure_threshold:
+        stats.down_until = time.monotonic() + cfg.cooldown
+        logger.warning(
+            "Taking %s/%s out of rotation for %.0fs", candidate.provider, candidate.model, cfg.cooldown,
+        )
+
+
+async def _attempt(
+    candidate: Candidate,
+    cfg: ModelRoutingConfig,
+    first_token: asyncio.Event,
+    request: dict[str, Any],
+) -> ChatResponse:
+    """Stream one candidate's answer, recording its TTFT and signalling its first token."""
+    from . import get_provider
+
+    started = time.monotonic()
+    stats = _stats_for(candidate, cfg)
+    got_token = False
+
+    def _on_chunk() -> None:
+        nonlocal got_token
+        if not got_token:
+            got_token = True
+            stats.ttft.append(time.monotonic() - started)
+            first_token.set()
+
+    try:
+        final = await chat_until(
+            get_provider(candidate.provider), model=candidate.model, on_chunk=_on_chunk, **request,
+        )
+    except asyncio.CancelledError:
+        if not got_token:
+            # Lost the hedge before its first token: its TTFT was at least this long.
+            stats.ttft.append(time.monotonic() - started)
+        raise
+    stats.failures = 0
+    stats.down_until = 0.0
+    return final
+
+
+async def routed_chat(
+    role: str,
+    candidates: Sequence[Candidate],
+    *,
+    messages: list[dict[str, Any]],
+    options: dict[str, Any] | None = None,
+    think: bool = False,
+    stop: StopCondition | None = None,
+) -> tuple[ChatResponse, Candidate]:
+    """Run a chat request across *candidates* with hedging and fallback.
+
+    Args:
+        role: Label for logs and metrics (e.g. ``"title"``).
+        candidates: Candidates in order of preference, usually from
+            :func:`role_candidates`.
+        messages: Chat messages, sent unchanged to every candidate.
+        options: Inference options, sent unchanged to every candidate.
+        think: Whether to request reasoning output.
+        stop: Ends each attempt early once its content meets this.
+
+    Returns:
+        The first complete response and the candidate that produced it.
+
+    Raises:
+        ValueError: If *candidates* is empty.
+        Exception: The last candidate's error when every candidate fails.
+    """
+    from config import load_config
+
+    if not candidates:
+        msg = f"No model configured for {role}"
+        raise ValueError(msg)
+    cfg = load_config().model_routing
+    request = {"stop": stop, "messages": messages, "options": options, "think": think}
+
+    # Healthy candidates first, in preference order; ones in cooldown are a last resort.
+    now = time.monotonic()
+    waiting = sorted(candidates, key=lambda c: _stats_for(c, cfg).down_until > now)
+    first_token = asyncio.Event()
+    running: dict[asyncio.Task[ChatResponse], Candidate] = {}
+    hedge_at: float | None = None
+    last_error: BaseException | None = None
+
+    def _start(candidate: Candidate) -> None:
+        nonlocal hedge_at
+        waiting.remove(candidate)
+        task = asyncio.create_task(_attempt(candidate, cfg, first_token, request))
+        running[task] = candidate
+        if hedge_at is None and cfg.hedge:
+            hedge_at = time.monotonic() + _hedge_delay(candidate, cfg)
+
+    _start(waiting[0])
+    try:
+        while running:
+            timeout = None
+            if hedge_at is not None and not first_token.is_set() and len(running) == 1 and waiting:
+                timeout = max(0.0, hedge_at - time.monotonic())
+            done, _pending = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                target = _pick_hedge(waiting, cfg)
+                hedge_at = float("inf")  # one hedge per call
+                if target is not None:
+                    primary = next(iter(running.values()))
+                    logger.info(
+                        "No token from %s/%s yet; hedging %s call to %s/%s",
+                        primary.provider, primary.model, role, target.provider, target.model,
+                    )
+                    _HEDGES.inc(role)
+                    _start(target)
+                continue
+
+            for task in done:
+                candidate = running.pop(task)
+                exc = task.exception()
+                if exc is None:
+                    _ANSWERED.inc(role, candidate.provider, candidate.model)
+                    return task.result(), candidate
+                last_error = exc
+                _record_failure(candidate, cfg, exc)
+            if not running and waiting:
+                logger.info("Falling back to %s/%s for %s", waiting[0].provider, waiting[0].model, role)
+                _FALLBACKS.inc(role)
+                _start(waiting[0])
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    # Only reached once every candidate has failed.
+    raise last_error  # type: ignore[misc]
+
+
+def reset_routing_stats() -> None:
+    """Forget all candidate latency and health stats (for tests)."""
+    _stats.clear()
@@ -0,0 +1,180 @@
+"""Early exit for callers that only need the start of a response.
+
+:func:`chat_until` reads a provider's ``chat_stream`` and closes it as soon
+as a :class:`StopCondition` is met, which ends the upstream request and
+the model's generation.  Usage for a response cut short is estimated:
+the provider reports token counts only at the end of a stream.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any
+
+from logging_config import log_event
+from utils.metrics import Counter
+
+from ._models import ChatMessage, ChatResponse, ProviderError, TokenUsage
+from ._protocol import Provider
+
+logger = logging.getLogger(__name__)
+
+_EARLY_STOPS = Counter("computron_llm_early_stops", "Model responses cut short by a stop condition.", ("model",))
+
+# Chars per token for the prompt estimate of a response cut short.
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True, slots=True)
+class StopCondition:
+    """When to stop reading a response; the first condition met ends it.
+
+    Attributes:
+        max_chars: Stop once the content is this long, cut to it.
+        stop_sequences: Stop at the first of these after any leading
+            whitespace; the sequence itself is dropped.
+        complete: Called with the content so far; ``True`` stops with the
+            content as it is.
+    """
+
+    max_chars: int | None = None
+    stop_sequences: tuple[str, ...] = ()
+    complete: Callable[[str], bool] | None = None
+
+    def cut(self, content: str) -> str | None:
+        """Return the content to keep if a condition is met, else ``None``."""
+        start = len(content) - len(content.lstrip())
+        ends = [i for seq in self.stop_sequences if (i := content.find(seq, start + 1)) > start]
+        if ends:
+            return content[:min(ends)]
+        if self.max_chars is not None and len(content) >= self.max_chars:
+            return content[:self.max_chars]
+        if self.complete is not None and self.complete(content):
+            return content
+        return None
+
+
+def json_complete(text: str) -> bool:
+    """Whether *text* holds a complete top-level JSON object or array.
+
+    Leading prose or a Markdown fence before the value is skipped.  Only
+    checks bracket balance (outside strings), so the value may still be
+    invalid JSON.
+    """
+    tail = text.rstrip().removesuffix("```").rstrip()
+    if not tail.endswith(("}", "]")):
+        return False
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return False
+    depth = 0
+    in_string = escaped = False
+    for ch in text[min(starts):]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def line_complete(marker: str) -> Callable[[str], bool]:
+    """Detector for outputs that end with the line containing *marker*."""
+
+    def _complete(text: str) -> bool:
+        i = text.find(marker)
+        return i >= 0 and "\n" in text[i + len(marker):]
+
+    return _complete
+
+
+def _estimate_prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content") or "")) for m in messages) // _CHARS_PER_TOKEN
+
+
+async def chat_until(
+    provider: Provider,
+    stop: StopCondition | None,
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    options: dict[str, Any] | None = None,
+    think: bool = False,
+    on_chunk: Callable[[], None] | None = None,
+) -> ChatResponse:
+    """Stream a chat response, closing the stream as soon as *stop* is met.
+
+    Args:
+        provider: The provider to call.
+        stop: Stop condition on the response content; ``None`` reads to the end.
+        model: Model name.
+        messages: Chat messages.
+        options: Inference options.
+        think: Whether to request reasoning output.
+        on_chunk: Called for every chunk received (e.g. to time the first).
+
+    Returns:
+        The provider's final response, or one built from the deltas read
+        when the response was cut short (``done_reason="stop"``, estimated
+        usage: prompt from the message size, completion from the chunk count).
+
+    Raises:
+        ProviderError: If the stream ends without a response.
+    """
+    content = ""
+    thinking: list[str] = []
+    chunks = 0
+    final: ChatResponse | None = None
+    kept: str | None = None
+    async with aclosing(
+        provider.chat_stream(model=model, messages=messages, options=options, think=think),
+    ) as stream:
+        async for chunk in stream:
+            if on_chunk is not None:
+                on_chunk()
+            if isinstance(chunk, ChatResponse):
+                final = chunk
+                break
+            chunks += 1
+            if chunk.thinking:
+                thinking.append(chunk.thinking)
+            if chunk.content:
+                content += chunk.content
+                if stop is not None and (kept := stop.cut(content)) is not None:
+                    break
+
+    if final is not None:
+        if stop is not None and final.message.content:
+            cut = stop.cut(final.message.content)
+            if cut is not None:
+                final = final.model_copy(update={"message": final.message.model_copy(update={"content": cut})})
+        return final
+    if kept is None:
+        msg = f"{model} stream ended without a response"
+        raise ProviderError(msg, retryable=True)
+
+    usage = TokenUsage(prompt_tokens=_estimate_prompt_tokens(messages), completion_tokens=chunks)
+    _EARLY_STOPS.inc(model)
+    log_event(
+        "model.early_stop", "%s stopped early after %d chunks", model, chunks,
+        level=logging.DEBUG, model=model, chunks=chunks,
+        prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens, usage_estimated=True,
+    )
+    return ChatResponse(
+        message=ChatMessage(content=kept, thinking="".join(thinking) or None),
+        usage=usage,
+        done_reason="stop",
+    )
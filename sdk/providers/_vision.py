@@ -1,8 +1,11 @@
 """Shared vision helper that routes image prompts through the configured provider."""
 
+import asyncio
+import base64
 import logging
 from typing import Any
 
+from sdk.media import prepare_image
 from settings import load_settings
 
 logger = logging.getLogger(__name__)
@@ -17,7 +20,9 @@ async def vision_generate(
     """Send an image + prompt to the configured vision model via the active provider.
 
     Reads vision_provider, vision_model, vision_options, and vision_think
-    from settings.json.
+    from settings.json; ``vision_fallbacks`` are used for hedging and
+    fallback (see ``sdk.providers._routing``).  The image is downscaled and re-encoded per the
+    ``media`` config and stored in the conversation's blob store.
 
     Args:
         prompt: Question or instruction about the image.
@@ -42,16 +47,15 @@ async def vision_generate(
     vision_options: dict[str, Any] = dict(settings.get("vision_options") or {})
     vision_think: bool = bool(settings.get("vision_think") or False)
 
-    from . import get_provider
-    provider = get_provider(vision_provider)
-    messages: list[dict[str, Any]] = [{
-        "role": "user",
-        "content": prompt,
-        "images": [{"data": image_base64, "media_type": media_type}],
-    }]
+    from ._routing import role_candidates, routed_chat
 
-    response = await provider.chat(
-        model=vision_model,
+    # Decoding, resizing and storing the image is CPU and disk work.
+    image = await asyncio.to_thread(prepare_image, base64.b64decode(image_base64), media_type)
+    messages: list[dict[str, Any]] = [{"role": "user", "content": prompt, "images": [image]}]
+
+    response, _candidate = await routed_chat(
+        "vision",
+        role_candidates(settings, "vision", vision_provider, vision_model),
         messages=messages,
         options=vision_options,
         think=vision_think,
@@ -2,20 +2,19 @@
 
 import logging
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from logging_config import log_event
+
 from ._registry import get_skill, list_skills
 from .agent_state import get_active_agent_state
 
 logger = logging.getLogger(__name__)
 
-_console = Console(stderr=True)
-
 
 def _log_skill_loaded(skill_name: str, description: str, new_tools: list[str]) -> None:
-    """Print a Rich panel when a skill is loaded."""
+    """Log a ``skill.loaded`` event."""
     body = Text()
     body.append("skill: ", style="bold")
     body.append(skill_name, style="bright_magenta")
@@ -27,42 +26,55 @@ def _log_skill_loaded(skill_name: str, description: str, new_tools: list[str]) -
         body.append("\ntools: ", style="bold")
         body.append("(none — guidance only)", style="dim")
 
-    _console.print(Panel(
-        body,
-        title="[bold bright_magenta]⚡ Skill Loaded[/bold bright_magenta]",
-        border_style="bright_magenta",
-        expand=False,
-    ))
+    log_event(
+        "skill.loaded", "Loaded skill %s", skill_name,
+        skill=skill_name, tools=new_tools,
+        panel=Panel(
+            body,
+            title="[bold bright_magenta]⚡ Skill Loaded[/bold bright_magenta]",
+            border_style="bright_magenta",
+            expand=False,
+        ),
+    )
 
 
 def _log_skill_already_loaded(skill_name: str) -> None:
-    """Print a dim panel when a skill is requested but already loaded."""
+    """Log a ``skill.already_loaded`` event."""
     body = Text()
     body.append(skill_name, style="bright_magenta")
     body.append("  (already loaded)", style="dim")
 
-    _console.print(Panel(
-        body,
-        title="[bold dim]⚡ Skill[/bold dim]",
-        border_style="dim",
-        expand=False,
-    ))
+    log_event(
+        "skill.already_loaded", "Skill %s already loaded", skill_name,
+        skill=skill_name,
+        panel=Panel(
+            body,
+            title="[bold dim]⚡ Skill[/bold dim]",
+            border_style="dim",
+            expand=False,
+        ),
+    )
 
 
 def _log_skill_error(skill_name: str, error: str) -> None:
-    """Print a red panel when a skill load fails."""
+    """Log a ``skill.error`` event when a skill load fails."""
     body = Text()
     body.append("skill: ", style="bold")
     body.append(skill_name, style="red")
     body.append(f"\nerror: ", style="bold")
     body.append(error, style="red")
 
-    _console.print(Panel(
-        body,
-        title="[bold red]⚡ Skill Error[/bold red]",
-        border_style="red",
-        expand=False,
-    ))
+    log_event(
+        "skill.error", "Failed to load skill %s: %s", skill_name, error,
+        level=logging.WARNING,
+        skill=skill_name, error=error,
+        panel=Panel(
+            body,
+            title="[bold red]⚡ Skill Error[/bold red]",
+            border_style="red",
+            expand=False,
+        ),
+    )
 
 
 def list_available_skills() -> str:
@@ -3,11 +3,11 @@
 import logging
 import uuid as _uuid
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
 from agents import AgentProfile, build_agent, get_agent_profile
+from logging_config import log_event
 from sdk.context import ContextManager, ConversationHistory, LLMCompactionStrategy
 from sdk.events import agent_span
 from sdk.hooks import PersistenceHook, default_hooks
@@ -17,11 +17,9 @@ from sdk.turn import StopRequestedError, get_conversation_id, run_turn
 
 logger = logging.getLogger(__name__)
 
-_console = Console(stderr=True)
-
 
 def _log_spawn(agent_name: str, profile: AgentProfile, instruction_preview: str) -> None:
-    """Print a Rich panel when a sub-agent is spawned."""
+    """Log an ``agent.spawn`` event when a sub-agent is spawned."""
     body = Text()
     body.append("agent:   ", style="bold")
     body.append(agent_name, style="bright_cyan")
@@ -66,16 +64,20 @@ def _log_spawn(agent_name: str, profile: AgentProfile, instruction_preview: str)
         preview += "…"
     body.append(preview, style="dim")
 
-    _console.print(Panel(
-        body,
-        title="[bold bright_cyan]🚀 Spawn Agent[/bold bright_cyan]",
-        border_style="bright_cyan",
-        expand=False,
-    ))
+    log_event(
+        "agent.spawn", "Spawning %s (profile %s)", agent_name, profile.id,
+        agent=agent_name, profile=profile.id, model=profile.model, skills=profile.skills, params=params,
+        panel=Panel(
+            body,
+            title="[bold bright_cyan]🚀 Spawn Agent[/bold bright_cyan]",
+            border_style="bright_cyan",
+            expand=False,
+        ),
+    )
 
 
 def _log_spawn_complete(agent_name: str, result_preview: str) -> None:
-    """Print a Rich panel when a spawned agent completes."""
+    """Log an ``agent.complete`` event when a spawned agent completes."""
     body = Text()
     body.append("agent:  ", style="bold")
     body.append(agent_name, style="green")
@@ -85,28 +87,37 @@ def _log_spawn_complete(agent_name: str, result_preview: str) -> None:
         preview += "…"
     body.append(preview, style="green")
 
-    _console.print(Panel(
-        body,
-        title="[bold green]✅ Agent Complete[/bold green]",
-        border_style="green",
-        expand=False,
-    ))
+    log_event(
+        "agent.complete", "Agent %s complete", agent_name,
+        agent=agent_name, result_chars=len(result_preview),
+        panel=Panel(
+            body,
+            title="[bold green]✅ Agent Complete[/bold green]",
+            border_style="green",
+            expand=False,
+        ),
+    )
 
 
 def _log_spawn_error(agent_name: str, error: str) -> None:
-    """Print a Rich panel when a spawned agent fails."""
+    """Log an ``agent.error`` event when a spawned agent fails."""
     body = Text()
     body.append("agent: ", style="bold")
     body.append(agent_name, style="red")
     body.append("\nerror: ", style="bold")
     body.append(error, style="red")
 
-    _console.print(Panel(
-        body,
-        title="[bold red]❌ Agent Error[/bold red]",
-        border_style="red",
-        expand=False,
-    ))
+    log_event(
+        "agent.error", "Agent %s failed: %s", agent_name, error,
+        level=logging.ERROR,
+        agent=agent_name, error=error,
+        panel=Panel(
+            body,
+            title="[bold red]❌ Agent Error[/bold red]",
+            border_style="red",
+            expand=False,
+        ),
+    )
 
 async def spawn_agent(
     instructions: str,
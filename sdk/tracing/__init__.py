@@ -0,0 +1,43 @@
+"""Per-turn latency tracing.
+
+Spans cover the turn, each agent, loop iterations, model streams (split
+into time-to-first-token and generation), tool calls, hooks, compaction,
+browser page settling and history persistence.  They are kept in a
+per-conversation ring buffer, queried with :func:`query_spans` /
+:func:`summarize` and exported for flamegraph viewers with
+:func:`to_chrome_trace`.
+"""
+
+from ._chrome import to_chrome_trace
+from ._spans import (
+    Span,
+    TraceBuffer,
+    annotate,
+    clear_trace,
+    close_span,
+    get_trace,
+    open_span,
+    query_spans,
+    record_span,
+    summarize,
+    trace_span,
+    trace_turn,
+    traced,
+)
+
+__all__ = [
+    "Span",
+    "TraceBuffer",
+    "annotate",
+    "clear_trace",
+    "close_span",
+    "get_trace",
+    "open_span",
+    "query_spans",
+    "record_span",
+    "summarize",
+    "to_chrome_trace",
+    "trace_span",
+    "trace_turn",
+    "traced",
+]
@@ -0,0 +1,45 @@
+"""Export spans as Chrome trace-event JSON.
+
+The output loads in ``chrome://tracing``, Perfetto (ui.perfetto.dev) and
+speedscope, which draw each lane (asyncio task or thread) as a row of
+nested spans.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ._spans import _EPOCH_OFFSET, Span
+
+
+def to_chrome_trace(spans: list[Span], *, process_name: str = "computron") -> dict[str, Any]:
+    """Convert *spans* to the trace-event format's JSON object form.
+
+    Each span becomes a complete (``"X"``) event; lanes become threads named
+    after their task.  Timestamps are microseconds since the epoch.
+    """
+    lanes: dict[str, int] = {}
+    events: list[dict[str, Any]] = [
+        {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": process_name}},
+    ]
+    for span in sorted(spans, key=lambda s: s.start):
+        tid = lanes.get(span.lane)
+        if tid is None:
+            tid = lanes[span.lane] = len(lanes) + 1
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": span.lane}})
+        args = {"span_id": span.span_id, "parent_id": span.parent_id, "turn": span.turn, **span.attrs}
+        if span.error:
+            args["error"] = span.error
+        if span.end is None:
+            args["open"] = True
+        events.append({
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "pid": 1,
+            "tid": tid,
+            "ts": round((span.start + _EPOCH_OFFSET) * 1e6, 1),
+            "dur": round(span.duration_ms * 1000, 1),
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
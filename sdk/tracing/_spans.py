@@ -0,0 +1,342 @@
+"""Span recording into per-conversation ring buffers.
+
+A span is a named, timed section of a turn.  ``turn_scope`` binds the
+conversation's :class:`TraceBuffer` to the current context with
+:func:`trace_turn`; everything below it (agent spans, loop iterations, model
+streams, tool calls, hooks) opens child spans with :func:`trace_span` or
+:func:`traced`.  With no buffer bound, recording is a no-op.
+
+The innermost open span is tracked in a ContextVar, so spans opened in
+tasks created by ``asyncio.gather`` or threads started by
+``asyncio.to_thread`` nest under the span that spawned them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# perf_counter() has the best resolution but an arbitrary origin; this offset
+# turns it into epoch seconds for display.
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+_span_ids = itertools.count(1)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed section of a turn.
+
+    Attributes:
+        name: Dotted span name, e.g. ``"llm"`` or ``"tool.read_file"``.
+        span_id: Unique id.
+        parent_id: Id of the enclosing span, if any.
+        turn: Turn number within the conversation (1-based).
+        lane: The asyncio task or thread the span ran on.
+        start: ``perf_counter`` time the span started.
+        end: ``perf_counter`` time it ended, or ``None`` while open.
+        attrs: Extra details (model, tool arguments size, ...).
+        error: Exception type name if the span exited with one.
+        buffer: The buffer the span is recorded into.
+    """
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    turn: int
+    lane: str
+    start: float
+    end: float | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    buffer: TraceBuffer | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration so far; still growing while the span is open."""
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form with the start as epoch seconds."""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "turn": self.turn,
+            "lane": self.lane,
+            "start": round(self.start + _EPOCH_OFFSET, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "open": self.end is None,
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class TraceBuffer:
+    """The most recent spans of one conversation.
+
+    Args:
+        conversation_id: The conversation the spans belong to.
+        max_spans: Finished spans kept; older ones are dropped first.
+    """
+
+    def __init__(self, conversation_id: str, max_spans: int) -> None:
+        self.conversation_id = conversation_id
+        self.turns = 0
+        self._finished: deque[Span] = deque(maxlen=max_spans)
+        self._open: dict[int, Span] = {}
+        self._lock = threading.Lock()
+
+    def opened(self, span: Span) -> None:
+        with self._lock:
+            self._open[span.span_id] = span
+
+    def closed(self, span: Span) -> None:
+        with self._lock:
+            self._open.pop(span.span_id, None)
+            self._finished.append(span)
+
+    def spans(self) -> list[Span]:
+        """Finished and still-open spans, ordered by start time."""
+        with self._lock:
+            spans = [*self._finished, *self._open.values()]
+        return sorted(spans, key=lambda s: s.start)
+
+
+_buffers: OrderedDict[str, TraceBuffer] = OrderedDict()
+_buffers_lock = threading.Lock()
+
+_active_buffer: ContextVar[TraceBuffer | None] = ContextVar("trace_buffer", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("trace_current_span", default=None)
+
+
+def _buffer_for(conversation_id: str) -> TraceBuffer | None:
+    """Get or create the buffer for *conversation_id*; ``None`` when tracing is off."""
+    from config import load_config
+
+    cfg = load_config().tracing
+    if not cfg.enabled:
+        return None
+    with _buffers_lock:
+        buffer = _buffers.get(conversation_id)
+        if buffer is None:
+            buffer = TraceBuffer(conversation_id, cfg.max_spans)
+            _buffers[conversation_id] = buffer
+        _buffers.move_to_end(conversation_id)
+        while len(_buffers) > max(1, cfg.max_conversations):
+            _buffers.popitem(last=False)
+        return buffer
+
+
+def get_trace(conversation_id: str) -> TraceBuffer | None:
+    """Return the recorded trace for *conversation_id*, if any."""
+    with _buffers_lock:
+        return _buffers.get(conversation_id)
+
+
+def clear_trace(conversation_id: str) -> None:
+    """Forget the trace for *conversation_id*."""
+    with _buffers_lock:
+        _buffers.pop(conversation_id, None)
+
+
+def _lane() -> str:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task.get_name() if task is not None else threading.current_thread().name
+
+
+def open_span(name: str, **attrs: Any) -> Span | None:
+    """Start a span without making it the current span.
+
+    For code that can't scope a ``with`` block to one context, such as an
+    async generator.  Pair with :func:`close_span`.
+
+    Returns:
+        The span, or ``None`` when no trace is being recorded.
+    """
+    buffer = _active_buffer.get()
+    if buffer is None:
+        return None
+    parent = _current_span.get()
+    span = Span(
+        name=name,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        turn=buffer.turns,
+        lane=_lane(),
+        start=time.perf_counter(),
+        attrs=attrs,
+        buffer=buffer,
+    )
+    buffer.opened(span)
+    return span
+
+
+def close_span(span: Span | None, *, error: BaseException | None = None, end: float | None = None) -> None:
+    """Finish a span from :func:`open_span` (no-op for ``None``).
+
+    Safe to call from another context, e.g. an async generator's cleanup.
+    """
+    if span is None or span.end is not None:
+        return
+    span.end = end if end is not None else time.perf_counter()
+    if error is not None:
+        span.error = type(error).__name__
+    if span.buffer is not None:
+        span.buffer.closed(span)
+
+
+def record_span(name: str, start: float, end: float, *, parent: Span | None = None, **attrs: Any) -> None:
+    """Record an already-measured interval (``perf_counter`` times) as a span."""
+    if parent is None:
+        parent = _current_span.get()
+    buffer = parent.buffer if parent is not None else _active_buffer.get()
+    if buffer is None:
+        return
+    span = Span(
+        name=name,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        turn=buffer.turns,
+        lane=parent.lane if parent is not None else _lane(),
+        start=start,
+        end=end,
+        attrs=attrs,
+        buffer=buffer,
+    )
+    buffer.closed(span)
+
+
+@contextmanager
+def trace_span(name: str, **attrs: Any) -> Iterator[Span | None]:
+    """Record the enclosed block as a child of the current span.
+
+    Yields:
+        The span (``None`` when not recording), whose ``attrs`` may be
+        extended inside the block.
+    """
+    span = open_span(name, **attrs)
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        close_span(span)
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+    """Decorate a sync or async function so each call is recorded as a span."""
+
+    def decorator(fn: _F) -> _F:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with trace_span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with trace_span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def annotate(**attrs: Any) -> None:
+    """Add details to the current span, if one is being recorded."""
+    span = _current_span.get()
+    if span is not None:
+        span.attrs.update(attrs)
+
+
+@contextmanager
+def trace_turn(conversation_id: str) -> Iterator[None]:
+    """Bind *conversation_id*'s buffer and record the enclosed turn as its root span."""
+    try:
+        buffer = _buffer_for(conversation_id)
+    except Exception:  # pragma: no cover - tracing must never break a turn
+        logger.exception("Failed to set up tracing for '%s'", conversation_id)
+        buffer = None
+    if buffer is None:
+        yield
+        return
+    buffer.turns += 1
+    buffer_token = _active_buffer.set(buffer)
+    span_token = _current_span.set(None)
+    try:
+        with trace_span("turn", conversation_id=conversation_id):
+            yield
+    finally:
+        _current_span.reset(span_token)
+        _active_buffer.reset(buffer_token)
+
+
+def query_spans(
+    buffer: TraceBuffer,
+    *,
+    turn: int | None = None,
+    name: str | None = None,
+    min_ms: float | None = None,
+) -> list[Span]:
+    """Select spans from *buffer*.
+
+    Args:
+        buffer: Trace buffer to read.
+        turn: Only this turn; negative counts back from the latest (-1 = last).
+        name: Only spans whose name equals this or starts with ``name + "."``.
+        min_ms: Only spans at least this long.
+    """
+    spans = buffer.spans()
+    if turn is not None:
+        wanted = buffer.turns + 1 + turn if turn < 0 else turn
+        spans = [s for s in spans if s.turn == wanted]
+    if name:
+        spans = [s for s in spans if s.name == name or s.name.startswith(name + ".")]
+    if min_ms is not None:
+        spans = [s for s in spans if s.duration_ms >= min_ms]
+    return spans
+
+
+def summarize(spans: list[Span]) -> dict[str, dict[str, float]]:
+    """Count, total and max duration per span name, longest total first."""
+    groups: dict[str, dict[str, float]] = {}
+    for span in spans:
+        duration = span.duration_ms
+        group = groups.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        group["count"] += 1
+        group["total_ms"] += duration
+        group["max_ms"] = max(group["max_ms"], duration)
+    for group in groups.values():
+        group["total_ms"] = round(group["total_ms"], 3)
+        group["max_ms"] = round(group["max_ms"], 3)
+    return dict(sorted(groups.items(), key=lambda item: -item[1]["total_ms"]))
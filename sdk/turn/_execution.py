@@ -2,18 +2,42 @@
 
 import asyncio
 import logging
-from collections.abc import AsyncGenerator, Callable
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from typing import Any
 
 from agents.types import Agent
 from sdk.context import ConversationHistory
-from sdk.events import AgentEvent, ContentPayload, TurnEndPayload, get_current_agent_name, publish_event
-from sdk.providers import ChatDelta, ChatResponse, ProviderError, get_provider
+from sdk.events import (
+    AgentEvent,
+    ContentPayload,
+    ModelQueuePayload,
+    TurnEndPayload,
+    get_current_agent_name,
+    publish_event,
+)
+from sdk.media import drop_stale_images
+from sdk.providers import AdaptiveLimiter, ChatDelta, ChatResponse, ProviderError, get_limiter, get_provider
 from sdk.skills.agent_state import _active_agent_state
 from sdk.tools import _execute_tool_call
+from sdk.tracing import close_span, open_span, record_span, trace_span
+from utils.metrics import Counter, Histogram
 
 from ._turn import StopRequestedError
 
+_LLM_TTFT_SECONDS = Histogram(
+    "computron_llm_ttft_seconds", "Time from request to first streamed chunk, per model.", ("model",),
+)
+_LLM_TOKENS_PER_SECOND = Histogram(
+    "computron_llm_tokens_per_second",
+    "Completion tokens per second of generation (after the first chunk), per model.",
+    ("model",),
+    buckets=(1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500, 1000),
+)
+_LLM_REQUESTS = Counter("computron_llm_requests", "Model calls by model and outcome.", ("model", "outcome"))
+_TOOL_SECONDS = Histogram("computron_tool_duration_seconds", "Tool call latency, including hooks.", ("tool",))
+
 
 def _get_parallel_config():
     """Lazy-load parallel config to avoid circular imports at module level."""
@@ -22,6 +46,13 @@ def _get_parallel_config():
     return load_config().parallel
 
 
+def _get_media_config():
+    """Lazy-load media config to avoid circular imports at module level."""
+    from config import load_config
+
+    return load_config().media
+
+
 class ToolLoopError(Exception):
     """Custom exception for errors in the tool loop."""
 
@@ -37,6 +68,37 @@ def _publish_turn_end() -> None:
         logger.exception("Failed to publish turn_end event")
 
 
+def _publish_queue_event(limiter: AdaptiveLimiter, **fields: Any) -> None:
+    """Emit a ModelQueuePayload. Logs but never raises on failure."""
+    try:
+        publish_event(AgentEvent(payload=ModelQueuePayload(
+            type="model_queue", provider=limiter.provider, model=limiter.model, **fields,
+        )))
+    except Exception:  # pragma: no cover - defensive
+        logger.exception("Failed to publish model_queue event")
+
+
+@asynccontextmanager
+async def _limited(limiter: AdaptiveLimiter | None) -> AsyncIterator[None]:
+    """Hold a limiter slot for one model call, publishing queue events if it has to wait."""
+    if limiter is None:
+        yield
+        return
+    queued_at: float | None = None
+
+    def _on_queued(position: int) -> None:
+        nonlocal queued_at
+        queued_at = time.perf_counter()
+        _publish_queue_event(limiter, queued=True, position=position)
+
+    async with limiter.slot(on_queued=_on_queued):
+        if queued_at is not None:
+            granted = time.perf_counter()
+            record_span("llm.queued", queued_at, granted)
+            _publish_queue_event(limiter, queued=False, waited_ms=round((granted - queued_at) * 1000, 1))
+        yield
+
+
 async def _stream_chat_with_retries(
     provider: Any,
     *,
@@ -46,66 +108,144 @@ async def _stream_chat_with_retries(
     options: dict[str, Any] | None = None,
     think: bool = False,
     retries: int = 5,
+    provider_name: str | None = None,
 ) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
     """Yield ChatDelta tokens, then the final ChatResponse. Retries on failure.
 
     If a stream fails mid-way after emitting deltas, retrying would cause
     content duplication. On retry, fall back to non-streaming chat() to
     yield a single complete ChatResponse instead.
+
+    With *provider_name*, each attempt holds a slot of the shared
+    provider/model limiter (see ``sdk.providers._ratelimit``).  Rate-limit
+    responses then wait in the limiter's queue, which honors
+    ``Retry-After``, rather than in a fixed backoff.
+
+    The call is traced as an ``llm`` span split into ``llm.ttft`` (until the
+    first chunk) and ``llm.generate``. Time the consumer spends between
+    chunks is included, since it delays reading the stream. TTFT and
+    generation speed also feed the per-model metrics.
     """
+    span = open_span("llm", model=model, messages=len(messages))
+    started_at = time.perf_counter()
+    first_chunk_at: float | None = None
+    final: ChatResponse | None = None
+    chunks = 0
+    error: BaseException | None = None
     attempt = 0
     total_attempts = 1 + max(0, retries)
-    while attempt < total_attempts:
-        try:
-            if attempt == 0:
-                async for chunk in provider.chat_stream(
-                    model=model,
-                    messages=messages,
-                    options=options,
-                    tools=tools,
-                    think=think,
-                ):
-                    yield chunk
-            else:
-                # Retry with non-streaming to avoid content duplication
-                yield await provider.chat(
-                    model=model,
-                    messages=messages,
-                    options=options,
-                    tools=tools,
-                    think=think,
+    limiter = get_limiter(provider_name, model) if provider_name else None
+    try:
+        while attempt < total_attempts:
+            try:
+                async with _limited(limiter):
+                    if attempt == 0:
+                        async for chunk in provider.chat_stream(
+                            model=model,
+                            messages=messages,
+                            options=options,
+                            tools=tools,
+                            think=think,
+                        ):
+                            if first_chunk_at is None:
+                                first_chunk_at = time.perf_counter()
+                            chunks += 1
+                            if isinstance(chunk, ChatResponse):
+                                final = chunk
+                            yield chunk
+                    else:
+                        # Retry with non-streaming to avoid content duplication
+                        response = await provider.chat(
+                            model=model,
+                            messages=messages,
+                            options=options,
+                            tools=tools,
+                            think=think,
+                        )
+                        if first_chunk_at is None:
+                            first_chunk_at = time.perf_counter()
+                        chunks += 1
+                        final = response
+                        yield response
+                return
+            except ProviderError as exc:
+                attempt += 1
+                if not exc.retryable:
+                    logger.error(
+                        "provider.chat_stream failed (non-retryable): %s | model=%s",
+                        exc,
+                        model,
+                    )
+                    raise
+                if limiter is not None and exc.status_code == 429:
+                    delay = 0  # the limiter holds the queue for Retry-After
+                elif exc.retry_after is not None:
+                    delay = min(exc.retry_after, 60)
+                else:
+                    delay = min(2**attempt, 32)
+                logger.warning(
+                    "provider.chat_stream failed (attempt %s/%s, retryable, backoff %ds): %s | model=%s",
+                    attempt,
+                    total_attempts,
+                    delay,
+                    exc,
+                    model,
                 )
-            return
-        except ProviderError as exc:
-            attempt += 1
-            if not exc.retryable:
+                if attempt >= total_attempts:
+                    raise
+                await asyncio.sleep(delay)
+            except Exception as exc:
                 logger.error(
-                    "provider.chat_stream failed (non-retryable): %s | model=%s",
+                    "provider.chat_stream failed (unexpected): %s | model=%s",
                     exc,
                     model,
                 )
                 raise
-            delay = min(2**attempt, 32)
-            logger.warning(
-                "provider.chat_stream failed (attempt %s/%s, retryable, backoff %ds): %s | model=%s",
-                attempt,
-                total_attempts,
-                delay,
-                exc,
-                model,
-            )
-            if attempt >= total_attempts:
-                raise
-            await asyncio.sleep(delay)
-        except Exception as exc:
-            logger.error(
-                "provider.chat_stream failed (unexpected): %s | model=%s",
-                exc,
-                model,
-            )
-            raise
-    msg = "Failed to get chat response after retries."
-    raise ToolLoopError(msg)
+        msg = "Failed to get chat response after retries."
+        raise ToolLoopError(msg)
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        end = time.perf_counter()
+        _record_llm_metrics(model, started_at, first_chunk_at, end, final, error)
+        if span is not None:
+            span.attrs.update(attempts=min(attempt + 1, total_attempts), chunks=chunks)
+            if first_chunk_at is not None:
+                span.attrs["ttft_ms"] = round((first_chunk_at - span.start) * 1000, 3)
+                record_span("llm.ttft", span.start, first_chunk_at, parent=span)
+                record_span("llm.generate", first_chunk_at, end, parent=span)
+            close_span(span, error=error, end=end)
+
+
+def _record_llm_metrics(
+    model: str,
+    started_at: float,
+    first_chunk_at: float | None,
+    end: float,
+    final: ChatResponse | None,
+    error: BaseException | None,
+) -> None:
+    """Record TTFT, generation speed and outcome for one model call."""
+    if error is not None:
+        outcome = "error"
+    elif final is None:
+        # The consumer stopped reading before the final response.
+        outcome = "abandoned"
+    else:
+        outcome = "ok"
+    _LLM_REQUESTS.inc(model, outcome)
+    if first_chunk_at is None:
+        return
+    _LLM_TTFT_SECONDS.observe(first_chunk_at - started_at, model)
+    generation = end - first_chunk_at
+    if final is not None and final.usage.completion_tokens > 0 and generation > 0:
+        _LLM_TOKENS_PER_SECOND.observe(final.usage.completion_tokens / generation, model)
+
+
+def _hook_span(hook: Any, phase: str) -> Any:
+    """Trace one hook call as ``hook.<phase>.<HookClass>``."""
+    return trace_span(f"hook.{phase}.{type(hook).__name__}")
 
 
 async def _run_tool_with_hooks(
@@ -117,23 +257,28 @@ async def _run_tool_with_hooks(
     tool_name = tool_call.function.name
     tool_arguments = tool_call.function.arguments
 
-    intercepted = None
-    for hook in hooks:
-        fn = getattr(hook, "before_tool", None)
-        if fn:
-            intercepted = fn(tool_name, tool_arguments)
-            if intercepted is not None:
-                break
+    started_at = time.perf_counter()
+    with trace_span(f"tool.{tool_name}", tool_call_id=tool_call.id):
+        intercepted = None
+        for hook in hooks:
+            fn = getattr(hook, "before_tool", None)
+            if fn:
+                with _hook_span(hook, "before_tool"):
+                    intercepted = fn(tool_name, tool_arguments)
+                if intercepted is not None:
+                    break
 
-    if intercepted is not None:
-        tool_result = intercepted
-    else:
-        tool_result = await _execute_tool_call(tool_name, tool_arguments, tools)
+        if intercepted is not None:
+            tool_result = intercepted
+        else:
+            tool_result = await _execute_tool_call(tool_name, tool_arguments, tools)
 
-    for hook in hooks:
-        fn = getattr(hook, "after_tool", None)
-        if fn:
-            tool_result = fn(tool_name, tool_arguments, tool_result)
+        for hook in hooks:
+            fn = getattr(hook, "after_tool", None)
+            if fn:
+                with _hook_span(hook, "after_tool"):
+                    tool_result = fn(tool_name, tool_arguments, tool_result)
+    _TOOL_SECONDS.observe(time.perf_counter() - started_at, tool_name)
 
     return {
         "role": "tool",
@@ -175,9 +320,11 @@ async def run_turn(
     for hook in hooks:
         fn = getattr(hook, "on_turn_start", None)
         if fn:
-            fn(agent.name)
+            with _hook_span(hook, "on_turn_start"):
+                fn(agent.name)
 
     parallel_cfg = _get_parallel_config()
+    keep_image_iterations = _get_media_config().keep_image_iterations
     final_content: str | None = None
     iteration = 0
     try:
@@ -185,112 +332,121 @@ async def run_turn(
             iteration += 1
             logger.debug("Tool loop iteration %d for agent '%s'", iteration, agent.name)
 
-            try:
-                # ── before_model hooks ───────────────────────────────────
-                for hook in hooks:
-                    fn = getattr(hook, "before_model", None)
-                    if fn:
-                        await fn(history, iteration, agent.name)
-
-                # Stream deltas to frontend as tokens arrive
-                response: ChatResponse | None = None
-                streamed_deltas = False
-                async for chunk in _stream_chat_with_retries(
-                    provider,
-                    model=agent.model,
-                    messages=history.messages,
-                    tools=agent_state.tools,
-                    options=agent.options,
-                    think=agent.think,
-                ):
-                    if isinstance(chunk, ChatDelta):
-                        streamed_deltas = True
+            with trace_span("iteration", agent_name=agent.name, iteration=iteration):
+                try:
+                    # ── before_model hooks ───────────────────────────────────
+                    for hook in hooks:
+                        fn = getattr(hook, "before_model", None)
+                        if fn:
+                            with _hook_span(hook, "before_model"):
+                                await fn(history, iteration, agent.name)
+
+                    # Stream deltas to frontend as tokens arrive
+                    response: ChatResponse | None = None
+                    streamed_deltas = False
+                    async for chunk in _stream_chat_with_retries(
+                        provider,
+                        model=agent.model,
+                        # Old images stay in history but not in the request.
+                        messages=drop_stale_images(history.messages, keep_image_iterations),
+                        tools=agent_state.tools,
+                        options=agent.options,
+                        think=agent.think,
+                        provider_name=agent.provider,
+                    ):
+                        if isinstance(chunk, ChatDelta):
+                            streamed_deltas = True
+                            try:
+                                publish_event(AgentEvent(payload=ContentPayload(
+                                    type="content",
+                                    content=chunk.content,
+                                    thinking=chunk.thinking,
+                                    delta=True,
+                                )))
+                            except Exception:  # pragma: no cover - defensive
+                                logger.exception("Failed to publish delta event")
+                        elif isinstance(chunk, ChatResponse):
+                            response = chunk
+
+                    if response is None:
+                        raise ToolLoopError("No ChatResponse received from provider")
+
+                    # ── after_model hooks (chain: each can rewrite response) ─
+                    for hook in hooks:
+                        fn = getattr(hook, "after_model", None)
+                        if fn:
+                            with _hook_span(hook, "after_model"):
+                                response = await fn(response, history, iteration, agent.name)
+
+                    content = response.message.content
+                    thinking = response.message.thinking
+                    tool_calls = response.message.tool_calls
+                    # Serialize tool calls to plain dicts for history storage so
+                    # providers can reconstruct their own types on the next turn.
+                    serialized_tool_calls = [tc.model_dump() for tc in tool_calls] if tool_calls else None
+                    assistant_message = {
+                        "role": "assistant",
+                        "content": content,
+                        "tool_calls": serialized_tool_calls,
+                        "thinking": thinking,
+                        "agent_name": get_current_agent_name(),
+                    }
+                    history.append(assistant_message)
+                    # Emit full content only if no deltas were streamed (fallback path)
+                    if not streamed_deltas:
                         try:
                             publish_event(AgentEvent(payload=ContentPayload(
-                                type="content",
-                                content=chunk.content,
-                                thinking=chunk.thinking,
-                                delta=True,
+                                type="content", content=content, thinking=thinking,
                             )))
                         except Exception:  # pragma: no cover - defensive
-                            logger.exception("Failed to publish delta event")
-                    elif isinstance(chunk, ChatResponse):
-                        response = chunk
-
-                if response is None:
-                    raise ToolLoopError("No ChatResponse received from provider")
-
-                # ── after_model hooks (chain: each can rewrite response) ─
-                for hook in hooks:
-                    fn = getattr(hook, "after_model", None)
-                    if fn:
-                        response = await fn(response, history, iteration, agent.name)
-
-                content = response.message.content
-                thinking = response.message.thinking
-                tool_calls = response.message.tool_calls
-                # Serialize tool calls to plain dicts for history storage so
-                # providers can reconstruct their own types on the next turn.
-                serialized_tool_calls = [tc.model_dump() for tc in tool_calls] if tool_calls else None
-                assistant_message = {
-                    "role": "assistant",
-                    "content": content,
-                    "tool_calls": serialized_tool_calls,
-                    "thinking": thinking,
-                    "agent_name": get_current_agent_name(),
-                }
-                history.append(assistant_message)
-                # Emit full content only if no deltas were streamed (fallback path)
-                if not streamed_deltas:
-                    try:
-                        publish_event(AgentEvent(payload=ContentPayload(
-                            type="content", content=content, thinking=thinking,
-                        )))
-                    except Exception:  # pragma: no cover - defensive
-                        logger.exception("Failed to publish model AgentEvent event")
-                if content is not None:
-                    final_content = content
-
-                if not tool_calls:
+                            logger.exception("Failed to publish model AgentEvent event")
+                    if content is not None:
+                        final_content = content
+
+                    if not tool_calls:
+                        _publish_turn_end()
+                        return final_content
+
+                    tool_names = [tc.function.name for tc in tool_calls]
+                    logger.debug("Executing %d tool call(s) for '%s': %s", len(tool_calls), agent.name, tool_names)
+
+                    parallel = parallel_cfg.enabled and len(tool_calls) > 1
+                    if parallel:
+                        logger.info(
+                            "Running %d tool calls in parallel for '%s' (max_concurrent=%d)",
+                            len(tool_calls),
+                            agent.name,
+                            parallel_cfg.max_concurrent,
+                        )
+                    sem = asyncio.Semaphore(parallel_cfg.max_concurrent if parallel else 1)
+
+                    async def _run(tc_item):
+                        async with sem:
+                            return await _run_tool_with_hooks(tc_item, agent_state.tools, hooks)
+
+                    results = await asyncio.gather(*[_run(tc) for tc in tool_calls])
+                    for tool_result in results:
+                        history.append(tool_result)
+
+                except StopRequestedError:
+                    logger.info("Agent '%s' tool loop stopped by user request", agent.name)
                     _publish_turn_end()
-                    return final_content
-
-                tool_names = [tc.function.name for tc in tool_calls]
-                logger.debug("Executing %d tool call(s) for '%s': %s", len(tool_calls), agent.name, tool_names)
-
-                parallel = parallel_cfg.enabled and len(tool_calls) > 1
-                if parallel:
-                    logger.info(
-                        "Running %d tool calls in parallel for '%s' (max_concurrent=%d)",
-                        len(tool_calls),
-                        agent.name,
-                        parallel_cfg.max_concurrent,
-                    )
-                sem = asyncio.Semaphore(parallel_cfg.max_concurrent if parallel else 1)
-
-                async def _run(tc_item):
-                    async with sem:
-                        return await _run_tool_with_hooks(tc_item, agent_state.tools, hooks)
-
-                results = await asyncio.gather(*[_run(tc) for tc in tool_calls])
-                for tool_result in results:
-                    history.append(tool_result)
-
-            except StopRequestedError:
-                logger.info("Agent '%s' tool loop stopped by user request", agent.name)
-                _publish_turn_end()
-                raise
-            except Exception as exc:
-                logger.exception("Unhandled exception in tool loop")
-                error_msg = str(exc) if isinstance(exc, ProviderError) else "An error occurred while processing your message."
-                publish_event(AgentEvent(payload=ContentPayload(type="content", content=error_msg)))
-                _publish_turn_end()
-                raise ToolLoopError(error_msg) from exc
+                    raise
+                except Exception as exc:
+                    logger.exception("Unhandled exception in tool loop")
+                    if isinstance(exc, ProviderError):
+                        error_msg = str(exc)
+                    else:
+                        error_msg = "An error occurred while processing your message."
+                    publish_event(AgentEvent(payload=ContentPayload(type="content", content=error_msg)))
+                    _publish_turn_end()
+                    raise ToolLoopError(error_msg) from exc
     finally:
         for hook in hooks:
             fn = getattr(hook, "on_turn_end", None)
             if fn:
                 try:
-                    fn(final_content, agent.name)
+                    with _hook_span(hook, "on_turn_end"):
+                        fn(final_content, agent.name)
                 except Exception:  # pragma: no cover - defensive
                     logger.exception("on_turn_end hook failed")
@@ -23,6 +23,8 @@ if TYPE_CHECKING:
 
 from sdk.events._context import _current_dispatcher
 from sdk.events._dispatcher import EventDispatcher, EventHandler
+from sdk.tracing import trace_turn
+from utils.metrics import Gauge
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,9 @@ _DEFAULT_CONVERSATION_ID = "default"
 # Conversations that currently have an active turn.
 _active_conversations: set[str] = set()
 
+_ACTIVE_TURNS = Gauge("computron_active_turns", "Conversations with a turn in flight.")
+_ACTIVE_TURNS.set_function(lambda: len(_active_conversations))
+
 # Per-conversation stop events so the HTTP stop endpoint can target a specific
 # conversation without interfering with others.
 _active_stop_events: dict[str, asyncio.Event] = {}
@@ -101,6 +106,7 @@ async def turn_scope(
     - The conversation is registered as active so ``is_turn_active`` returns True
     - If a handler is provided, it is subscribed for the duration of the turn
     - In-flight async handler tasks are drained before teardown
+    - The turn is traced into the conversation's span buffer (``sdk.tracing``)
     - Teardown always occurs, even if the body raises
 
     Args:
@@ -119,11 +125,12 @@ async def turn_scope(
     stop_token = _stop_event.set(stop_event)
     conversation_token = _conversation_id.set(sid)
     try:
-        if handler is not None:
-            async with dispatcher.subscription(handler):
+        with trace_turn(sid):
+            if handler is not None:
+                async with dispatcher.subscription(handler):
+                    yield None
+            else:
                 yield None
-        else:
-            yield None
     finally:
         try:
             await dispatcher.drain()
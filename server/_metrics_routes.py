@@ -0,0 +1,26 @@
+"""HTTP route exposing process metrics for Prometheus scrapes."""
+
+from aiohttp import web
+
+from utils.metrics import render_prometheus
+
+
+async def handle_metrics(_request: web.Request) -> web.Response:
+    """Return every registered metric in the Prometheus text format.
+
+    Counters and histograms cover model TTFT and tokens/sec per model, tool
+    and broker-verb latency, compactions, task durations and conversation
+    cache hits/evictions; gauges cover active turns, cache size, task queue
+    depth and pending event-handler tasks.
+    """
+    response = web.Response(text=render_prometheus(), content_type="text/plain")
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    return response
+
+
+def register_metrics_routes(app: web.Application) -> None:
+    """Register the metrics route on the application."""
+    app.router.add_route("GET", "/metrics", handle_metrics)
+
+
+__all__ = ["register_metrics_routes"]
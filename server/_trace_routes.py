@@ -0,0 +1,49 @@
+"""HTTP route for per-turn latency traces."""
+
+from aiohttp import web
+
+from sdk.tracing import get_trace, query_spans, summarize, to_chrome_trace
+
+
+async def handle_conversation_trace(request: web.Request) -> web.Response:
+    """Return a conversation's recorded spans.
+
+    Query parameters:
+        turn: A turn number, or a negative offset from the latest
+            (``-1`` = last turn). Default: every turn still buffered.
+        name: Only spans with this name or dotted prefix (e.g. ``tool``).
+        min_ms: Only spans at least this long.
+        format: ``chrome`` for Chrome trace-event JSON (loads in Perfetto
+            or ``chrome://tracing``); otherwise spans plus a per-name breakdown.
+    """
+    conversation_id = request.match_info["conversation_id"]
+    buffer = get_trace(conversation_id)
+    if buffer is None:
+        return web.json_response({"error": "No trace recorded for this conversation"}, status=404)
+
+    try:
+        turn = int(request.query["turn"]) if "turn" in request.query else None
+        min_ms = float(request.query["min_ms"]) if "min_ms" in request.query else None
+    except ValueError:
+        return web.json_response({"error": "turn must be an integer and min_ms a number"}, status=400)
+    spans = query_spans(buffer, turn=turn, name=request.query.get("name"), min_ms=min_ms)
+
+    if request.query.get("format") == "chrome":
+        return web.json_response(
+            to_chrome_trace(spans, process_name=f"conversation {conversation_id}"),
+            headers={"Content-Disposition": f'attachment; filename="trace-{conversation_id}.json"'},
+        )
+    return web.json_response({
+        "conversation_id": conversation_id,
+        "turns": buffer.turns,
+        "breakdown": summarize(spans),
+        "spans": [span.to_dict() for span in spans],
+    })
+
+
+def register_trace_routes(app: web.Application) -> None:
+    """Register trace routes on the application."""
+    app.router.add_route("GET", "/api/conversations/{conversation_id}/trace", handle_conversation_trace)
+
+
+__all__ = ["register_trace_routes"]
@@ -33,16 +33,19 @@ from conversations import (
 from conversations import (
     list_conversations as _list_conversations,
 )
+from sdk.tracing import clear_trace
 from sdk.turn import is_turn_active, queue_nudge, request_stop
 from server._feature_routes import register_feature_routes
 from server._integrations_oauth_routes import register_oauth_routes
 from server._integrations_routes import register_integrations_routes
+from server._metrics_routes import register_metrics_routes
 from server._model_routes import register_model_routes
 from server._profile_routes import register_profile_routes
 from server._provider_routes import register_provider_routes
 from server._settings_routes import register_settings_routes
 from server._setup_routes import register_setup_routes
 from server._task_routes import register_task_routes
+from server._trace_routes import register_trace_routes
 from server.message_handler import handle_user_message, resume_conversation
 from tools.custom_tools.registry import delete_tool, list_tools
 from tools.desktop._exec import DesktopExecError
@@ -330,6 +333,7 @@ async def delete_conversation_handler(request: Request) -> Response:
     """Delete a conversation and all its turns/history."""
     conversation_id = request.match_info["conversation_id"]
     found = _delete_conversation(conversation_id)
+    clear_trace(conversation_id)
     if not found:
         return web.json_response({"error": "Conversation not found"}, status=404)
     return web.Response(status=204)
@@ -419,6 +423,12 @@ def create_app(*, client_max_size: int = 10 * 1024**2) -> web.Application:
     app.router.add_route("POST", "/api/conversations/sessions/{conversation_id}/resume", resume_conversation_handler)
     app.router.add_route("DELETE", "/api/conversations/sessions/{conversation_id}", delete_conversation_handler)
 
+    # Per-turn latency traces
+    register_trace_routes(app)
+
+    # Prometheus metrics
+    register_metrics_routes(app)
+
     # Task engine routes
     register_task_routes(app)
 
@@ -622,6 +632,9 @@ async def _stop_deferred_subsystems(app: web.Application) -> None:
     runner = app.get("task_runner")
     if runner:
         await runner.stop()
+    from sdk.providers._http import close_http_clients
+
+    await close_http_clients()
 
 
 __all__ = ["create_app"]
@@ -6,7 +6,6 @@ from collections import OrderedDict
 from collections.abc import AsyncGenerator, Callable, Sequence
 from contextlib import suppress
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
@@ -24,6 +23,7 @@ from conversations import (
     save_conversation_title,
     save_loaded_skills,
 )
+from logging_config import log_event
 from sdk import (
     PersistenceHook,
     default_hooks,
@@ -45,13 +45,13 @@ from sdk.turn._turn import StopRequestedError
 from tools.browser.core import release_agent_browser
 from tools.memory import load_memory
 from tools.virtual_computer.receive_file import receive_attachment
+from utils.metrics import Counter, Gauge
 
 logger = logging.getLogger(__name__)
-_console = Console(stderr=True)
 
 
 def _log_turn_start(profile: AgentProfile) -> None:
-    """Print a Rich panel showing the active profile and its settings."""
+    """Log a ``turn.start`` event with the active profile and its settings."""
     body = Text()
     body.append("profile: ", style="bold")
     body.append(profile.name, style="bright_magenta")
@@ -90,13 +90,15 @@ def _log_turn_start(profile: AgentProfile) -> None:
         body.append("\nparams:  ", style="bold")
         body.append(", ".join(params), style="dim")
 
-    _console.print(
-        Panel(
+    log_event(
+        "turn.start", "Turn with profile %s (%s)", profile.id, profile.model or "-",
+        profile=profile.id, model=profile.model, skills=profile.skills, params=params,
+        panel=Panel(
             body,
             title="[bold bright_magenta]🤖 Agent Turn[/bold bright_magenta]",
             border_style="bright_magenta",
             expand=False,
-        )
+        ),
     )
 
 
@@ -107,6 +109,13 @@ def _log_turn_start(profile: AgentProfile) -> None:
 _MAX_CACHED_CONVERSATIONS = 25
 _conversations: OrderedDict[str, ConversationHistory] = OrderedDict()
 
+_CACHE_LOOKUPS = Counter(
+    "computron_conversation_cache_lookups", "In-memory conversation cache lookups by result.", ("result",),
+)
+_CACHE_EVICTIONS = Counter("computron_conversation_cache_evictions", "Conversations evicted from the in-memory cache.")
+_CACHE_SIZE = Gauge("computron_conversation_cache_size", "Conversations held in the in-memory cache.")
+_CACHE_SIZE.set_function(lambda: len(_conversations))
+
 # Track background tasks to avoid garbage collection (RUF006)
 _background_tasks: set[asyncio.Task] = set()
 
@@ -129,8 +138,10 @@ async def _get_conversation(conversation_id: str) -> tuple[ConversationHistory,
         msg = "conversation_id is required"
         raise ValueError(msg)
     if conversation_id in _conversations:
+        _CACHE_LOOKUPS.inc("hit")
         _conversations.move_to_end(conversation_id)
         return _conversations[conversation_id], False
+    _CACHE_LOOKUPS.inc("miss")
     persisted = load_conversation_history(conversation_id)
     is_new = persisted is None
     if is_new:
@@ -160,6 +171,7 @@ async def _evict_lru_conversation(exclude: str | None = None) -> None:
                 continue
             if not is_turn_active(cid):
                 _conversations.pop(cid)
+                _CACHE_EVICTIONS.inc()
                 await release_agent_browser(f"conv:{cid}")
                 logger.info(
                     "Evicted LRU conversation %s from in-memory cache", cid,
@@ -145,6 +145,10 @@ function DesktopAppInner({ dark, onToggleTheme }) {
         onAgentContextUsage: ({ agentId, iteration, maxIterations, contextUsage }) => {
             agentDispatch({ type: 'UPDATE_ITERATION', agentId, iteration, maxIterations, contextUsage });
         },
+        // Agent waiting for (or granted) a rate-limited model call
+        onAgentQueued: ({ agentId, queued, position }) => {
+            agentDispatch({ type: 'UPDATE_QUEUED', agentId, queued, position });
+        },
         // Agent file output — activity log entry is buffered by
         // useStreamingChat, this callback handles any side effects.
         onAgentFileOutput: () => {},
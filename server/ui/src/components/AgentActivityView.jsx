@@ -78,6 +78,11 @@ export default function AgentActivityView({ onNudge, onPreview }) {
                             </span>
                         )}
                         <ContextUsageBadge contextUsage={agent.contextUsage} />
+                        {agent.queued !== null && agent.queued !== undefined && (
+                            <span data-testid="agent-queued" title="Waiting for the model's rate limit">
+                                queued #{agent.queued}
+                            </span>
+                        )}
                         {agent.childIds.length > 0 && (
                             <span>{agent.childIds.length} sub-agent{agent.childIds.length !== 1 ? 's' : ''}</span>
                         )}
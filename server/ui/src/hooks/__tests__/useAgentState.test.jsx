@@ -281,6 +281,31 @@ describe('useAgentState reducer', () => {
         });
     });
 
+    // ── Rate-limiter queue ─────────────────────────────────────────
+
+    describe('UPDATE_QUEUED', () => {
+        it('tracks the queue position until the call is granted', () => {
+            const { getState, dispatch } = renderWithProvider();
+
+            dispatch(agentStarted('root-1'));
+            dispatch({ type: 'UPDATE_QUEUED', agentId: 'root-1', queued: true, position: 3 });
+            expect(getState().agents['root-1'].queued).toBe(3);
+
+            dispatch({ type: 'UPDATE_QUEUED', agentId: 'root-1', queued: false, position: null });
+            expect(getState().agents['root-1'].queued).toBeNull();
+        });
+
+        it('AGENT_COMPLETED clears a stale queued flag', () => {
+            const { getState, dispatch } = renderWithProvider();
+
+            dispatch(agentStarted('root-1'));
+            dispatch({ type: 'UPDATE_QUEUED', agentId: 'root-1', queued: true, position: 1 });
+            dispatch(agentCompleted('root-1', 'error'));
+
+            expect(getState().agents['root-1'].queued).toBeNull();
+        });
+    });
+
     // ── Open/close file tabs ───────────────────────────────────────
 
     describe('OPEN_FILE', () => {
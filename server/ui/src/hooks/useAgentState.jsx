@@ -43,6 +43,7 @@ function _makeAgent(id, name, parentId, instruction, startedAt) {
         iteration: null,         // current loop iteration
         maxIterations: null,     // budget limit
         contextUsage: null,      // how full the context window is
+        queued: null,            // queue position while waiting on the rate limiter
     };
 }
 
@@ -110,7 +111,7 @@ function _agentReducer(state, action) {
                 ...state,
                 agents: {
                     ...state.agents,
-                    [agentId]: { ...agent, status, activeTool: null, completedAt: Date.now() },
+                    [agentId]: { ...agent, status, activeTool: null, queued: null, completedAt: Date.now() },
                 },
             };
         }
@@ -277,6 +278,19 @@ function _agentReducer(state, action) {
             };
         }
 
+        case 'UPDATE_QUEUED': {
+            const { agentId, queued, position } = action;
+            const agent = state.agents[agentId];
+            if (!agent) return state;
+            return {
+                ...state,
+                agents: {
+                    ...state.agents,
+                    [agentId]: { ...agent, queued: queued ? (position || 1) : null },
+                },
+            };
+        }
+
         case 'OPEN_FILE': {
             const { agentId, item } = action;
             const agent = state.agents[agentId];
@@ -110,6 +110,17 @@ function _handleStreamEvent(data, callbacks) {
             });
         }
     }
+
+    // Model call waiting on the client-side rate limiter → "queued" badge
+    if (type === 'model_queue') {
+        if (callbacks.onAgentQueued && agentId) {
+            callbacks.onAgentQueued({
+                agentId,
+                queued: payload.queued,
+                position: payload.position ?? null,
+            });
+        }
+    }
 }
 
 /**
@@ -7,8 +7,7 @@ wizard or the settings page).
 
 import json
 import logging
-import os
-import tempfile
+import threading
 import urllib.parse
 from pathlib import Path
 from typing import Any
@@ -16,6 +15,7 @@ from typing import Any
 from pydantic import BaseModel, ConfigDict, field_validator
 
 from config import load_config
+from utils.file_cache import WatchedValue, atomic_write_text
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +52,11 @@ _DEFAULTS: dict[str, Any] = {
     },
     "title_provider": "",
     "title_model": "",
+    # Extra [{"provider": ..., "model": ...}] candidates per role, used for
+    # hedged requests and when the configured model is failing.
+    "vision_fallbacks": [],
+    "compaction_fallbacks": [],
+    "title_fallbacks": [],
 }
 
 # Metadata service IPs that must never be reachable via user-supplied URLs.
@@ -89,6 +94,9 @@ class SettingsUpdate(BaseModel):
     compaction_options: dict[str, Any] | None = None
     title_provider: str | None = None
     title_model: str | None = None
+    vision_fallbacks: list[dict[str, str]] | None = None
+    compaction_fallbacks: list[dict[str, str]] | None = None
+    title_fallbacks: list[dict[str, str]] | None = None
 
     @field_validator("direct_providers")
     @classmethod
@@ -104,12 +112,51 @@ class SettingsUpdate(BaseModel):
             _validate_base_url(base_url)
         return v
 
+    @field_validator("vision_fallbacks", "compaction_fallbacks", "title_fallbacks")
+    @classmethod
+    def _validate_fallbacks(cls, v: list[dict[str, str]] | None) -> list[dict[str, str]] | None:
+        for entry in v or ():
+            if not entry.get("provider") or not entry.get("model"):
+                raise ValueError("fallback entries need a provider and a model")
+        return v
+
 
 def _settings_path() -> Path:
     cfg = load_config()
     return Path(cfg.settings.home_dir) / _SETTINGS_FILE
 
 
+def _read_settings(path: Path, previous: dict[str, Any] | None) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return dict(_DEFAULTS)
+    except Exception:
+        if previous is not None:
+            # Most likely a non-atomic external edit caught mid-write; the
+            # completed write triggers another reload.
+            logger.warning("Failed to read settings file, keeping last good settings")
+            return previous
+        logger.warning("Failed to read settings file, using defaults")
+        return dict(_DEFAULTS)
+
+
+def _json_copy(value: Any) -> Any:
+    """Deep-copy a JSON-shaped value (4x faster than ``copy.deepcopy``)."""
+    if type(value) is dict:
+        return {k: _json_copy(v) for k, v in value.items()}
+    if type(value) is list:
+        return [_json_copy(v) for v in value]
+    return value
+
+
+# Parsed settings.json, reloaded only when the file changes on disk.
+_settings_cache: WatchedValue[dict[str, Any]] = WatchedValue(_read_settings)
+
+# Serializes read-merge-write cycles in save_settings().
+_save_lock = threading.Lock()
+
+
 def load_settings() -> dict[str, Any]:
     """Return the settings dict.
 
@@ -120,14 +167,11 @@ def load_settings() -> dict[str, Any]:
 
     Before the file has ever been written (a brand-new install, pre-wizard)
     this returns a copy of _DEFAULTS.
+
+    The parsed file is cached in-process and re-read only after it changes
+    on disk; each call returns a private copy the caller may mutate.
     """
-    path = _settings_path()
-    if path.exists():
-        try:
-            return json.loads(path.read_text())
-        except Exception:
-            logger.warning("Failed to read settings file, using defaults")
-    return dict(_DEFAULTS)
+    return _json_copy(_settings_cache.get(_settings_path()))
 
 
 def save_settings(data: dict[str, Any]) -> dict[str, Any]:
@@ -139,23 +183,14 @@ def save_settings(data: dict[str, Any]) -> dict[str, Any]:
     every default key. Later calls read the now-complete file and merge in
     ``data``, so it stays complete.
     """
-    current = load_settings()
-    current.update(data)
     path = _settings_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    # Atomic write: write to a temp file in the same directory, then rename.
-    # This prevents a corrupt settings.json if the process is killed mid-write.
-    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".settings_tmp_")
-    try:
-        with os.fdopen(fd, "w") as f:
-            f.write(json.dumps(current, indent=2))
-        os.replace(tmp_path, path)
-    except Exception:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        raise
+    with _save_lock:
+        current = load_settings()
+        current.update(data)
+        # Atomic write: readers (and a process killed mid-write) only ever
+        # see the old or the new file.
+        atomic_write_text(path, json.dumps(current, indent=2))
+        _settings_cache.set(path, _json_copy(current))
     return current
 
 
@@ -19,6 +19,7 @@ from tools.browser import (
     save_page_content,
     scroll_page,
     select_option,
+    wait_for_download,
 )
 from tools.virtual_computer import run_bash_cmd
 
@@ -60,6 +61,8 @@ _SKILL = Skill(
         Click any file link to download it — the browser saves it automatically.
         The tool response will tell you the saved path. Then use run_bash_cmd
         to process the file (grep, head, cat, python, etc.).
+        Large files may come back as "Download in progress" with an id: call
+        wait_for_download("<id>") to get the saved path once it finishes.
 
         VISION vs REF-BASED TOOLS:
         Prefer ref-based tools (click, fill_field, drag, select_option) when
@@ -91,6 +94,7 @@ _SKILL = Skill(
         inspect_page,
         execute_javascript,
         save_page_content,
+        wait_for_download,
         run_bash_cmd,
     ],
 )
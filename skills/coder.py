@@ -9,6 +9,7 @@ from tools.virtual_computer import (
     install_packages,
     list_dir,
     read_file,
+    read_files,
     replace_in_file,
     run_bash_cmd,
     write_file,
@@ -30,6 +31,8 @@ _SKILL = Skill(
         READING FILES — always read a file before editing it. read_file returns
         content with embedded line numbers (cat -n style). Use grep to locate
         relevant code, then read_file(start=N, end=M) for targeted sections.
+        When you need several files (or sections), read them together with
+        read_files(["a.py", "b.py:40-120"]) instead of one read_file per turn.
 
         EDITING FILES — use apply_text_patch(path, old_text, new_text) for precise
         edits: old_text must match exactly one location in the file. Copy old_text
@@ -66,6 +69,7 @@ _SKILL = Skill(
     """),
     tools=[
         read_file,
+        read_files,
         grep,
         list_dir,
         write_file,
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from utils.metrics import Gauge, Histogram
+
 if TYPE_CHECKING:
     from config import GoalsConfig
     from tasks._executor import TaskExecutor
@@ -17,6 +20,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_QUEUE_DEPTH = Gauge("computron_task_queue_depth", "Ready tasks waiting for a free runner slot (as of the last tick).")
+_RUNNING = Gauge("computron_tasks_running", "Tasks currently executing.")
+_TASK_SECONDS = Histogram(
+    "computron_task_duration_seconds",
+    "Task execution time by outcome.",
+    ("outcome",),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+
 
 class TaskRunner:
     """Background loop that polls for ready tasks and executes them.
@@ -104,9 +116,11 @@ class TaskRunner:
             self._store.stamp_last_run_spawned(goal.id)
             logger.info("Spawned run #%d for goal %s", run.run_number, goal.id)
 
+        waiting = 0
         for task_result, task in self._store.get_ready_task_results():
             if len(self._running) >= self._config.max_concurrent:
-                break
+                waiting += 1
+                continue
             if task_result.id not in self._running:
                 self._store.mark_task_result_running(task_result.id)
                 self._store.update_run_status(task_result.run_id)
@@ -120,15 +134,20 @@ class TaskRunner:
         for trid in done:
             del self._running[trid]
             self._running_goal_ids.pop(trid, None)
+        _QUEUE_DEPTH.set(waiting)
+        _RUNNING.set(len(self._running))
 
     async def _execute(self, task_result: "TaskResult", task: "Task") -> None:
         """Execute a task, recording outcome into its result."""
+        started_at = time.monotonic()
         try:
             result_text, file_paths = await self._executor.run(task_result, task)
+            _TASK_SECONDS.observe(time.monotonic() - started_at, "completed")
             if file_paths:
                 self._store.set_file_outputs(task_result.id, file_paths)
             self._store.mark_task_result_completed(task_result.id, result_text)
         except Exception:
+            _TASK_SECONDS.observe(time.monotonic() - started_at, "failed")
             error_msg = traceback.format_exc()
             logger.exception("Task %s failed", task.description)
 
@@ -169,6 +169,22 @@ class TestEnabledFilter:
         assert p is not None
         assert p.enabled is True
 
+    def test_external_edit_is_picked_up(self, tmp_path):
+        """Edits made outside the process show up on the next lookup."""
+        save_agent_profile(_make_profile())
+        assert get_agent_profile("test").name == "Test"
+        path = tmp_path / "agent_profiles" / "test.json"
+        data = json.loads(path.read_text())
+        data["name"] = "Edited"
+        path.write_text(json.dumps(data))
+        assert get_agent_profile("test").name == "Edited"
+
+    def test_returned_profiles_are_copies(self):
+        """Mutating a returned profile does not change the cached one."""
+        save_agent_profile(_make_profile(skills=["coder"]))
+        get_agent_profile("test").skills.append("browser")
+        assert get_agent_profile("test").skills == ["coder"]
+
 
 @pytest.mark.unit
 class TestDuplicate:
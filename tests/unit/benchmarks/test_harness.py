@@ -0,0 +1,76 @@
+"""Unit tests for the benchmark harness and baseline comparison."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from benchmarks import Report, Result, compare, registered_cases
+from benchmarks.__main__ import main
+from benchmarks._harness import latency, throughput
+
+
+def _report(*results: Result) -> Report:
+    return Report(results=list(results))
+
+
+@pytest.mark.unit
+class TestResults:
+    """Building results from raw samples."""
+
+    def test_latency_scales_and_divides(self):
+        result = latency("x", [0.001, 0.002, 0.003], unit="us", per=10, size=5)
+        assert result.key == "x[size=5]"
+        assert result.median == pytest.approx(200.0)
+        assert result.p95 == pytest.approx(300.0)
+        assert result.higher_is_better is False
+
+    def test_throughput_tail_is_the_slow_end(self):
+        result = throughput("y", [1.0, 2.0, 4.0], amount=8.0, unit="MB/s")
+        assert result.median == pytest.approx(4.0)
+        assert result.p95 == pytest.approx(2.0)
+        assert result.higher_is_better is True
+
+
+@pytest.mark.unit
+class TestCompare:
+    """Regression detection against a baseline."""
+
+    def test_slower_latency_beyond_threshold_regresses(self):
+        baseline = _report(latency("a", [1.0]), latency("b", [1.0]))
+        current = _report(latency("a", [1.5]), latency("b", [1.1]))
+        by_key = {c.key: c for c in compare(current, baseline, threshold=0.2)}
+        assert by_key["a"].regressed is True
+        assert by_key["a"].change == pytest.approx(0.5)
+        assert by_key["b"].regressed is False
+
+    def test_lower_throughput_regresses(self):
+        baseline = _report(throughput("t", [1.0], amount=100, unit="MB/s"))
+        faster = _report(throughput("t", [0.5], amount=100, unit="MB/s"))
+        slower = _report(throughput("t", [2.0], amount=100, unit="MB/s"))
+        assert compare(faster, baseline, threshold=0.2)[0].regressed is False
+        assert compare(slower, baseline, threshold=0.2)[0].regressed is True
+
+    def test_unmatched_results_are_skipped(self):
+        baseline = _report(latency("a", [1.0], size=1))
+        current = _report(latency("a", [1.0], size=2), latency("new", [1.0]))
+        assert compare(current, baseline, threshold=0.2) == []
+
+
+@pytest.mark.unit
+def test_cli_writes_report_and_flags_regressions(tmp_path, capsys):
+    assert "context.stats" in registered_cases()
+    out = tmp_path / "report.json"
+    assert main(["context.stats", "--quick", "--json", str(out)]) == 0
+    report = Report.model_validate_json(out.read_text())
+    assert {r.name for r in report.results} == {"context.stats"}
+
+    # A baseline far faster than anything achievable makes every result a regression.
+    data = json.loads(out.read_text())
+    for result in data["results"]:
+        result["median"] /= 1000
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(data))
+    assert main(["context.stats", "--quick", "--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,177 @@
+"""Unit tests for the inference server's job scheduler."""
+
+from __future__ import annotations
+
+import importlib.util
+import threading
+from pathlib import Path
+
+import pytest
+
+_JOBS_PATH = Path(__file__).resolve().parents[3] / "container" / "inference_jobs.py"
+_spec = importlib.util.spec_from_file_location("inference_jobs", _JOBS_PATH)
+inference_jobs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(inference_jobs)
+
+_BASES = {"fast": "schnell", "quality": "dev", "photorealistic": "dev"}
+
+
+def _affinity(gen_type, body):
+    if gen_type == "image":
+        return _BASES[body["model"]], body["model"]
+    return gen_type, gen_type
+
+
+def _complete(job):
+    job.emit({"status": "complete", "path": "/out/%s.png" % job.body["model"]})
+    return {"path": "/out.png"}
+
+
+def _scheduler(runner=_complete, loaded=None):
+    scheduler = inference_jobs.JobScheduler(runner, _affinity)
+    scheduler._loaded = loaded
+    return scheduler
+
+
+def _models(scheduler):
+    return [info["model"] for info in scheduler.jobs()]
+
+
+@pytest.mark.unit
+class TestOrdering:
+    """Priority, model affinity and anti-starvation."""
+
+    def test_priority_then_loaded_model_then_base_then_fifo(self):
+        scheduler = _scheduler(loaded=("dev", "quality"))
+        for model in ("fast", "photorealistic", "quality", "fast"):
+            scheduler.submit("image", {"model": model})
+        # The loaded model first, then a LoRA swap, before switching base.
+        assert _models(scheduler) == ["quality", "photorealistic", "fast", "fast"]
+
+        scheduler.submit("image", {"model": "fast"}, priority=5)
+        # The urgent job switches to schnell, so the other schnell jobs follow it.
+        assert _models(scheduler) == ["fast", "fast", "fast", "photorealistic", "quality"]
+        assert scheduler.jobs()[0]["priority"] == 5
+
+    def test_running_job_reports_its_model_as_loaded(self):
+        scheduler = _scheduler(loaded=("dev", "quality"))
+        fast = scheduler.submit("image", {"model": "fast"})
+        scheduler.submit("image", {"model": "quality"})
+        assert scheduler.position(fast) == 1
+
+    def test_passed_over_job_eventually_runs(self):
+        scheduler = _scheduler(loaded=("dev", "quality"))
+        video = scheduler.submit("video", {"model": None})
+        for _ in range(6):
+            scheduler.submit("image", {"model": "quality"})
+
+        order = [info["type"] for info in scheduler.jobs()]
+        assert order.index("video") == inference_jobs._MAX_BYPASS
+        assert scheduler.position(video) == inference_jobs._MAX_BYPASS
+
+
+@pytest.mark.unit
+class TestExecution:
+    """The worker thread, cancellation and streaming."""
+
+    def test_runs_jobs_and_keeps_results(self):
+        scheduler = _scheduler()
+        job = scheduler.submit("image", {"model": "fast"}, stream=False)
+        scheduler.start()
+        assert job.done.wait(5)
+        scheduler.close()
+
+        assert job.state == "complete"
+        assert job.result == {"path": "/out.png"}
+        assert scheduler.get(job.id) is job
+        assert not scheduler.busy()
+
+    def test_runner_error_fails_job(self):
+        def _boom(job):
+            raise RuntimeError("CUDA out of memory")
+
+        scheduler = _scheduler(_boom)
+        job = scheduler.submit("image", {"model": "fast"})
+        scheduler.start()
+        assert job.done.wait(5)
+        scheduler.close()
+
+        assert job.state == "failed"
+        assert job.error == "CUDA out of memory"
+        assert job.events.get_nowait()["status"] == "failed"
+
+    def test_cancel_queued_job(self):
+        scheduler = _scheduler()
+        job = scheduler.submit("image", {"model": "fast"})
+        assert scheduler.cancel(job.id) is job
+
+        assert job.state == "cancelled"
+        assert scheduler.jobs() == []
+        assert scheduler.cancel(job.id) is None  # already finished
+
+    def test_cancel_running_job_stops_at_next_step(self):
+        started = threading.Event()
+        steps = []
+
+        def _slow(job):
+            started.set()
+            for step in range(1000):
+                job.emit({"status": "generating", "step": step})
+                steps.append(step)
+                threading.Event().wait(0.01)
+
+        scheduler = _scheduler(_slow)
+        job = scheduler.submit("image", {"model": "fast"})
+        scheduler.start()
+        assert started.wait(5)
+        scheduler.cancel(job.id)
+        assert job.done.wait(5)
+        scheduler.close()
+
+        assert job.state == "cancelled"
+        assert len(steps) < 1000
+
+    def test_stream_reports_queue_position_then_progress(self):
+        release = threading.Event()
+
+        def _gated(job):
+            release.wait(5)
+            return _complete(job)
+
+        scheduler = _scheduler(_gated)
+        scheduler.submit("image", {"model": "fast"})
+        job = scheduler.submit("image", {"model": "fast"})
+        lines = []
+
+        def _write(event):
+            lines.append(event)
+            release.set()
+
+        scheduler.start()
+        scheduler.stream(job, _write, poll_s=0.01)
+        scheduler.close()
+
+        assert lines[0]["job_id"] == job.id
+        assert lines[0]["status"] == "loading"
+        assert lines[0]["queue_position"] in (0, 1)
+        assert lines[-1] == {"status": "complete", "path": "/out/fast.png"}
+
+    def test_disconnected_client_cancels_its_job(self):
+        scheduler = _scheduler()
+        job = scheduler.submit("image", {"model": "fast"})
+
+        def _write(event):
+            raise BrokenPipeError
+
+        scheduler.stream(job, _write, poll_s=0.01)
+        assert job.state == "cancelled"
+
+    def test_close_hands_queued_jobs_back(self):
+        scheduler = _scheduler()
+        job = scheduler.submit("image", {"model": "quality"})
+        scheduler.close(lambda queued: {"status": "restart_required", "model": queued.body["model"]})
+
+        assert job.state == "restart_required"
+        assert job.events.get_nowait() == {"status": "restart_required", "model": "quality"}
+        with pytest.raises(RuntimeError):
+            scheduler.submit("image", {"model": "fast"})
@@ -0,0 +1,206 @@
+"""Unit tests for the shared model residency coordinator."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+_RESIDENCY_PATH = Path(__file__).resolve().parents[3] / "container" / "model_residency.py"
+_spec = importlib.util.spec_from_file_location("model_residency", _RESIDENCY_PATH)
+model_residency = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(model_residency)
+
+Resident = model_residency.Resident
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def evicted():
+    return []
+
+
+@pytest.fixture
+def ollama():
+    """What the simulated Ollama holds; ``None`` while it is unreachable."""
+    return {"models": None}
+
+
+@pytest.fixture
+def registry(tmp_path, clock, evicted, ollama):
+    """A registry with a simulated 24 GB budget."""
+    return model_residency.Registry(
+        str(tmp_path / "residency.json"), budget=24_000, evictor=evicted.append, clock=clock,
+        ollama=lambda: ollama["models"],
+    )
+
+
+@pytest.mark.unit
+class TestPolicy:
+    """Pure eviction and TTL decisions."""
+
+    def test_nothing_evicted_when_it_fits(self):
+        residents = [Resident("grounding", 17_000)]
+        assert model_residency.plan_evictions(residents, budget_mb=24_000, need_mb=6_000, now=0) == []
+
+    def test_cheapest_to_lose_goes_first(self):
+        now = 10_000.0
+        residents = [
+            # Used a lot and slow to reload: worth keeping.
+            Resident("inference", 12_000, load_cost_s=40, uses=5, last_used=now - 60),
+            # Cheap to reload and used once long ago.
+            Resident("ollama:summarizer", 8_000, kind="ollama", model="summarizer", load_cost_s=5, uses=1,
+                     last_used=now - 3_600),
+        ]
+        plan = model_residency.plan_evictions(residents, budget_mb=24_000, need_mb=8_000, now=now)
+        assert [r.name for r in plan] == ["ollama:summarizer"]
+
+        plan = model_residency.plan_evictions(residents, budget_mb=24_000, need_mb=20_000, now=now)
+        assert [r.name for r in plan] == ["ollama:summarizer", "inference"]
+
+    def test_busy_and_excluded_residents_are_kept(self):
+        residents = [Resident("inference", 12_000, busy=1), Resident("grounding", 17_000)]
+        plan = model_residency.plan_evictions(
+            residents, budget_mb=24_000, need_mb=17_000, now=0, exclude={"grounding"},
+        )
+        assert plan == []
+
+    def test_no_budget_never_evicts(self):
+        assert model_residency.plan_evictions([Resident("a", 1e9)], budget_mb=None, need_mb=1e9, now=0) == []
+
+    def test_idle_ttl_grows_with_use_and_reload_cost(self):
+        now = 10_000.0
+        rare = Resident("a", 8_000, load_cost_s=5, uses=0, last_used=now)
+        hot = Resident("b", 8_000, load_cost_s=40, uses=4, last_used=now)
+        assert model_residency.idle_ttl(rare, now) == model_residency._MIN_IDLE_S
+        assert model_residency.idle_ttl(hot, now) > model_residency.idle_ttl(rare, now)
+        assert model_residency.idle_ttl(hot, now) <= model_residency._MAX_IDLE_S
+
+
+@pytest.mark.unit
+class TestRegistry:
+    """The shared registry file, with a simulated budget and clock."""
+
+    def test_acquire_evicts_to_fit_budget(self, registry, evicted, clock):
+        registry.acquire("ollama:summarizer", footprint_mb=8_000, kind="ollama", model="summarizer")
+        registry.acquire("inference", footprint_mb=12_000)
+        assert evicted == []
+
+        clock.now += 60
+        victims = registry.acquire("grounding", footprint_mb=17_000)
+
+        assert {v.name for v in victims} == {v.name for v in evicted}
+        assert sum(r.footprint_mb for r in registry.residents()) <= 24_000
+        assert "grounding" in {r.name for r in registry.residents()}
+
+    def test_busy_resident_survives_pressure(self, registry, evicted):
+        registry.acquire("inference", footprint_mb=12_000)
+        registry.touch("inference", busy=True)
+        registry.acquire("grounding", footprint_mb=17_000)
+
+        assert evicted == []
+        assert registry.should_release("inference") is False
+
+    def test_job_that_loads_before_registering_stays_busy(self, registry, evicted):
+        # A job marks the server busy before its first load registers it.
+        registry.touch("inference", busy=True)
+        registry.acquire("inference", footprint_mb=12_000, busy=True)
+        registry.acquire("grounding", footprint_mb=17_000)
+
+        assert evicted == []
+        registry.touch("inference", busy=False)
+        assert registry.acquire("grounding", footprint_mb=17_000)[0].name == "inference"
+
+    def test_busy_acquire_does_not_double_count(self, registry):
+        registry.acquire("inference", footprint_mb=12_000)
+        registry.touch("inference", busy=True)
+        registry.acquire("inference", busy=True)
+        registry.touch("inference", busy=False)
+
+        [resident] = registry.residents()
+        assert resident.busy == 0
+
+    def test_sweep_evicts_expired_residents(self, registry, evicted, clock):
+        registry.acquire("ollama:summarizer", kind="ollama", model="summarizer")
+        registry.acquire("inference", footprint_mb=12_000, pid=os.getpid())
+        for _ in range(3):
+            registry.touch("inference", load_cost_s=30)
+
+        clock.now += model_residency._MIN_IDLE_S + 1
+        victims = registry.sweep(exclude={"inference"})
+
+        assert [v.name for v in victims] == ["ollama:summarizer"]
+        # Frequently used and slow to reload: still within its longer TTL.
+        assert registry.should_release("inference") is False
+
+        clock.now += model_residency._MAX_IDLE_S
+        assert registry.should_release("inference") is True
+
+    def test_evicted_server_sees_it_should_release(self, registry):
+        registry.acquire("inference", footprint_mb=20_000)
+        registry.acquire("grounding", footprint_mb=17_000)
+        assert registry.should_release("inference") is True
+
+    def test_dead_servers_are_dropped(self, registry):
+        registry.acquire("grounding", footprint_mb=1, pid=2**22 + 12345)
+        assert registry.residents() == []
+
+
+@pytest.mark.unit
+class TestOllamaSync:
+    """Reconciling Ollama residents with the models Ollama holds."""
+
+    def test_unloaded_model_is_dropped_after_grace(self, registry, clock, ollama):
+        registry.acquire("ollama:summarizer", kind="ollama", model="summarizer")
+        ollama["models"] = {}
+        # Registered before the request that loads it: kept for a while.
+        assert [r.name for r in registry.residents()] == ["ollama:summarizer"]
+
+        clock.now += model_residency._OLLAMA_GRACE_S + 1
+        assert registry.residents() == []
+
+    def test_busy_model_is_kept(self, registry, clock, ollama):
+        registry.acquire("ollama:summarizer", kind="ollama", model="summarizer")
+        registry.touch("ollama:summarizer", busy=True)
+        ollama["models"] = {}
+        clock.now += model_residency._OLLAMA_GRACE_S + 1
+        assert [r.name for r in registry.residents()] == ["ollama:summarizer"]
+
+    def test_loaded_size_replaces_estimate(self, registry, ollama):
+        registry.acquire("ollama:summarizer", kind="ollama", model="summarizer")
+        ollama["models"] = {"summarizer:latest": 5_000.0}
+        [resident] = registry.residents()
+        assert resident.footprint_mb == 5_000.0
+
+    def test_unregistered_model_counts_but_is_never_evicted(self, registry, evicted, clock, ollama):
+        ollama["models"] = {"agent:30b": 20_000.0}
+        registry.acquire("inference", footprint_mb=12_000)
+
+        [agent] = [r for r in registry.residents() if r.external]
+        assert (agent.name, agent.model, agent.footprint_mb) == ("ollama:agent:30b", "agent:30b", 20_000.0)
+        assert evicted == []
+        clock.now += model_residency._MAX_IDLE_S + 1
+        assert [v.name for v in registry.sweep()] == ["inference"]
+
+        ollama["models"] = {}
+        assert registry.residents() == []
+
+    def test_claiming_an_external_model_manages_it(self, registry, ollama):
+        ollama["models"] = {"summarizer:latest": 5_000.0}
+        registry.acquire("ollama:summarizer:latest", kind="ollama", model="summarizer:latest")
+        [resident] = registry.residents()
+        assert resident.external is False
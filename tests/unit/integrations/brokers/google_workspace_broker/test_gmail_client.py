@@ -0,0 +1,116 @@
+"""GmailClient against a local stub of the Gmail API."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from integrations.brokers.google_workspace_broker._gmail_client import GmailClient
+from tests.unit.integrations.fixtures.fake_google import FakeGoogle, FakeGoogleServer
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeGoogle]:
+    state = FakeGoogle(labels=[
+        {"id": "INBOX", "name": "INBOX", "type": "system"},
+        {"id": "Label_7", "name": "Receipts", "type": "user"},
+    ])
+    for i in range(30):
+        state.add_message(f"m{i:02d}", f"Order {i}", ["INBOX"])
+    state.add_message("r1", "Your receipt", ["Label_7"])
+    with FakeGoogleServer(state) as running:
+        yield running
+
+
+def _client(fake: FakeGoogle) -> GmailClient:
+    return GmailClient(Credentials(token="test-token"), root_url=fake.root_url)
+
+
+def _serial_listing(client: GmailClient, label: str, limit: int) -> list[dict]:
+    """The pre-batching implementation: one metadata GET per message."""
+    ids = client._list_message_ids(label_ids=[client.resolve_label_id(label)], limit=limit)
+    return [client._get_metadata(mid) for mid in ids]
+
+
+@pytest.mark.unit
+class TestListMessages:
+    """Batched metadata retrieval."""
+
+    def test_listing_uses_one_batch_round_trip(self, fake: FakeGoogle):
+        client = _client(fake)
+        headers = client.list_messages("INBOX", limit=30)
+
+        assert [h["uid"] for h in headers] == [f"m{i:02d}" for i in range(30)]
+        assert headers[3]["subject"] == "Order 3"
+        assert fake.requests == [
+            "GET /gmail/v1/users/me/labels",
+            "GET /gmail/v1/users/me/messages",
+            "POST /batch",
+        ]
+
+    def test_batched_listing_beats_serial_round_trips(self, fake: FakeGoogle):
+        client = _client(fake)
+        client.list_labels()
+        fake.latency_s = 0.01
+
+        t0 = time.perf_counter()
+        serial = _serial_listing(client, "INBOX", 30)
+        serial_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        batched = client.list_messages("INBOX", limit=30)
+        batched_s = time.perf_counter() - t0
+
+        assert batched == serial
+        # 31 round-trips vs 2 at 10 ms each
+        assert batched_s < serial_s / 3
+
+    def test_failed_batch_parts_are_retried_individually(self, fake: FakeGoogle):
+        fake.fail_batch_parts = {"m01", "m02"}
+        headers = _client(fake).search_messages("Order 1", "INBOX", limit=5)
+
+        assert [h["uid"] for h in headers] == ["m01", "m10", "m11", "m12", "m13"]
+        assert fake.requests.count("GET /gmail/v1/users/me/messages/m01") == 1
+
+    def test_deleted_messages_are_skipped(self, fake: FakeGoogle):
+        client = _client(fake)
+        fake.fail_batch_parts = {"m00"}
+        original = fake.handle
+
+        def _handle(method, path, query, body):  # noqa: ANN001, ANN202
+            if path.endswith("/messages/m00"):
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            return original(method, path, query, body)
+
+        fake.handle = _handle  # type: ignore[method-assign]
+        headers = client.list_messages("INBOX", limit=3)
+        assert [h["uid"] for h in headers] == ["m01", "m02"]
+
+
+@pytest.mark.unit
+class TestLabelCache:
+    """Label name → ID resolution."""
+
+    def test_labels_listed_once(self, fake: FakeGoogle):
+        client = _client(fake)
+        client.list_messages("Receipts", limit=5)
+        client.search_messages("receipt", "Receipts", limit=5)
+        assert fake.requests.count("GET /gmail/v1/users/me/labels") == 1
+
+    def test_unknown_label_relists_once(self, fake: FakeGoogle):
+        client = _client(fake)
+        client.list_labels()
+        fake.labels.append({"id": "Label_9", "name": "Travel", "type": "user"})
+
+        assert client.resolve_label_id("Travel") == "Label_9"
+        assert client.resolve_label_id("Label_42") == "Label_42"
+        assert client.resolve_label_id("Label_42") == "Label_42"
+        assert fake.requests.count("GET /gmail/v1/users/me/labels") == 3
+
+    def test_move_uses_batch_modify(self, fake: FakeGoogle):
+        client = _client(fake)
+        client.move_messages("INBOX", ["m00", "m01"], "Receipts")
+        assert fake.messages["m00"]["labelIds"] == ["Label_7"]
+        assert "POST /gmail/v1/users/me/messages/batchModify" in fake.requests
@@ -0,0 +1,232 @@
+"""Metadata mirror sync and local answers, replaying recorded API responses."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from integrations.brokers.google_workspace_broker import _mirror
+from integrations.brokers.google_workspace_broker._calendar_client import CalendarClient
+from integrations.brokers.google_workspace_broker._drive_client import DriveClient
+from integrations.brokers.google_workspace_broker._gmail_client import GmailClient
+from integrations.brokers.google_workspace_broker._mirror import MetadataMirror, _parse_drive_query
+from integrations.brokers.google_workspace_broker._mirror_db import MirrorDB
+from integrations.brokers.google_workspace_broker._verbs import VerbDispatcher
+from integrations.permissions import Access, Capability
+from tests.unit.integrations.fixtures.fake_google import FakeGoogle, FakeGoogleServer, load_recorded
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeGoogle]:
+    state = FakeGoogle(labels=[
+        {"id": "INBOX", "name": "INBOX", "type": "system"},
+        {"id": "Label_7", "name": "Receipts", "type": "user"},
+    ])
+    state.add_message("m3", "Weekly digest", ["INBOX"], internal_date=3000)
+    state.add_message("m2", "Invoice 1182 overdue", ["INBOX"], sender="billing@vendor.test", internal_date=2000)
+    state.add_message("m1", "Invoice 1181 paid", ["INBOX"], sender="billing@vendor.test", internal_date=1000)
+    with FakeGoogleServer(state) as running:
+        yield running
+
+
+def _mirror_for(fake: FakeGoogle, tmp_path: Path) -> MetadataMirror:
+    creds = Credentials(token="test-token")
+    return MetadataMirror(
+        MirrorDB(tmp_path / "mirror.sqlite3"),
+        drive=DriveClient(creds, root_url=fake.root_url),
+        gmail=GmailClient(creds, root_url=fake.root_url),
+        calendar=CalendarClient(creds, root_url=fake.root_url),
+    )
+
+
+def _ts(iso: str) -> float:
+    return datetime.fromisoformat(iso).replace(tzinfo=UTC).timestamp()
+
+
+@pytest.mark.unit
+class TestDriveMirror:
+    """Drive full listing, change feed and local queries."""
+
+    async def test_full_sync_then_local_listing(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("drive_full"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_drive)
+
+        fake.requests.clear()
+        files = await mirror.list_drive_files("root", limit=10)
+        assert [f["id"] for f in files] == ["fReports", "fBudget", "fNotes"]
+        assert files[1]["size"] == "48211"
+        assert fake.requests == []
+
+    async def test_change_feed_applied(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("drive_full"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_drive)
+        fake.replay(load_recorded("drive_changes"))
+        await asyncio.to_thread(mirror._sync_drive)
+
+        root = await mirror.list_drive_files("root", limit=10)
+        assert [(f["id"], f["name"]) for f in root] == [("fReports", "Reports"), ("fNotes", "meeting notes.txt")]
+        assert "trashed" not in root[1]
+        reports = await mirror.list_drive_files("fReports", limit=10)
+        assert [f["id"] for f in reports] == ["fPlan", "fArchive"]
+        assert mirror._db.get_cursor("drive").value == "105"
+
+    async def test_name_search_uses_prefix_full_text(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("drive_full"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_drive)
+
+        hits = await mirror.search_drive_files("name contains 'budg' and trashed = false", limit=10)
+        assert [f["id"] for f in hits] == ["fBudget", "fArchive"]
+        in_folder = await mirror.search_drive_files("'fReports' in parents and mimeType != 'image/png'", limit=10)
+        assert [f["id"] for f in in_folder] == ["fArchive"]
+        assert await mirror.search_drive_files("fullText contains 'budget'", limit=10) is None
+
+    async def test_expired_token_triggers_full_resync(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("drive_full"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_drive)
+        fake.replay(load_recorded("drive_expired"))
+        await asyncio.to_thread(mirror._sync_drive)
+
+        assert [f["id"] for f in await mirror.list_drive_files("root", limit=10)] == ["fFresh"]
+        assert mirror._db.get_cursor("drive").value == "200"
+
+    async def test_stale_or_invalidated_cursor_goes_live(self, fake: FakeGoogle, tmp_path: Path, monkeypatch):
+        fake.replay(load_recorded("drive_full"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_drive)
+
+        mirror.invalidate("drive")
+        assert await mirror.list_drive_files("root", limit=10) is None
+        fake.replay(load_recorded("drive_changes"))
+        await asyncio.to_thread(mirror._sync_drive)
+        assert await mirror.list_drive_files("root", limit=10) is not None
+        monkeypatch.setattr(_mirror, "_MAX_STALENESS_S", -1.0)
+        assert await mirror.list_drive_files("root", limit=10) is None
+
+
+@pytest.mark.unit
+class TestGmailMirror:
+    """Gmail recent-window sync and history replay."""
+
+    async def test_listing_and_field_search(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("gmail_profile"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_gmail)
+
+        listed = await mirror.list_messages("INBOX", limit=2)
+        assert [h["uid"] for h in listed] == ["m3", "m2"]
+        found = await mirror.search_messages("subject:invoice from:billing@vendor.test", "INBOX", limit=5)
+        assert [h["uid"] for h in found] == ["m2", "m1"]
+        assert [h["uid"] for h in await mirror.search_messages("subject:overdue", "INBOX", limit=5)] == ["m2"]
+        assert await mirror.search_messages("subject:billing", "INBOX", limit=5) == []
+        # Free text can match bodies, which the mirror does not hold.
+        assert await mirror.search_messages("invoice", "INBOX", limit=5) is None
+        assert await mirror.search_messages("subject:invoice is:unread", "INBOX", limit=5) is None
+
+    async def test_short_listing_goes_live_unless_mailbox_complete(self, fake: FakeGoogle, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(_mirror, "_GMAIL_WINDOW", 2)
+        fake.replay(load_recorded("gmail_profile"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_gmail)
+
+        assert [h["uid"] for h in await mirror.list_messages("INBOX", limit=2)] == ["m3", "m2"]
+        assert await mirror.list_messages("INBOX", limit=3) is None
+
+    async def test_history_replay(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("gmail_profile"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_gmail)
+        fake.add_message("n1", "Invoice 1183", ["INBOX", "UNREAD"], internal_date=4000)
+        fake.replay(load_recorded("gmail_history"))
+        await asyncio.to_thread(mirror._sync_gmail)
+
+        assert [h["uid"] for h in await mirror.list_messages("INBOX", limit=5)] == ["n1", "m1"]
+        assert [h["uid"] for h in await mirror.list_messages("Receipts", limit=5)] == ["m1"]
+        assert mirror._db.get_cursor("gmail").value == "504"
+
+    async def test_expired_history_triggers_full_resync(self, fake: FakeGoogle, tmp_path: Path):
+        fake.replay(load_recorded("gmail_profile"))
+        mirror = _mirror_for(fake, tmp_path)
+        await asyncio.to_thread(mirror._sync_gmail)
+        del fake.messages["m3"]
+        fake.replay(load_recorded("gmail_expired"))
+        await asyncio.to_thread(mirror._sync_gmail)
+
+        assert [h["uid"] for h in await mirror.list_messages("INBOX", limit=5)] == ["m2", "m1"]
+        assert mirror._db.get_cursor("gmail").value == "900"
+
+
+@pytest.mark.unit
+class TestCalendarMirror:
+    """Per-calendar sync tokens."""
+
+    async def test_sync_token_lifecycle(self, fake: FakeGoogle, tmp_path: Path):
+        mirror = _mirror_for(fake, tmp_path)
+        assert await mirror.list_events("primary", days_forward=7, days_back=0, limit=10) is None
+
+        fake.replay(load_recorded("calendar_full"))
+        await mirror.sync_all()
+        window = (_ts("2026-05-01T00:00:00"), _ts("2026-07-01T00:00:00"))
+        assert [e["id"] for e in mirror._db.events_between("primary", *window, 10)] == [
+            "evStandup", "evHoliday", "evReview",
+        ]
+        assert mirror._db.get_cursor("calendar:primary").meta["name"] == "me@example.com"
+
+        fake.replay(load_recorded("calendar_incremental"))
+        await mirror.sync_all()
+        assert [e["id"] for e in mirror._db.events_between("primary", *window, 10)] == [
+            "evLunch", "evHoliday", "evReview",
+        ]
+
+        fake.replay(load_recorded("calendar_expired"))
+        await mirror.sync_all()
+        assert [e["id"] for e in mirror._db.events_between("primary", *window, 10)] == ["evReview"]
+        assert mirror._db.get_cursor("calendar:primary").value == "sync-9"
+        assert await mirror.list_events("primary", days_forward=7, days_back=400, limit=10) is None
+
+
+@pytest.mark.unit
+def test_parse_drive_query() -> None:
+    parsed = _parse_drive_query("name contains 'Bob\\'s plan' and 'root' in parents")
+    assert parsed is not None
+    assert parsed.name_prefix == ["Bob's plan"]
+    assert parsed.parents == ["root"]
+    assert _parse_drive_query("name contains 'a' or name contains 'b'") is None
+    assert _parse_drive_query("modifiedTime > '2026-01-01'") is None
+
+
+@pytest.mark.unit
+async def test_dispatcher_answers_from_mirror(fake: FakeGoogle, tmp_path: Path):
+    """List verbs skip Google while the mirror is fresh and go live after a write."""
+    creds = Credentials(
+        token="test-token",
+        scopes=["https://www.googleapis.com/auth/drive.file"],
+    )
+    dispatcher = VerbDispatcher(
+        creds,
+        permissions={Capability.DRIVE: Access.READ_WRITE},
+        downloads_dir=tmp_path / "downloads",
+        mirror_path=tmp_path / "mirror.sqlite3",
+        root_url=fake.root_url,
+    )
+    fake.replay(load_recorded("drive_full"))
+    await dispatcher.mirror.sync_all()
+
+    fake.requests.clear()
+    result = await dispatcher.dispatch("list_drive_files", {"limit": 2})
+    assert [f["id"] for f in result["files"]] == ["fReports", "fBudget"]
+    assert fake.requests == []
+
+    dispatcher.mirror.invalidate("drive")
+    fake.replay({"GET /files": [(200, {"files": [{"id": "live", "name": "live.txt"}]})]})
+    result = await dispatcher.dispatch("list_drive_files", {"limit": 2})
+    assert [f["id"] for f in result["files"]] == ["live"]
+    assert fake.requests == ["GET /files"]
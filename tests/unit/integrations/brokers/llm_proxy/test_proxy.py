@@ -0,0 +1,74 @@
+"""Tests for the LLM proxy's request forwarding."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from aiohttp import web
+
+from integrations.brokers.llm_proxy._proxy import build_app, create_upstream_session
+
+
+@pytest.fixture
+async def upstream(aiohttp_server):
+    """Upstream that echoes what it received."""
+    seen: list[dict] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        body = await request.read()
+        seen.append({
+            "path": str(request.rel_url),
+            "headers": dict(request.headers),
+            "body": body,
+        })
+        return web.Response(body=b"echo:" + body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", handler)
+    server = await aiohttp_server(app)
+    server.seen = seen
+    return server
+
+
+@pytest.fixture
+async def proxy(aiohttp_client, upstream):
+    session = create_upstream_session()
+    base = str(upstream.make_url("")).rstrip("/")
+    app = build_app(session, base, "anthropic", "real-key", logging.getLogger("test"))
+    yield await aiohttp_client(app)
+    await session.close()
+
+
+@pytest.mark.unit
+async def test_forwards_body_and_injects_auth(proxy, upstream):
+    resp = await proxy.post(
+        "/v1/messages?beta=1", data=b'{"model": "x"}', headers={"x-api-key": "proxy"},
+    )
+
+    assert resp.status == 200
+    assert await resp.read() == b'echo:{"model": "x"}'
+    [seen] = upstream.seen
+    assert seen["path"] == "/v1/messages?beta=1"
+    assert seen["headers"]["x-api-key"] == "real-key"
+    assert seen["body"] == b'{"model": "x"}'
+
+
+@pytest.mark.unit
+async def test_streams_chunked_request_body(proxy, upstream):
+    async def chunks():
+        for part in (b'{"messages": [', b'"a", "b"', b"]}"):
+            yield part
+
+    resp = await proxy.post("/v1/chat/completions", data=chunks())
+
+    assert resp.status == 200
+    assert upstream.seen[0]["body"] == b'{"messages": ["a", "b"]}'
+
+
+@pytest.mark.unit
+async def test_get_without_body(proxy, upstream):
+    resp = await proxy.get("/v1/models")
+
+    assert resp.status == 200
+    assert upstream.seen[0]["body"] == b""
@@ -0,0 +1,215 @@
+"""In-process HTTP stub of the Google APIs used by the Google Workspace broker.
+
+A ``ThreadingHTTPServer`` on port 0 serving JSON from a ``FakeGoogle``
+instance that holds Gmail labels and messages as plain dicts.  Tests seed
+state, point a client at ``fake.root_url`` (via the clients' ``root_url``
+override) and assert on state and on ``fake.requests`` afterwards.
+
+Supports the subset the broker uses:
+
+- Gmail: ``labels.list``, ``messages.list`` (labelIds, q as a substring
+  match on the subject, maxResults, pageToken), ``messages.get``
+  (format=metadata), ``messages.batchModify`` and multipart batch requests
+  at ``/batch``.
+
+Anything else — the Drive, Gmail history and Calendar change feeds the
+metadata mirror consumes — is answered from *recorded* responses:
+``load_recorded(name)`` reads one scenario from ``google_sync.json`` (a map
+of ``"METHOD /path"`` to a list of ``[status, body]`` pairs), and
+``fake.replay(...)`` queues them.  Each request pops the next response
+for its route.
+
+Configurable behaviors (simple attributes on the instance):
+
+- ``latency_s``: sleep applied to every HTTP request, to make round-trip
+  counts visible in wall-clock time.
+- ``fail_batch_parts``: message IDs whose batch part returns 429; the same
+  ID fetched individually succeeds.
+"""
+
+from __future__ import annotations
+
+import email.parser
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+_GMAIL = "/gmail/v1/users/me"
+_RECORDED = Path(__file__).with_name("google_sync.json")
+
+
+def load_recorded(name: str) -> dict[str, list[tuple[int, dict[str, Any]]]]:
+    """Return one recorded scenario from ``google_sync.json``."""
+    scenario = json.loads(_RECORDED.read_text())[name]
+    return {route: [(status, body) for status, body in responses] for route, responses in scenario.items()}
+
+
+@dataclass
+class FakeGoogle:
+    """State and counters for the stub server."""
+
+    labels: list[dict[str, Any]] = field(default_factory=list)
+    messages: dict[str, dict[str, Any]] = field(default_factory=dict)
+    latency_s: float = 0.0
+    fail_batch_parts: set[str] = field(default_factory=set)
+    requests: list[str] = field(default_factory=list)
+    root_url: str = ""
+    recorded: dict[str, list[tuple[int, dict[str, Any]]]] = field(default_factory=dict)
+
+    def replay(self, responses: dict[str, list[tuple[int, dict[str, Any]]]]) -> None:
+        """Queue recorded responses, after any still pending for the same route."""
+        for route, queue in responses.items():
+            self.recorded.setdefault(route, []).extend(queue)
+
+    def add_message(
+        self,
+        message_id: str,
+        subject: str,
+        labels: list[str],
+        sender: str = "a@example.com",
+        internal_date: int = 0,
+    ) -> None:
+        self.messages[message_id] = {
+            "id": message_id,
+            "internalDate": str(internal_date),
+            "labelIds": list(labels),
+            "payload": {"headers": [
+                {"name": "From", "value": sender},
+                {"name": "To", "value": "me@example.com"},
+                {"name": "Subject", "value": subject},
+                {"name": "Date", "value": "Mon, 4 May 2026 09:00:00 +0000"},
+            ]},
+        }
+
+    # --- request routing -----------------------------------------------------
+
+    def handle(self, method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, dict[str, Any]]:
+        queue = self.recorded.get(f"{method} {path}")
+        if queue:
+            return queue.pop(0)
+        if method == "GET" and path == f"{_GMAIL}/labels":
+            return 200, {"labels": self.labels}
+        if method == "GET" and path == f"{_GMAIL}/messages":
+            return 200, self._list_messages(query)
+        if method == "GET" and path.startswith(f"{_GMAIL}/messages/"):
+            message = self.messages.get(path.rsplit("/", 1)[1])
+            if message is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            return 200, message
+        if method == "POST" and path == f"{_GMAIL}/messages/batchModify":
+            return 200, self._batch_modify(json.loads(body))
+        return 404, {"error": {"code": 404, "message": f"no route for {method} {path}"}}
+
+    def _list_messages(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        label = query.get("labelIds", [None])[0]
+        q = query.get("q", [""])[0].lower()
+        ids = [
+            mid for mid, m in self.messages.items()
+            if (label is None or label in m["labelIds"])
+            and (not q or q in _subject(m).lower())
+        ]
+        start = int(query.get("pageToken", ["0"])[0])
+        size = int(query.get("maxResults", ["100"])[0])
+        page = ids[start:start + size]
+        resp: dict[str, Any] = {"messages": [{"id": mid} for mid in page]}
+        if start + size < len(ids):
+            resp["nextPageToken"] = str(start + size)
+        return resp
+
+    def _batch_modify(self, body: dict[str, Any]) -> dict[str, Any]:
+        for mid in body["ids"]:
+            labels = self.messages[mid]["labelIds"]
+            labels[:] = [l for l in labels if l not in body.get("removeLabelIds", [])]
+            labels.extend(l for l in body.get("addLabelIds", []) if l not in labels)
+        return {}
+
+    def handle_batch(self, content_type: str, body: bytes) -> tuple[str, bytes]:
+        """Answer a multipart/mixed batch by dispatching each embedded request."""
+        outer = email.parser.BytesParser().parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body,
+        )
+        boundary = "batch_fake_google"
+        out: list[str] = []
+        for part in outer.get_payload():
+            content_id = part["Content-ID"]
+            raw = part.get_payload()
+            request_line = raw.split("\n", 1)[0].strip()
+            method, target, _ = request_line.split(" ", 2)
+            url = urlsplit(target)
+            mid = url.path.rsplit("/", 1)[1]
+            if mid in self.fail_batch_parts:
+                status, payload = 429, {"error": {"code": 429, "message": "rateLimitExceeded"}}
+            else:
+                status, payload = self.handle(method, url.path, parse_qs(url.query), b"")
+            reason = "OK" if status == 200 else "Error"
+            out.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id[1:-1]}>\r\n\r\n"
+                f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        out.append(f"--{boundary}--\r\n")
+        return f"multipart/mixed; boundary={boundary}", "".join(out).encode()
+
+
+def _subject(message: dict[str, Any]) -> str:
+    for header in message["payload"]["headers"]:
+        if header["name"] == "Subject":
+            return header["value"]
+    return ""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        fake = self.server.fake  # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        fake.requests.append(f"{method} {url.path}")
+        if fake.latency_s:
+            time.sleep(fake.latency_s)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if method == "POST" and (url.path == "/batch" or url.path.startswith("/batch/")):
+            content_type, payload = fake.handle_batch(self.headers["Content-Type"], body)
+            status = 200
+        else:
+            status, data = fake.handle(method, url.path, parse_qs(url.query), body)
+            content_type, payload = "application/json", json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+
+class FakeGoogleServer:
+    """Context manager running a ``FakeGoogle`` behind a local HTTP server."""
+
+    def __init__(self, fake: FakeGoogle | None = None) -> None:
+        self.fake = fake or FakeGoogle()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.fake = self.fake  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeGoogle:
+        host, port = self._server.server_address[:2]
+        self.fake.root_url = f"http://{host}:{port}/"
+        self._thread.start()
+        return self.fake
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -15,6 +17,25 @@ from sdk.context._strategy import (
     _find_first_user,
     _serialize_messages,
 )
+from sdk.providers import Candidate
+
+
+_RESIDENCY_PATH = Path(__file__).resolve().parents[4] / "container" / "model_residency.py"
+_spec = importlib.util.spec_from_file_location("model_residency", _RESIDENCY_PATH)
+model_residency = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(model_residency)
+
+
+@pytest.fixture(autouse=True)
+def residency(tmp_path, monkeypatch):
+    """Point compaction at a private residency registry that records evictions."""
+    evicted: list = []
+    registry = model_residency.Registry(
+        str(tmp_path / "residency.json"), budget=None, evictor=evicted.append, ollama=lambda: None,
+    )
+    registry.evicted = evicted
+    monkeypatch.setattr("sdk.context._strategy._residency_registry", lambda: registry)
+    return registry
 
 
 def _make_stats(fill_ratio: float = 0.8) -> ContextStats:
@@ -46,7 +67,7 @@ async def test_summary_inserted_as_assistant_role():
          patch("sdk.context._strategy.save_summary_record"), \
          patch("sdk.context._strategy.load_settings",
                return_value={"compaction_provider": "test-provider", "compaction_model": "test-model", "compaction_options": {}}):
-        mock_summarize.return_value = ("This is the summary.", "test-model")
+        mock_summarize.return_value = ("This is the summary.", Candidate("test-provider", "test-model"))
 
         await strategy.apply(history, _make_stats(0.8))
 
@@ -83,7 +104,7 @@ async def test_tool_pairs_kept_together():
          patch("sdk.context._strategy.save_summary_record"), \
          patch("sdk.context._strategy.load_settings",
                return_value={"compaction_provider": "test-provider", "compaction_model": "test-model", "compaction_options": {}}):
-        mock_summarize.return_value = ("Summary text.", "test-model")
+        mock_summarize.return_value = ("Summary text.", Candidate("test-provider", "test-model"))
 
         await strategy.apply(history, _make_stats(0.8))
 
@@ -215,7 +236,7 @@ async def test_summary_record_includes_metadata():
                return_value={"compaction_provider": "test-provider", "compaction_model": "test-model", "compaction_options": {"temperature": 0.3}}), \
          patch("sdk.context._strategy.get_conversation_id", return_value="conv-123"), \
          patch("sdk.context._strategy.get_current_agent_name", return_value="BROWSER"):
-        mock_summarize.return_value = ("Summary.", "test-model")
+        mock_summarize.return_value = ("Summary.", Candidate("test-provider", "test-model"))
 
         await strategy.apply(history, _make_stats(0.8))
 
@@ -226,6 +247,122 @@ async def test_summary_record_includes_metadata():
     assert record.options == {"temperature": 0.3}
 
 
+# ── summarizer residency ────────────────────────────────────────────────
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_summarizer_stays_resident_after_compaction(residency):
+    """Compaction records the summarizer's use instead of running ``ollama stop``."""
+    messages = [
+        {"role": "system", "content": "You are helpful."},
+        {"role": "user", "content": "original request"},
+        *[{"role": "user" if i % 2 == 0 else "assistant", "content": f"msg {i}"} for i in range(10)],
+        {"role": "user", "content": "recent user"},
+        {"role": "assistant", "content": "recent assistant"},
+    ]
+    strategy = SummarizeStrategy(threshold=0.5, keep_recent_groups=1, summary_model="test-model")
+
+    with patch.object(strategy, "_summarize", new_callable=AsyncMock, return_value=("Summary.", Candidate("ollama", "test-model"))), \
+         patch("sdk.context._strategy.save_summary_record"), \
+         patch("sdk.context._strategy._unload_model", new_callable=AsyncMock) as mock_unload, \
+         patch("sdk.context._strategy.load_settings",
+               return_value={"compaction_provider": "ollama", "compaction_model": "test-model", "compaction_options": {}}):
+        await strategy.apply(_build_history(messages), _make_stats(0.8))
+
+    mock_unload.assert_not_awaited()
+    [resident] = residency.residents()
+    assert (resident.name, resident.kind, resident.model) == ("ollama:test-model", "ollama", "test-model")
+    assert resident.busy == 0
+    assert resident.uses == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_summarizer_released_when_compaction_fails_late(residency):
+    """A failure after summarizing still marks the summarizer idle."""
+    messages = [
+        {"role": "system", "content": "You are helpful."},
+        {"role": "user", "content": "original request"},
+        *[{"role": "user" if i % 2 == 0 else "assistant", "content": f"msg {i}"} for i in range(10)],
+        {"role": "user", "content": "recent user"},
+        {"role": "assistant", "content": "recent assistant"},
+    ]
+    strategy = SummarizeStrategy(threshold=0.5, keep_recent_groups=1, summary_model="test-model")
+
+    with patch.object(strategy, "_summarize", new_callable=AsyncMock, return_value=("Summary.", Candidate("ollama", "test-model"))), \
+         patch("sdk.context._strategy.save_summary_record", side_effect=OSError("disk full")), \
+         patch("sdk.context._strategy.load_settings",
+               return_value={"compaction_provider": "ollama", "compaction_model": "test-model", "compaction_options": {}}), \
+         pytest.raises(OSError, match="disk full"):
+        await strategy.apply(_build_history(messages), _make_stats(0.8))
+
+    [resident] = residency.residents()
+    assert resident.busy == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fallback_that_answered_is_registered_and_released(residency):
+    """A compaction fallback that answered is tracked alongside the configured summarizer."""
+    messages = [
+        {"role": "system", "content": "You are helpful."},
+        {"role": "user", "content": "original request"},
+        *[{"role": "user" if i % 2 == 0 else "assistant", "content": f"msg {i}"} for i in range(10)],
+        {"role": "user", "content": "recent user"},
+        {"role": "assistant", "content": "recent assistant"},
+    ]
+    strategy = SummarizeStrategy(threshold=0.5, keep_recent_groups=1, summary_model="test-model")
+
+    with patch.object(strategy, "_summarize", new_callable=AsyncMock, return_value=("Summary.", Candidate("ollama", "backup-model"))), \
+         patch("sdk.context._strategy.save_summary_record"), \
+         patch("sdk.context._strategy.load_settings",
+               return_value={"compaction_provider": "ollama", "compaction_model": "test-model", "compaction_options": {}}):
+        await strategy.apply(_build_history(messages), _make_stats(0.8))
+
+    residents = {r.model: r for r in residency.residents()}
+    assert set(residents) == {"test-model", "backup-model"}
+    assert all(r.busy == 0 for r in residents.values())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cloud_summarizer_skips_residency(residency):
+    """A summarizer that uses no local VRAM is never registered or unloaded."""
+    messages = [
+        {"role": "system", "content": "You are helpful."},
+        {"role": "user", "content": "original request"},
+        *[{"role": "user" if i % 2 == 0 else "assistant", "content": f"msg {i}"} for i in range(10)],
+        {"role": "user", "content": "recent user"},
+        {"role": "assistant", "content": "recent assistant"},
+    ]
+    residency.acquire("inference", footprint_mb=12_000)
+    strategy = SummarizeStrategy(threshold=0.5, keep_recent_groups=1, summary_model="claude-haiku")
+
+    with patch.object(strategy, "_summarize", new_callable=AsyncMock,
+                      return_value=("Summary.", Candidate("anthropic", "claude-haiku"))), \
+         patch("sdk.context._strategy.save_summary_record"), \
+         patch("sdk.context._strategy._unload_model", new_callable=AsyncMock) as mock_unload, \
+         patch("sdk.context._strategy.load_settings",
+               return_value={"compaction_provider": "anthropic", "compaction_model": "claude-haiku", "compaction_options": {}}):
+        await strategy.apply(_build_history(messages), _make_stats(0.8))
+
+    mock_unload.assert_not_awaited()
+    assert [r.name for r in residency.residents()] == ["inference"]
+    assert residency.evicted == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_release_unloads_directly_without_coordinator(monkeypatch):
+    from sdk.context._strategy import _release_model
+
+    monkeypatch.setattr("sdk.context._strategy._residency_registry", lambda: None)
+    with patch("sdk.context._strategy._unload_model", new_callable=AsyncMock) as mock_unload:
+        await _release_model(Candidate("ollama", "test-model"))
+    mock_unload.assert_awaited_once_with("test-model")
+
+
 # ── _unload_model (async subprocess) ────────────────────────────────────
 
 
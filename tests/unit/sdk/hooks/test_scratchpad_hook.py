@@ -1,11 +1,12 @@
-"""Tests for the ScratchpadHook Rich panel logging."""
+"""Tests for the ScratchpadHook events and their Rich panels."""
 
 import json
+import logging
 from io import StringIO
-from unittest.mock import patch
 
 import pytest
 
+from logging_config import create_handler
 from sdk.hooks._scratchpad_hook import ScratchpadHook
 
 
@@ -14,6 +15,20 @@ def hook():
     return ScratchpadHook()
 
 
+@pytest.fixture()
+def buf():
+    """Render events through the rich console sink into a buffer."""
+    buf = StringIO()
+    handler, _ = create_handler("rich", stream=buf, background=False)
+    events = logging.getLogger("events")
+    previous_level = events.level
+    events.addHandler(handler)
+    events.setLevel(logging.INFO)
+    yield buf
+    events.removeHandler(handler)
+    events.setLevel(previous_level)
+
+
 @pytest.mark.unit
 class TestScratchpadHookPassthrough:
     """Non-scratchpad tools are passed through unchanged."""
@@ -31,10 +46,8 @@ class TestScratchpadHookPassthrough:
 class TestScratchpadHookWrite:
     """Panels for save_to_scratchpad."""
 
-    def test_save_prints_panel(self, hook):
+    def test_save_prints_panel(self, hook, buf):
         """The hook prints a green panel with key and value."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         tool_result = str({"status": "ok", "key": "card_3", "value": "queen"})
         result = hook.after_tool(
@@ -47,10 +60,8 @@ class TestScratchpadHookWrite:
         assert "card_3" in output
         assert "queen" in output
 
-    def test_save_truncates_long_value(self, hook):
+    def test_save_truncates_long_value(self, hook, buf):
         """Values longer than 200 chars are truncated in the panel."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         long_value = "x" * 300
         hook.after_tool(
@@ -67,10 +78,8 @@ class TestScratchpadHookWrite:
 class TestScratchpadHookRead:
     """Panels for recall_from_scratchpad."""
 
-    def test_recall_single_key(self, hook):
+    def test_recall_single_key(self, hook, buf):
         """The hook prints a cyan panel with the recalled key and value."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         tool_result = json.dumps({"status": "ok", "key": "card_3", "value": "queen"})
         result = hook.after_tool(
@@ -83,10 +92,8 @@ class TestScratchpadHookRead:
         assert "card_3" in output
         assert "queen" in output
 
-    def test_recall_all_items(self, hook):
+    def test_recall_all_items(self, hook, buf):
         """Recall with no key shows all stored items."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         tool_result = json.dumps({"status": "ok", "items": {"a": "1", "b": "2"}})
         hook.after_tool("recall_from_scratchpad", {}, tool_result)
@@ -96,10 +103,8 @@ class TestScratchpadHookRead:
         assert "a:" in output
         assert "b:" in output
 
-    def test_recall_empty(self, hook):
+    def test_recall_empty(self, hook, buf):
         """Recall all on empty scratchpad shows empty message."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         tool_result = json.dumps({"status": "ok", "items": {}})
         hook.after_tool("recall_from_scratchpad", {}, tool_result)
@@ -107,10 +112,8 @@ class TestScratchpadHookRead:
         output = buf.getvalue()
         assert "empty" in output
 
-    def test_recall_not_found(self, hook):
+    def test_recall_not_found(self, hook, buf):
         """Recall of a missing key shows not-found styling."""
-        buf = StringIO()
-        hook._console = _make_console(buf)
 
         tool_result = json.dumps({"status": "not_found", "key": "missing"})
         hook.after_tool("recall_from_scratchpad", {"key": "missing"}, tool_result)
@@ -119,9 +122,3 @@ class TestScratchpadHookRead:
         assert "not found" in output
         assert "missing" in output
 
-
-def _make_console(buf: StringIO):
-    """Create a Rich Console that writes to a StringIO buffer."""
-    from rich.console import Console
-
-    return Console(file=buf, force_terminal=True, width=120)
@@ -0,0 +1,112 @@
+"""Tests for the image pipeline: blob store, references and stale-image expiry."""
+
+from __future__ import annotations
+
+import base64
+from unittest.mock import patch
+
+import pytest
+
+import conversations
+from sdk.media import BlobStore, drop_stale_images, fit_image, image_base64, inline_images, prepare_image
+from sdk.providers._ollama import _convert_messages_for_ollama
+from sdk.turn._turn import _conversation_id
+
+_PNG = b"\x89PNG\r\n\x1a\nfake"
+
+
+@pytest.fixture
+def conversation(tmp_path, monkeypatch):
+    """Bind a conversation whose blob dir is under tmp_path."""
+    monkeypatch.setattr(conversations, "get_blob_dir", lambda cid: tmp_path / cid / "blobs")
+    token = _conversation_id.set("conv-1")
+    yield tmp_path / "conv-1" / "blobs"
+    _conversation_id.reset(token)
+
+
+@pytest.mark.unit
+def test_blob_store_dedupes_by_content(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+
+    first = store.put(_PNG, "image/png")
+    second = store.put(_PNG, "image/png")
+
+    assert first == second
+    assert [p.name for p in store.root.iterdir()] == [f"{first}.png"]
+    assert store.get(first) == (_PNG, "image/png")
+    assert store.base64(first) == base64.b64encode(_PNG).decode("ascii")
+
+
+@pytest.mark.unit
+def test_blob_store_missing_digest_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        BlobStore(tmp_path).get("0" * 64)
+
+
+@pytest.mark.unit
+def test_prepare_image_stores_blob_and_resolves_reference(conversation):
+    with patch("sdk.media._images.fit_image", lambda data, media_type, **_: (data, media_type)):
+        image = prepare_image(_PNG, "image/png")
+
+    assert set(image) == {"ref", "media_type"}
+    assert (conversation / f"{image['ref']}.png").read_bytes() == _PNG
+    expected = base64.b64encode(_PNG).decode("ascii")
+    assert image_base64(image) == expected
+    # Providers send the bytes, not the reference.
+    converted = _convert_messages_for_ollama([{"role": "user", "content": "x", "images": [image]}])
+    assert converted[0]["images"] == [expected]
+
+
+@pytest.mark.unit
+async def test_inline_images_reads_references_without_mutating(conversation):
+    with patch("sdk.media._images.fit_image", lambda data, media_type, **_: (data, media_type)):
+        image = prepare_image(_PNG, "image/png")
+    messages = [{"role": "user", "content": "x", "images": [image]}, {"role": "assistant", "content": "y"}]
+
+    inlined = await inline_images(messages)
+
+    assert inlined[0]["images"][0]["data"] == base64.b64encode(_PNG).decode("ascii")
+    assert inlined[1] is messages[1]
+    assert "data" not in messages[0]["images"][0]
+    assert await inline_images(inlined) is inlined
+
+
+@pytest.mark.unit
+def test_prepare_image_inline_without_conversation():
+    with patch("sdk.media._images.fit_image", lambda data, media_type, **_: (data, media_type)):
+        image = prepare_image(_PNG, "image/png")
+
+    assert image == {"data": base64.b64encode(_PNG).decode("ascii"), "media_type": "image/png"}
+
+
+@pytest.mark.unit
+def test_fit_image_passes_through_undecodable_data():
+    assert fit_image(b"not an image", "image/png", max_side=64, fmt="jpeg") == (b"not an image", "image/png")
+
+
+@pytest.mark.unit
+def test_drop_stale_images_keeps_recent_and_leaves_input_intact():
+    image = {"data": "aGk=", "media_type": "image/png"}
+    messages = [
+        {"role": "user", "content": "look", "images": [image]},
+        {"role": "assistant", "content": "1"},
+        {"role": "user", "content": "again", "images": [image, image]},
+        {"role": "assistant", "content": "2"},
+        {"role": "user", "content": "", "images": [image]},
+    ]
+
+    out = drop_stale_images(messages, keep_iterations=2)
+
+    assert "images" not in out[0]
+    assert out[0]["content"] == "look\n[1 image(s) from an earlier step omitted]"
+    assert out[2] is messages[2]
+    assert out[4] is messages[4]
+    assert messages[0]["images"] == [image]
+
+
+@pytest.mark.unit
+def test_drop_stale_images_returns_same_list_when_nothing_expires():
+    messages = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+    assert drop_stale_images(messages, keep_iterations=1) is messages
+    assert drop_stale_images(messages, keep_iterations=None) is messages
@@ -0,0 +1,73 @@
+"""Tests for the shared provider HTTP pools."""
+
+from __future__ import annotations
+
+import pytest
+from aiohttp import web
+
+from sdk.providers._http import (
+    _CONNECTIONS,
+    _IN_FLIGHT,
+    _REQUESTS,
+    close_http_clients,
+    direct_http_client,
+    proxy_http_client,
+)
+
+
+@pytest.fixture
+async def clients():
+    yield
+    await close_http_clients()
+
+
+@pytest.fixture
+async def broker_socket(tmp_path):
+    """An HTTP server on a Unix socket, standing in for the llm_proxy broker."""
+
+    async def handler(_request: web.Request) -> web.Response:
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/v1/models", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    path = tmp_path / "llm_test.sock"
+    await web.UnixSite(runner, str(path)).start()
+    yield path
+    await runner.cleanup()
+
+
+@pytest.mark.unit
+async def test_clients_are_shared_per_endpoint(clients, tmp_path):
+    sock = tmp_path / "llm_openai.sock"
+
+    assert proxy_http_client(sock) is proxy_http_client(sock)
+    assert direct_http_client("http://localhost:8080/v1") is direct_http_client("http://localhost:8080/")
+    assert direct_http_client("http://localhost:8080/v1") is not direct_http_client("http://localhost:9090/v1")
+
+
+@pytest.mark.unit
+async def test_pool_metrics_track_requests_and_connections(clients, broker_socket):
+    client = proxy_http_client(broker_socket)
+    before = _REQUESTS.value("llm_test")
+
+    for _ in range(3):
+        resp = await client.get("http://localhost/v1/models")
+        assert resp.json() == {"ok": True}
+
+    assert _REQUESTS.value("llm_test") == before + 3
+    assert _IN_FLIGHT.value("llm_test") == 0
+    # Keep-alive: the three requests reused one connection, now idle.
+    assert _CONNECTIONS.value("llm_test", "idle") == 1
+    assert _CONNECTIONS.value("llm_test", "active") == 0
+
+
+@pytest.mark.unit
+async def test_in_flight_counts_open_streams(clients, broker_socket):
+    client = proxy_http_client(broker_socket)
+
+    async with client.stream("GET", "http://localhost/v1/models") as resp:
+        assert resp.status_code == 200
+        assert _IN_FLIGHT.value("llm_test") == 1
+    assert _IN_FLIGHT.value("llm_test") == 0
@@ -133,6 +133,29 @@ class TestOllamaProviderChat:
         assert result.message.content == "response text"
         assert result.usage.prompt_tokens == 200
 
+    @pytest.mark.asyncio
+    async def test_closing_chat_stream_early_closes_client_stream(self):
+        """A consumer that stops reading ends the underlying HTTP stream."""
+        closed = []
+
+        async def _endless():
+            try:
+                while True:
+                    yield _FakeOllamaResponse(message=_FakeMessage(content="tok "), done=False)
+            finally:
+                closed.append(True)
+
+        provider = OllamaProvider.__new__(OllamaProvider)
+        provider._client = AsyncMock()
+        provider._client.chat.return_value = _endless()
+
+        stream = provider.chat_stream(model="test-model", messages=[{"role": "user", "content": "hi"}])
+        first = await anext(stream)
+        await stream.aclose()
+
+        assert first.content == "tok "
+        assert closed == [True]
+
 
 @pytest.mark.unit
 class TestWrapOllamaError:
@@ -0,0 +1,153 @@
+"""Tests for the client-side rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from sdk.providers import ProviderError
+from sdk.providers._ratelimit import (
+    AdaptiveLimiter,
+    _limiters,
+    note_response_headers,
+    pause_from_headers,
+    retry_after_from_headers,
+)
+
+
+def _rate_limited(retry_after: float | None = None) -> ProviderError:
+    return ProviderError("slow down", retryable=True, status_code=429, retry_after=retry_after)
+
+
+@pytest.mark.unit
+async def test_serves_waiters_in_order_within_concurrency_limit():
+    limiter = AdaptiveLimiter("p", "m", max_concurrency=2)
+    order: list[int] = []
+    release = asyncio.Event()
+
+    async def call(i: int) -> None:
+        async with limiter.slot():
+            order.append(i)
+            await release.wait()
+
+    tasks = [asyncio.create_task(call(i)) for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert order == [0, 1]
+    assert limiter.in_flight == 2
+    assert limiter.queued == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+async def test_aimd_halves_once_per_round_and_recovers():
+    limiter = AdaptiveLimiter("p", "m", max_concurrency=8, default_retry_after=0)
+    starts = [await limiter.acquire() for _ in range(4)]
+
+    # Four calls from the same round all hit a 429: one cut, not four.
+    for started in starts:
+        limiter.release(started, _rate_limited())
+    assert limiter.limit == 4
+
+    started = await limiter.acquire()
+    limiter.release(started)
+    assert limiter.limit == pytest.approx(4.25)
+
+
+@pytest.mark.unit
+async def test_retry_after_pauses_the_queue():
+    limiter = AdaptiveLimiter("p", "m")
+    started = await limiter.acquire()
+    limiter.release(started, _rate_limited(retry_after=0.1))
+
+    t0 = time.monotonic()
+    await limiter.acquire()
+
+    assert time.monotonic() - t0 >= 0.09
+
+
+@pytest.mark.unit
+async def test_token_bucket_spaces_out_calls():
+    limiter = AdaptiveLimiter("p", "m", requests_per_minute=1200, burst=1)  # one per 50ms
+
+    t0 = time.monotonic()
+    for _ in range(3):
+        limiter.release(await limiter.acquire())
+
+    assert time.monotonic() - t0 >= 0.09
+
+
+@pytest.mark.unit
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = AdaptiveLimiter("p", "m", max_concurrency=1)
+    held = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queued == 0
+
+    limiter.release(held)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+async def test_on_queued_reports_position():
+    limiter = AdaptiveLimiter("p", "m", max_concurrency=1)
+    held = await limiter.acquire()
+    positions: list[int] = []
+    waiters = [asyncio.create_task(limiter.acquire(positions.append)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    assert positions == [1, 2]
+    limiter.release(held)
+    limiter.release(await waiters[0])
+    limiter.release(await waiters[1])
+
+
+@pytest.mark.unit
+def test_retry_after_header_forms():
+    assert retry_after_from_headers({"retry-after": "3"}) == 3.0
+    assert retry_after_from_headers({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    date = (datetime.now(UTC) + timedelta(seconds=30)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    assert 28 <= retry_after_from_headers({"retry-after": date}) <= 30
+    assert retry_after_from_headers({}) is None
+    assert retry_after_from_headers({"retry-after": "soon"}) is None
+
+
+@pytest.mark.unit
+def test_pause_from_exhausted_rate_limit_headers():
+    assert pause_from_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m30s"}) == 90
+    assert pause_from_headers({"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "250ms"}) == 0.25
+    reset = (datetime.now(UTC) + timedelta(seconds=20)).isoformat().replace("+00:00", "Z")
+    pause = pause_from_headers({
+        "anthropic-ratelimit-requests-remaining": "0", "anthropic-ratelimit-requests-reset": reset,
+    })
+    assert 18 <= pause <= 20
+    # Capacity left: no pause.
+    assert pause_from_headers({"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "1s"}) is None
+
+
+@pytest.mark.unit
+async def test_response_headers_pause_every_model_of_the_provider():
+    limiters = [AdaptiveLimiter("acme", "a"), AdaptiveLimiter("acme", "b"), AdaptiveLimiter("other", "c")]
+    for limiter in limiters:
+        _limiters[(limiter.provider, limiter.model)] = limiter
+    try:
+        note_response_headers("acme", {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "5"})
+        now = time.monotonic()
+        assert limiters[0]._ready_in(now) > 4
+        assert limiters[1]._ready_in(now) > 4
+        assert limiters[2]._ready_in(now) == 0
+    finally:
+        for limiter in limiters:
+            _limiters.pop((limiter.provider, limiter.model), None)
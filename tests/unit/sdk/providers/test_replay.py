@@ -0,0 +1,149 @@
+"""Tests for the offline record/replay provider."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config import ReplayConfig
+from sdk.providers import ChatDelta, ChatMessage, ChatResponse, TokenUsage, get_provider, reset_provider
+from sdk.providers._replay import ReplayProvider
+
+
+def search_web(query: str, limit: int = 5) -> str:
+    """Search the web.
+
+    Args:
+        query: What to search for.
+        limit: Maximum results.
+    """
+    return ""
+
+
+def read_file(path: str, line_numbers: bool) -> str:
+    """Read a file."""
+    return ""
+
+
+class _FakeUpstream:
+    """Streams a fixed reply with small gaps, like a real model."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat_stream(self, *, model, messages, tools=None, options=None, think=False):
+        import asyncio
+
+        self.calls += 1
+        for word in ("Hello", " from", f" call {self.calls}"):
+            await asyncio.sleep(0.01)
+            yield ChatDelta(content=word)
+        yield ChatResponse(
+            message=ChatMessage(content=f"Hello from call {self.calls}"),
+            usage=TokenUsage(prompt_tokens=12, completion_tokens=3),
+            done_reason="stop",
+            raw=object(),
+        )
+
+
+def _provider(tmp_path, **settings):
+    return ReplayProvider(ReplayConfig(**settings), cassette_dir=tmp_path)
+
+
+async def _collect(provider, messages, tools=None):
+    return [item async for item in provider.chat_stream(model="m", messages=messages, tools=tools)]
+
+
+def _user(text):
+    return [{"role": "user", "content": text}]
+
+
+@pytest.mark.unit
+class TestRecordReplay:
+    async def test_recorded_exchange_replays_with_deltas_and_usage(self, tmp_path):
+        recorder = _provider(tmp_path, mode="record")
+        recorder._upstream = _FakeUpstream()
+        recorded = await _collect(recorder, _user("hi"), [search_web])
+
+        replayer = _provider(tmp_path, mode="replay", ttft_ms=0, tokens_per_second=0)
+        replayed = await _collect(replayer, _user("hi"), [search_web])
+
+        assert [d.content for d in replayed[:-1]] == [d.content for d in recorded[:-1]]
+        assert replayed[-1].message.content == "Hello from call 1"
+        assert replayed[-1].usage.completion_tokens == 3
+        assert replayed[-1].raw is None
+
+    async def test_unseen_request_falls_back_to_same_shape(self, tmp_path):
+        recorder = _provider(tmp_path, mode="record")
+        recorder._upstream = _FakeUpstream()
+        await _collect(recorder, _user("with tools"), [search_web])
+        await _collect(recorder, _user("no tools"))
+
+        replayer = _provider(tmp_path, mode="replay", ttft_ms=0, tokens_per_second=0)
+        response = (await _collect(replayer, _user("something new"), [search_web]))[-1]
+
+        assert response.message.content == "Hello from call 1"
+
+    async def test_configured_ttft_delays_first_token(self, tmp_path):
+        recorder = _provider(tmp_path, mode="record")
+        recorder._upstream = _FakeUpstream()
+        await _collect(recorder, _user("hi"))
+
+        replayer = _provider(tmp_path, mode="replay", ttft_ms=80, tokens_per_second=0)
+        t0 = time.monotonic()
+        stream = replayer.chat_stream(model="m", messages=_user("hi"))
+        await anext(stream)
+        assert time.monotonic() - t0 >= 0.07
+        await stream.aclose()
+
+    async def test_empty_cassette_raises(self, tmp_path):
+        from sdk.providers import ProviderError
+
+        with pytest.raises(ProviderError, match="No recorded exchanges"):
+            await _collect(_provider(tmp_path, mode="replay"), _user("hi"))
+
+
+@pytest.mark.unit
+class TestSynthetic:
+    async def test_tool_rounds_then_reply(self, tmp_path):
+        provider = _provider(tmp_path, mode="synthetic", synthetic_tool_calls=2, synthetic_reply_tokens=5)
+        messages = _user("find me something")
+
+        for _ in range(2):
+            response = (await _collect(provider, messages, [search_web, read_file]))[-1]
+            [call] = response.message.tool_calls
+            assert response.done_reason == "tool_calls"
+            required = {"search_web": {"query"}, "read_file": {"path", "line_numbers"}}[call.function.name]
+            assert set(call.function.arguments) == required
+            messages = [
+                *messages,
+                {"role": "assistant", "content": "", "tool_calls": [call.model_dump()]},
+                {"role": "tool", "content": "ok", "tool_name": call.function.name},
+            ]
+
+        items = await _collect(provider, messages, [search_web, read_file])
+        assert len(items) == 6
+        assert items[-1].message.content == "".join(d.content for d in items[:-1])
+        assert items[-1].message.tool_calls is None
+
+    async def test_scripts_are_deterministic_and_respect_allowed_tools(self, tmp_path):
+        provider = _provider(tmp_path, mode="synthetic", synthetic_tools=["read_file"])
+        first = await provider.chat(model="m", messages=_user("x"), tools=[search_web, read_file])
+        second = await provider.chat(model="m", messages=_user("x"), tools=[search_web, read_file])
+
+        assert first.message.tool_calls[0].function.name == "read_file"
+        assert first.message.tool_calls == second.message.tool_calls
+
+
+@pytest.mark.unit
+def test_factory_creates_replay_without_endpoint(tmp_path):
+    cfg = MagicMock()
+    cfg.replay = ReplayConfig(mode="synthetic", cassette_dir=str(tmp_path))
+    reset_provider()
+    try:
+        with patch("sdk.providers.load_settings", return_value={}), \
+             patch("sdk.providers._replay.load_config", return_value=cfg):
+            provider = get_provider("replay")
+    finally:
+        reset_provider()
+    assert isinstance(provider, ReplayProvider)
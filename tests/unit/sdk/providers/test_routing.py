@@ -0,0 +1,154 @@
+"""Tests for hedged, health-aware routing of small model calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from config import ModelRoutingConfig
+from sdk.providers import ChatDelta, ChatMessage, ChatResponse, ProviderError, StopCondition
+from sdk.providers._routing import (
+    Candidate,
+    _hedge_delay,
+    _stats_for,
+    reset_routing_stats,
+    role_candidates,
+    routed_chat,
+)
+
+_CFG = ModelRoutingConfig(hedge_default_delay=0.05, hedge_min_delay=0.01, min_samples=3, failure_threshold=2)
+_MESSAGES = [{"role": "user", "content": "name this"}]
+
+
+class _ScriptedProvider:
+    """Streams ``reply`` after ``delay`` seconds, or raises ``error``."""
+
+    def __init__(self, reply: str = "", *, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def chat_stream(self, **kwargs: Any) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        yield ChatDelta(content=self.reply)
+        yield ChatResponse(message=ChatMessage(content=self.reply))
+
+
+@pytest.fixture(autouse=True)
+def _routing(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("config.load_config", lambda: SimpleNamespace(model_routing=_CFG))
+    reset_routing_stats()
+    yield
+    reset_routing_stats()
+
+
+def _use(monkeypatch: pytest.MonkeyPatch, **providers: _ScriptedProvider) -> None:
+    monkeypatch.setattr("sdk.providers.get_provider", lambda name: providers[name])
+
+
+_A = Candidate("a", "model-a")
+_B = Candidate("b", "model-b")
+
+
+@pytest.mark.unit
+async def test_fast_primary_answers_without_hedging(monkeypatch):
+    a, b = _ScriptedProvider("primary"), _ScriptedProvider("fallback")
+    _use(monkeypatch, a=a, b=b)
+
+    response, candidate = await routed_chat("title", [_A, _B], messages=_MESSAGES)
+
+    assert response.message.content == "primary"
+    assert candidate == _A
+    assert b.calls == 0
+
+
+@pytest.mark.unit
+async def test_stop_condition_applies_to_each_attempt(monkeypatch):
+    _use(monkeypatch, a=_ScriptedProvider("primary"))
+
+    response, _candidate = await routed_chat("title", [_A], messages=_MESSAGES, stop=StopCondition(max_chars=3))
+
+    assert response.message.content == "pri"
+
+
+@pytest.mark.unit
+async def test_slow_primary_is_hedged_and_cancelled(monkeypatch):
+    a, b = _ScriptedProvider("primary", delay=5), _ScriptedProvider("fallback")
+    _use(monkeypatch, a=a, b=b)
+
+    response, candidate = await asyncio.wait_for(routed_chat("title", [_A, _B], messages=_MESSAGES), 1)
+
+    assert response.message.content == "fallback"
+    assert candidate == _B
+    assert a.cancelled
+    # The loser's wait counts as a lower bound on its TTFT.
+    assert _stats_for(_A, _CFG).ttft[0] >= 0.04
+
+
+@pytest.mark.unit
+async def test_failed_candidate_falls_back_and_leaves_rotation(monkeypatch):
+    a = _ScriptedProvider(error=ProviderError("overloaded", retryable=True, status_code=529))
+    b = _ScriptedProvider("fallback")
+    _use(monkeypatch, a=a, b=b)
+
+    for _ in range(_CFG.failure_threshold):
+        _response, candidate = await routed_chat("vision", [_A, _B], messages=_MESSAGES)
+        assert candidate == _B
+    assert a.calls == _CFG.failure_threshold
+
+    # In cooldown: the fallback is tried first and the primary not at all.
+    _response, candidate = await routed_chat("vision", [_A, _B], messages=_MESSAGES)
+    assert candidate == _B
+    assert a.calls == _CFG.failure_threshold
+
+
+@pytest.mark.unit
+async def test_raises_last_error_when_every_candidate_fails(monkeypatch):
+    a = _ScriptedProvider(error=ProviderError("a down", retryable=True))
+    b = _ScriptedProvider(error=ProviderError("b down", retryable=True))
+    _use(monkeypatch, a=a, b=b)
+
+    with pytest.raises(ProviderError, match="b down"):
+        await routed_chat("compaction", [_A, _B], messages=_MESSAGES)
+
+
+@pytest.mark.unit
+async def test_no_candidates_is_an_error():
+    with pytest.raises(ValueError, match="No model configured for title"):
+        await routed_chat("title", [], messages=_MESSAGES)
+
+
+@pytest.mark.unit
+def test_hedge_delay_tracks_p95_ttft():
+    assert _hedge_delay(_A, _CFG) == _CFG.hedge_default_delay  # too few samples
+    _stats_for(_A, _CFG).ttft.extend([0.2, 0.3, 0.4, 2.0])
+    assert _hedge_delay(_A, _CFG) == 2.0
+    _stats_for(_A, _CFG).ttft.extend([0.001] * 80)
+    assert _hedge_delay(_A, _CFG) == _CFG.hedge_min_delay
+
+
+@pytest.mark.unit
+def test_role_candidates_puts_configured_model_first():
+    settings = {
+        "title_fallbacks": [
+            {"provider": "a", "model": "model-a"},
+            {"provider": "b", "model": "model-b"},
+            {"provider": "", "model": "ignored"},
+        ],
+    }
+    assert role_candidates(settings, "title", "a", "model-a") == [_A, _B]
+    assert role_candidates(settings, "title", "", "") == [_A, _B]
+    assert role_candidates({}, "vision", "a", "model-a") == [_A]
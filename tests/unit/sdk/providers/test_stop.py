@@ -0,0 +1,115 @@
+"""Tests for early-exit streaming with stop conditions."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from sdk.providers import (
+    ChatDelta,
+    ChatMessage,
+    ChatResponse,
+    ProviderError,
+    StopCondition,
+    TokenUsage,
+    chat_until,
+    json_complete,
+    line_complete,
+)
+
+
+class _StreamingProvider:
+    """Streams ``tokens`` as deltas, then a final response with real usage."""
+
+    def __init__(self, tokens: list[str], *, final: bool = True) -> None:
+        self.tokens = tokens
+        self.final = final
+        self.sent = 0
+        self.closed = False
+
+    async def chat_stream(self, **kwargs: Any) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
+        try:
+            for token in self.tokens:
+                self.sent += 1
+                yield ChatDelta(content=token)
+            if self.final:
+                yield ChatResponse(
+                    message=ChatMessage(content="".join(self.tokens)),
+                    usage=TokenUsage(prompt_tokens=42, completion_tokens=len(self.tokens)),
+                    done_reason="stop",
+                )
+        finally:
+            self.closed = True
+
+
+_MESSAGES = [{"role": "user", "content": "x" * 400}]
+
+
+@pytest.mark.unit
+def test_stop_sequence_ignores_leading_whitespace():
+    stop = StopCondition(stop_sequences=("\n",))
+    assert stop.cut("\n  Trip planning") is None
+    assert stop.cut("\n  Trip planning\nmore") == "\n  Trip planning"
+
+
+@pytest.mark.unit
+def test_max_chars_and_detector():
+    assert StopCondition(max_chars=5).cut("abcdefg") == "abcde"
+    assert StopCondition(max_chars=5).cut("abc") is None
+    assert StopCondition(complete=lambda text: text.endswith("!")).cut("done!") == "done!"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("text", "expected"), [
+    ('{"a": 1}', True),
+    ('```json\n[{"a": "}"}, {"b": [1, 2]}]\n```', True),
+    ('Here you go: {"a": {"b": 1}', False),
+    ('{"a": "x\\"}"', False),
+    ("no json here", False),
+])
+def test_json_complete(text, expected):
+    assert json_complete(text) is expected
+
+
+@pytest.mark.unit
+def test_line_complete():
+    detector = line_complete("[CURRENT]")
+    assert not detector("1. Build a site\n2. [CURRENT] Add a blog")
+    assert detector("1. Build a site\n2. [CURRENT] Add a blog\n")
+
+
+@pytest.mark.unit
+async def test_stops_reading_once_condition_is_met():
+    provider = _StreamingProvider(["Trip", " planning", "\n", "Ignored", " rest"] + ["x"] * 100)
+
+    response = await chat_until(
+        provider, StopCondition(stop_sequences=("\n",)), model="m", messages=_MESSAGES,
+    )
+
+    assert response.message.content == "Trip planning"
+    assert response.done_reason == "stop"
+    assert provider.sent == 3
+    assert provider.closed
+    # Usage is estimated: prompt from message size, completion from chunks read.
+    assert response.usage.prompt_tokens == 100
+    assert response.usage.completion_tokens == 3
+
+
+@pytest.mark.unit
+async def test_returns_provider_response_when_condition_not_met():
+    provider = _StreamingProvider(["short", " title"])
+
+    response = await chat_until(provider, StopCondition(max_chars=80), model="m", messages=_MESSAGES)
+
+    assert response.message.content == "short title"
+    assert response.usage.prompt_tokens == 42
+
+
+@pytest.mark.unit
+async def test_stream_without_response_is_an_error():
+    provider = _StreamingProvider(["partial"], final=False)
+
+    with pytest.raises(ProviderError, match="without a response"):
+        await chat_until(provider, None, model="m", messages=_MESSAGES)
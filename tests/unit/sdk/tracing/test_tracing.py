@@ -0,0 +1,163 @@
+"""Tests for per-turn latency tracing."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from agents.types import Agent
+from config import ReplayConfig
+from sdk.context import ConversationHistory
+from sdk.events import agent_span
+from sdk.providers._replay import ReplayProvider
+from sdk.skills import AgentState
+from sdk.tracing import (
+    annotate,
+    clear_trace,
+    get_trace,
+    query_spans,
+    summarize,
+    to_chrome_trace,
+    trace_span,
+    trace_turn,
+    traced,
+)
+from sdk.turn import run_turn, turn_scope
+
+
+@pytest.fixture
+def conversation_id():
+    cid = f"trace-{uuid.uuid4().hex[:8]}"
+    yield cid
+    clear_trace(cid)
+
+
+def _by_name(buffer):
+    return {span.name: span for span in buffer.spans()}
+
+
+@pytest.mark.unit
+class TestSpans:
+    """Recording, nesting and the ring buffer."""
+
+    def test_no_buffer_means_no_recording(self):
+        with trace_span("orphan") as span:
+            annotate(ignored=True)
+        assert span is None
+
+    async def test_nesting_across_tasks_and_threads(self, conversation_id):
+        def _in_thread():
+            with trace_span("thread.work"):
+                pass
+
+        with trace_turn(conversation_id):
+            with trace_span("parent"):
+                await asyncio.gather(
+                    asyncio.create_task(asyncio.sleep(0)),
+                    asyncio.to_thread(_in_thread),
+                )
+
+        spans = _by_name(get_trace(conversation_id))
+        assert spans["parent"].parent_id == spans["turn"].span_id
+        assert spans["thread.work"].parent_id == spans["parent"].span_id
+        assert spans["thread.work"].lane != spans["parent"].lane
+
+    async def test_traced_decorator_records_errors_and_attrs(self, conversation_id):
+        @traced("work")
+        async def _work():
+            annotate(items=3)
+            raise ValueError("boom")
+
+        with trace_turn(conversation_id), pytest.raises(ValueError):
+            await _work()
+
+        work = _by_name(get_trace(conversation_id))["work"]
+        assert work.error == "ValueError"
+        assert work.attrs == {"items": 3}
+
+    def test_ring_buffer_keeps_newest_spans(self, conversation_id, monkeypatch):
+        from config import load_config
+
+        monkeypatch.setattr(load_config().tracing, "max_spans", 5)
+        with trace_turn(conversation_id):
+            for index in range(10):
+                with trace_span(f"span.{index}"):
+                    pass
+
+        names = [span.name for span in get_trace(conversation_id).spans()]
+        # The turn span closes last, so it is kept along with the newest children.
+        assert names == ["turn", "span.6", "span.7", "span.8", "span.9"]
+
+    def test_query_by_turn_name_and_duration(self, conversation_id):
+        for _ in range(2):
+            with trace_turn(conversation_id):
+                with trace_span("tool.read_file"):
+                    pass
+                with trace_span("tool_like"):
+                    pass
+
+        buffer = get_trace(conversation_id)
+        assert buffer.turns == 2
+        last = query_spans(buffer, turn=-1, name="tool")
+        assert [(s.name, s.turn) for s in last] == [("tool.read_file", 2)]
+        assert query_spans(buffer, min_ms=60_000) == []
+        assert summarize(query_spans(buffer, name="tool"))["tool.read_file"]["count"] == 2
+
+    def test_chrome_export(self, conversation_id):
+        with trace_turn(conversation_id):
+            with trace_span("llm", model="m"):
+                pass
+
+        trace = to_chrome_trace(get_trace(conversation_id).spans())
+        complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in complete] == ["turn", "llm"]
+        assert complete[1]["args"]["model"] == "m"
+        assert complete[1]["ts"] >= complete[0]["ts"]
+        assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in trace["traceEvents"])
+
+
+def echo(text: str) -> str:
+    """Return *text*.
+
+    Args:
+        text: Any text.
+    """
+    return text
+
+
+class _Hook:
+    def after_tool(self, tool_name: str, tool_arguments: Any, tool_result: Any) -> Any:
+        return tool_result
+
+
+@pytest.mark.unit
+async def test_run_turn_is_traced(conversation_id, monkeypatch, tmp_path: Path):
+    settings = ReplayConfig(mode="synthetic", ttft_ms=0, tokens_per_second=0, synthetic_tool_calls=2)
+    provider = ReplayProvider(settings, cassette_dir=tmp_path)
+    import sdk.turn._execution as mod
+
+    monkeypatch.setattr(mod, "get_provider", lambda *_a, **_k: provider)
+    agent = Agent(name="Test", description="d", instruction="x", provider="replay", model="m", options={}, tools=[echo])
+    history = ConversationHistory([{"role": "system", "content": "x"}, {"role": "user", "content": "go"}])
+
+    async with turn_scope(conversation_id=conversation_id):
+        async with agent_span("Test", agent_state=AgentState(agent.tools)):
+            await run_turn(history, agent=agent, hooks=[_Hook()])
+
+    buffer = get_trace(conversation_id)
+    summary = summarize(buffer.spans())
+    assert summary["iteration"]["count"] == 3
+    assert summary["llm"]["count"] == 3
+    assert summary["tool.echo"]["count"] == 2
+    assert summary["hook.after_tool._Hook"]["count"] == 2
+    assert summary["llm.ttft"]["count"] == summary["llm.generate"]["count"] == 3
+
+    spans = _by_name(buffer)
+    assert spans["agent"].parent_id == spans["turn"].span_id
+    assert spans["iteration"].parent_id == spans["agent"].span_id
+    assert "ttft_ms" in spans["llm"].attrs
+    assert not any(span.end is None for span in buffer.spans())
@@ -489,6 +489,34 @@ async def test_non_retryable_provider_error_raises_immediately() -> None:
             await run_turn(history, _make_agent())
 
 
+async def test_rate_limited_call_waits_in_limiter_queue(_patch_publish_event: MagicMock) -> None:
+    """A 429 pauses the shared limiter for Retry-After; the retry queues instead of backing off."""
+    from sdk.providers._ratelimit import reset_limiters
+
+    class ThrottledOnceProvider(FakeProvider):
+        async def chat_stream(self, **kw: Any) -> AsyncGenerator[ChatDelta | ChatResponse, None]:
+            self._call_count += 1
+            raise ProviderError("slow down", retryable=True, status_code=429, retry_after=0.05)
+            yield  # make it a generator
+
+    reset_limiters()
+    history = ConversationHistory([{"role": "user", "content": "hi"}])
+    provider = ThrottledOnceProvider([_text_response("unused"), _text_response("done")])
+    try:
+        with patch(f"{_MOD}.get_provider", return_value=provider):
+            result = await run_turn(history, _make_agent())
+    finally:
+        reset_limiters()
+
+    assert result == "done"
+    queue_events = [
+        c.args[0].payload for c in _patch_publish_event.call_args_list
+        if c.args[0].payload.type == "model_queue"
+    ]
+    assert [e.queued for e in queue_events] == [True, False]
+    assert queue_events[1].waited_ms >= 40
+
+
 async def test_no_agent_state_raises() -> None:
     """run_turn outside an agent_span raises ToolLoopError."""
     _active_agent_state.set(None)
@@ -557,6 +585,28 @@ async def test_thinking_preserved_in_history() -> None:
     assert history.messages[-1]["thinking"] == "let me think..."
 
 
+async def test_records_model_and_tool_metrics() -> None:
+    """Each model call feeds the TTFT histogram and each tool call the latency histogram."""
+    from sdk.turn._execution import _LLM_REQUESTS, _LLM_TTFT_SECONDS, _TOOL_SECONDS
+
+    model = "metrics-model"
+    ttft_before = _LLM_TTFT_SECONDS.count(model)
+    ok_before = _LLM_REQUESTS.value(model, "ok")
+    tool_before = _TOOL_SECONDS.count("_dummy_tool")
+    provider = FakeProvider([
+        _tool_call_response("_dummy_tool", {"x": "v"}),
+        _text_response("done"),
+    ])
+    history = ConversationHistory([{"role": "user", "content": "go"}])
+
+    with patch(f"{_MOD}.get_provider", return_value=provider):
+        await run_turn(history, _make_agent(model=model))
+
+    assert _LLM_TTFT_SECONDS.count(model) == ttft_before + 2
+    assert _LLM_REQUESTS.value(model, "ok") == ok_before + 2
+    assert _TOOL_SECONDS.count("_dummy_tool") == tool_before + 1
+
+
 # ---------------------------------------------------------------------------
 # Tests: parallel tool execution
 # ---------------------------------------------------------------------------
@@ -0,0 +1,23 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from server._metrics_routes import handle_metrics
+
+
+@pytest.mark.unit
+async def test_metrics_endpoint_renders_instrumented_metrics():
+    import server.message_handler  # noqa: F401 - registers the cache metrics
+    import sdk.turn._execution  # noqa: F401 - registers the model and tool metrics
+
+    resp = await handle_metrics(MagicMock())
+
+    assert resp.status == 200
+    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert "# TYPE computron_active_turns gauge" in body
+    assert "# TYPE computron_llm_ttft_seconds histogram" in body
+    assert "# TYPE computron_tool_duration_seconds histogram" in body
+    assert "# TYPE computron_conversation_cache_evictions counter" in body
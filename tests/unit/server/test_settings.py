@@ -156,3 +156,46 @@ class TestSettingsUpdate:
         assert "vision_model" in dumped
         assert "setup_complete" not in dumped
         assert "direct_providers" not in dumped
+
+
+@pytest.mark.unit
+class TestSettingsCache:
+    """In-process caching of settings.json."""
+
+    def test_external_edit_is_picked_up(self, tmp_path):
+        """A write by another process is visible on the next load."""
+        save_settings({"vision_model": "a"})
+        assert load_settings()["vision_model"] == "a"
+        data = json.loads((tmp_path / "settings.json").read_text())
+        data["vision_model"] = "b"
+        (tmp_path / "settings.json").write_text(json.dumps(data))
+        assert load_settings()["vision_model"] == "b"
+
+    def test_callers_get_private_copies(self):
+        """Mutating a returned dict does not leak into later loads."""
+        save_settings({"vision_options": {"num_ctx": 1}})
+        first = load_settings()
+        first["vision_options"]["num_ctx"] = 999
+        assert load_settings()["vision_options"]["num_ctx"] == 1
+
+    def test_half_written_file_keeps_last_good_settings(self, tmp_path):
+        """A torn external write does not reset settings to defaults."""
+        save_settings({"default_agent": "code_expert"})
+        assert load_settings()["default_agent"] == "code_expert"
+        (tmp_path / "settings.json").write_text('{"default_agent": "cod')
+        assert load_settings()["default_agent"] == "code_expert"
+
+    def test_concurrent_saves_do_not_lose_updates(self):
+        """Read-merge-write cycles from several threads are serialized."""
+        import threading
+
+        threads = [
+            threading.Thread(target=save_settings, args=({f"key_{i}": i},))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        s = load_settings()
+        assert all(s[f"key_{i}"] == i for i in range(8))
@@ -0,0 +1,51 @@
+"""Tests for the conversation trace endpoint."""
+
+import json
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from sdk.tracing import clear_trace, trace_span, trace_turn
+from server._trace_routes import handle_conversation_trace
+
+
+def _request(conversation_id: str, query: dict | None = None) -> MagicMock:
+    req = MagicMock()
+    req.match_info = {"conversation_id": conversation_id}
+    req.query = query or {}
+    return req
+
+
+@pytest.fixture
+def traced_conversation():
+    cid = f"route-{uuid.uuid4().hex[:8]}"
+    with trace_turn(cid):
+        with trace_span("tool.read_file"):
+            pass
+    yield cid
+    clear_trace(cid)
+
+
+@pytest.mark.unit
+class TestConversationTrace:
+    async def test_unknown_conversation_is_404(self):
+        resp = await handle_conversation_trace(_request("missing"))
+        assert resp.status == 404
+
+    async def test_returns_spans_and_breakdown(self, traced_conversation):
+        resp = await handle_conversation_trace(_request(traced_conversation, {"name": "tool", "turn": "-1"}))
+        body = json.loads(resp.body)
+        assert body["turns"] == 1
+        assert [s["name"] for s in body["spans"]] == ["tool.read_file"]
+        assert body["breakdown"]["tool.read_file"]["count"] == 1
+
+    async def test_chrome_format(self, traced_conversation):
+        resp = await handle_conversation_trace(_request(traced_conversation, {"format": "chrome"}))
+        body = json.loads(resp.body)
+        assert "attachment" in resp.headers["Content-Disposition"]
+        assert {e["name"] for e in body["traceEvents"] if e["ph"] == "X"} == {"turn", "tool.read_file"}
+
+    async def test_bad_query_is_400(self, traced_conversation):
+        resp = await handle_conversation_trace(_request(traced_conversation, {"min_ms": "slow"}))
+        assert resp.status == 400
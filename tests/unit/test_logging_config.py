@@ -1,14 +1,36 @@
 """Unit tests for global logging configuration.
 
 These tests assert that calling `setup_logging` configures key logger levels
-used throughout the application, including the REPL namespace.
+used throughout the application, including the REPL namespace, and that the
+json / rich sinks and the background queue handler format records correctly.
 """
 
+import json
 import logging
+from io import StringIO
 
 import pytest
+from rich.panel import Panel
 
-from logging_config import setup_logging
+from logging_config import create_handler, log_event, setup_logging, stop_logging
+
+
+@pytest.fixture
+def events_to():
+    """Attach a handler to the ``events`` logger for the duration of a test."""
+    events = logging.getLogger("events")
+    attached: list[logging.Handler] = []
+    previous_level = events.level
+    events.setLevel(logging.INFO)
+
+    def attach(handler: logging.Handler) -> None:
+        events.addHandler(handler)
+        attached.append(handler)
+
+    yield attach
+    for handler in attached:
+        events.removeHandler(handler)
+    events.setLevel(previous_level)
 
 
 @pytest.mark.unit
@@ -19,10 +41,67 @@ def test_setup_logging_sets_expected_levels() -> None:
     Some agent namespaces are more verbose for debugging tool flows.
     """
     # Act
-    setup_logging()
+    setup_logging("json")
+    stop_logging()
 
     # Assert specific namespaces of interest
     assert logging.getLogger("repls").getEffectiveLevel() == logging.INFO
     assert logging.getLogger("tools").getEffectiveLevel() == logging.WARNING
     assert logging.getLogger("ollama").getEffectiveLevel() == logging.WARNING
     assert logging.getLogger("agents").getEffectiveLevel() == logging.DEBUG
+
+
+@pytest.mark.unit
+def test_json_sink_writes_event_fields(events_to) -> None:
+    buf = StringIO()
+    handler, _ = create_handler("json", stream=buf, background=False)
+    events_to(handler)
+
+    log_event("tool.done", "Ran %s", "grep", panel=Panel("ignored"), tool="grep", args={"q": "x"})
+
+    record = json.loads(buf.getvalue())
+    assert record["event"] == "tool.done"
+    assert record["msg"] == "Ran grep"
+    assert record["level"] == "INFO"
+    assert record["tool"] == "grep"
+    assert record["args"] == {"q": "x"}
+    assert "panel" not in record
+
+
+@pytest.mark.unit
+def test_rich_sink_renders_panel(events_to) -> None:
+    buf = StringIO()
+    handler, _ = create_handler("rich", stream=buf, background=False)
+    events_to(handler)
+
+    log_event("skill.loaded", "Loaded skill %s", "coder", panel=Panel("panel body", title="Skill Loaded"))
+
+    output = buf.getvalue()
+    assert "Skill Loaded" in output
+    assert "panel body" in output
+
+
+@pytest.mark.unit
+def test_background_handler_writes_from_listener_thread() -> None:
+    buf = StringIO()
+    handler, listener = create_handler("json", stream=buf)
+    logger = logging.getLogger("tests.background_logging")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        items = ["a"]
+        logger.warning("items=%s", items)
+        items.append("b")  # arguments are captured when the call is made
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+        listener.stop()  # drains the queue
+
+    first, second = (json.loads(line) for line in buf.getvalue().splitlines())
+    assert first["msg"] == "items=['a']"
+    assert second["msg"] == "failed"
+    assert "ValueError: boom" in second["exc"]
@@ -1,5 +1,6 @@
 """Tests for the browser context pool (copy-on-create isolation)."""
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -75,8 +76,12 @@ def _make_browser(**kwargs: Any) -> Browser:
 
 
 @pytest.fixture(autouse=True)
-def _clean_pool():
-    """Ensure the global pool is clean."""
+def _clean_pool(monkeypatch: pytest.MonkeyPatch):
+    """Ensure the global pool is clean and contexts are created on demand."""
+    from config import load_config
+
+    monkeypatch.setattr(load_config().tools.browser, "context_pool_size", 0)
+    monkeypatch.setattr(f"{_MOD}._context_pool", None)
     _agent_browsers.clear()
     yield
     _agent_browsers.clear()
@@ -227,3 +232,18 @@ async def test_ephemeral_inherits_storage_state(monkeypatch: pytest.MonkeyPatch)
 
     call_kwargs = root._pw_browser.new_context.call_args[1]
     assert call_kwargs["storage_state"]["cookies"] == [{"name": "session", "value": "abc"}]
+
+
+async def test_concurrent_calls_for_same_agent_share_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parallel get_browser calls from one agent create a single context."""
+    root = _make_browser()
+
+    monkeypatch.setattr(f"{_MOD}.get_current_depth", lambda: 1)
+    monkeypatch.setattr(f"{_MOD}.get_conversation_id", lambda: "conv-1")
+    monkeypatch.setattr(f"{_MOD}.get_current_agent_id", lambda: "root.par.1")
+
+    with patch(f"{_MOD}._get_root_browser", new_callable=AsyncMock, return_value=root):
+        first, second = await asyncio.gather(get_browser(), get_browser())
+
+    assert first is second
+    root._pw_browser.new_context.assert_awaited_once()
@@ -0,0 +1,239 @@
+"""Tests for the pre-warmed ephemeral context pool."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from tools.browser.core._context_pool import ContextPool
+from tools.browser.core.browser import Browser
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self._closed = False
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def on(self, event: str, callback: Any) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._closed = True
+
+
+class _FakeCDP:
+    def __init__(self, log: list[tuple[str, dict]]) -> None:
+        self._log = log
+
+    async def send(self, method: str, params: dict) -> None:
+        self._log.append((method, params))
+
+    async def detach(self) -> None:
+        pass
+
+
+class _FakeContext:
+    """BrowserContext stub that records listeners, cookies and CDP calls."""
+
+    def __init__(self, storage: dict[str, Any] | None = None) -> None:
+        self.pages: list[_FakePage] = []
+        self.listeners: dict[str, list[Any]] = {}
+        self.cookies: list[dict] = []
+        self.cdp_calls: list[tuple[str, dict]] = []
+        self.storage_calls = 0
+        self._storage = storage or {"cookies": [], "origins": []}
+        self.closed = False
+
+    def on(self, event: str, callback: Any) -> None:
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event: str, payload: Any) -> None:
+        for callback in self.listeners.get(event, []):
+            callback(payload)
+
+    async def storage_state(self) -> dict[str, Any]:
+        self.storage_calls += 1
+        return dict(self._storage)
+
+    async def new_page(self) -> _FakePage:
+        page = _FakePage()
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page: _FakePage) -> _FakeCDP:
+        return _FakeCDP(self.cdp_calls)
+
+    async def clear_cookies(self) -> None:
+        self.cookies = []
+
+    async def add_cookies(self, cookies: list[dict]) -> None:
+        self.cookies.extend(cookies)
+
+    async def clear_permissions(self) -> None:
+        pass
+
+    async def set_extra_http_headers(self, headers: dict[str, str]) -> None:
+        pass
+
+    async def add_init_script(self, script: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _make_root(storage: dict[str, Any] | None = None) -> tuple[Browser, list[_FakeContext]]:
+    created: list[_FakeContext] = []
+
+    async def _new_context(**kwargs: Any) -> _FakeContext:
+        ctx = _FakeContext()
+        ctx.cookies = list(kwargs["storage_state"]["cookies"])
+        created.append(ctx)
+        return ctx
+
+    pw_browser = MagicMock()
+    pw_browser.new_context = _new_context
+    root = Browser(context=_FakeContext(storage), extra_headers={}, pw_browser=pw_browser)  # type: ignore[arg-type]
+    return root, created
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class _Request:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+@pytest.mark.unit
+class TestContextPool:
+    """Warm-up, snapshot caching and recycling."""
+
+    async def test_warm_contexts_are_handed_out(self):
+        """Warm contexts are reused and the pool refills in the background."""
+        root, created = _make_root()
+        pool = ContextPool(root, size=2)
+        pool.warm()
+        await _settle()
+        assert pool.idle_count == 2
+
+        browser = await pool.acquire()
+        assert browser._context is created[0]
+        await _settle()
+        assert pool.idle_count == 2
+        assert len(created) == 3
+        await pool.close()
+
+    async def test_snapshot_cached_until_root_activity(self):
+        """The root profile is serialized once until its context sees traffic."""
+        root, _created = _make_root()
+        pool = ContextPool(root, size=0)
+
+        await asyncio.gather(pool.acquire(), pool.acquire(), pool.acquire())
+        assert root._context.storage_calls == 1
+
+        root._context.emit("response", object())
+        await pool.acquire()
+        assert root._context.storage_calls == 2
+
+    async def test_stale_idle_contexts_are_discarded(self):
+        """Warm contexts from an older snapshot are not handed out."""
+        root, created = _make_root()
+        pool = ContextPool(root, size=1)
+        pool.warm()
+        await _settle()
+        stale = created[0]
+
+        root._context.emit("response", object())
+        browser = await pool.acquire()
+        await _settle()
+        assert browser._context is not stale
+        assert stale.closed is True
+        await pool.close()
+
+    async def test_release_recycles_and_resets(self):
+        """Released contexts are cleared, re-seeded and returned to the pool."""
+        seed = {"name": "sid", "value": "1", "domain": "example.com", "path": "/"}
+        root, _created = _make_root({"cookies": [seed], "origins": []})
+        pool = ContextPool(root, size=1)
+
+        browser = await pool.acquire()
+        ctx = browser._context
+        await ctx.new_page()
+        ctx.cookies.append({"name": "tracker", "value": "x"})
+        ctx.emit("request", _Request("https://shop.test/cart?id=1"))
+
+        await pool.release(browser)
+
+        assert ctx.closed is False
+        assert pool.idle_count == 1
+        assert ctx.cookies == [seed]
+        assert all(page.is_closed() for page in ctx.pages)
+        assert ("Storage.clearDataForOrigin", {"origin": "https://shop.test", "storageTypes": "all"}) in ctx.cdp_calls
+        assert await pool.acquire() is browser
+        await pool.close()
+
+    async def test_release_closes_when_refill_filled_the_pool(self):
+        """A context is not recycled past the pool size if a refill finished during its reset."""
+        root, _created = _make_root()
+        pool = ContextPool(root, size=1)
+        browser = await pool.acquire()
+        browser._download_tasks.add(asyncio.ensure_future(asyncio.sleep(3600)))
+
+        await pool.release(browser)
+
+        assert browser._closed is True
+        assert pool.idle_count == 1
+        await pool.close()
+
+    async def test_reset_forgets_previous_downloads(self):
+        """Downloads started by the previous agent are stopped and forgotten."""
+        root, _created = _make_root()
+        pool = ContextPool(root, size=0)
+        browser = await pool.acquire()
+        download = asyncio.ensure_future(asyncio.sleep(3600))
+        browser._download_tasks.add(download)
+        download.add_done_callback(browser._download_tasks.discard)
+        browser._downloads["dl-1"] = MagicMock(state="in_progress", reported=False)
+        browser._expected_download_sizes["https://shop.test/report.pdf"] = 1024
+
+        await browser.reset_context([], [])
+
+        assert download.cancelled()
+        assert browser.get_download("dl-1") is None
+        assert browser.drain_downloads() == []
+        assert browser._expected_download_sizes == {}
+
+    async def test_release_closes_when_seeded_storage_was_touched(self):
+        """Contexts that visited an origin with seeded localStorage are closed."""
+        storage = {
+            "cookies": [],
+            "origins": [{"origin": "https://mail.test", "localStorage": [{"name": "k", "value": "v"}]}],
+        }
+        root, _created = _make_root(storage)
+        pool = ContextPool(root, size=1)
+
+        browser = await pool.acquire()
+        browser._context.emit("request", _Request("https://mail.test/inbox"))
+        await pool.release(browser)
+
+        assert browser._closed is True
+        await pool.close()
+
+    async def test_size_zero_closes_on_release(self):
+        """With pre-warming disabled, released contexts are closed."""
+        root, created = _make_root()
+        pool = ContextPool(root, size=0)
+
+        browser = await pool.acquire()
+        await _settle()
+        assert len(created) == 1
+        await pool.release(browser)
+        assert browser._closed is True
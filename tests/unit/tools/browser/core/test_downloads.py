@@ -0,0 +1,117 @@
+"""Tests for in-flight download tracking."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from tools.browser.core import _downloads
+from tools.browser.core._downloads import DownloadHandle
+from tools.browser.core.browser import Browser
+
+
+class FakeDownload:
+    """Playwright-like download whose file is written until ``finish`` is set."""
+
+    def __init__(self, partial: Path, *, url: str = "https://example.com/big.zip", name: str = "big.zip") -> None:
+        self.url = url
+        self.suggested_filename = name
+        self._impl_obj = SimpleNamespace(_artifact=SimpleNamespace(absolute_path=str(partial)))
+        self._partial = partial
+        self.finish = asyncio.Event()
+
+    async def path(self) -> str:
+        await self.finish.wait()
+        return str(self._partial)
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_downloads, "_POLL_INTERVAL_S", 0.01)
+
+
+def _browser(downloads_dir: Path) -> Browser:
+    ctx = SimpleNamespace(pages=[], on=lambda *a: None)
+    browser = Browser(context=ctx, extra_headers={})  # type: ignore[arg-type]
+    browser._downloads_dir = str(downloads_dir)
+    return browser
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDownloadHandle:
+    """Progress, sniffing and completion of a single download."""
+
+    async def test_reports_progress_and_sniffed_type_before_completion(self, tmp_path: Path) -> None:
+        partial = tmp_path / "3f2a-uuid"
+        partial.write_bytes(b"PK\x03\x04" + b"\x00" * 1020)
+        download = FakeDownload(partial)
+        handle = DownloadHandle(download, downloads_dir=str(tmp_path), total_bytes=4096)
+
+        task = asyncio.create_task(handle.run())
+        info = await handle.wait(timeout=0.1)
+
+        assert info.state == "in_progress"
+        assert info.download_id == handle.id
+        assert info.size_bytes == 1024
+        assert info.total_bytes == 4096
+        assert info.content_type == "application/zip"
+        assert info.partial_path == str(partial)
+
+        with partial.open("ab") as f:
+            f.write(b"\x00" * 3072)
+        download.finish.set()
+        final = await task
+
+        assert final is not None and final.state == "complete"
+        assert final.path == str(tmp_path / "big.zip")
+        assert final.size_bytes == 4096
+        assert (await handle.wait(timeout=0)).path == final.path
+
+    async def test_identical_download_is_deduplicated(self, tmp_path: Path) -> None:
+        (tmp_path / "report.pdf").write_bytes(b"%PDF-1.4 same")
+        partial = tmp_path / "uuid"
+        partial.write_bytes(b"%PDF-1.4 same")
+        download = FakeDownload(partial, name="report (1).pdf")
+        download.finish.set()
+
+        info = await DownloadHandle(download, downloads_dir=str(tmp_path)).run()
+
+        assert info is not None and info.deduplicated is True
+        assert info.path == str(tmp_path / "report.pdf")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["report.pdf"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBrowserDownloads:
+    """The browser returns long downloads as in progress."""
+
+    async def test_slow_download_is_drained_once_as_in_progress(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(Browser, "_DOWNLOAD_RETURN_AFTER_S", 0.05)
+        browser = _browser(tmp_path)
+        partial = tmp_path / "uuid"
+        partial.write_bytes(b"\x00" * 10)
+        download = FakeDownload(partial)
+
+        task = asyncio.create_task(browser._handle_download(download))
+        browser._download_tasks.add(task)
+        await browser._await_downloads()
+
+        [pending] = browser.drain_downloads()
+        assert pending.state == "in_progress"
+        assert browser.drain_downloads() == []
+
+        handle = browser.get_download(pending.download_id)
+        assert handle is not None
+        download.finish.set()
+        await task
+
+        assert (await handle.wait(timeout=1)).state == "complete"
+        # Already reported as in progress; wait_for_download delivers the result.
+        assert browser.drain_downloads() == []
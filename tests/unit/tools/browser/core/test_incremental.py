@@ -0,0 +1,156 @@
+"""Tests for incremental DOM snapshot state and the page view diff path."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from tools.browser.core._incremental import SnapshotState, apply_delta, render_changes
+
+
+def _text(key: int, text: str) -> dict[str, Any]:
+    return {"type": "text", "depth": 0, "text": text, "viewport": "in", "key": key}
+
+
+def _button(key: int, ref: int, name: str) -> dict[str, Any]:
+    return {
+        "type": "interactive", "depth": 0, "ref": ref, "role": "button",
+        "name": name, "viewport": "in", "key": key,
+    }
+
+
+def _delta(doc: str, seq: int, *, reset: bool = False, order: list[int] | None = None,
+           removed: list[int] | None = None) -> dict[str, Any]:
+    return {"doc": doc, "seq": seq, "reset": reset, "order": order, "removed": removed or []}
+
+
+@pytest.mark.unit
+class TestApplyDelta:
+    """Merging walker deltas into the per-frame node list."""
+
+    def test_reset_builds_state(self):
+        """A reset delta replaces any previous state."""
+        state = apply_delta(None, [_text(1, "Hello"), _button(2, 1, "Go")], _delta("d", 1, reset=True, order=[1, 2]))
+        assert state is not None
+        assert [n.text or n.name for n in state.ordered_nodes()] == ["Hello", "Go"]
+        assert state.since() == {"doc": "d", "seq": 1}
+
+    def test_changed_and_removed_nodes_merge(self):
+        """Changed nodes replace old ones; removed keys disappear."""
+        state = apply_delta(None, [_text(1, "A"), _button(2, 1, "Buy"), _text(3, "C")],
+                            _delta("d", 1, reset=True, order=[1, 2, 3]))
+        state = apply_delta(state, [_button(2, 1, "Bought")], _delta("d", 2, order=[1, 2], removed=[3]))
+        assert state is not None
+        assert [n.text or n.name for n in state.ordered_nodes()] == ["A", "Bought"]
+
+    def test_unchanged_order_reuses_previous(self):
+        """A null order keeps the previous key sequence."""
+        state = apply_delta(None, [_text(1, "A"), _text(2, "B")], _delta("d", 1, reset=True, order=[1, 2]))
+        state = apply_delta(state, [_text(2, "B2")], _delta("d", 2))
+        assert state is not None
+        assert [n.text for n in state.ordered_nodes()] == ["A", "B2"]
+
+    def test_out_of_sync_delta_returns_none(self):
+        """A delta referencing unknown keys cannot be applied."""
+        state = apply_delta(None, [_text(1, "A")], _delta("d", 1, reset=True, order=[1]))
+        assert apply_delta(state, [], _delta("d", 2, order=[1, 9])) is None
+
+    def test_previous_state_is_not_mutated(self):
+        """A rejected delta leaves the previous state usable."""
+        state = apply_delta(None, [_text(1, "A")], _delta("d", 1, reset=True, order=[1]))
+        assert state is not None
+        assert apply_delta(state, [_text(2, "B")], _delta("d", 2, order=[1, 9], removed=[1])) is None
+        assert [n.text for n in state.ordered_nodes()] == ["A"]
+        assert set(state.nodes) == {1}
+
+
+@pytest.mark.unit
+class TestRenderChanges:
+    """Line diff rendering between consecutive views."""
+
+    def test_reports_added_and_removed_lines(self):
+        """Only differing lines are listed."""
+        diff = render_changes(["Shop", "[5] [button] Add"], ["Shop", "[5] [button] Added", "[9] [link] Cart"])
+        assert "+2 -1 lines" in diff
+        assert "- [5] [button] Add" in diff
+        assert "+ [9] [link] Cart" in diff
+        assert "Shop" not in diff
+
+    def test_no_changes(self):
+        """Identical views produce a short notice."""
+        assert render_changes(["a"], ["a"]).startswith("[No changes since last view")
+
+
+class _DeltaFrame:
+    """Frame stub that replays canned walker results in order."""
+
+    def __init__(self, results: list[dict[str, Any]]) -> None:
+        self.url = "https://example.test/shop"
+        self._results = list(results)
+        self.params: list[dict[str, Any]] = []
+
+    async def evaluate(self, script: str, params: Any = None) -> Any:
+        self.params.append(params)
+        return self._results.pop(0)
+
+
+_VIEWPORT = {"width": 1280, "height": 800, "scroll_top": 0, "document_height": 4000}
+
+
+@pytest.mark.unit
+class TestBuildPageViewIncremental:
+    """build_page_view in incremental mode."""
+
+    @pytest.fixture(autouse=True)
+    def _enable_incremental(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from config import load_config
+
+        monkeypatch.setattr(load_config().tools.browser, "incremental_snapshots", True)
+
+    async def test_second_snapshot_sends_diff(self):
+        """Follow-up snapshots pass ``since`` and expose a compact change list."""
+        from tools.browser.core.browser import ActiveView
+        from tools.browser.core.page_view import build_page_view
+
+        products = [_text(i, f"Product {i} " + "x" * 80) for i in range(1, 40)]
+        frame = _DeltaFrame([
+            {"nodes": [*products, _button(100, 1, "Add to Cart")], "viewport": _VIEWPORT,
+             "incremental": _delta("d", 1, reset=True, order=[*range(1, 40), 100])},
+            {"nodes": [_button(100, 1, "Added")], "viewport": _VIEWPORT,
+             "incremental": _delta("d", 2)},
+        ])
+        view = ActiveView(frame=frame, title="Shop", url=frame.url)
+
+        first = await build_page_view(view, None)
+        assert first.changes is None
+        assert "[1] [button] Add to Cart" in first.content
+
+        second = await build_page_view(view, None)
+        assert frame.params[1]["since"] == {"doc": "d", "seq": 1}
+        assert second.snapshot_nodes == 40
+        assert second.snapshot_sent_nodes == 1
+        assert "[1] [button] Added" in second.content
+        assert "Product 1" in second.content
+        assert second.changes is not None
+        assert "+ [1] [button] Added" in second.changes
+        assert "Product 1" not in second.changes
+
+    async def test_out_of_sync_delta_refetches(self):
+        """A delta that cannot be merged triggers a full re-fetch."""
+        from tools.browser.core.browser import ActiveView
+        from tools.browser.core.page_view import build_page_view
+
+        frame = _DeltaFrame([
+            {"nodes": [_text(1, "One")], "viewport": _VIEWPORT,
+             "incremental": _delta("d", 1, reset=True, order=[1])},
+            {"nodes": [], "viewport": _VIEWPORT, "incremental": _delta("d", 2, order=[1, 2])},
+            {"nodes": [_text(1, "One"), _text(2, "Two")], "viewport": _VIEWPORT,
+             "incremental": _delta("d", 3, reset=True, order=[1, 2])},
+        ])
+        view = ActiveView(frame=frame, title="Shop", url=frame.url)
+
+        await build_page_view(view, None)
+        pv = await build_page_view(view, None)
+        assert frame.params[2]["since"] is None
+        assert "Two" in pv.content
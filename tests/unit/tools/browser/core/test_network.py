@@ -0,0 +1,172 @@
+"""Tests for the agent-context request blocking and caching policy."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from config import BrowserNetworkConfig
+from tools.browser.core._network import HttpDiskCache, ResourcePolicy, _cache_ttl
+
+
+class _FakeRequest:
+    def __init__(self, url: str, resource_type: str, method: str = "GET") -> None:
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes, headers: dict[str, str], status: int = 200) -> None:
+        self._body = body
+        self.headers = headers
+        self.status = status
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+class _FakeRoute:
+    """Records which terminal action the policy took for a request."""
+
+    def __init__(self, request: _FakeRequest, response: _FakeResponse | None = None) -> None:
+        self.request = request
+        self._response = response
+        self.action: str | None = None
+        self.fulfilled: dict[str, Any] = {}
+        self.fetches = 0
+
+    async def abort(self, error_code: str = "failed") -> None:
+        self.action = f"abort:{error_code}"
+
+    async def continue_(self) -> None:
+        self.action = "continue"
+
+    async def fetch(self) -> _FakeResponse:
+        self.fetches += 1
+        assert self._response is not None
+        return self._response
+
+    async def fulfill(self, **kwargs: Any) -> None:
+        self.action = "fulfill"
+        self.fulfilled = kwargs
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.handler: Any = None
+
+    async def route(self, pattern: str, handler: Any) -> None:
+        self.handler = handler
+
+
+def _config(**overrides: Any) -> BrowserNetworkConfig:
+    values: dict[str, Any] = {"block_resource_types": ["media"], "block_domains": ["doubleclick.net"]}
+    values.update(overrides)
+    return BrowserNetworkConfig(**values)
+
+
+async def _install(policy: ResourcePolicy) -> tuple[_FakeContext, Any]:
+    ctx = _FakeContext()
+    stats = await policy.install(ctx)  # type: ignore[arg-type]
+    return ctx, stats
+
+
+@pytest.mark.unit
+class TestResourcePolicy:
+    """Routing decisions made for each request."""
+
+    async def test_blocks_by_type_and_domain(self):
+        """Blocked types and hosts (including subdomains) are aborted."""
+        ctx, stats = await _install(ResourcePolicy(_config(), cache=None))
+
+        video = _FakeRoute(_FakeRequest("https://cdn.test/clip.mp4", "media"))
+        ad = _FakeRoute(_FakeRequest("https://ad.doubleclick.net/x.js", "script"))
+        page = _FakeRoute(_FakeRequest("https://shop.test/", "document"))
+        for route in (video, ad, page):
+            await ctx.handler(route)
+
+        assert video.action == "abort:blockedbyclient"
+        assert ad.action == "abort:blockedbyclient"
+        assert page.action == "continue"
+        assert stats.drain().blocked_requests == 2
+        assert stats.blocked_requests == 0
+
+    async def test_static_assets_served_from_shared_cache(self, tmp_path: Path):
+        """A cacheable asset fetched by one context is served to the next from disk."""
+        cache = HttpDiskCache(tmp_path, max_bytes=1 << 20)
+        policy = ResourcePolicy(_config(), cache)
+        headers = {"Content-Type": "text/css", "Cache-Control": "public, max-age=600", "Content-Encoding": "gzip"}
+
+        first_ctx, _first_stats = await _install(policy)
+        miss = _FakeRoute(_FakeRequest("https://cdn.test/app.css", "stylesheet"), _FakeResponse(b"body{}", headers))
+        await first_ctx.handler(miss)
+        assert miss.fetches == 1
+        assert miss.action == "fulfill"
+
+        second_ctx, second_stats = await _install(policy)
+        hit = _FakeRoute(_FakeRequest("https://cdn.test/app.css", "stylesheet"))
+        await second_ctx.handler(hit)
+        assert hit.fetches == 0
+        assert hit.fulfilled["body"] == b"body{}"
+        assert "content-encoding" not in hit.fulfilled["headers"]
+        assert second_stats.cached_requests == 1
+        assert second_stats.bytes_saved == len(b"body{}")
+
+    async def test_uncacheable_responses_are_not_stored(self, tmp_path: Path):
+        """Responses without a positive max-age are fetched every time."""
+        policy = ResourcePolicy(_config(), HttpDiskCache(tmp_path, max_bytes=1 << 20))
+        ctx, _stats = await _install(policy)
+        response = _FakeResponse(b"x", {"cache-control": "no-cache"})
+
+        for _ in range(2):
+            route = _FakeRoute(_FakeRequest("https://cdn.test/a.js", "script"), response)
+            await ctx.handler(route)
+            assert route.fetches == 1
+
+    def test_fast_settle_flags(self):
+        """Settle phases are skipped only when their resources are blocked."""
+        assert not ResourcePolicy(_config(), None).skip_font_wait
+        policy = ResourcePolicy(_config(block_resource_types=["font", "image", "media"]), None)
+        assert policy.skip_font_wait
+        assert policy.skip_animation_wait
+        slow = ResourcePolicy(_config(block_resource_types=["font"], fast_settle=False), None)
+        assert not slow.skip_font_wait
+
+
+@pytest.mark.unit
+class TestCacheRules:
+    """Cache TTL derivation and disk limits."""
+
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"cache-control": "max-age=60"}, 60),
+            ({"cache-control": "public, max-age=999999"}, 3600),
+            ({"cache-control": "max-age=31536000, immutable"}, 3600),
+            ({"cache-control": "private, max-age=60"}, 0),
+            ({"cache-control": "max-age=60", "vary": "Cookie"}, 0),
+            ({"cache-control": "max-age=60", "vary": "Accept-Encoding"}, 60),
+            ({"cache-control": "max-age=60", "set-cookie": "a=b"}, 0),
+            ({}, 0),
+        ],
+    )
+    def test_cache_ttl(self, headers: dict[str, str], expected: int):
+        assert _cache_ttl(headers, cap_s=3600) == expected
+
+    async def test_prunes_oldest_entries(self, tmp_path: Path):
+        """Writes past the size limit evict the oldest bodies."""
+        cache = HttpDiskCache(tmp_path, max_bytes=350)
+        for i in range(3):
+            await cache.put(f"https://cdn.test/{i}.js", 200, {}, b"x" * 100, ttl_s=60)
+        for age, body in enumerate(sorted(tmp_path.glob("*.body"))):
+            os.utime(body, (1_000 + age, 1_000 + age))
+        oldest = min(tmp_path.glob("*.body"), key=lambda p: p.stat().st_mtime)
+
+        await cache.put("https://cdn.test/new.js", 200, {}, b"x" * 100, ttl_s=60)
+
+        assert not oldest.exists()
+        assert await cache.get("https://cdn.test/new.js") is not None
@@ -0,0 +1,45 @@
+"""Tests for the page settle helper."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from config import BrowserWaitConfig
+from tools.browser.core.waits import wait_for_page_settle
+
+
+class _FakePage:
+    """Page stub that records which settle scripts were evaluated."""
+
+    def __init__(self) -> None:
+        self.scripts: list[str] = []
+
+    async def wait_for_load_state(self, state: str, timeout: int) -> None:
+        pass
+
+    async def evaluate(self, script: str) -> Any:
+        self.scripts.append(script)
+
+    async def wait_for_function(self, script: str, timeout: int) -> None:
+        self.scripts.append(script)
+
+
+@pytest.mark.unit
+class TestFastSettle:
+    """Skipping font and animation phases."""
+
+    async def test_all_phases_run_by_default(self):
+        page = _FakePage()
+        timings = await wait_for_page_settle(page, waits=BrowserWaitConfig())  # type: ignore[arg-type]
+        assert timings.skipped_phases == []
+        assert any("document.fonts.ready" in s for s in page.scripts)
+        assert any("getAnimations" in s for s in page.scripts)
+
+    async def test_skipped_phases_are_reported(self):
+        page = _FakePage()
+        waits = BrowserWaitConfig(skip_font_phase=True, skip_animation_phase=True)
+        timings = await wait_for_page_settle(page, waits=waits)  # type: ignore[arg-type]
+        assert timings.skipped_phases == ["fonts", "animations"]
+        assert len(page.scripts) == 1  # DOM quiet only
@@ -13,6 +13,7 @@ from tools.browser.core._file_detection import (
     format_download_message,
     is_file_content_type,
     save_response_as_file,
+    sniff_content_type,
 )
 
 
@@ -258,6 +259,52 @@ class TestBuildDownloadInfoFromPath:
         assert info.content_type == "application/octet-stream"
 
 
+# ---------------------------------------------------------------------------
+# sniff_content_type
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.unit
+class TestSniffContentType:
+    """Tests for magic-byte content-type detection."""
+
+    def test_signature_overrides_generic_header(self) -> None:
+        assert sniff_content_type(b"%PDF-1.7\n", "application/octet-stream") == "application/pdf"
+
+    def test_signature_overrides_wrong_header(self) -> None:
+        assert sniff_content_type(b"\x89PNG\r\n\x1a\n", "text/html") == "image/png"
+
+    def test_zip_keeps_specific_office_type(self) -> None:
+        xlsx = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        assert sniff_content_type(b"PK\x03\x04rest", filename="sheet.xlsx") == xlsx
+
+    def test_falls_back_to_declared_then_filename(self) -> None:
+        assert sniff_content_type(b"a,b\n1,2", "text/csv; charset=utf-8") == "text/csv"
+        assert sniff_content_type(b"a,b\n1,2", filename="data.csv") == "text/csv"
+        assert sniff_content_type(b"\x00\x01") == "application/octet-stream"
+
+
+@pytest.mark.unit
+class TestResponseDeduplication:
+    """Identical response bodies are stored once."""
+
+    @pytest.mark.asyncio
+    async def test_identical_body_reuses_existing_file(self, tmp_path: Path) -> None:
+        body = b"%PDF-1.4 same bytes"
+        (tmp_path / "report.pdf").write_bytes(body)
+        response = AsyncMock()
+        response.body = AsyncMock(return_value=body)
+        response.url = "https://mirror.example.com/copy-of-report.pdf"
+        response.headers = {"content-type": "application/octet-stream"}
+
+        info = await save_response_as_file(response, downloads_dir=tmp_path)
+
+        assert info.deduplicated is True
+        assert info.path == str(tmp_path / "report.pdf")
+        assert info.content_type == "application/pdf"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["report.pdf"]
+
+
 # ---------------------------------------------------------------------------
 # format_download_message
 # ---------------------------------------------------------------------------
@@ -279,6 +326,21 @@ class TestFormatDownloadMessage:
         assert "application/pdf" in msg
         assert "12.1 KB" in msg
 
+    def test_in_progress_message_points_to_wait_tool(self) -> None:
+        info = DownloadInfo(
+            path="/home/computron/big.zip",
+            content_type="application/zip",
+            size_bytes=1024,
+            filename="big.zip",
+            state="in_progress",
+            download_id="abcd1234",
+            total_bytes=4096,
+        )
+        msg = format_download_message(info)
+        assert "in progress" in msg
+        assert 'wait_for_download("abcd1234")' in msg
+        assert "4.0 KB" in msg
+
 
 # ---------------------------------------------------------------------------
 # open_url file detection integration
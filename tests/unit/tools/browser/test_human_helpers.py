@@ -26,6 +26,9 @@ from tools.browser.core.human import (
     human_type,
     _get_human_config,
     _HumanConfig,
+    human_click_at,
+    human_double_click_at,
+    start_input_stats,
     _bezier_point,
     _build_trajectory,
     _ease_in_out,
@@ -522,3 +525,119 @@ def test_build_trajectory_zero_distance() -> None:
     last_x, last_y = points[-1]
     assert abs(last_x - 50.0) < 1e-6
     assert abs(last_y - 50.0) < 1e-6
+
+
+# ---------------------------------------------------------------------------
+# Fast mode
+# ---------------------------------------------------------------------------
+
+
+def _fast_config(*, stealth: bool = True) -> _HumanConfig:
+    return _HumanConfig(
+        hover_min_ms=100,
+        hover_max_ms=100,
+        click_hold_min_ms=100,
+        click_hold_max_ms=100,
+        delay_min_ms=100,
+        delay_max_ms=100,
+        extra_pause_every_chars=1,
+        extra_pause_min_ms=100,
+        extra_pause_max_ms=100,
+        fast=True,
+        stealth=stealth,
+    )
+
+
+class FakeCDPSession:
+    def __init__(self, recorder: list[dict]) -> None:
+        self.recorder = recorder
+
+    async def send(self, method: str, params: dict) -> None:
+        assert method == "Input.dispatchMouseEvent"
+        self.recorder.append(params)
+
+
+class CDPPage(DummyPage):
+    def __init__(self, events: list[dict]) -> None:
+        super().__init__(mouse=SimpleNamespace())
+        self.context = SimpleNamespace(new_cdp_session=self._new_session)
+        self._events = events
+
+    async def _new_session(self, page) -> FakeCDPSession:  # type: ignore[no-untyped-def]
+        return FakeCDPSession(self._events)
+
+
+@pytest.mark.unit
+async def test_fast_click_dispatches_one_cdp_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tools.browser.core.human._config_cache", _fast_config())
+
+    async def _no_sleep(duration_ms: int) -> None:
+        raise AssertionError("fast mode must not sleep")
+
+    monkeypatch.setattr("tools.browser.core.human._sleep_ms", _no_sleep)
+    events: list[dict] = []
+    page = CDPPage(events)
+    stats = start_input_stats()
+
+    await human_click_at(cast(Page, page), 100.0, 100.0, 120.0, 110.0)
+
+    kinds = [e["type"] for e in events]
+    assert kinds[-2:] == ["mousePressed", "mouseReleased"]
+    assert set(kinds[:-2]) == {"mouseMoved"}
+    assert events[-1]["x"] == events[-2]["x"] == events[-3]["x"]
+    assert stats.mode == "fast"
+    assert stats.round_trips == 1
+    assert stats.events == len(events)
+
+    # The next gesture starts from where the last one ended.
+    events.clear()
+    await human_double_click_at(cast(Page, page), 300.0, 300.0, 310.0, 310.0)
+    presses = [e["clickCount"] for e in events if e["type"] == "mousePressed"]
+    assert presses == [1, 2]
+    assert stats.round_trips == 2
+
+
+@pytest.mark.unit
+async def test_fast_click_without_cdp_uses_collapsed_mouse_moves(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tools.browser.core.human._config_cache", _fast_config())
+    recorder: list[str] = []
+
+    class Mouse:
+        async def move(self, x, y, steps=1):  # type: ignore[no-untyped-def]
+            recorder.append(f"move:{steps}")
+
+        async def down(self, button="left", click_count=1):  # type: ignore[no-untyped-def]
+            recorder.append(f"down:{button}")
+
+        async def up(self, button="left", click_count=1):  # type: ignore[no-untyped-def]
+            recorder.append(f"up:{button}")
+
+    page = DummyPage(mouse=Mouse())
+    await human_click_at(cast(Page, page), 10.0, 10.0, 20.0, 20.0)
+
+    assert len(recorder) == 3
+    assert recorder[0].startswith("move:")
+    assert recorder[1:] == ["down:left", "up:left"]
+
+
+@pytest.mark.unit
+async def test_fast_type_uses_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    recorder: list[str] = []
+
+    class Keyboard(DummyKeyboard):
+        async def insert_text(self, text: str) -> None:
+            self.recorder.append(f"insert:{text}")
+
+    page = DummyPage(keyboard=Keyboard(recorder))
+    locator = DummyLocator(DummyElementHandle(frame=DummyFrame(page=page)))
+    text = "x" * 40
+
+    monkeypatch.setattr("tools.browser.core.human._config_cache", _fast_config(stealth=False))
+    await human_type(cast(Page, page), cast(Locator, locator), text, clear_existing=False)
+    assert recorder == ["insert:" + "x" * 32, "insert:" + "x" * 8]
+
+    # Stealth keeps real key events, still without per-key delays.
+    recorder.clear()
+    monkeypatch.setattr("tools.browser.core.human._config_cache", _fast_config(stealth=True))
+    await human_type(cast(Page, page), cast(Locator, locator), text, clear_existing=False)
+    assert recorder == ["type:" + "x" * 32, "type:" + "x" * 8]
@@ -336,3 +336,86 @@ class TestReadPage:
 
         assert isinstance(result, str)
         assert "Viewport:" in result
+
+
+# ---------------------------------------------------------------------------
+# Converted content cache
+# ---------------------------------------------------------------------------
+
+
+class _RevisionedPage(_ReadContentPage):
+    """Read-content stub that reports a DOM revision and counts extractions."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.rev = 0
+        self.extractions = 0
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        if "contentRevision" in script:
+            return {"doc": "doc-1", "rev": self.rev}
+        if "querySelector" in script and "article" in script:
+            self.extractions += 1
+        return await super().evaluate(script, arg)
+
+
+class TestReadPageCache:
+    """Tests for reuse of converted markdown across read_page calls."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self) -> None:
+        from tools.browser.read_content import _content_cache
+
+        _content_cache.clear()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pages_and_queries_reuse_conversion(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Later pages and queries on an unchanged DOM skip re-extraction."""
+        paragraphs = "".join(f"<p>Paragraph {i} pricing text.</p>" for i in range(2000))
+        page = _RevisionedPage(html=f"<body>{paragraphs}</body>")
+        browser = StubBrowser(page)
+        monkeypatch.setattr("tools.browser.read_content.get_active_view", _make_fake_get_active_view(browser))
+
+        await read_page(page_number=1)
+        await read_page(page_number=2)
+        await read_page(query="pricing")
+        assert page.extractions == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dom_mutation_invalidates(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A new DOM revision forces a fresh extraction."""
+        page = _RevisionedPage(html="<body><p>Before</p></body>")
+        browser = StubBrowser(page)
+        monkeypatch.setattr("tools.browser.read_content.get_active_view", _make_fake_get_active_view(browser))
+
+        assert "Before" in await read_page()
+        page.rev = 1
+        page._html = "<body><p>After</p></body>"
+        assert "After" in await read_page()
+        assert page.extractions == 2
+
+
+class TestPageOffsets:
+    """Tests for line-aligned pagination of converted content."""
+
+    @pytest.mark.unit
+    def test_pages_break_on_lines_and_cover_content(self) -> None:
+        """Pages end on newlines, stay within budget and reassemble the text."""
+        from tools.browser.read_content import _PageContent
+
+        markdown = "\n".join(f"line {i} " + "y" * (i % 300) for i in range(1000))
+        content = _PageContent.from_markdown(markdown)
+        pages: list[str] = []
+        truncated = True
+        while truncated:
+            text, truncated = content.page(len(pages) + 1)
+            pages.append(text)
+        assert "".join(pages) == markdown
+        assert all(len(p) <= _READ_BUDGET for p in pages)
+        assert all(p.endswith("\n") for p in pages[:-1])
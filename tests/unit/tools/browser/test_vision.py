@@ -36,8 +36,9 @@ class _ScreenshotFakeLocator:
     async def count(self) -> int:
         return 1 if self._exists else 0
 
-    async def screenshot(self, *, type: str = "png") -> bytes:
-        assert type == "png"
+    async def screenshot(self, *, type: str = "png", **_options: object) -> bytes:
+        assert type in ("png", "jpeg")
+        self.last_type = type
         if not self._exists:
             raise AssertionError("Should not capture screenshot when locator does not exist")
         return self._screenshot_bytes
@@ -55,9 +56,11 @@ class _ScreenshotFakePage:
         self._locator_map = locator_map or {}
         self.url = url
         self.viewport_size = {"width": 1024, "height": 768}
+        self.screenshot_options: dict[str, object] = {}
 
-    async def screenshot(self, *, full_page: bool = False, type: str = "png") -> bytes:
-        assert type == "png"
+    async def screenshot(self, *, full_page: bool = False, type: str = "png", **options: object) -> bytes:
+        assert type in ("png", "jpeg")
+        self.screenshot_options = {"type": type, **options}
         return self._screenshot_bytes
 
     async def evaluate(self, script: str, arg: object = None) -> str | dict:
@@ -109,6 +112,7 @@ _FAKE_SETTINGS = {
 async def _fake_vision_generate(prompt, image_base64, *, media_type="image/png"):
     """Stand-in for sdk.providers.vision_generate."""
     _fake_vision_generate.called = True
+    _fake_vision_generate.last_media_type = media_type
     _fake_vision_generate.last_prompt = prompt
     _fake_vision_generate.last_image = image_base64
     return "Mock answer"
@@ -149,6 +153,9 @@ async def test_inspect_page_success(monkeypatch: pytest.MonkeyPatch) -> None:
     assert _fake_vision_generate.last_prompt == "What is in the header?"
     encoded = base64.b64encode(b"fake-image-bytes").decode("ascii")
     assert _fake_vision_generate.last_image == encoded
+    # Captured as JPEG at CSS scale per the default media config.
+    assert page.screenshot_options == {"type": "jpeg", "quality": 80, "scale": "css"}
+    assert _fake_vision_generate.last_media_type == "image/jpeg"
 
 
 @pytest.mark.unit
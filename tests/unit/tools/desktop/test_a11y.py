@@ -0,0 +1,87 @@
+"""Unit tests for the accessibility tree daemon client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tools.desktop import _a11y, _tools
+from tools.desktop._a11y import query_a11y_daemon
+
+_SAVE = {"role": "push button", "label": "Save", "x": 90, "y": 40, "w": 60, "h": 30}
+
+
+@pytest.fixture(autouse=True)
+def _isolate(tmp_path, monkeypatch):
+    """Point sockets into tmp_path and reset per-display state."""
+    monkeypatch.setattr(_a11y, "_socket_path", lambda display: str(tmp_path / ("a11y%s.sock" % display)))
+    monkeypatch.setattr(_a11y, "_snapshots", {})
+    monkeypatch.setattr(_a11y, "_spawned_at", {})
+
+
+async def _fake_daemon(path: str, requests: list[dict], elements: list[dict]) -> asyncio.AbstractServer:
+    async def _handle(reader, writer):
+        request = json.loads(await reader.readline())
+        requests.append(request)
+        if request.get("since") == "r1":
+            reply = {"rev": "r1", "unchanged": True}
+        else:
+            reply = {"rev": "r1", "elements": elements}
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_unix_server(_handle, path=path)
+
+
+@pytest.mark.unit
+async def test_snapshot_then_unchanged_reply_reuses_cache():
+    """The second query sends the known revision and reuses the cached elements."""
+    requests: list[dict] = []
+    server = await _fake_daemon(_a11y._socket_path(":99"), requests, [_SAVE])
+    async with server:
+        first = await query_a11y_daemon(":99")
+        second = await query_a11y_daemon(":99")
+
+    assert first == [_SAVE]
+    assert second is first
+    assert requests == [{"op": "snapshot", "since": ""}, {"op": "snapshot", "since": "r1"}]
+
+
+@pytest.mark.unit
+async def test_missing_daemon_is_started_once():
+    """Without a socket, the daemon is started in the background and None returned."""
+    with patch("tools.desktop._a11y._run_desktop_cmd", new_callable=AsyncMock) as mock_cmd:
+        assert await query_a11y_daemon(":99") is None
+        assert await query_a11y_daemon(":99") is None
+
+    mock_cmd.assert_awaited_once()
+    cmd = mock_cmd.await_args.args[0]
+    assert cmd.startswith("nohup /usr/bin/python3.10 /opt/desktop/a11y_tree.py --serve ")
+    assert mock_cmd.await_args.kwargs["display"] == ":99"
+
+
+@pytest.mark.unit
+async def test_get_a11y_tree_falls_back_to_one_shot_script():
+    """_get_a11y_tree runs the one-shot walker when the daemon is unavailable."""
+    with (
+        patch("tools.desktop._tools.query_a11y_daemon", new_callable=AsyncMock, return_value=None),
+        patch("tools.desktop._tools._run_desktop_cmd", new_callable=AsyncMock) as mock_cmd,
+    ):
+        mock_cmd.return_value = "warning: noise\n" + json.dumps([_SAVE])
+        assert await _tools._get_a11y_tree() == [_SAVE]
+    mock_cmd.assert_awaited_once_with(_a11y.A11Y_SCRIPT)
+
+
+@pytest.mark.unit
+async def test_get_a11y_tree_prefers_daemon():
+    """A daemon answer skips the subprocess entirely."""
+    with (
+        patch("tools.desktop._tools.query_a11y_daemon", new_callable=AsyncMock, return_value=[_SAVE]),
+        patch("tools.desktop._tools._run_desktop_cmd", new_callable=AsyncMock) as mock_cmd,
+    ):
+        assert await _tools._get_a11y_tree() == [_SAVE]
+    mock_cmd.assert_not_awaited()
@@ -0,0 +1,150 @@
+"""Unit tests for in-memory screen capture."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import struct
+import textwrap
+import zlib
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tools.desktop import _screenshot
+from tools.desktop._screenshot import grab_frame
+
+_GRABBER_PATH = Path(__file__).resolve().parents[4] / "container" / "screen_grabber.py"
+_spec = importlib.util.spec_from_file_location("screen_grabber", _GRABBER_PATH)
+screen_grabber = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(screen_grabber)
+
+
+class _FakeScreen:
+    """4x2 BGRX screen whose pixels can be changed between grabs."""
+
+    width, height, uses_shm = 4, 2, True
+
+    def __init__(self) -> None:
+        self.pixels = bytearray(b"\x10\x20\x30\x00" * 8)
+
+    def grab(self):
+        return bytes(self.pixels), self.width * 4
+
+
+def _decode_png(data: bytes) -> tuple[int, int, bytes]:
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    idat_len = struct.unpack(">I", data[33:37])[0]
+    assert data[37:41] == b"IDAT"
+    raw = zlib.decompress(data[41:41 + idat_len])
+    rows = [raw[r * (width * 3 + 1) + 1:(r + 1) * (width * 3 + 1)] for r in range(height)]
+    return width, height, b"".join(rows)
+
+
+@pytest.fixture(autouse=True)
+def _reset_grabbers(monkeypatch):
+    monkeypatch.setattr(_screenshot, "_grabbers", {})
+
+
+@pytest.mark.unit
+class TestGrabberWorker:
+    """Frame cropping, encoding and change detection in screen_grabber.py."""
+
+    def test_png_without_pillow_swaps_bgrx_to_rgb(self):
+        width, height, rgb = _decode_png(screen_grabber.png_from_bgrx(b"\x01\x02\x03\x00" * 6, 12, 3, 2))
+        assert (width, height) == (3, 2)
+        assert rgb == b"\x03\x02\x01" * 6
+
+    def test_crop_clamps_to_screen(self):
+        raw = bytes(range(32))
+        cropped, stride, w, h = screen_grabber.crop(raw, 16, [2, 1, 10, 10], (4, 2))
+        assert (stride, w, h) == (8, 2, 1)
+        assert cropped == raw[24:32]
+        with pytest.raises(ValueError):
+            screen_grabber.crop(raw, 16, [10, 10, 5, 5], (4, 2))
+
+    def test_unchanged_frame_skips_encoding(self):
+        screen = _FakeScreen()
+        header, data = screen_grabber.handle(screen, {"format": "png"})
+        assert header["size"] == len(data) > 0
+        assert not header["unchanged"]
+
+        again, data = screen_grabber.handle(screen, {"since": header["digest"]})
+        assert again["unchanged"] and data == b""
+
+        screen.pixels[0] = 0xFF
+        changed, _ = screen_grabber.handle(screen, {"since": header["digest"]})
+        assert not changed["unchanged"]
+        assert changed["digest"] != header["digest"]
+
+    def test_region_digest_ignores_changes_elsewhere(self):
+        screen = _FakeScreen()
+        first, _ = screen_grabber.handle(screen, {"region": [0, 0, 2, 1]})
+        screen.pixels[-4] = 0xFF
+        second, _ = screen_grabber.handle(screen, {"region": [0, 0, 2, 1], "since": first["digest"]})
+        assert second["unchanged"]
+
+    def test_serve_protocol(self):
+        stdin = io.BytesIO(b'{"format": "png"}\n{"region": [9, 9, 1, 1]}\n')
+        stdout = io.BytesIO()
+        screen_grabber.serve(_FakeScreen(), stdin, stdout)
+
+        out = io.BytesIO(stdout.getvalue())
+        assert json.loads(out.readline())["ready"] is True
+        header = json.loads(out.readline())
+        assert _decode_png(out.read(header["size"]))[:2] == (4, 2)
+        assert "outside" in json.loads(out.readline())["error"]
+
+
+@pytest.mark.unit
+class TestGrabFrame:
+    """The per-display grabber process and the scrot fallback."""
+
+    async def test_frames_come_from_persistent_process(self, tmp_path, monkeypatch):
+        script = tmp_path / "grabber.py"
+        script.write_text(textwrap.dedent(f"""
+            import importlib.util, os, sys
+            spec = importlib.util.spec_from_file_location("g", {str(_GRABBER_PATH)!r})
+            g = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(g)
+
+            class Screen:
+                width, height, uses_shm = 2, 1, True
+                def grab(self):
+                    return b"\\x00\\x00\\xff\\x00" + os.getpid().to_bytes(4, "little"), 8
+
+            g.serve(Screen(), sys.stdin.buffer, sys.stdout.buffer)
+        """))
+        monkeypatch.setattr(_screenshot, "_GRABBER_SCRIPT", str(script))
+
+        with patch("tools.desktop._screenshot._run_desktop_cmd", new_callable=AsyncMock) as mock_cmd:
+            first = await grab_frame()
+            second = await grab_frame(since=first.digest)
+            await _screenshot.close_grabber(":99")
+
+        mock_cmd.assert_not_awaited()
+        assert first.media_type == "image/png"
+        assert (first.width, first.height) == (2, 1)
+        assert _decode_png(first.data)[2][:3] == b"\xff\x00\x00"
+        # Same process (same pid in the pixels), nothing re-encoded.
+        assert second.unchanged and second.data == b""
+
+    async def test_falls_back_to_scrot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(_screenshot, "_GRABBER_SCRIPT", str(tmp_path / "missing.py"))
+        png = screen_grabber.png_from_bgrx(b"\x00" * 8, 8, 2, 1)
+
+        async def _fake_scrot(cmd, *, display):
+            Path(cmd.split()[-1]).write_bytes(png)
+            return ""
+
+        with patch("tools.desktop._screenshot._run_desktop_cmd", side_effect=_fake_scrot) as mock_cmd:
+            frame = await grab_frame(region=(0, 0, 2, 1))
+            again = await grab_frame(region=(0, 0, 2, 1), since=frame.digest)
+
+        assert frame.data == png
+        assert (frame.width, frame.height) == (2, 1)
+        assert again.unchanged
+        assert "-a 0,0,2,1" in mock_cmd.call_args.args[0]
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from tools._grounding import GroundingResponse
+from tools.desktop._screenshot import Frame
 from tools.desktop._tools import (
     describe_screen,
     keyboard_press,
@@ -29,6 +30,7 @@ def _mock_desktop_deps():
         patch("tools.desktop._tools._run_desktop_cmd", new_callable=AsyncMock) as mock_cmd,
         patch("tools.desktop._tools._get_a11y_tree", new_callable=AsyncMock) as mock_a11y,
         patch("tools.desktop._tools.asyncio.sleep", new_callable=AsyncMock),
+        patch.dict("tools.desktop._tools._last_description", clear=True),
     ):
         # Default a11y tree
         mock_a11y.return_value = [
@@ -77,6 +79,11 @@ async def test_read_screen_empty_a11y(_mock_desktop_deps):
 # ── describe_screen ──────────────────────────────────────────────────
 
 
+_FRAME = Frame(
+    data=b"\xff\xd8\xff" + b"\x00" * 100, media_type="image/jpeg", width=1280, height=720, digest="d1",
+)
+
+
 @pytest.fixture
 def _mock_vision_deps():
     """Mock vision model deps for describe_screen tests."""
@@ -91,10 +98,10 @@ def _mock_vision_deps():
 
     with (
         patch("settings.load_settings", return_value=fake_settings),
-        patch("tools.desktop._tools.capture_screenshot", new_callable=AsyncMock) as mock_capture,
+        patch("tools.desktop._tools.grab_frame", new_callable=AsyncMock) as mock_capture,
         patch("sdk.providers.vision_generate", _fake_vision_generate),
     ):
-        mock_capture.return_value = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+        mock_capture.return_value = _FRAME
         yield {"capture": mock_capture}
 
 
@@ -121,10 +128,10 @@ async def test_describe_screen_no_vision_model():
     with (
         patch("tools.desktop._tools.ensure_desktop_running", new_callable=AsyncMock),
         patch("settings.load_settings", return_value=fake_settings),
-        patch("tools.desktop._tools.capture_screenshot", new_callable=AsyncMock) as mock_capture,
+        patch("tools.desktop._tools.grab_frame", new_callable=AsyncMock) as mock_capture,
         patch("sdk.providers.vision_generate", _raises_no_model),
     ):
-        mock_capture.return_value = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+        mock_capture.return_value = _FRAME
         result = await describe_screen()
         assert "error" in result.lower()
 
@@ -156,10 +163,10 @@ async def test_describe_screen_vision_model_failure():
 
     with (
         patch("settings.load_settings", return_value=fake_settings),
-        patch("tools.desktop._tools.capture_screenshot", new_callable=AsyncMock) as mock_capture,
+        patch("tools.desktop._tools.grab_frame", new_callable=AsyncMock) as mock_capture,
         patch("sdk.providers.vision_generate", _failing_vision),
     ):
-        mock_capture.return_value = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+        mock_capture.return_value = _FRAME
         result = await describe_screen()
     assert "error" in result.lower()
     assert "model timeout" in result.lower()
@@ -180,15 +187,30 @@ async def test_describe_screen_empty_response():
 
     with (
         patch("settings.load_settings", return_value=fake_settings),
-        patch("tools.desktop._tools.capture_screenshot", new_callable=AsyncMock) as mock_capture,
+        patch("tools.desktop._tools.grab_frame", new_callable=AsyncMock) as mock_capture,
         patch("sdk.providers.vision_generate", _empty_vision),
     ):
-        mock_capture.return_value = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+        mock_capture.return_value = _FRAME
         result = await describe_screen()
     assert "error" in result.lower()
     assert "empty" in result.lower()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_describe_screen_reuses_answer_for_unchanged_screen(_mock_vision_deps):
+    """An identical screen skips the vision model and returns the last answer."""
+    first = await describe_screen()
+    assert _mock_vision_deps["capture"].await_args.kwargs["since"] is None
+    assert _mock_vision_deps["capture"].await_args.kwargs["fmt"] == "jpeg"
+
+    _mock_vision_deps["capture"].return_value = Frame(b"", "image/jpeg", 1280, 720, "d1", unchanged=True)
+    with patch("sdk.providers.vision_generate", side_effect=AssertionError("vision called")):
+        second = await describe_screen()
+    assert second == first
+    assert _mock_vision_deps["capture"].await_args.kwargs["since"] == "d1"
+
+
 # ── mouse actions ─────────────────────────────────────────────────────
 
 
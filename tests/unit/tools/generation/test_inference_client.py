@@ -0,0 +1,154 @@
+"""Unit tests for the native inference server client, against a fake server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import web
+
+from tools.generation import _inference
+from tools.generation.generate_image import generate_image
+
+
+class _FakeInferenceServer:
+    """Serves /health and /generate-stream from scripted event lists."""
+
+    def __init__(self) -> None:
+        self.healthy = True
+        self.streams: list[list[dict]] = []
+        self.bodies: list[dict] = []
+        self.peers: set[int] = set()
+
+    async def _health(self, request: web.Request) -> web.Response:
+        if not self.healthy:
+            return web.json_response({}, status=503)
+        return web.json_response({"status": "ok", "model": None})
+
+    async def _generate_stream(self, request: web.Request) -> web.StreamResponse:
+        self.bodies.append(await request.json())
+        self.peers.add(request.transport.get_extra_info("peername")[1])
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await resp.prepare(request)
+        for event in self.streams.pop(0):
+            await resp.write(json.dumps(event).encode() + b"\n")
+        await resp.write_eof()
+        return resp
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_post("/generate-stream", self._generate_stream)
+        return app
+
+
+@pytest.fixture
+async def fake_server(monkeypatch) -> AsyncIterator[_FakeInferenceServer]:
+    server = _FakeInferenceServer()
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(_inference, "SERVER_URL", "http://127.0.0.1:%d" % port)
+    yield server
+    await _inference.close()
+    await runner.cleanup()
+
+
+async def _collect(gen_type: str = "image", **params) -> list[dict]:
+    return [e async for e in _inference.generate_stream(gen_type, "a red fox", **params)]
+
+
+@pytest.mark.unit
+class TestGenerateStream:
+    """Streaming, restarts and auto-start."""
+
+    async def test_streams_events_over_one_session(self, fake_server):
+        done = {"status": "complete", "path": "/home/computron/generated_images/fox.png"}
+        fake_server.streams = [
+            [{"status": "loading", "message": "Loading"}, {"status": "generating", "step": 1, "total_steps": 2}, done],
+            [done],
+        ]
+        first = await _collect(model="fast", size="square")
+        session = _inference._session
+        second = await _collect()
+
+        assert [e["status"] for e in first] == ["loading", "generating", "complete"]
+        assert second == [done]
+        assert fake_server.bodies[0] == {"type": "image", "description": "a red fox", "model": "fast", "size": "square"}
+        assert _inference._session is session
+        assert len(fake_server.peers) == 1  # the connection was kept alive
+
+    async def test_restart_required_restarts_and_resubmits(self, fake_server, monkeypatch):
+        kill = AsyncMock()
+        monkeypatch.setattr(_inference, "_kill_server", kill)
+        fake_server.streams = [
+            [{"status": "restart_required", "model": "quality"}],
+            [{"status": "complete", "path": "/out.png"}],
+        ]
+        events = await _collect(model="quality")
+
+        kill.assert_awaited_once_with(None)
+        assert events[0] == {"status": "loading", "message": "Restarting server for quality..."}
+        assert events[-1]["path"] == "/out.png"
+        assert len(fake_server.bodies) == 2
+
+    async def test_unreachable_without_script_is_unavailable(self, fake_server, monkeypatch):
+        fake_server.healthy = False
+        monkeypatch.setattr(_inference, "SERVER_SCRIPT", "/nonexistent/inference_server.py")
+        with pytest.raises(_inference.InferenceUnavailableError):
+            await _collect()
+
+    async def test_auto_starts_server(self, fake_server, monkeypatch):
+        fake_server.healthy = False
+        monkeypatch.setattr(_inference, "native_available", lambda: True)
+        monkeypatch.setattr(_inference, "_server_process_alive", lambda: False)
+        monkeypatch.setattr(_inference, "_start_server", lambda: setattr(fake_server, "healthy", True))
+        monkeypatch.setattr(_inference.asyncio, "sleep", AsyncMock())
+        fake_server.streams = [[{"status": "complete", "path": "/out.png"}]]
+
+        assert (await _collect())[-1]["path"] == "/out.png"
+
+
+@pytest.mark.unit
+async def test_slow_consumer_only_gets_latest_preview():
+    """Queued events keep their step but lose previews superseded by newer ones."""
+    async def _events():
+        for step in range(1, 5):
+            yield {"status": "generating", "step": step, "preview": "img%d" % step}
+            await asyncio.sleep(0)
+
+    seen = []
+    async for event in _inference._latest_previews(_events()):
+        seen.append(event)
+        await asyncio.sleep(0.01)  # slower than the producer
+
+    assert [e["step"] for e in seen] == [1, 2, 3, 4]
+    assert seen[-1]["preview"] == "img4"
+    assert sum("preview" in e for e in seen) < 4
+
+
+@pytest.mark.unit
+async def test_generate_image_uses_native_client(monkeypatch):
+    """With the server script present, no Python subprocess is spawned."""
+    async def _stream(gen_type, description, **params):
+        assert params == {"model": "fast", "size": "square"}
+        yield {"status": "complete", "path": "/home/computron/generated_images/fox.png"}
+
+    monkeypatch.setattr(_inference, "native_available", lambda: True)
+    monkeypatch.setattr(_inference, "generate_stream", _stream)
+    with (
+        patch("tools.generation.generate_image.publish_event"),
+        patch("asyncio.create_subprocess_exec") as mock_exec,
+        patch.object(Path, "exists", return_value=True),
+        patch.object(Path, "is_file", return_value=True),
+    ):
+        result = await generate_image("a red fox")
+
+    assert result == {"status": "ok", "path": "/home/computron/generated_images/fox.png", "media_type": "image"}
+    mock_exec.assert_not_called()
@@ -7,7 +7,7 @@ import tempfile
 
 import pytest
 
-from tools.virtual_computer.read_ops import head, read_file, tail
+from tools.virtual_computer.read_ops import head, read_file, read_files, tail
 from tools.virtual_computer.file_ops import write_file
 
 
@@ -49,3 +49,41 @@ def test_head_and_tail_defaults() -> None:
         assert "L9\n" in t.content
         assert "L10\n" in t.content
         assert "L8" not in t.content
+
+
+@pytest.mark.unit
+async def test_read_files_ranges_and_order() -> None:
+    with tempfile.TemporaryDirectory() as tmp_home:
+        a = str(Path(tmp_home) / "a.txt")
+        b = str(Path(tmp_home) / "b.txt")
+        write_file(a, "alpha\nbeta\n")
+        write_file(b, "".join(f"L{i}\n" for i in range(1, 11)))
+        res = await read_files([a, f"{b}:4-5", str(Path(tmp_home) / "missing.txt")])
+        assert res.success
+        assert [f.file_path for f in res.files] == [a, b, str(Path(tmp_home) / "missing.txt")]
+        assert res.files[0].content is not None
+        assert res.files[0].content.startswith("     1\talpha")
+        assert res.files[1].content == "     4\tL4\n     5\tL5\n"
+        assert (res.files[1].start, res.files[1].end) == (4, 5)
+        assert not res.files[2].success
+        assert not res.truncated
+
+
+@pytest.mark.unit
+async def test_read_files_shares_budget_on_line_boundaries() -> None:
+    with tempfile.TemporaryDirectory() as tmp_home:
+        small = str(Path(tmp_home) / "small.txt")
+        big = str(Path(tmp_home) / "big.txt")
+        write_file(small, "tiny\n")
+        write_file(big, "".join(f"line {i}\n" for i in range(1, 501)))
+        res = await read_files([small, big], max_chars=200)
+        assert res.truncated
+        assert res.total_chars <= 200
+        assert res.files[0].content == "     1\ttiny\n"
+        assert not res.files[0].truncated
+        big_res = res.files[1]
+        assert big_res.truncated
+        assert big_res.content is not None
+        assert big_res.content.endswith("\n")
+        assert big_res.start == 1
+        assert big_res.end == big_res.content.count("\n")
@@ -0,0 +1,165 @@
+"""Tests for the change-notified file cache."""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from utils import file_cache
+from utils.file_cache import WatchedValue, atomic_write_text
+
+_linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+def _counting_loader(calls: list[Path]):
+    def _load(path: Path, previous: dict | None) -> dict:
+        calls.append(path)
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    return _load
+
+
+@pytest.fixture(params=["inotify", "stat"])
+def detection(request, monkeypatch):
+    """Run each test with inotify and with the stat fallback."""
+    if request.param == "stat":
+        monkeypatch.setattr(file_cache, "_get_inotify", lambda: None)
+    elif not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    return request.param
+
+
+@pytest.mark.unit
+class TestWatchedFile:
+    """Single-file values."""
+
+    def test_reloads_only_after_change(self, tmp_path, detection):
+        path = tmp_path / "settings.json"
+        path.write_text('{"a": 1}')
+        calls: list[Path] = []
+        value = WatchedValue(_counting_loader(calls))
+
+        assert value.get(path) == {"a": 1}
+        assert value.get(path) == {"a": 1}
+        assert len(calls) == 1
+
+        atomic_write_text(path, '{"a": 2, "bb": 3}')
+        assert value.get(path) == {"a": 2, "bb": 3}
+        assert len(calls) == 2
+
+    def test_detects_creation_and_deletion(self, tmp_path, detection):
+        path = tmp_path / "settings.json"
+        calls: list[Path] = []
+        value = WatchedValue(_counting_loader(calls))
+
+        assert value.get(path) == {}
+        path.write_text('{"x": true}')
+        assert value.get(path) == {"x": True}
+        path.unlink()
+        assert value.get(path) == {}
+
+    @_linux_only
+    def test_unrelated_files_do_not_reload(self, tmp_path):
+        path = tmp_path / "settings.json"
+        path.write_text("{}")
+        calls: list[Path] = []
+        value = WatchedValue(_counting_loader(calls))
+        value.get(path)
+
+        (tmp_path / "conversation.json").write_text("{}")
+        value.get(path)
+        assert len(calls) == 1
+
+    @_linux_only
+    def test_only_requested_paths_are_counted(self, tmp_path):
+        path = tmp_path / "settings.json"
+        atomic_write_text(path, "{}")
+        value = WatchedValue(_counting_loader([]))
+        value.get(path)
+
+        for i in range(5):
+            atomic_write_text(tmp_path / f"other-{i}.json", "{}")
+        atomic_write_text(path, '{"a": 1}')
+        assert value.get(path) == {"a": 1}
+        inotify = file_cache._get_inotify()
+        assert inotify is not None
+        assert all(p in (path, tmp_path) or not p.is_relative_to(tmp_path) for p in inotify._generations)
+
+    @_linux_only
+    def test_hot_path_does_no_file_io(self, tmp_path, monkeypatch):
+        path = tmp_path / "settings.json"
+        path.write_text('{"a": 1}')
+        value = WatchedValue(_counting_loader([]))
+        value.get(path)
+
+        def _no_io(*args, **kwargs):
+            raise AssertionError("file I/O on the cached path")
+
+        monkeypatch.setattr(os, "stat", _no_io)
+        monkeypatch.setattr(os, "scandir", _no_io)
+        monkeypatch.setattr(Path, "read_text", _no_io)
+        for _ in range(100):
+            assert value.get(path) == {"a": 1}
+
+
+@pytest.mark.unit
+class TestWatchedDirectory:
+    """Directory-of-files values."""
+
+    def test_sees_new_and_edited_entries(self, tmp_path, detection):
+        d = tmp_path / "profiles"
+        calls: list[Path] = []
+
+        def _load(path: Path, previous: dict | None) -> dict:
+            calls.append(path)
+            if not path.is_dir():
+                return {}
+            return {f.name: f.read_text() for f in path.glob("*.json")}
+
+        value = WatchedValue(_load, directory=True)
+        assert value.get(d) == {}
+
+        d.mkdir()
+        (d / "a.json").write_text("1")
+        assert value.get(d) == {"a.json": "1"}
+        (d / "a.json").write_text("22")
+        assert value.get(d) == {"a.json": "22"}
+        assert value.get(d) == {"a.json": "22"}
+        assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_concurrent_writers_never_tear_reads(tmp_path):
+    """Readers only ever parse complete documents while writers replace the file."""
+    path = tmp_path / "settings.json"
+    atomic_write_text(path, json.dumps({"n": 0, "pad": "x" * 50_000}))
+    errors: list[BaseException] = []
+
+    def _load(p: Path, previous: dict | None) -> dict:
+        return json.loads(p.read_text())
+
+    value = WatchedValue(_load)
+    stop = threading.Event()
+
+    def _writer(offset: int) -> None:
+        for i in range(50):
+            atomic_write_text(path, json.dumps({"n": offset + i, "pad": "x" * 50_000}))
+        stop.set()
+
+    def _reader() -> None:
+        try:
+            while not stop.is_set():
+                assert "n" in value.get(path)
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_reader) for _ in range(3)]
+    threads += [threading.Thread(target=_writer, args=(k * 100,)) for k in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
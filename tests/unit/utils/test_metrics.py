@@ -0,0 +1,103 @@
+"""Tests for the lock-free metrics registry and Prometheus rendering."""
+
+import threading
+
+import pytest
+
+from utils.metrics import Counter, Gauge, Histogram, Registry, _Metric, render_prometheus
+
+
+@pytest.fixture
+def registry() -> Registry:
+    return Registry()
+
+
+@pytest.mark.unit
+def test_counter_sums_across_threads(registry):
+    counter = Counter("jobs", "Jobs run.", ("kind",), registry=registry)
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counter.inc("b", amount=2.5)
+
+    assert counter.value("a") == 4000
+    assert counter.value("b") == 2.5
+
+
+@pytest.mark.unit
+def test_wrong_label_count_raises(registry):
+    counter = Counter("jobs", "Jobs run.", ("kind",), registry=registry)
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc()
+
+
+@pytest.mark.unit
+def test_metric_kinds_must_implement_samples(registry):
+    class Incomplete(_Metric):
+        kind = "untyped"
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete("incomplete", "No samples.", registry=registry)
+
+
+@pytest.mark.unit
+def test_gauge_inc_dec_set_and_function(registry):
+    gauge = Gauge("depth", "Queue depth.", registry=registry)
+    gauge.inc(amount=3)
+    gauge.dec()
+    assert gauge.value() == 2
+    gauge.set(7)
+    assert gauge.value() == 7
+
+    items = [1, 2, 3]
+    live = Gauge("live", "Live items.", registry=registry)
+    live.set_function(lambda: len(items))
+    items.append(4)
+    assert live.value() == 4
+
+
+@pytest.mark.unit
+def test_histogram_buckets_are_cumulative(registry):
+    hist = Histogram("latency_seconds", "Latency.", ("op",), buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, "read")
+
+    text = render_prometheus(registry)
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{op="read",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{op="read",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{op="read",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{op="read"} 4' in text
+    assert hist.count("read") == 4
+
+
+@pytest.mark.unit
+def test_render_escapes_labels_and_suffixes_counters(registry):
+    counter = Counter("calls", "Calls\nmade.", ("name",), registry=registry)
+    counter.inc('say "hi"\\')
+
+    text = render_prometheus(registry)
+
+    assert "# HELP calls Calls\\nmade." in text
+    assert "# TYPE calls counter" in text
+    assert 'calls_total{name="say \\"hi\\"\\\\"} 1.0' in text
+
+
+@pytest.mark.unit
+def test_failing_gauge_function_is_skipped(registry):
+    broken = Gauge("broken", "Broken.", registry=registry)
+    broken.set_function(lambda: 1 / 0)
+    Counter("ok", "Fine.", registry=registry).inc()
+
+    text = render_prometheus(registry)
+
+    assert "broken" not in text
+    assert "ok_total 1.0" in text
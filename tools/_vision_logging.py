@@ -1,21 +1,12 @@
-"""Shared Rich panel logging for vision model tool calls."""
+"""Shared event logging (with Rich panels) for vision model tool calls."""
 
 from __future__ import annotations
 
 import logging
 
-logger = logging.getLogger(__name__)
-
-# Lazy-initialised Rich console for panel logging.
-_console = None
+from logging_config import log_event
 
-
-def _get_console():
-    global _console  # noqa: PLW0603
-    if _console is None:
-        from rich.console import Console
-        _console = Console(stderr=True)
-    return _console
+logger = logging.getLogger(__name__)
 
 
 def log_vision_panel(
@@ -27,7 +18,7 @@ def log_vision_panel(
     *,
     image_source: str = "",
 ) -> None:
-    """Emit a Rich panel summarising a vision model call.
+    """Log a ``vision.call`` event (with a Rich panel) summarising a vision model call.
 
     Only emits when DEBUG logging is enabled.
 
@@ -59,10 +50,15 @@ def log_vision_panel(
     title = "[bold cyan]%s[/bold cyan]  [dim]%s[/dim]" % (tool_name, model)
     subtitle = "[bold]%.0fms[/bold]  %d chars" % (elapsed_ms, len(response))
 
-    _get_console().print(Panel(
-        body,
-        title=title,
-        subtitle=subtitle,
-        border_style="dim",
-        expand=False,
-    ))
+    log_event(
+        "vision.call", "%s (%s): %d chars in %.0fms", tool_name, model, len(response), elapsed_ms,
+        tool=tool_name, model=model, source=image_source, response_chars=len(response),
+        elapsed_ms=round(elapsed_ms, 1),
+        panel=Panel(
+            body,
+            title=title,
+            subtitle=subtitle,
+            border_style="dim",
+            expand=False,
+        ),
+    )
@@ -20,12 +20,15 @@ Public API:
   action (click, type, scroll, drag, etc.).
 - execute_javascript: Execute arbitrary JavaScript for advanced scenarios (use sparingly;
   prefer structured tools like click, fill_field for reliability).
+- wait_for_download: Wait for a download reported as in progress and return
+  its saved path.
 - close_browser: Cleanly close the persistent Playwright browser.
 """
 
 from .core import Browser, close_browser, get_browser
 from .core.exceptions import BrowserToolError
 from .core.page_view import PageView
+from .downloads import wait_for_download
 from .interactions import (
     click,
     drag,
@@ -67,4 +70,5 @@ __all__ = [
     "save_page_content",
     "scroll_page",
     "select_option",
+    "wait_for_download",
 ]
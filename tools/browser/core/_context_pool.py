@@ -0,0 +1,237 @@
+"""Pool of pre-warmed ephemeral browser contexts for agents.
+
+Creating an ephemeral context costs a ``storage_state()`` round-trip on the
+root profile (serializing every cookie and localStorage entry) plus a
+``new_context()`` call with init scripts.  The pool keeps a few contexts
+ready, seeded from a cached snapshot of the root profile that is refreshed
+only after the root context sees network activity, and recycles released
+contexts instead of destroying them.
+
+Handing out a context never takes a global lock: the idle deque is only
+touched synchronously on the event loop, and concurrent snapshot refreshes
+share a single in-flight ``storage_state()`` call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Request
+
+    from tools.browser.core.browser import Browser
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ContextPool"]
+
+
+def _origin(url: str) -> str | None:
+    """Return the ``scheme://host[:port]`` origin of *url*, or ``None``."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ContextPool:
+    """Warm ephemeral contexts on the root browser's Chrome process.
+
+    Args:
+        root: The persistent root browser whose profile seeds every context.
+        size: Number of idle contexts to keep ready. ``0`` disables
+            pre-warming and recycling — contexts are created on demand and
+            closed on release.
+    """
+
+    def __init__(self, root: Browser, size: int) -> None:
+        self.root = root
+        self._size = max(0, size)
+        self._idle: deque[tuple[Browser, int]] = deque()
+        self._generation = 0
+        self._state: Any = None
+        self._stale = True
+        self._refresh: asyncio.Future[tuple[int, Any]] | None = None
+        self._refill: asyncio.Task[None] | None = None
+        self._background: set[asyncio.Task[None]] = set()
+        self._creating = 0
+        self._closed = False
+        # Per-context bookkeeping: snapshot generation and visited origins.
+        self._generations: dict[Browser, int] = {}
+        self._origins: dict[Browser, set[str]] = {}
+        root._context.on("response", self._on_root_activity)
+
+    def _on_root_activity(self, _response: Any) -> None:
+        """Mark the cached snapshot stale after any root profile traffic."""
+        self._stale = True
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm contexts ready to be handed out."""
+        return len(self._idle)
+
+    async def _snapshot(self) -> tuple[int, Any]:
+        """Return ``(generation, storage_state)``, refreshing it if stale."""
+        if not self._stale:
+            return self._generation, self._state
+        if self._refresh is None:
+            self._refresh = asyncio.ensure_future(self._refresh_snapshot())
+            self._refresh.add_done_callback(self._clear_refresh)
+        return await asyncio.shield(self._refresh)
+
+    def _clear_refresh(self, _fut: asyncio.Future[tuple[int, Any]]) -> None:
+        self._refresh = None
+
+    async def _refresh_snapshot(self) -> tuple[int, Any]:
+        # Clear the flag first so traffic during the call marks it stale again.
+        self._stale = False
+        try:
+            state = await self.root._context.storage_state()
+        except Exception:
+            self._stale = True
+            raise
+        self._state = state
+        self._generation += 1
+        logger.debug("Refreshed root storage snapshot (generation %d)", self._generation)
+        return self._generation, state
+
+    async def _create(self, generation: int, state: Any) -> Browser:
+        """Create a new ephemeral context seeded from *state*."""
+        browser = await type(self.root).start_ephemeral(self.root, storage_state=state)
+        origins: set[str] = set()
+
+        def _on_request(request: Request) -> None:
+            origin = _origin(request.url)
+            if origin is not None:
+                origins.add(origin)
+
+        browser._context.on("request", _on_request)
+        self._generations[browser] = generation
+        self._origins[browser] = origins
+        return browser
+
+    def _forget(self, browser: Browser) -> None:
+        self._generations.pop(browser, None)
+        self._origins.pop(browser, None)
+
+    async def acquire(self) -> Browser:
+        """Hand out a context seeded from the current root snapshot.
+
+        Returns a warm context when one matches the current snapshot,
+        otherwise creates one on demand.  Either way a background refill
+        tops the pool back up to its target size.
+        """
+        generation, state = await self._snapshot()
+        browser: Browser | None = None
+        while self._idle:
+            candidate, candidate_gen = self._idle.popleft()
+            if candidate_gen == generation and not candidate._closed:
+                browser = candidate
+                break
+            self._discard(candidate)
+        if browser is None:
+            browser = await self._create(generation, state)
+            logger.debug("Created ephemeral context on demand (pool empty)")
+        self._schedule_refill()
+        return browser
+
+    async def release(self, browser: Browser) -> None:
+        """Return *browser* to the pool, or close it if it cannot be reused.
+
+        A context is recycled only when it was seeded from the current
+        snapshot and every origin it touched can be wiped without losing
+        seeded localStorage.  Anything else is closed.
+        """
+        generation = self._generations.get(browser)
+        origins = self._origins.get(browser, set())
+        recyclable = (
+            not self._closed
+            and not browser._closed
+            and generation == self._generation
+            and not self._stale
+            and len(self._idle) + self._creating < self._size
+            and not origins & self._seeded_origins()
+        )
+        if not recyclable:
+            self._forget(browser)
+            await browser.close_context()
+            return
+        try:
+            await browser.reset_context(self._state.get("cookies", []), sorted(origins))
+        except Exception:
+            logger.warning("Failed to recycle browser context — closing it", exc_info=True)
+            self._forget(browser)
+            await browser.close_context()
+            return
+        origins.clear()
+        # The reset awaits, so a refill may have filled the pool meanwhile.
+        if self._closed or generation != self._generation or len(self._idle) >= self._size:
+            self._forget(browser)
+            await browser.close_context()
+            return
+        self._idle.append((browser, generation))
+        logger.debug("Recycled browser context (%d idle)", len(self._idle))
+
+    def _seeded_origins(self) -> set[str]:
+        """Origins whose localStorage comes from the root snapshot."""
+        if not self._state:
+            return set()
+        return {entry["origin"] for entry in self._state.get("origins", []) if entry.get("localStorage")}
+
+    def warm(self) -> None:
+        """Start filling the pool in the background."""
+        self._schedule_refill()
+
+    def _schedule_refill(self) -> None:
+        if self._closed or self._size == 0:
+            return
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.ensure_future(self._fill())
+
+    async def _fill(self) -> None:
+        while not self._closed and len(self._idle) + self._creating < self._size:
+            self._creating += 1
+            try:
+                generation, state = await self._snapshot()
+                browser = await self._create(generation, state)
+            except Exception:
+                logger.warning("Failed to pre-warm browser context", exc_info=True)
+                return
+            finally:
+                self._creating -= 1
+            if self._closed:
+                self._forget(browser)
+                await browser.close_context()
+                return
+            self._idle.append((browser, generation))
+            logger.debug("Pre-warmed browser context (%d idle)", len(self._idle))
+
+    def _discard(self, browser: Browser) -> None:
+        """Close a stale idle context without blocking the caller."""
+        self._forget(browser)
+        task = asyncio.ensure_future(browser.close_context())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def close(self) -> None:
+        """Stop refilling and close every idle context."""
+        self._closed = True
+        if self._refill is not None and not self._refill.done():
+            self._refill.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._refill
+        idle = [browser for browser, _ in self._idle]
+        self._idle.clear()
+        for browser in idle:
+            self._forget(browser)
+            try:
+                await browser.close_context()
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to close pooled browser context")
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
@@ -50,28 +50,30 @@ class DomNode:
     extra: dict | None = None
 
 
-__all__ = ["DomNode", "NodeType", "ViewportPosition", "parse_nodes"]
+__all__ = ["DomNode", "NodeType", "ViewportPosition", "parse_node", "parse_nodes"]
+
+
+def parse_node(d: dict) -> DomNode:
+    """Convert a single raw JS dict into a typed DomNode."""
+    return DomNode(
+        type=NodeType(d["type"]),
+        depth=d.get("depth", 0),
+        ref=d.get("ref"),
+        role=d.get("role"),
+        name=d.get("name"),
+        text=d.get("text"),
+        value=d.get("value"),
+        level=d.get("level"),
+        tag=d.get("tag"),
+        viewport=ViewportPosition(d.get("viewport", "in")),
+        expanded=d.get("expanded"),
+        selected=d.get("selected"),
+        checked=d.get("checked"),
+        pressed=d.get("pressed"),
+        extra=d.get("extra"),
+    )
 
 
 def parse_nodes(raw: list[dict]) -> list[DomNode]:
     """Convert raw JS dicts into typed DomNode instances."""
-    result: list[DomNode] = []
-    for d in raw:
-        result.append(DomNode(
-            type=NodeType(d["type"]),
-            depth=d.get("depth", 0),
-            ref=d.get("ref"),
-            role=d.get("role"),
-            name=d.get("name"),
-            text=d.get("text"),
-            value=d.get("value"),
-            level=d.get("level"),
-            tag=d.get("tag"),
-            viewport=ViewportPosition(d.get("viewport", "in")),
-            expanded=d.get("expanded"),
-            selected=d.get("selected"),
-            checked=d.get("checked"),
-            pressed=d.get("pressed"),
-            extra=d.get("extra"),
-        ))
-    return result
+    return [parse_node(d) for d in raw]
@@ -0,0 +1,201 @@
+"""Tracking of in-flight browser downloads.
+
+Playwright only hands over a download's path once it has finished, so a
+large file would hold up the interaction that triggered it.  A
+:class:`DownloadHandle` instead watches the file Playwright is writing,
+sniffs its content type from the first bytes, publishes
+``DownloadProgressPayload`` events, and lets the browser return an
+in-progress :class:`DownloadInfo` while the download continues.  When it
+completes, the file is renamed to the suggested filename, or dropped in
+favour of an identical file already in the downloads directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import secrets
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from tools.browser.core._file_detection import (
+    _SNIFF_BYTES,
+    DownloadInfo,
+    build_download_info_from_path,
+    file_sha256,
+    find_duplicate,
+    sniff_content_type,
+)
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_S = 0.25
+_PROGRESS_EVENT_INTERVAL_S = 1.0
+
+
+def _artifact_path(download: Any) -> Path | None:
+    """Return the file Playwright is writing for *download*, if exposed.
+
+    This reads Playwright's private artifact object; when that is not
+    available, progress is only reported on completion.
+    """
+    try:
+        impl = getattr(download, "_impl_obj", download)
+        path = impl._artifact.absolute_path
+    except AttributeError:
+        return None
+    return Path(path) if isinstance(path, str) and path else None
+
+
+class DownloadHandle:
+    """One browser download, from the download event until it is saved."""
+
+    def __init__(self, download: Any, *, downloads_dir: str, total_bytes: int | None = None) -> None:
+        self.id = secrets.token_hex(4)
+        self.url: str = getattr(download, "url", "") or ""
+        self.suggested_filename: str = getattr(download, "suggested_filename", "") or ""
+        self.downloads_dir = downloads_dir
+        self.total_bytes = total_bytes
+        self.partial_path = _artifact_path(download)
+        self.state: Literal["in_progress", "complete", "failed"] = "in_progress"
+        self.bytes_received = 0
+        self.content_type: str | None = None
+        self.info: DownloadInfo | None = None
+        self.reported = False
+        """True once an in-progress info for this download was returned to a tool."""
+        self._download = download
+        self._done = asyncio.Event()
+        self._last_event = 0.0
+
+    @property
+    def filename(self) -> str:
+        if self.info is not None:
+            return self.info.filename
+        return self.suggested_filename or (self.partial_path.name if self.partial_path else self.id)
+
+    def snapshot(self) -> DownloadInfo:
+        """Current state as a ``DownloadInfo`` (the final one once complete)."""
+        if self.info is not None:
+            return self.info
+        dest = Path(self.downloads_dir) / self.suggested_filename if self.suggested_filename else None
+        return DownloadInfo(
+            path=str(dest or self.partial_path or ""),
+            content_type=self.content_type or sniff_content_type(b"", filename=self.suggested_filename),
+            size_bytes=self.bytes_received,
+            filename=self.filename,
+            state=self.state,
+            download_id=self.id,
+            total_bytes=self.total_bytes,
+            partial_path=str(self.partial_path) if self.partial_path else None,
+        )
+
+    async def wait(self, timeout: float | None = None) -> DownloadInfo:
+        """Wait up to *timeout* seconds for completion and return the current state."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._done.wait(), timeout)
+        return self.snapshot()
+
+    async def run(self) -> DownloadInfo | None:
+        """Follow the download to completion and save it.
+
+        Returns:
+            The final ``DownloadInfo``, or ``None`` if the download failed.
+        """
+        monitor = asyncio.create_task(self._monitor()) if self.partial_path else None
+        try:
+            path = await self._download.path()
+        except Exception:
+            logger.exception("Download %s failed", self.url)
+            path = None
+        finally:
+            if monitor is not None:
+                monitor.cancel()
+        try:
+            if not path:
+                logger.warning("Download completed but no path available")
+                self.state = "failed"
+                return None
+            self.info = await asyncio.to_thread(self._finish, Path(path))
+            self.state = "complete"
+            return self.info
+        finally:
+            self._done.set()
+            self._publish(force=True)
+
+    async def _monitor(self) -> None:
+        """Poll the partial file for progress and sniff its content type."""
+        assert self.partial_path is not None
+        while True:
+            try:
+                size = self.partial_path.stat().st_size
+            except OSError:
+                size = 0
+            if size != self.bytes_received:
+                self.bytes_received = size
+                if self.content_type is None and size >= _SNIFF_BYTES:
+                    self.content_type = await asyncio.to_thread(self._sniff, self.partial_path)
+                self._publish()
+            await asyncio.sleep(_POLL_INTERVAL_S)
+
+    def _sniff(self, path: Path) -> str | None:
+        try:
+            with path.open("rb") as f:
+                head = f.read(_SNIFF_BYTES)
+        except OSError:
+            return None
+        return sniff_content_type(head, filename=self.suggested_filename)
+
+    def _finish(self, path: Path) -> DownloadInfo:
+        """Deduplicate or rename the finished file (runs in a worker thread)."""
+        size = path.stat().st_size
+        self.bytes_received = size
+        if self.downloads_dir:
+            directory = Path(self.downloads_dir)
+            duplicate = find_duplicate(directory, file_sha256(path), size, exclude=path)
+            if duplicate is not None:
+                path.unlink(missing_ok=True)
+                logger.info("Download %s identical to %s; keeping one copy", self.filename, duplicate)
+                return build_download_info_from_path(duplicate).model_copy(update={"deduplicated": True})
+
+            # Playwright saves downloads with opaque UUID filenames.  Rename
+            # to the server's suggested name so the agent sees a meaningful
+            # filename and MIME-type detection works correctly.
+            suggested = self.suggested_filename
+            if suggested:
+                dest = directory / suggested
+                if dest.exists():
+                    dest = directory / f"{dest.stem}_{secrets.token_hex(4)}{dest.suffix}"
+                try:
+                    path.rename(dest)
+                    path = dest
+                except OSError:
+                    logger.debug("Could not rename download to %s", suggested)
+        return build_download_info_from_path(path)
+
+    def _publish(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_event < _PROGRESS_EVENT_INTERVAL_S:
+            return
+        self._last_event = now
+        try:
+            from sdk.events import AgentEvent, DownloadProgressPayload, publish_event
+
+            info = self.snapshot()
+            publish_event(AgentEvent(payload=DownloadProgressPayload(
+                type="download_progress",
+                download_id=self.id,
+                filename=info.filename,
+                url=self.url,
+                status=self.state,
+                bytes_received=info.size_bytes,
+                total_bytes=self.total_bytes,
+                content_type=info.content_type,
+                path=info.path if self.state == "complete" else None,
+            )))
+        except Exception:
+            logger.debug("Failed to publish download progress", exc_info=True)
+
+
+__all__ = ["DownloadHandle"]
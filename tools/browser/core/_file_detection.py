@@ -2,15 +2,21 @@
 
 Detects when a navigation or interaction results in a file (PDF, image,
 archive, etc.) rather than an HTML page, and provides utilities to save
-the file and report it to the agent.
+the file and report it to the agent.  Content types are sniffed from the
+first bytes, and a file identical to one already in the downloads
+directory is replaced by a reference to the existing copy.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import mimetypes
+import os
 import uuid
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -42,16 +48,29 @@ class DownloadInfo(BaseModel):
     """Metadata about a downloaded file.
 
     Attributes:
-        path: Absolute path to the saved file.
+        path: Absolute path to the saved file (where it will be saved while
+            ``state`` is ``"in_progress"``).
         content_type: MIME type of the downloaded file.
-        size_bytes: File size in bytes.
+        size_bytes: File size in bytes (bytes received so far while in progress).
         filename: The filename (basename) of the saved file.
+        state: ``"complete"``, or ``"in_progress"`` when the interaction
+            returned before a large download finished.
+        download_id: Handle for ``wait_for_download`` while in progress.
+        total_bytes: Expected size, when known, while in progress.
+        partial_path: The file being written, readable while in progress.
+        deduplicated: True when an identical file already existed and
+            ``path`` points to it instead of a new copy.
     """
 
     path: str
     content_type: str
     size_bytes: int
     filename: str
+    state: Literal["complete", "in_progress", "failed"] = "complete"
+    download_id: str | None = None
+    total_bytes: int | None = None
+    partial_path: str | None = None
+    deduplicated: bool = False
 
 
 def is_file_content_type(content_type: str) -> bool:
@@ -117,9 +136,20 @@ async def save_response_as_file(
         if refetched:
             body = refetched
 
-    dest.write_bytes(body)
-
+    ct = sniff_content_type(body[:_SNIFF_BYTES], ct, filename=basename)
     size = len(body)
+    existing = await asyncio.to_thread(_find_identical, dl_path, body, size)
+    if existing is not None:
+        logger.info("File download identical to %s; not saving a copy", existing)
+        return DownloadInfo(
+            path=str(existing),
+            content_type=ct,
+            size_bytes=size,
+            filename=existing.name,
+            deduplicated=True,
+        )
+
+    await asyncio.to_thread(dest.write_bytes, body)
 
     logger.info(
         "Saved file download: %s (%s, %d bytes)", dest, ct, size,
@@ -133,6 +163,121 @@ async def save_response_as_file(
     )
 
 
+# ── Content sniffing ─────────────────────────────────────────────────
+
+_SNIFF_BYTES = 512
+
+# (offset, signature, MIME type), checked in order.
+_SIGNATURES: tuple[tuple[int, bytes, str], ...] = (
+    (0, b"%PDF", "application/pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (8, b"WEBP", "image/webp"),
+    (8, b"WAVE", "audio/wav"),
+    (8, b"AVI ", "video/x-msvideo"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"\x1aE\xdf\xa3", "video/webm"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"BZh", "application/x-bzip2"),
+    (0, b"\xfd7zXZ\x00", "application/x-xz"),
+    (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (0, b"Rar!\x1a\x07", "application/vnd.rar"),
+    (257, b"ustar", "application/x-tar"),
+    (0, b"SQLite format 3\x00", "application/vnd.sqlite3"),
+    (0, b"PAR1", "application/vnd.apache.parquet"),
+    (0, b"\x7fELF", "application/x-executable"),
+)
+
+
+def sniff_content_type(head: bytes, declared: str | None = None, *, filename: str = "") -> str:
+    """Return the MIME type of a file from its first bytes.
+
+    A recognised signature wins over *declared* (the Content-Type header),
+    except that ZIP-based formats (docx, xlsx, epub, jar, ...) keep the more
+    specific type implied by *declared* or *filename*.  Without a signature,
+    *declared* is used if it is specific, then the type guessed from
+    *filename*, then ``application/octet-stream``.
+
+    Args:
+        head: The first bytes of the file (``_SNIFF_BYTES`` is enough).
+        declared: Content-Type from the server, possibly with parameters.
+        filename: Name used for extension-based guessing.
+    """
+    declared_base = (declared or "").split(";")[0].strip().lower()
+    guessed = mimetypes.guess_type(filename)[0] if filename else None
+    for offset, signature, mime in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if mime == "application/zip":
+                for specific in (declared_base, guessed):
+                    if specific and specific not in ("application/zip", "application/octet-stream"):
+                        return specific
+            return mime
+    stripped = head.lstrip()[:64].lower()
+    if stripped.startswith((b"<!doctype html", b"<html")):
+        return "text/html"
+    if declared_base and declared_base not in ("application/octet-stream", "binary/octet-stream"):
+        return declared_base
+    return guessed or "application/octet-stream"
+
+
+# ── Duplicate detection ──────────────────────────────────────────────
+
+_HASH_CHUNK = 1024 * 1024
+# (path, size, mtime_ns) → sha256 of files already hashed in downloads dirs.
+_hash_cache: dict[tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: Path) -> str:
+    """Hash *path* in chunks (downloads can be larger than memory)."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached_sha256(path: Path, stat_result: os.stat_result) -> str:
+    key = (str(path), stat_result.st_size, stat_result.st_mtime_ns)
+    sha = _hash_cache.get(key)
+    if sha is None:
+        sha = _hash_cache[key] = file_sha256(path)
+    return sha
+
+
+def find_duplicate(directory: Path, sha256: str, size: int, *, exclude: Path | None = None) -> Path | None:
+    """Return a file in *directory* with the given content hash, if any.
+
+    Only files of the same size are hashed, so the check is cheap for a
+    directory of unrelated downloads.
+    """
+    try:
+        entries = list(directory.iterdir())
+    except OSError:
+        return None
+    for entry in entries:
+        if entry == exclude:
+            continue
+        try:
+            st = entry.stat()
+            if not entry.is_file() or st.st_size != size:
+                continue
+            if _cached_sha256(entry, st) == sha256:
+                return entry
+        except OSError:
+            continue
+    return None
+
+
+def _find_identical(directory: Path, body: bytes, size: int) -> Path | None:
+    return find_duplicate(directory, hashlib.sha256(body).hexdigest(), size)
+
+
 def _is_viewer_html(body: bytes, expected_ct: str) -> bool:
     """Return True if the body is a Chromium viewer HTML wrapper.
 
@@ -211,8 +356,12 @@ def build_download_info_from_path(
     """
     p = Path(path)
     if content_type is None:
-        content_type, _ = mimetypes.guess_type(p.name)
-        content_type = content_type or "application/octet-stream"
+        try:
+            with p.open("rb") as f:
+                head = f.read(_SNIFF_BYTES)
+        except OSError:
+            head = b""
+        content_type = sniff_content_type(head, filename=p.name)
 
     return DownloadInfo(
         path=str(p),
@@ -232,8 +381,22 @@ def format_download_message(info: DownloadInfo) -> str:
         A string suitable for use as PageView.content.
     """
     size_str = _format_size(info.size_bytes)
+    if info.state == "in_progress":
+        total = f" of {_format_size(info.total_bytes)}" if info.total_bytes else ""
+        partial = f"Partial data so far: {info.partial_path}\n" if info.partial_path else ""
+        return (
+            f"Download in progress: {info.filename} (id {info.download_id})\n"
+            f"Type: {info.content_type}\n"
+            f"Received: {size_str}{total}\n"
+            f"{partial}"
+            f'\nCall wait_for_download("{info.download_id}") for the saved path before '
+            f"processing the whole file."
+        )
+    if info.state == "failed":
+        return f"Download failed: {info.filename}"
+    duplicate = " (identical to an earlier download)" if info.deduplicated else ""
     return (
-        f"Downloaded file: {info.path}\n"
+        f"Downloaded file: {info.path}{duplicate}\n"
         f"Type: {info.content_type}\n"
         f"Size: {size_str}\n"
         f"\nUse run_bash_cmd to inspect or process this file."
@@ -260,7 +423,10 @@ def _format_size(size_bytes: int) -> str:
 __all__ = [
     "DownloadInfo",
     "build_download_info_from_path",
+    "file_sha256",
+    "find_duplicate",
     "format_download_message",
     "is_file_content_type",
     "save_response_as_file",
+    "sniff_content_type",
 ]
@@ -4,17 +4,24 @@ from __future__ import annotations
 
 import html2text
 
-_converter = html2text.HTML2Text()
-_converter.ignore_images = True
-_converter.ignore_emphasis = False
-_converter.body_width = 0
-_converter.protect_links = True
-_converter.unicode_snob = True
+
+def _new_converter() -> html2text.HTML2Text:
+    converter = html2text.HTML2Text()
+    converter.ignore_images = True
+    converter.ignore_emphasis = False
+    converter.body_width = 0
+    converter.protect_links = True
+    converter.unicode_snob = True
+    return converter
 
 
 def html_to_markdown(html: str) -> str:
-    """Convert HTML to markdown."""
-    return _converter.handle(html)
+    """Convert HTML to markdown.
+
+    Safe to call from worker threads — each call uses its own converter
+    because ``HTML2Text`` keeps parse state on the instance.
+    """
+    return _new_converter().handle(html)
 
 
 __all__ = ["html_to_markdown"]
@@ -0,0 +1,122 @@
+"""Python-side state for incremental DOM snapshots.
+
+In incremental mode the JS walker returns only the nodes that changed since
+the previous snapshot of the same document, keyed by stable node ids.  This
+module merges those deltas into the node list kept per frame (so unchanged
+nodes are never re-sent or re-parsed) and renders a compact line diff
+between two consecutive views.
+"""
+
+from __future__ import annotations
+
+import difflib
+from dataclasses import dataclass, field
+from typing import Any
+
+from tools.browser.core._dom_nodes import DomNode, parse_node
+
+__all__ = ["SnapshotState", "apply_delta", "render_changes"]
+
+
+@dataclass(slots=True)
+class SnapshotState:
+    """Node list and last rendered view for one document.
+
+    Attributes:
+        doc: Random document id assigned by the JS walker.
+        seq: Sequence number of the snapshot this state reflects.
+        nodes: Parsed nodes by stable key.
+        order: Node keys in document order.
+        lines: Rendered content lines of the last view built from this state.
+        view_params: Scope/full-page/budget the ``lines`` were rendered with.
+    """
+
+    doc: str
+    seq: int
+    nodes: dict[int, DomNode]
+    order: list[int]
+    lines: list[str] = field(default_factory=list)
+    view_params: tuple[Any, ...] = ()
+
+    def since(self) -> dict[str, Any]:
+        """Return the marker the JS walker diffs against."""
+        return {"doc": self.doc, "seq": self.seq}
+
+    def ordered_nodes(self) -> list[DomNode]:
+        """Return the nodes in document order."""
+        return [self.nodes[key] for key in self.order]
+
+
+def apply_delta(
+    state: SnapshotState | None,
+    raw_nodes: list[dict],
+    delta: dict[str, Any],
+) -> SnapshotState | None:
+    """Merge an incremental snapshot result into *state*.
+
+    Args:
+        state: State from the previous snapshot of this frame, if any.
+        raw_nodes: Changed (or, on reset, all) node dicts from the walker.
+        delta: The walker's ``incremental`` block.
+
+    Returns:
+        The updated state, or ``None`` when the delta does not line up with
+        *state* and a full snapshot is needed instead.
+    """
+    same_doc = state is not None and state.doc == delta["doc"]
+    if delta["reset"] or state is None or not same_doc:
+        nodes: dict[int, DomNode] = {}
+        previous_order: list[int] | None = None
+    else:
+        nodes = dict(state.nodes)
+        previous_order = state.order
+
+    for d in raw_nodes:
+        nodes[d["key"]] = parse_node(d)
+    for key in delta["removed"]:
+        nodes.pop(key, None)
+
+    order = delta["order"] if delta["order"] is not None else previous_order
+    if order is None or any(key not in nodes for key in order):
+        return None
+    # Drop nodes that fell out of the walk without being reported as removed
+    if len(nodes) != len(order):
+        nodes = {key: nodes[key] for key in order}
+
+    return SnapshotState(
+        doc=delta["doc"],
+        seq=delta["seq"],
+        nodes=nodes,
+        order=order,
+        lines=state.lines if state is not None and same_doc else [],
+        view_params=state.view_params if state is not None and same_doc else (),
+    )
+
+
+def render_changes(old_lines: list[str], new_lines: list[str]) -> str:
+    """Render the lines added and removed between two views.
+
+    Args:
+        old_lines: Content lines of the previous view.
+        new_lines: Content lines of the current view.
+
+    Returns:
+        A header followed by ``- old`` / ``+ new`` lines in view order.
+    """
+    out: list[str] = []
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        for line in old_lines[i1:i2]:
+            out.append(f"- {line}")
+            removed += 1
+        for line in new_lines[j1:j2]:
+            out.append(f"+ {line}")
+            added += 1
+
+    if not out:
+        return "[No changes since last view — call browse_page() for the full view]"
+    header = f"[Changes since last view: +{added} -{removed} lines — call browse_page() for the full view]"
+    return "\n".join([header, *out])
@@ -0,0 +1,261 @@
+"""Network-layer resource policy for agent browser contexts.
+
+Agent contexts do not need most of what a page downloads: videos, ad and
+tracker scripts, and — depending on configuration — images and web fonts.
+``ResourcePolicy`` installs a single route on each ephemeral context that
+
+* aborts requests whose resource type or host is blocked,
+* serves cacheable static assets (scripts, stylesheets, fonts, images) from
+  a disk cache shared by every context on the Chrome process, and
+* lets everything else through untouched.
+
+Playwright disables Chromium's HTTP cache for routed contexts, so the shared
+disk cache also stands in for the per-context memory cache that ephemeral
+contexts would otherwise start without.
+
+Per-context counters (``NetworkStats``) are drained after every browser
+action and reported on ``SettleTimings``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from playwright.async_api import Error as PlaywrightError
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
+
+    from config import BrowserNetworkConfig
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HttpDiskCache", "NetworkStats", "ResourcePolicy"]
+
+_CACHEABLE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+
+# Headers that describe the wire encoding rather than the decoded body we
+# store, or that must never be replayed to another context.
+_DROP_HEADERS = frozenset({
+    "content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection",
+})
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class NetworkStats:
+    """Counters for requests the policy handled since the last drain."""
+
+    blocked_requests: int = 0
+    cached_requests: int = 0
+    bytes_saved: int = 0
+
+    def drain(self) -> NetworkStats:
+        """Return a copy of the counters and reset them to zero."""
+        snapshot = NetworkStats(self.blocked_requests, self.cached_requests, self.bytes_saved)
+        self.blocked_requests = self.cached_requests = self.bytes_saved = 0
+        return snapshot
+
+
+def _cache_ttl(headers: dict[str, str], cap_s: int) -> int:
+    """Return how long a response may be served from cache, in seconds.
+
+    Only responses with an explicit positive ``max-age`` (or ``immutable``)
+    and no ``no-store``/``no-cache``/``private`` directive are cached.
+    Responses that vary on anything but encoding or set cookies are not.
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if any(d in cache_control for d in ("no-store", "no-cache", "private")):
+        return 0
+    if "set-cookie" in headers:
+        return 0
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return 0
+    if "immutable" in cache_control:
+        return cap_s
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return 0
+    return min(int(match.group(1)), cap_s)
+
+
+class HttpDiskCache:
+    """Small on-disk cache of decoded HTTP response bodies keyed by URL.
+
+    Each entry is a ``<sha256>.json`` metadata file next to a ``<sha256>.body``
+    file.  Writes go through a temp file and ``os.replace`` so concurrent
+    readers never see a partial entry.  When the directory grows past
+    *max_bytes*, the least recently written entries are pruned.
+
+    Args:
+        root: Cache directory (created on first write).
+        max_bytes: Soft size limit for all bodies together.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._size: int | None = None
+        self._pruning = False
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self._root / f"{key}.json", self._root / f"{key}.body"
+
+    def _read(self, url: str) -> tuple[int, dict[str, str], bytes] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta["url"] != url or meta["expires"] < time.time():
+                return None
+            return meta["status"], meta["headers"], body_path.read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write(self, url: str, status: int, headers: dict[str, str], body: bytes, ttl_s: int) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "status": status, "headers": headers, "expires": time.time() + ttl_s}
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode())):
+            fd, tmp = tempfile.mkstemp(dir=self._root, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                Path(tmp).replace(path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self._root.glob("*.body"))
+        else:
+            self._size += len(body)
+        if self._size > self._max_bytes:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop the oldest entries until the cache is at 80% of its limit."""
+        bodies = sorted(self._root.glob("*.body"), key=lambda p: p.stat().st_mtime)
+        size = sum(p.stat().st_size for p in bodies)
+        target = int(self._max_bytes * 0.8)
+        for body_path in bodies:
+            if size <= target:
+                break
+            try:
+                size -= body_path.stat().st_size
+                body_path.unlink()
+                body_path.with_suffix(".json").unlink(missing_ok=True)
+            except OSError:
+                continue
+        self._size = size
+
+    async def get(self, url: str) -> tuple[int, dict[str, str], bytes] | None:
+        """Return ``(status, headers, body)`` for a fresh entry, else ``None``."""
+        return await asyncio.to_thread(self._read, url)
+
+    async def put(self, url: str, status: int, headers: dict[str, str], body: bytes, ttl_s: int) -> None:
+        """Store a response body for *ttl_s* seconds."""
+        try:
+            await asyncio.to_thread(self._write, url, status, headers, body, ttl_s)
+        except OSError:
+            logger.debug("Failed to write HTTP cache entry for %s", url, exc_info=True)
+
+
+class ResourcePolicy:
+    """Blocking and caching rules applied to agent browser contexts.
+
+    Args:
+        config: The ``tools.browser.network`` settings.
+        cache: Shared disk cache, or ``None`` to disable response caching.
+    """
+
+    def __init__(self, config: BrowserNetworkConfig, cache: HttpDiskCache | None) -> None:
+        self._blocked_types = frozenset(t.lower() for t in config.block_resource_types)
+        self._blocked_domains = tuple(d.lower().lstrip(".") for d in config.block_domains)
+        self._cache = cache
+        self._cache_max_age_s = config.cache_max_age_s
+        self._fast_settle = config.fast_settle
+
+    @property
+    def active(self) -> bool:
+        """Whether the policy has any rule worth routing requests for."""
+        return bool(self._blocked_types or self._blocked_domains or self._cache)
+
+    @property
+    def skip_font_wait(self) -> bool:
+        """Fonts never load, so waiting on ``document.fonts.ready`` is pointless."""
+        return self._fast_settle and "font" in self._blocked_types
+
+    @property
+    def skip_animation_wait(self) -> bool:
+        """Image fade-ins and media transitions cannot start when both are blocked."""
+        return self._fast_settle and {"image", "media"} <= self._blocked_types
+
+    def _is_blocked_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self._blocked_domains)
+
+    async def install(self, context: BrowserContext) -> NetworkStats:
+        """Route every request of *context* through the policy.
+
+        Returns:
+            The live counters for this context.
+        """
+        stats = NetworkStats()
+
+        async def _handle(route: Route) -> None:
+            try:
+                await self._handle(route, stats)
+            except PlaywrightError:
+                # The page or context went away mid-request.
+                logger.debug("Route handling aborted for %s", route.request.url)
+
+        await context.route("**/*", _handle)
+        return stats
+
+    async def _handle(self, route: Route, stats: NetworkStats) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in self._blocked_types or self._is_blocked_host(request.url):
+            stats.blocked_requests += 1
+            await route.abort("blockedbyclient")
+            return
+
+        if self._cache is None or request.method != "GET" or resource_type not in _CACHEABLE_TYPES:
+            await route.continue_()
+            return
+
+        url = request.url
+        hit = await self._cache.get(url)
+        if hit is not None:
+            status, headers, body = hit
+            stats.cached_requests += 1
+            stats.bytes_saved += len(body)
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except PlaywrightError:
+            await route.continue_()
+            return
+        await route.fulfill(response=response, body=body)
+
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        ttl_s = _cache_ttl(headers, self._cache_max_age_s) if response.status == 200 else 0
+        if ttl_s > 0:
+            stored = {k: v for k, v in headers.items() if k not in _DROP_HEADERS}
+            await self._cache.put(url, response.status, stored, body, ttl_s)
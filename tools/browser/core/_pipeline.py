@@ -21,7 +21,7 @@ from tools.browser.core._dom_nodes import (
 )
 from tools.browser.core.site_filters import filter_for_site
 
-__all__ = ["process_snapshot"]
+__all__ = ["process_nodes", "process_snapshot"]
 
 
 def process_snapshot(
@@ -46,7 +46,33 @@ def process_snapshot(
     Returns:
         Tuple of (annotated text content, whether output was truncated).
     """
-    nodes = parse_nodes(raw_nodes)
+    return process_nodes(
+        parse_nodes(raw_nodes),
+        url=url,
+        scope_query=scope_query,
+        budget=budget,
+        name_limit=name_limit,
+        full_page=full_page,
+    )
+
+
+def process_nodes(
+    nodes: list[DomNode],
+    *,
+    url: str = "",
+    scope_query: str | None = None,
+    budget: int = 8000,
+    name_limit: int = 150,
+    full_page: bool = False,
+) -> tuple[str, bool]:
+    """Process already-parsed DOM nodes into annotated text output.
+
+    Same stages as ``process_snapshot`` minus parsing, for callers that keep
+    parsed nodes between snapshots.
+
+    Returns:
+        Tuple of (annotated text content, whether output was truncated).
+    """
     if not full_page:
         nodes = _filter_viewport(nodes)
     prefix = ""
@@ -36,7 +36,11 @@ from pydantic import BaseModel, ConfigDict
 
 import tools.browser.core.waits as browser_waits
 from config import load_config
+from tools.browser.core._context_pool import ContextPool
+from tools.browser.core._downloads import DownloadHandle
 from tools.browser.core._file_detection import DownloadInfo
+from tools.browser.core._network import HttpDiskCache, NetworkStats, ResourcePolicy
+from tools.browser.core.human import InputStats, start_input_stats
 
 if TYPE_CHECKING:  # Imported only for type checking to avoid runtime dependency surface
     from playwright.async_api import Geolocation, ProxySettings, ViewportSize
@@ -152,6 +156,7 @@ class BrowserInteractionResult(BaseModel):
     settle_timings: browser_waits.SettleTimings | None = None
     frame_transition: str | None = None
     action_ms: float = 0.0
+    input_stats: InputStats | None = None
 
 
 def _chrome_ua_metadata(version: str) -> tuple[str, dict]:
@@ -245,6 +250,14 @@ class Browser:
         self._download_listener_pages: set[int] = set()  # page id() tracking
         self._download_tasks: set[asyncio.Task[None]] = set()
         self._download_event: asyncio.Event = asyncio.Event()
+        self._downloads: dict[str, DownloadHandle] = {}
+        # Content-Length of attachment responses, keyed by URL, so a download
+        # that starts from one can report its expected size.
+        self._expected_download_sizes: dict[str, int] = {}
+        # Request blocking/caching rules. Set on the root browser and applied
+        # to every ephemeral context created from it.
+        self._network_policy: ResourcePolicy | None = None
+        self._network_stats: NetworkStats | None = None
 
         # Auto-attach download listeners to pages created by popups or
         # target=_blank links so file downloads in new tabs are captured.
@@ -287,34 +300,29 @@ class Browser:
         self._attach_download_listener(page)
 
     async def _handle_download(self, download: Any) -> None:
-        """Process a Playwright download event and record the result."""
-        try:
-            path = await download.path()
-            if not path:
-                logger.warning("Download completed but no path available")
-                return
-
-            # Playwright saves downloads with opaque UUID filenames.  Rename
-            # to the server's suggested name so the agent sees a meaningful
-            # filename and MIME-type detection works correctly.
-            suggested: str = getattr(download, "suggested_filename", "")
-            if suggested and self._downloads_dir:
-                dest = Path(self._downloads_dir) / suggested
-                if dest.exists():
-                    stem, suffix = dest.stem, dest.suffix
-                    suggested = f"{stem}_{secrets.token_hex(4)}{suffix}"
-                    dest = Path(self._downloads_dir) / suggested
-                try:
-                    Path(path).rename(dest)
-                    path = str(dest)
-                except OSError:
-                    logger.debug("Could not rename download to %s", suggested)
-
-            from tools.browser.core._file_detection import build_download_info_from_path
+        """Follow a Playwright download event and record the result.
 
-            info = build_download_info_from_path(path)
-            self._pending_downloads.append(info)
+        The download is registered as soon as it starts, so an interaction
+        can report it while it is still being written (see
+        ``drain_downloads``).
+        """
+        try:
+            url = getattr(download, "url", "") or ""
+            handle = DownloadHandle(
+                download,
+                downloads_dir=self._downloads_dir,
+                total_bytes=self._expected_download_sizes.pop(url, None),
+            )
+            self._downloads[handle.id] = handle
+            while len(self._downloads) > self._MAX_TRACKED_DOWNLOADS:
+                self._downloads.pop(next(iter(self._downloads)))
             self._download_event.set()
+
+            info = await handle.run()
+            if info is None:
+                return
+            if not handle.reported:
+                self._pending_downloads.append(info)
             logger.info(
                 "Download captured: %s (%s, %d bytes)",
                 info.filename, info.content_type, info.size_bytes,
@@ -322,10 +330,31 @@ class Browser:
         except Exception:
             logger.exception("Failed to process download event")
 
+    _MAX_TRACKED_DOWNLOADS = 50
+    # How long an interaction waits for a download before returning it as in progress.
+    _DOWNLOAD_RETURN_AFTER_S: float = 3.0
+
+    async def _await_downloads(self) -> None:
+        """Wait for running downloads, but no longer than ``_DOWNLOAD_RETURN_AFTER_S``."""
+        if self._download_tasks:
+            await asyncio.wait(set(self._download_tasks), timeout=self._DOWNLOAD_RETURN_AFTER_S)
+
+    def get_download(self, download_id: str) -> DownloadHandle | None:
+        """Return the tracked download with *download_id*, if any."""
+        return self._downloads.get(download_id)
+
     def drain_downloads(self) -> list[DownloadInfo]:
-        """Return and clear any pending downloads captured since the last drain."""
+        """Return and clear any pending downloads captured since the last drain.
+
+        Downloads still being written are included once, as in-progress
+        infos carrying a ``download_id``.
+        """
         downloads = list(self._pending_downloads)
         self._pending_downloads.clear()
+        for handle in self._downloads.values():
+            if handle.state == "in_progress" and not handle.reported:
+                handle.reported = True
+                downloads.append(handle.snapshot())
         return downloads
 
     @classmethod
@@ -522,6 +551,9 @@ class Browser:
                 context, root_browser._ua_string, root_browser._ua_metadata
             )
 
+        policy = root_browser._network_policy
+        network_stats = await policy.install(context) if policy is not None else None
+
         instance = cls(
             context=context,
             extra_headers=headers,
@@ -531,6 +563,8 @@ class Browser:
         instance._downloads_dir = root_browser._downloads_dir
         instance._ua_string = root_browser._ua_string
         instance._ua_metadata = root_browser._ua_metadata
+        instance._network_policy = policy
+        instance._network_stats = network_stats
         return instance
 
     async def close_context(self) -> None:
@@ -554,6 +588,55 @@ class Browser:
         except Exception:  # noqa: BLE001
             logger.warning("Failed to close ephemeral browser context")
 
+    async def reset_context(self, cookies: list[dict[str, Any]], origins: list[str]) -> None:
+        """Return an ephemeral context to its freshly seeded state for reuse.
+
+        Closes every page, wipes all storage (localStorage, IndexedDB,
+        service workers, cache storage) for the *origins* the context
+        visited, replaces its cookies with *cookies*, and forgets the
+        previous agent's downloads.
+
+        Args:
+            cookies: Seed cookies from the root storage snapshot.
+            origins: Origins whose storage must be cleared.
+        """
+        pages = list(self._context.pages)
+        self._download_listener_pages.clear()
+        if origins:
+            # Storage.clearDataForOrigin needs a page target in this context.
+            scratch = await self._context.new_page()
+            pages.append(scratch)
+            cdp = await self._context.new_cdp_session(scratch)
+            try:
+                for origin in origins:
+                    await cdp.send(
+                        "Storage.clearDataForOrigin",
+                        {"origin": origin, "storageTypes": "all"},
+                    )
+            finally:
+                await cdp.detach()
+        for page in pages:
+            if not page.is_closed():
+                await asyncio.wait_for(page.close(), timeout=self._PAGE_CLOSE_TIMEOUT_S)
+        await self._context.clear_cookies()
+        if cookies:
+            await self._context.add_cookies(cookies)
+        await self._context.clear_permissions()
+        self._download_listener_pages.clear()
+        self._active_frame = None
+        # Stop following downloads before forgetting them, so none is recorded afterwards.
+        tasks = list(self._download_tasks)
+        if tasks:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._downloads.clear()
+        self._expected_download_sizes.clear()
+        self._pending_downloads.clear()
+        self._download_event.clear()
+        if self._network_stats is not None:
+            self._network_stats.drain()
+
     async def new_page(self) -> Page:
         """Open a new page within the persistent context.
 
@@ -889,12 +972,17 @@ class Browser:
     ) -> BrowserInteractionResult:
         """Shared post-action pipeline: downloads, settle, iframe detection, logging."""
         wait_cfg = load_config().tools.browser.waits
+        policy = self._network_policy
+        if policy is not None and (policy.skip_font_wait or policy.skip_animation_wait):
+            wait_cfg = wait_cfg.model_copy(update={
+                "skip_font_phase": policy.skip_font_wait,
+                "skip_animation_phase": policy.skip_animation_wait,
+            })
 
         # 1. Download detection
         download_info: DownloadInfo | None = None
 
-        if self._download_tasks:
-            await asyncio.gather(*self._download_tasks, return_exceptions=True)
+        await self._await_downloads()
 
         pending = self.drain_downloads()
         if pending:
@@ -927,12 +1015,17 @@ class Browser:
             # This catches same-tab redirect chains to PDFs (e.g. Bing
             # click-through → prier.com/document.pdf) where the download
             # event fires after the initial check but during settle.
-            if self._download_tasks:
-                await asyncio.gather(*self._download_tasks, return_exceptions=True)
+            await self._await_downloads()
             late_downloads = self.drain_downloads()
             if late_downloads:
                 download_info = late_downloads[0]
 
+            if settle_timings is not None and self._network_stats is not None:
+                stats = self._network_stats.drain()
+                settle_timings.blocked_requests = stats.blocked_requests
+                settle_timings.cached_requests = stats.cached_requests
+                settle_timings.bytes_saved = stats.bytes_saved
+
         # 2b. If we saw a Content-Disposition: attachment response but the
         # Playwright download event hasn't fired yet, wait for it.  This
         # only triggers when an attachment header was observed — zero cost
@@ -942,8 +1035,7 @@ class Browser:
                 await asyncio.wait_for(self._download_event.wait(), timeout=2.0)
             except asyncio.TimeoutError:
                 logger.debug("Download grace period expired despite attachment header")
-            if self._download_tasks:
-                await asyncio.gather(*self._download_tasks, return_exceptions=True)
+            await self._await_downloads()
             grace_downloads = self.drain_downloads()
             if grace_downloads:
                 download_info = grace_downloads[0]
@@ -1058,6 +1150,13 @@ class Browser:
             disposition = resp.headers.get("content-disposition", "")
             if "attachment" in disposition:
                 _saw_download_response = True
+                length = resp.headers.get("content-length", "")
+                if length.isdigit():
+                    sizes = self._expected_download_sizes
+                    sizes[resp.url] = int(length)
+                    # Attachments that never become downloads are never popped.
+                    while len(sizes) > self._MAX_TRACKED_DOWNLOADS:
+                        sizes.pop(next(iter(sizes)))
 
         def _on_new_page(new_page: Page) -> None:
             new_pages.append(new_page)
@@ -1072,6 +1171,7 @@ class Browser:
         page.on("response", _on_response)
         self._context.on("page", _on_new_page)
 
+        input_stats = start_input_stats()
         t0 = time.monotonic()
         await action()
         action_ms = (time.monotonic() - t0) * 1000
@@ -1123,6 +1223,7 @@ class Browser:
             saw_download_response=_saw_download_response,
         )
         result.action_ms = action_ms
+        result.input_stats = input_stats if input_stats.mode else None
 
         # If a download was captured from a new tab, close that tab so the
         # agent returns to the original page.  Otherwise current_page() would
@@ -1139,7 +1240,8 @@ class Browser:
 
 _browser: Browser | None = None
 _agent_browsers: dict[str, Browser] = {}
-_agent_browser_lock = asyncio.Lock()
+_agent_browser_pending: dict[str, asyncio.Future[Browser]] = {}
+_context_pool: ContextPool | None = None
 
 
 def _kill_driver_tree(pid: int) -> None:
@@ -1194,10 +1296,40 @@ async def _get_root_browser() -> Browser:
             downloads_path=downloads_dir,
         )
         _browser._downloads_dir = downloads_dir
+        _browser._network_policy = _build_network_policy()
         atexit.register(_atexit_kill_browser)
+        _get_context_pool(_browser).warm()
     return _browser
 
 
+def _build_network_policy() -> ResourcePolicy | None:
+    """Build the request blocking/caching policy for agent contexts."""
+    config = load_config()
+    network = config.tools.browser.network
+    cache = None
+    if network.cache_enabled:
+        cache_dir = Path(config.settings.home_dir) / "browser" / "http_cache"
+        cache = HttpDiskCache(cache_dir, max_bytes=network.cache_max_mb * 1024 * 1024)
+    policy = ResourcePolicy(network, cache)
+    return policy if policy.active else None
+
+
+def _get_context_pool(root: Browser) -> ContextPool:
+    """Return the context pool bound to *root*, creating it on first use."""
+    global _context_pool
+    if _context_pool is None or _context_pool.root is not root:
+        size = load_config().tools.browser.context_pool_size
+        _context_pool = ContextPool(root, size)
+    return _context_pool
+
+
+async def _acquire_agent_browser(root: Browser, key: str) -> Browser:
+    ephemeral = await _get_context_pool(root).acquire()
+    _agent_browsers[key] = ephemeral
+    logger.info("Assigned ephemeral browser context to key '%s'", key)
+    return ephemeral
+
+
 async def get_browser() -> Browser:
     """Get the browser instance for the current agent.
 
@@ -1224,24 +1356,33 @@ async def get_browser() -> Browser:
             raise RuntimeError("get_browser() called outside an agent span")
         key = agent_id
 
-    async with _agent_browser_lock:
-        if key in _agent_browsers:
-            return _agent_browsers[key]
+    existing = _agent_browsers.get(key)
+    if existing is not None:
+        return existing
 
-        state = await root._context.storage_state()
-        ephemeral = await Browser.start_ephemeral(root, storage_state=state)
-        _agent_browsers[key] = ephemeral
-        logger.info("Created ephemeral browser context for key '%s'", key)
-        return ephemeral
+    # Concurrent calls for the same key share one acquisition; different
+    # keys never wait on each other.
+    pending = _agent_browser_pending.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(_acquire_agent_browser(root, key))
+        _agent_browser_pending[key] = pending
+        pending.add_done_callback(lambda _fut: _agent_browser_pending.pop(key, None))
+    return await asyncio.shield(pending)
 
 
 async def release_agent_browser(key: str) -> None:
-    """Close and remove an ephemeral browser context by its storage key."""
-    async with _agent_browser_lock:
-        browser = _agent_browsers.pop(key, None)
+    """Release an agent's ephemeral browser context by its storage key.
+
+    The context is recycled into the warm pool when possible, otherwise
+    closed.
+    """
+    browser = _agent_browsers.pop(key, None)
     if browser is not None:
         try:
-            await browser.close_context()
+            if _context_pool is not None:
+                await _context_pool.release(browser)
+            else:
+                await browser.close_context()
             logger.info("Released browser context for '%s'", key)
         except Exception:  # noqa: BLE001
             logger.warning("Failed to release browser context for '%s'", key)
@@ -1249,12 +1390,17 @@ async def release_agent_browser(key: str) -> None:
 
 async def close_browser() -> None:
     """Shutdown all browser instances — ephemeral contexts and root singleton."""
-    global _browser
+    global _browser, _context_pool
 
-    # Close all ephemeral sub-agent contexts first.
-    async with _agent_browser_lock:
-        agents = list(_agent_browsers.items())
-        _agent_browsers.clear()
+    # Close the warm pool and all ephemeral sub-agent contexts first.
+    if _context_pool is not None:
+        try:
+            await _context_pool.close()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to close browser context pool")
+        _context_pool = None
+    agents = list(_agent_browsers.items())
+    _agent_browsers.clear()
     for agent_id, browser in agents:
         try:
             await browser.close_context()
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import logging
 import math
 import random
+import weakref
 from dataclasses import dataclass
+from typing import Any
 
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Frame, Locator, Page
@@ -28,6 +31,8 @@ class _HumanConfig:
     extra_pause_every_chars: int
     extra_pause_min_ms: int
     extra_pause_max_ms: int
+    fast: bool = False
+    stealth: bool = True
 
 
 _config_cache: _HumanConfig | None = None
@@ -49,10 +54,50 @@ def _get_human_config() -> _HumanConfig:
             extra_pause_every_chars=max(typing.extra_pause_every_chars, 0),
             extra_pause_min_ms=max(0, typing.extra_pause_min_ms),
             extra_pause_max_ms=max(typing.extra_pause_min_ms, typing.extra_pause_max_ms),
+            fast=cfg.mode == "fast",
+            stealth=cfg.stealth,
         )
     return _config_cache
 
 
+@dataclass
+class InputStats:
+    """How input for one interaction was dispatched.
+
+    ``round_trips`` approximates the sequential awaits on the browser for
+    pointer moves and typing; a fast-mode batch counts as one however many
+    events it carries.
+    """
+
+    mode: str = ""
+    events: int = 0
+    round_trips: int = 0
+
+    @property
+    def summary(self) -> str:
+        """One-line description for the interaction timing table."""
+        return f"{self.mode}: {self.events} events, {self.round_trips} round trips"
+
+
+_input_stats_var: contextvars.ContextVar[InputStats | None] = contextvars.ContextVar("_input_stats", default=None)
+
+
+def start_input_stats() -> InputStats:
+    """Start collecting ``InputStats`` for the interaction running in this context."""
+    stats = InputStats()
+    _input_stats_var.set(stats)
+    return stats
+
+
+def _note_input(mode: str, *, events: int, round_trips: int) -> None:
+    stats = _input_stats_var.get()
+    if stats is None:
+        return
+    stats.mode = mode if stats.mode in ("", mode) else "mixed"
+    stats.events += events
+    stats.round_trips += round_trips
+
+
 def _page_for(target: Page | Frame) -> Page:
     """Extract the ``Page`` from a ``Page | Frame`` for mouse/keyboard input.
 
@@ -298,6 +343,8 @@ async def _mouse_move_with_fake_cursor(page: Page, *, x: float, y: float) -> Non
 
     # Build a natural Bezier trajectory with jitter and ease-in-out pacing.
     trajectory = _build_trajectory(start_x, start_y, x, y)
+    # Overlay install + position read, then an overlay update and a move per step.
+    _note_input("human", events=len(trajectory), round_trips=3 + 2 * len(trajectory))
 
     for xi, yi in trajectory:
         try:
@@ -329,6 +376,176 @@ async def _mouse_move_with_fake_cursor(page: Page, *, x: float, y: float) -> Non
         await asyncio.sleep(0.03)
 
 
+# ── Fast mode ─────────────────────────────────────────────────────────
+#
+# Fast mode still builds a Bezier trajectory, but sends it together with the
+# button events as one pipelined batch of CDP ``Input.dispatchMouseEvent``
+# commands: no per-step sleeps, overlay updates or round-trips.  Pages
+# without a CDP session (non-Chromium) fall back to Playwright's mouse with
+# the pauses removed.
+
+# insertText / keyboard.type chunk size; a progressive screenshot is
+# requested between chunks.
+_TYPE_CHUNK_CHARS = 32
+
+_BUTTON_MASKS = {"none": 0, "left": 1, "right": 2, "middle": 4}
+
+_FAST_CURSOR_SCRIPT = (
+    "(coords) => {" + _CURSOR_OVERLAY_SCRIPT + "window.__llmCursorSet?.(coords[0], coords[1]); }"
+)
+
+
+class _FastPageState:
+    """Per-page CDP session and last pointer position for fast mode."""
+
+    def __init__(self) -> None:
+        self.cdp: Any = None
+        self.cdp_failed = False
+        self.pointer: tuple[float, float] | None = None
+
+
+_fast_states: weakref.WeakKeyDictionary[Any, _FastPageState] = weakref.WeakKeyDictionary()
+
+
+def _fast_state(page: Page) -> _FastPageState:
+    try:
+        state = _fast_states.get(page)
+        if state is None:
+            state = _fast_states[page] = _FastPageState()
+    except TypeError:  # test stubs that can't be weakly referenced
+        state = _FastPageState()
+    return state
+
+
+async def _cdp_for(page: Page, state: _FastPageState) -> Any:
+    """Return a CDP session for *page*, or ``None`` if CDP is unavailable."""
+    if state.cdp is None and not state.cdp_failed:
+        try:
+            state.cdp = await page.context.new_cdp_session(page)
+        except (PlaywrightError, AttributeError) as exc:
+            logger.debug("No CDP session for fast input on %s: %s", getattr(page, "url", "<unknown>"), exc)
+            state.cdp_failed = True
+    return state.cdp
+
+
+def _mouse_event(kind: str, x: float, y: float, *, button: str = "none", held: str = "none", clicks: int = 0) -> dict:
+    event: dict[str, Any] = {
+        "type": kind,
+        "x": x,
+        "y": y,
+        "button": button,
+        "buttons": _BUTTON_MASKS[held],
+    }
+    if clicks:
+        event["clickCount"] = clicks
+    return event
+
+
+def _move_events(page: Page, x: float, y: float, *, held: str = "none") -> list[dict]:
+    """Precompute the trajectory from the last known pointer position to (x, y)."""
+    state = _fast_state(page)
+    start_x, start_y = state.pointer or (x, y)
+    state.pointer = (x, y)
+    trajectory = _build_trajectory(start_x, start_y, x, y)
+    return [_mouse_event("mouseMoved", px, py, button=held, held=held) for px, py in trajectory]
+
+
+def _click_events(x: float, y: float, *, button: str = "left", clicks: int = 1) -> list[dict]:
+    events = []
+    for n in range(1, clicks + 1):
+        events.append(_mouse_event("mousePressed", x, y, button=button, held=button, clicks=n))
+        events.append(_mouse_event("mouseReleased", x, y, button=button, clicks=n))
+    return events
+
+
+async def _dispatch_mouse_batch(page: Page, events: list[dict], *, cursor: tuple[float, float] | None = None) -> None:
+    """Send *events* in one pipelined batch and move the overlay to *cursor*.
+
+    Commands are issued without awaiting each other; the connection keeps
+    them in order, so the whole gesture costs one round-trip.
+    """
+    state = _fast_state(page)
+    cdp = await _cdp_for(page, state)
+    if cdp is None:
+        await _dispatch_with_mouse(page, events)
+    else:
+        sends = [cdp.send("Input.dispatchMouseEvent", event) for event in events]
+        if cursor is not None:
+            sends.append(_set_cursor_overlay(page, cursor))
+        await asyncio.gather(*sends)
+        _note_input("fast", events=len(events), round_trips=1)
+
+    from tools.browser.events import request_progressive_screenshot
+
+    request_progressive_screenshot(page)
+
+
+async def _set_cursor_overlay(page: Page, cursor: tuple[float, float]) -> None:
+    try:
+        await page.evaluate(_FAST_CURSOR_SCRIPT, list(cursor))
+    except PlaywrightError as exc:
+        logger.debug("Fast-mode cursor overlay update failed: %s", exc)
+
+
+async def _dispatch_with_mouse(page: Page, events: list[dict]) -> None:
+    """Fallback for pages without CDP: replay *events* through ``page.mouse``.
+
+    Runs of moves collapse into one ``mouse.move(..., steps=n)`` call.
+    """
+    mouse = page.mouse
+    round_trips = 0
+    pending_moves: list[dict] = []
+
+    async def _flush_moves() -> None:
+        nonlocal round_trips
+        if pending_moves:
+            last = pending_moves[-1]
+            await mouse.move(last["x"], last["y"], steps=len(pending_moves))
+            round_trips += 1
+            pending_moves.clear()
+
+    for event in events:
+        if event["type"] == "mouseMoved":
+            pending_moves.append(event)
+            continue
+        await _flush_moves()
+        if event["type"] == "mousePressed":
+            await mouse.down(button=event["button"], click_count=event["clickCount"])
+        else:
+            await mouse.up(button=event["button"], click_count=event["clickCount"])
+        round_trips += 1
+    await _flush_moves()
+    _note_input("fast", events=len(events), round_trips=round_trips)
+
+
+async def _fast_click(page: Page, x: float, y: float, *, button: str = "left", clicks: int = 1) -> None:
+    await _dispatch_mouse_batch(page, _move_events(page, x, y) + _click_events(x, y, button=button, clicks=clicks),
+                                cursor=(x, y))
+
+
+async def _fast_press_and_hold(page: Page, x: float, y: float, duration_ms: int) -> None:
+    press = _mouse_event("mousePressed", x, y, button="left", held="left", clicks=1)
+    await _dispatch_mouse_batch(page, [*_move_events(page, x, y), press], cursor=(x, y))
+    from tools.browser.events import request_progressive_screenshot
+
+    hold_duration = max(0, duration_ms)
+    elapsed = 0
+    while elapsed < hold_duration:
+        chunk = min(250, hold_duration - elapsed)
+        await _sleep_ms(chunk)
+        elapsed += chunk
+        request_progressive_screenshot(page)
+    await _dispatch_mouse_batch(page, [_mouse_event("mouseReleased", x, y, button="left", clicks=1)])
+
+
+async def _fast_drag(page: Page, start: tuple[float, float], dest: tuple[float, float]) -> None:
+    events = _move_events(page, *start)
+    events.append(_mouse_event("mousePressed", *start, button="left", held="left", clicks=1))
+    events += _move_events(page, *dest, held="left")
+    events.append(_mouse_event("mouseReleased", *dest, button="left", clicks=1))
+    await _dispatch_mouse_batch(page, events, cursor=dest)
+
+
 async def human_click(target: Page | Frame, locator: Locator) -> None:
     """Perform a human-like click on an element using an explicit Playwright page.
 
@@ -389,6 +606,10 @@ async def human_click(target: Page | Frame, locator: Locator) -> None:
     target_x += random.uniform(-jitter_x, jitter_x)
     target_y += random.uniform(-jitter_y, jitter_y)
 
+    if cfg.fast:
+        await _fast_click(page, target_x, target_y)
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -476,6 +697,10 @@ async def human_press_and_hold(
     target_x += random.uniform(-jitter_x, jitter_x)
     target_y += random.uniform(-jitter_y, jitter_y)
 
+    if cfg.fast:
+        await _fast_press_and_hold(page, target_x, target_y, duration_ms)
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -630,6 +855,10 @@ async def human_drag(
     dest_x += random.uniform(-jitter_x, jitter_x)
     dest_y += random.uniform(-jitter_y, jitter_y)
 
+    if cfg.fast:
+        await _fast_drag(page, (start_x, start_y), (dest_x, dest_y))
+        return
+
     mouse = page.mouse
 
     # Move to drag start, press, glide to destination, then release.
@@ -685,6 +914,11 @@ async def human_type(target: Page | Frame, locator: Locator, text: str, *, clear
             # If keyboard.press fails, raising is preferable to silently using fill.
             raise BrowserToolError("Failed to clear existing text via keyboard", tool="fill_field") from exc
 
+    if cfg.fast:
+        await _fast_type(page, text, stealth=cfg.stealth)
+        return
+
+    _note_input("human", events=len(text), round_trips=len(text))
     for idx, ch in enumerate(text):
         delay = random.randint(cfg.delay_min_ms, cfg.delay_max_ms)
         # Type single character (keyboard.type handles single chars fine)
@@ -702,6 +936,26 @@ async def human_type(target: Page | Frame, locator: Locator, text: str, *, clear
             await _sleep_ms(random.randint(cfg.extra_pause_min_ms, cfg.extra_pause_max_ms))
 
 
+async def _fast_type(page: Page, text: str, *, stealth: bool) -> None:
+    """Type *text* in chunks with no per-key delay.
+
+    With *stealth*, each chunk still goes through ``keyboard.type`` so the
+    page sees real key events; otherwise ``insert_text`` (CDP
+    ``Input.insertText``) inserts the chunk in one step.
+    """
+    from tools.browser.events import request_progressive_screenshot
+
+    keyboard = page.keyboard
+    chunks = [text[i:i + _TYPE_CHUNK_CHARS] for i in range(0, len(text), _TYPE_CHUNK_CHARS)]
+    for chunk in chunks:
+        if stealth:
+            await keyboard.type(chunk)
+        else:
+            await keyboard.insert_text(chunk)
+        request_progressive_screenshot(page)
+    _note_input("fast", events=len(text), round_trips=len(chunks))
+
+
 async def human_press_keys(target: Page | Frame, keys: list[str]) -> None:
     """Press one or more keyboard keys on the provided Playwright Page.
 
@@ -733,6 +987,7 @@ async def human_press_keys(target: Page | Frame, keys: list[str]) -> None:
         raise BrowserToolError("Provided page has no keyboard available", tool="press_keys")
 
     keyboard = page.keyboard
+    fast = _get_human_config().fast
 
     for key in keys:
         if not isinstance(key, str) or not key:
@@ -747,7 +1002,8 @@ async def human_press_keys(target: Page | Frame, keys: list[str]) -> None:
             for mod in modifiers:
                 await keyboard.down(mod)
                 # small jitter between modifier downs
-                await _sleep_ms(random.randint(0, 10))
+                if not fast:
+                    await _sleep_ms(random.randint(0, 10))
 
             # Press and release the base key
             await keyboard.press(base)
@@ -755,9 +1011,11 @@ async def human_press_keys(target: Page | Frame, keys: list[str]) -> None:
             # Release modifiers in reverse order
             for mod in reversed(modifiers):
                 await keyboard.up(mod)
-                await _sleep_ms(random.randint(0, 10))
+                if not fast:
+                    await _sleep_ms(random.randint(0, 10))
         except Exception as exc:  # pragma: no cover - bubbling Playwright errors
             raise BrowserToolError(f"Failed to press key '{key}': {exc}", tool="press_keys") from exc
+        _note_input("fast" if fast else "human", events=1 + 2 * len(modifiers), round_trips=1 + 2 * len(modifiers))
 
 
 def _random_point_in_bbox(
@@ -810,6 +1068,10 @@ async def human_click_at(
 
     target_x, target_y = _random_point_in_bbox(x1, y1, x2, y2)
 
+    if cfg.fast:
+        await _fast_click(page, target_x, target_y)
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -864,6 +1126,10 @@ async def human_press_and_hold_at(
 
     target_x, target_y = _random_point_in_bbox(x1, y1, x2, y2)
 
+    if cfg.fast:
+        await _fast_press_and_hold(page, target_x, target_y, duration_ms)
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -929,6 +1195,11 @@ async def human_double_click_at(
 
     target_x, target_y = _random_point_in_bbox(x1, y1, x2, y2)
 
+    if cfg.fast:
+        # clickCount 1 then 2 makes the browser fire dblclick.
+        await _fast_click(page, target_x, target_y, clicks=2)
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -977,6 +1248,10 @@ async def human_right_click_at(
 
     target_x, target_y = _random_point_in_bbox(x1, y1, x2, y2)
 
+    if cfg.fast:
+        await _fast_click(page, target_x, target_y, button="right")
+        return
+
     mouse = page.mouse
     await _mouse_move_with_fake_cursor(page, x=target_x, y=target_y)
     await _sleep_ms(random.randint(cfg.hover_min_ms, cfg.hover_max_ms))
@@ -1023,6 +1298,10 @@ async def human_drag_at(
     start_x, start_y = _random_point_in_bbox(sx1, sy1, sx2, sy2)
     dest_x, dest_y = _random_point_in_bbox(dx1, dy1, dx2, dy2)
 
+    if cfg.fast:
+        await _fast_drag(page, (start_x, start_y), (dest_x, dest_y))
+        return
+
     mouse = page.mouse
 
     # Move to drag start, press, glide to destination, then release.
@@ -1045,6 +1324,7 @@ async def human_drag_at(
 
 
 __all__ = [
+    "InputStats",
     "human_click",
     "human_click_at",
     "human_double_click_at",
@@ -1056,6 +1336,7 @@ __all__ = [
     "human_right_click_at",
     "human_scroll",
     "human_type",
+    "start_input_stats",
 ]
 
 
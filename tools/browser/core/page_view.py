@@ -19,13 +19,17 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+import weakref
+from typing import Any
 
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Response
 from pydantic import BaseModel
 
+from config import load_config
 from tools.browser.core._file_detection import DownloadInfo, is_file_content_type
-from tools.browser.core._pipeline import process_snapshot
+from tools.browser.core._incremental import SnapshotState, apply_delta, render_changes
+from tools.browser.core._pipeline import process_nodes, process_snapshot
 from tools.browser.core.browser import ActiveView
 
 # URL extensions that indicate non-HTML content the DOM walker can't handle.
@@ -47,6 +51,12 @@ logger = logging.getLogger(__name__)
 DEFAULT_BUDGET = 8000
 MAX_NAME_LEN = 150
 
+# A change list is only worth showing when it is much smaller than the view.
+_MAX_CHANGES_FRACTION = 0.5
+
+# Incremental snapshot state per Playwright frame; entries vanish with the frame.
+_snapshot_states: weakref.WeakKeyDictionary[Any, SnapshotState] = weakref.WeakKeyDictionary()
+
 
 class PageView(BaseModel):
     """Page view combining content and interactive elements.
@@ -58,6 +68,9 @@ class PageView(BaseModel):
         content: Annotated text mixing content and ``[ref] [role] name`` annotations.
         viewport: Current viewport/scroll state dict.
         truncated: Whether content was truncated by the character budget.
+        changes: Compact diff against the previous view of the same document,
+            set only by incremental snapshots when it is much smaller than
+            ``content``.
     """
 
     title: str
@@ -67,31 +80,124 @@ class PageView(BaseModel):
     viewport: dict[str, int] | None = None
     truncated: bool = False
     downloaded_file: DownloadInfo | None = None
+    changes: str | None = None
     # Snapshot timing (for logging, not serialized to LLM)
     snapshot_js_ms: float = 0
     snapshot_py_ms: float = 0
     snapshot_nodes: int = 0
+    snapshot_sent_nodes: int = 0
 
 
 # ---------------------------------------------------------------------------
 # JavaScript structured DOM walker
 # ---------------------------------------------------------------------------
 # Executed via a single page.evaluate() call.  Accepts a params object:
-#   { fullPage: boolean }
+#   { fullPage: boolean, incremental: boolean, since: {doc, seq} | null }
 # Returns: { nodes: [...], viewport: { width, height, scroll_top, document_height } }
 #
 # Each interactive element is stamped with a data-ct-ref="N" attribute so
 # Playwright locators can resolve refs via CSS attribute selectors.
 #
+# Incremental mode keeps per-document state on the window: refs and node keys
+# are stable across snapshots, a MutationObserver invalidates cached subtree
+# walks, and only nodes that changed since ``since`` are returned alongside an
+# ``incremental`` block ({doc, seq, reset, order, removed}).  ``order`` is
+# null when the key sequence is unchanged.  When ``since`` does not match the
+# page's last snapshot the result is a reset containing every node.
+#
 # Emits structured node data — all formatting, scoping, deduplication,
 # and budget enforcement happen in the Python pipeline (_pipeline.py).
 
 _STRUCTURED_SNAPSHOT_JS = """
 (params) => {
-  const { fullPage } = params;
+  const { fullPage, incremental, since } = params;
   const vh = window.innerHeight;
   const vw = window.innerWidth;
 
+  // ---- Incremental state ----
+  const STATE_KEY = Symbol.for('computron.snapshotState');
+
+  // Drop cached walks for a node and its ancestors (crossing shadow roots).
+  // ``root`` also forces a fresh walk of the whole subtree, for changes such
+  // as class/style attributes whose effect cascades to descendants.
+  function invalidate(s, target, root) {
+    let n = target.nodeType === 1 ? target : target.parentNode;
+    if (!n) return;
+    if (root && n.nodeType === 1) s.freshRoots.add(n);
+    while (n && !s.invalidated.has(n)) {
+      s.invalidated.add(n);
+      s.cache.delete(n);
+      n = n.parentNode || n.host || null;
+    }
+  }
+
+  function onMutations(s, records) {
+    for (const r of records) {
+      const t = r.target;
+      // Changes outside <body> (stylesheets, <html> classes) can restyle anything
+      if (!document.body || !document.body.contains(t)) {
+        s.cache = new WeakMap();
+        continue;
+      }
+      invalidate(s, t, r.type === 'attributes');
+    }
+  }
+
+  function createState() {
+    const s = {
+      doc: Math.random().toString(36).slice(2),
+      seq: 0,
+      ids: new WeakMap(), nextId: 1,
+      refs: new WeakMap(), nextRef: 0,
+      cache: new WeakMap(), invalidated: new WeakSet(), freshRoots: new WeakSet(),
+      json: new WeakMap(),
+      viewKey: '', prev: null, prevOrder: null,
+    };
+    s.observer = new MutationObserver((records) => onMutations(s, records));
+    s.observer.observe(document, {
+      childList: true, characterData: true, attributes: true, subtree: true,
+    });
+    // Events that change rendering without touching the DOM: element scrolls
+    // move children in/out of view, and hover/focus can flip :hover/:focus
+    // styles on the target and its nearest ancestors.
+    s.onEvent = (e) => {
+      let n = e.target;
+      for (let i = 0; n && n.nodeType === 1 && i < 3; i++, n = n.parentElement) invalidate(s, n, true);
+    };
+    for (const type of ['scroll', 'mouseover', 'mouseout', 'focusin', 'focusout']) {
+      document.addEventListener(type, s.onEvent, { capture: true, passive: true });
+    }
+    s.dispose = () => {
+      s.observer.disconnect();
+      for (const type of ['scroll', 'mouseover', 'mouseout', 'focusin', 'focusout']) {
+        document.removeEventListener(type, s.onEvent, { capture: true });
+      }
+    };
+    return s;
+  }
+
+  let state = null;
+  if (incremental) {
+    state = window[STATE_KEY] || null;
+    if (!state) {
+      state = createState();
+      Object.defineProperty(window, STATE_KEY, { value: state, configurable: true });
+      // Refs from an earlier full snapshot would collide with stable refs
+      const old = document.querySelectorAll('[data-ct-ref]');
+      for (let i = 0; i < old.length; i++) old[i].removeAttribute('data-ct-ref');
+    }
+    onMutations(state, state.observer.takeRecords());
+    const viewKey = [fullPage, window.scrollX, window.scrollY, vw, vh].join('|');
+    if (state.viewKey !== viewKey) {
+      state.cache = new WeakMap();
+      state.viewKey = viewKey;
+    }
+  } else if (window[STATE_KEY]) {
+    // Full snapshots renumber refs, so stable incremental refs are void
+    window[STATE_KEY].dispose();
+    delete window[STATE_KEY];
+  }
+
   // ---- Role mapping ----
   function getRole(el) {
     const explicit = el.getAttribute('role');
@@ -280,15 +386,63 @@ _STRUCTURED_SNAPSHOT_JS = """
   // ---- Ref counter ----
   let refCounter = 0;
 
-  // Clean up stale refs from previous snapshots
-  const stale = document.querySelectorAll('[data-ct-ref]');
-  for (let i = 0; i < stale.length; i++) stale[i].removeAttribute('data-ct-ref');
+  if (!state) {
+    // Clean up stale refs from previous snapshots
+    const stale = document.querySelectorAll('[data-ct-ref]');
+    for (let i = 0; i < stale.length; i++) stale[i].removeAttribute('data-ct-ref');
+  }
+
+  // Stamp el with its ref: sequential per snapshot, or stable per element
+  // in incremental mode.
+  function stampRef(el) {
+    let ref;
+    if (state) {
+      ref = state.refs.get(el);
+      if (ref === undefined) {
+        ref = ++state.nextRef;
+        state.refs.set(el, ref);
+      }
+    } else {
+      ref = ++refCounter;
+    }
+    const value = String(ref);
+    if (el.getAttribute('data-ct-ref') !== value) el.setAttribute('data-ct-ref', value);
+    return ref;
+  }
 
   // ---- Output ----
   const nodes = [];
+  const seenKeys = new Set();
   let depth = 0;
 
-  function emit(node) { nodes.push(node); }
+  // Subtree caching is unsafe for shadow DOM (not observed) and live form
+  // values (not reflected as mutations); these counters detect both.
+  let shadowCount = 0;
+  let formCount = 0;
+  let forceFresh = false;
+
+  function push(node) {
+    if (state) {
+      if (seenKeys.has(node.key)) node = Object.assign({}, node, { key: state.nextId++ });
+      seenKeys.add(node.key);
+    }
+    nodes.push(node);
+  }
+
+  // ``source`` is the DOM node the output came from; ``end`` marks the
+  // closing half of a container pair so both halves get distinct keys.
+  function emit(node, source, end) {
+    if (state) {
+      let id = state.ids.get(source);
+      if (id === undefined) {
+        id = state.nextId++;
+        state.ids.set(source, id);
+      }
+      node.key = end ? -id : id;
+      if ('value' in node || 'checked' in node) formCount++;
+    }
+    push(node);
+  }
 
   // Walk the child nodes of a container (element or shadow root).
   function walkChildren(container) {
@@ -298,7 +452,10 @@ _STRUCTURED_SNAPSHOT_JS = """
         if (child.nodeType === 3) {
           const text = child.textContent.trim();
           if (text.length > 1) {
-            emit({ type: 'text', depth: depth, text: text.length > 200 ? text.substring(0, 200) + '...' : text, viewport: 'in' });
+            emit({
+              type: 'text', depth: depth, viewport: 'in',
+              text: text.length > 200 ? text.substring(0, 200) + '...' : text,
+            }, child);
           }
         } else if (child.nodeType === 1) {
           walkSlotOrElement(child);
@@ -320,7 +477,10 @@ _STRUCTURED_SNAPSHOT_JS = """
             if (node.nodeType === 3) {
               const text = node.textContent.trim();
               if (text.length > 1) {
-                emit({ type: 'text', depth: depth, text: text.length > 200 ? text.substring(0, 200) + '...' : text, viewport: 'in' });
+                emit({
+                  type: 'text', depth: depth, viewport: 'in',
+                  text: text.length > 200 ? text.substring(0, 200) + '...' : text,
+                }, node);
               }
             } else if (node.nodeType === 1) {
               walk(node, false);
@@ -335,7 +495,46 @@ _STRUCTURED_SNAPSHOT_JS = """
     }
   }
 
+  // Replay a cached subtree walk when nothing inside it has changed and it
+  // has not moved; otherwise walk it and cache the emitted range.
   function walk(el, isRoot) {
+    if (!state || isRoot) {
+      walkElement(el, isRoot);
+      return;
+    }
+    const fresh = forceFresh || state.freshRoots.has(el);
+    const r = el.getBoundingClientRect();
+    const box = r.top + ',' + r.left + ',' + r.width + ',' + r.height;
+    const hit = fresh ? undefined : state.cache.get(el);
+    if (hit && hit.box === box) {
+      const shift = depth - hit.depth;
+      for (let i = hit.start; i < hit.end; i++) {
+        const n = hit.nodes[i];
+        push(shift ? Object.assign({}, n, { depth: n.depth + shift }) : n);
+      }
+      state.cache.set(el, {
+        nodes: nodes, start: nodes.length - (hit.end - hit.start), end: nodes.length,
+        depth: depth, box: box,
+      });
+      return;
+    }
+    const start = nodes.length;
+    const startDepth = depth;
+    const shadows = shadowCount;
+    const forms = formCount;
+    const outerFresh = forceFresh;
+    forceFresh = fresh;
+    walkElement(el, false);
+    forceFresh = outerFresh;
+    if (fresh) state.freshRoots.delete(el);
+    if (shadowCount === shadows && formCount === forms) {
+      state.cache.set(el, { nodes: nodes, start: start, end: nodes.length, depth: startDepth, box: box });
+    } else {
+      state.cache.delete(el);
+    }
+  }
+
+  function walkElement(el, isRoot) {
     // Slot forwarding for double-nested shadow DOM (e.g. Reddit)
     if (el.tagName === 'SLOT') { walkSlotOrElement(el); return; }
 
@@ -365,10 +564,9 @@ _STRUCTURED_SNAPSHOT_JS = """
       let name = getName(el);
       if (!name && role !== 'combobox' && el.tagName !== 'SELECT') return;
 
-      refCounter++;
-      el.setAttribute('data-ct-ref', String(refCounter));
+      const ref = stampRef(el);
 
-      const node = { type: 'interactive', depth: depth, ref: refCounter, role: role, name: name || '', viewport: vp };
+      const node = { type: 'interactive', depth: depth, ref: ref, role: role, name: name || '', viewport: vp };
 
       if (role === 'combobox' || el.tagName === 'SELECT') {
         const sel = el.querySelector('option:checked,option[selected]');
@@ -398,7 +596,7 @@ _STRUCTURED_SNAPSHOT_JS = """
       const selected = el.getAttribute('aria-selected');
       if (selected === 'true') node.selected = true;
 
-      emit(node);
+      emit(node, el);
       return;
     }
 
@@ -411,11 +609,10 @@ _STRUCTURED_SNAPSHOT_JS = """
       }
       if (!name) name = el.getAttribute('aria-label') || el.dataset?.image || el.dataset?.name || '';
       if (name && name.length < 80) {
-        refCounter++;
-        el.setAttribute('data-ct-ref', String(refCounter));
+        const ref = stampRef(el);
         el.setAttribute('role', 'button');
         el.setAttribute('aria-label', name);
-        emit({ type: 'interactive', depth: depth, ref: refCounter, role: 'button', name: name, viewport: vp });
+        emit({ type: 'interactive', depth: depth, ref: ref, role: 'button', name: name, viewport: vp }, el);
         return;
       }
     }
@@ -424,24 +621,24 @@ _STRUCTURED_SNAPSHOT_JS = """
     if (role === 'heading') {
       const lvl = el.tagName.match(/H(\\d)/)?.[1] || '';
       const text = (el.innerText || '').trim();
-      if (text) emit({ type: 'heading', depth: depth, name: text, level: parseInt(lvl) || null, viewport: vp });
+      if (text) emit({ type: 'heading', depth: depth, name: text, level: parseInt(lvl) || null, viewport: vp }, el);
       return;
     }
 
     // Images
     if (role === 'img') {
       const alt = (el.getAttribute('alt') || el.getAttribute('aria-label') || '').trim();
-      if (alt) emit({ type: 'image', depth: depth, name: alt, viewport: vp });
+      if (alt) emit({ type: 'image', depth: depth, name: alt, viewport: vp }, el);
       return;
     }
 
     // Structural containers
     if (CONTAINER_TAGS.has(el.tagName)) {
-      emit({ type: 'container_start', depth: depth, tag: el.tagName.toLowerCase(), viewport: vp });
+      emit({ type: 'container_start', depth: depth, tag: el.tagName.toLowerCase(), viewport: vp }, el);
       depth++;
       walkChildren(el);
       depth--;
-      emit({ type: 'container_end', depth: depth, tag: el.tagName.toLowerCase(), viewport: vp });
+      emit({ type: 'container_end', depth: depth, tag: el.tagName.toLowerCase(), viewport: vp }, el, true);
       return;
     }
 
@@ -449,7 +646,10 @@ _STRUCTURED_SNAPSHOT_JS = """
     if (el.children.length === 0 && !el.shadowRoot) {
       const text = (el.innerText || '').trim();
       if (text && text.length > 1) {
-        emit({ type: 'text', depth: depth, text: text.length > 200 ? text.substring(0, 200) + '...' : text, viewport: vp });
+        emit({
+          type: 'text', depth: depth, viewport: vp,
+          text: text.length > 200 ? text.substring(0, 200) + '...' : text,
+        }, el);
       }
       return;
     }
@@ -463,7 +663,10 @@ _STRUCTURED_SNAPSHOT_JS = """
       }
       const text = (el.innerText || '').trim();
       if (text && text.length > 1) {
-        emit({ type: 'text', depth: depth, text: text.length > 200 ? text.substring(0, 200) + '...' : text, viewport: vp });
+        emit({
+          type: 'text', depth: depth, viewport: vp,
+          text: text.length > 200 ? text.substring(0, 200) + '...' : text,
+        }, el);
       }
       return;
     }
@@ -472,13 +675,17 @@ _STRUCTURED_SNAPSHOT_JS = """
     if (isTextContainer(el)) {
       const text = (el.innerText || '').trim();
       if (text && text.length > 1) {
-        emit({ type: 'text', depth: depth, text: text.length > 200 ? text.substring(0, 200) + '...' : text, viewport: vp });
+        emit({
+          type: 'text', depth: depth, viewport: vp,
+          text: text.length > 200 ? text.substring(0, 200) + '...' : text,
+        }, el);
       }
       return;
     }
 
     // Recurse into children / shadow DOM
     if (el.shadowRoot) {
+      shadowCount++;
       try { walkChildren(el.shadowRoot); }
       catch (_e) { walkChildren(el); }
     } else {
@@ -488,23 +695,72 @@ _STRUCTURED_SNAPSHOT_JS = """
 
   walk(document.body, true);
 
-  return {
-    nodes: nodes,
-    viewport: {
-      width: Math.floor(vw),
-      height: Math.floor(vh),
-      scroll_top: Math.floor(window.scrollY),
-      document_height: Math.floor(
-        document.scrollingElement
-          ? document.scrollingElement.scrollHeight
-          : document.body.scrollHeight
-      )
+  const viewport = {
+    width: Math.floor(vw),
+    height: Math.floor(vh),
+    scroll_top: Math.floor(window.scrollY),
+    document_height: Math.floor(
+      document.scrollingElement
+        ? document.scrollingElement.scrollHeight
+        : document.body.scrollHeight
+    )
+  };
+
+  if (!state) return { nodes: nodes, viewport: viewport };
+
+  // ---- Diff against the previous snapshot ----
+  const canDiff = !!(state.prev && since && since.doc === state.doc && since.seq === state.seq);
+  const order = new Array(nodes.length);
+  const current = new Map();
+  const changed = [];
+  for (let i = 0; i < nodes.length; i++) {
+    const n = nodes[i];
+    let json = state.json.get(n);
+    if (json === undefined) {
+      json = JSON.stringify(n);
+      state.json.set(n, json);
     }
+    order[i] = n.key;
+    current.set(n.key, json);
+    if (!canDiff || state.prev.get(n.key) !== json) changed.push(n);
+  }
+  const removed = [];
+  let sameOrder = false;
+  if (canDiff) {
+    for (const key of state.prev.keys()) if (!current.has(key)) removed.push(key);
+    const prevOrder = state.prevOrder;
+    sameOrder = prevOrder.length === order.length && order.every((k, i) => k === prevOrder[i]);
+  }
+  state.prev = current;
+  state.prevOrder = order;
+  state.seq += 1;
+  state.invalidated = new WeakSet();
+  // Discard records caused by our own ref/role stamping during the walk
+  state.observer.takeRecords();
+
+  return {
+    nodes: changed,
+    viewport: viewport,
+    incremental: {
+      doc: state.doc,
+      seq: state.seq,
+      reset: !canDiff,
+      order: sameOrder ? null : order,
+      removed: removed,
+    },
   };
 }
 """
 
 
+async def _evaluate_snapshot(view: ActiveView, params: dict[str, Any]) -> dict[str, Any]:
+    result: dict[str, Any] = await asyncio.wait_for(
+        view.frame.evaluate(_STRUCTURED_SNAPSHOT_JS, params),
+        timeout=15,
+    )
+    return result
+
+
 async def build_page_view(
     view: ActiveView,
     response: Response | None,
@@ -530,6 +786,9 @@ async def build_page_view(
     snapshot_js_ms = 0.0
     snapshot_py_ms = 0.0
     snapshot_nodes = 0
+    snapshot_sent_nodes = 0
+    changes: str | None = None
+    incremental = load_config().tools.browser.incremental_snapshots
 
     # Detect non-HTML content (PDF, images, etc.) before attempting JS evaluate
     # which would hang indefinitely on pages without a normal DOM.
@@ -557,18 +816,31 @@ async def build_page_view(
         )
     else:
         try:
+            prev_state = _snapshot_states.get(view.frame) if incremental else None
+            params = {
+                "fullPage": full_page,
+                "incremental": incremental,
+                "since": prev_state.since() if prev_state is not None else None,
+            }
             t0 = time.monotonic()
-            raw_result = await asyncio.wait_for(
-                view.frame.evaluate(
-                    _STRUCTURED_SNAPSHOT_JS,
-                    {"fullPage": full_page},
-                ),
-                timeout=15,
-            )
+            raw_result = await _evaluate_snapshot(view, params)
             t_js = time.monotonic()
 
             raw_nodes = raw_result.get("nodes", [])
             raw_viewport = raw_result.get("viewport", {})
+            delta = raw_result.get("incremental")
+            state: SnapshotState | None = None
+            if delta is not None:
+                state = apply_delta(prev_state, raw_nodes, delta)
+                if state is None:
+                    # Delta did not line up with our node list — fetch everything
+                    logger.debug("Incremental snapshot out of sync for %s; resetting", view.url)
+                    t0 = time.monotonic()
+                    raw_result = await _evaluate_snapshot(view, {**params, "since": None})
+                    t_js = time.monotonic()
+                    raw_nodes = raw_result.get("nodes", [])
+                    raw_viewport = raw_result.get("viewport", {})
+                    state = apply_delta(None, raw_nodes, raw_result["incremental"])
 
             viewport_data = {
                 "scroll_top": raw_viewport.get("scroll_top", 0),
@@ -577,19 +849,40 @@ async def build_page_view(
                 "document_height": raw_viewport.get("document_height", 0),
             }
 
-            content, truncated = process_snapshot(
-                raw_nodes,
-                url=view.url,
-                scope_query=scope,
-                budget=budget,
-                name_limit=MAX_NAME_LEN,
-                full_page=full_page,
-            )
+            if state is None:
+                content, truncated = process_snapshot(
+                    raw_nodes,
+                    url=view.url,
+                    scope_query=scope,
+                    budget=budget,
+                    name_limit=MAX_NAME_LEN,
+                    full_page=full_page,
+                )
+                snapshot_nodes = len(raw_nodes)
+            else:
+                content, truncated = process_nodes(
+                    state.ordered_nodes(),
+                    url=view.url,
+                    scope_query=scope,
+                    budget=budget,
+                    name_limit=MAX_NAME_LEN,
+                    full_page=full_page,
+                )
+                snapshot_nodes = len(state.order)
+                lines = content.split("\n")
+                view_params = (scope, full_page, budget)
+                if prev_state is not None and prev_state.doc == state.doc and state.view_params == view_params:
+                    diff = render_changes(state.lines, lines)
+                    if len(diff) < len(content) * _MAX_CHANGES_FRACTION:
+                        changes = diff
+                state.lines = lines
+                state.view_params = view_params
+                _snapshot_states[view.frame] = state
             t_py = time.monotonic()
 
             snapshot_js_ms = (t_js - t0) * 1000
             snapshot_py_ms = (t_py - t_js) * 1000
-            snapshot_nodes = len(raw_nodes)
+            snapshot_sent_nodes = len(raw_nodes)
         except TimeoutError:
             logger.warning("DOM snapshot timed out for %s (may be non-HTML content)", view.url)
             content = (
@@ -608,9 +901,11 @@ async def build_page_view(
         content=content,
         viewport=viewport_data,
         truncated=truncated,
+        changes=changes,
         snapshot_js_ms=snapshot_js_ms,
         snapshot_py_ms=snapshot_py_ms,
         snapshot_nodes=snapshot_nodes,
+        snapshot_sent_nodes=snapshot_sent_nodes,
     )
 
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from playwright.async_api import (
     Error as PlaywrightError,
@@ -18,6 +18,7 @@ from playwright.async_api import (
 )
 
 from config import BrowserWaitConfig
+from sdk.tracing import annotate, traced
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,10 @@ class SettleTimings:
     dom_quiet_timed_out: bool = False
     animation_ms: float = 0
     animation_timed_out: bool = False
+    skipped_phases: list[str] = field(default_factory=list)
+    blocked_requests: int = 0
+    cached_requests: int = 0
+    bytes_saved: int = 0
     error: str | None = None
 
     @property
@@ -51,6 +56,7 @@ class SettleTimings:
         ]
 
 
+@traced("browser.page_settle")
 async def wait_for_page_settle(
     page: Page | Frame,
     *,
@@ -75,6 +81,11 @@ async def wait_for_page_settle(
        finish so modal slide-ins, fades, and skeleton transitions are
        fully rendered.  Capped to avoid blocking on infinite loops.
 
+    The font and animation phases are skipped (and listed in
+    ``skipped_phases``) when ``waits.skip_font_phase`` /
+    ``waits.skip_animation_phase`` are set — the fast-settle policy does
+    this when the resources they wait on are blocked at the network layer.
+
     Returns:
         SettleTimings with per-phase durations.
     """
@@ -95,130 +106,155 @@ async def wait_for_page_settle(
             return timings
 
         # Phase 2: web fonts
-        font_timeout_ms = max(0, waits.font_timeout_ms)
-        font_js = f"""async () => {{
-            try {{
-                await Promise.race([
-                    document.fonts.ready,
-                    new Promise(r => setTimeout(r, {font_timeout_ms})),
-                ]);
-            }} catch {{}}
-        }}"""
-        t0 = time.monotonic()
-        try:
-            await page.evaluate(font_js)
-        except PlaywrightTimeoutError:
-            timings.font_timed_out = True
-        timings.font_ms = (time.monotonic() - t0) * 1000
+        if waits.skip_font_phase:
+            timings.skipped_phases.append("fonts")
+        else:
+            await _wait_for_fonts(page, waits, timings)
 
         # Phase 3: DOM quiet window (including shadow roots)
         if not hasattr(page, "wait_for_function"):
             return timings
+        await _wait_for_dom_quiet(page, waits, timings)
 
-        dom_quiet_ms = max(0, waits.dom_quiet_window_ms)
-        dom_js = f"""() => {{
-            return new Promise((resolve) => {{
-                const quiet = {dom_quiet_ms};
-                const observeOpts = {{ childList: true, subtree: true, attributes: true, characterData: true }};
+        # Phase 4: short CSS animations
+        if waits.skip_animation_phase:
+            timings.skipped_phases.append("animations")
+        else:
+            await _wait_for_animations(page, waits, timings)
+    except PlaywrightError as exc:
+        timings.error = str(exc)
+    finally:
+        phases = {f"{name.replace(' ', '_')}_ms": round(ms, 1) for name, ms, _timed_out in timings.phases}
+        annotate(skipped=timings.skipped_phases, **phases)
+
+    return timings
+
+
+async def _wait_for_fonts(page: Page | Frame, waits: BrowserWaitConfig, timings: SettleTimings) -> None:
+    """Wait for ``document.fonts.ready``, capped at ``font_timeout_ms``."""
+    font_timeout_ms = max(0, waits.font_timeout_ms)
+    font_js = f"""async () => {{
+        try {{
+            await Promise.race([
+                document.fonts.ready,
+                new Promise(r => setTimeout(r, {font_timeout_ms})),
+            ]);
+        }} catch {{}}
+    }}"""
+    t0 = time.monotonic()
+    try:
+        await page.evaluate(font_js)
+    except PlaywrightTimeoutError:
+        timings.font_timed_out = True
+    timings.font_ms = (time.monotonic() - t0) * 1000
 
-                const isSignificant = (mutations) => mutations.some(m => {{
-                    if (m.type === 'attributes' && m.attributeName === 'value') {{
-                        const t = m.target;
-                        if (t.tagName === 'INPUT' || t.tagName === 'TEXTAREA') return false;
+
+async def _wait_for_dom_quiet(page: Page | Frame, waits: BrowserWaitConfig, timings: SettleTimings) -> None:
+    """Wait for a window without significant DOM mutations."""
+    dom_quiet_ms = max(0, waits.dom_quiet_window_ms)
+    dom_js = f"""() => {{
+        return new Promise((resolve) => {{
+            const quiet = {dom_quiet_ms};
+            const observeOpts = {{ childList: true, subtree: true, attributes: true, characterData: true }};
+
+            const isSignificant = (mutations) => mutations.some(m => {{
+                if (m.type === 'attributes' && m.attributeName === 'value') {{
+                    const t = m.target;
+                    if (t.tagName === 'INPUT' || t.tagName === 'TEXTAREA') return false;
+                }}
+                if (m.type === 'characterData') {{
+                    let n = m.target.parentNode;
+                    while (n) {{
+                        if (n.tagName === 'INPUT' || n.tagName === 'TEXTAREA') return false;
+                        n = n.parentNode;
                     }}
-                    if (m.type === 'characterData') {{
-                        let n = m.target.parentNode;
-                        while (n) {{
-                            if (n.tagName === 'INPUT' || n.tagName === 'TEXTAREA') return false;
-                            n = n.parentNode;
-                        }}
+                }}
+                return true;
+            }});
+
+            let timer = setTimeout(() => {{ obs.disconnect(); resolve(true); }}, quiet);
+
+            const resetTimer = () => {{
+                clearTimeout(timer);
+                timer = setTimeout(() => {{ obs.disconnect(); resolve(true); }}, quiet);
+            }};
+
+            const callback = (mutations) => {{
+                if (isSignificant(mutations)) resetTimer();
+                // Watch for new shadow roots in added nodes
+                for (const m of mutations) {{
+                    if (m.type !== 'childList') continue;
+                    for (const node of m.addedNodes) {{
+                        if (node.nodeType === 1) observeShadowRoots(node);
                     }}
-                    return true;
-                }});
-
-                let timer = setTimeout(() => {{ obs.disconnect(); resolve(true); }}, quiet);
-
-                const resetTimer = () => {{
-                    clearTimeout(timer);
-                    timer = setTimeout(() => {{ obs.disconnect(); resolve(true); }}, quiet);
-                }};
-
-                const callback = (mutations) => {{
-                    if (isSignificant(mutations)) resetTimer();
-                    // Watch for new shadow roots in added nodes
-                    for (const m of mutations) {{
-                        if (m.type !== 'childList') continue;
-                        for (const node of m.addedNodes) {{
-                            if (node.nodeType === 1) observeShadowRoots(node);
+                }}
+            }};
+
+            const obs = new MutationObserver(callback);
+
+            // Recursively find and observe all open shadow roots
+            const observeShadowRoots = (root) => {{
+                try {{
+                    const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+                    let el = walker.currentNode;
+                    while (el) {{
+                        if (el.shadowRoot) {{
+                            obs.observe(el.shadowRoot, observeOpts);
+                            // Also walk inside the shadow root
+                            observeShadowRoots(el.shadowRoot);
                         }}
+                        el = walker.nextNode();
                     }}
-                }};
-
-                const obs = new MutationObserver(callback);
-
-                // Recursively find and observe all open shadow roots
-                const observeShadowRoots = (root) => {{
-                    try {{
-                        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
-                        let el = walker.currentNode;
-                        while (el) {{
-                            if (el.shadowRoot) {{
-                                obs.observe(el.shadowRoot, observeOpts);
-                                // Also walk inside the shadow root
-                                observeShadowRoots(el.shadowRoot);
-                            }}
-                            el = walker.nextNode();
-                        }}
-                    }} catch {{}}
-                }};
+                }} catch {{}}
+            }};
 
-                try {{
-                    obs.observe(document, observeOpts);
-                    observeShadowRoots(document);
-                }} catch (e) {{
-                    clearTimeout(timer);
-                    resolve(true);
-                }}
-            }});
-        }}"""
-        t0 = time.monotonic()
-        try:
-            await page.wait_for_function(dom_js, timeout=waits.dom_mutation_timeout_ms)
-        except PlaywrightTimeoutError:
-            timings.dom_quiet_timed_out = True
-        timings.dom_quiet_ms = (time.monotonic() - t0) * 1000
-
-        # Phase 4: wait for short CSS animations to finish.
-        # Only waits on animations with duration ≤ 1s (modal fades,
-        # slide-ins, skeleton transitions).  Long/infinite animations
-        # are ignored.  The whole phase is capped at animation_timeout_ms.
-        anim_timeout_ms = max(0, waits.animation_timeout_ms)
-        anim_js = f"""async () => {{
             try {{
-                const anims = document.getAnimations().filter(a => {{
-                    try {{
-                        const d = a.effect?.getComputedTiming()?.duration;
-                        return typeof d === 'number' && d <= 1000;
-                    }} catch {{ return false; }}
-                }});
-                if (anims.length > 0) {{
-                    await Promise.race([
-                        Promise.allSettled(anims.map(a => a.finished)),
-                        new Promise(r => setTimeout(r, {anim_timeout_ms})),
-                    ]);
-                }}
-            }} catch {{}}
-        }}"""
-        t0 = time.monotonic()
-        try:
-            await page.evaluate(anim_js)
-        except PlaywrightTimeoutError:
-            timings.animation_timed_out = True
-        timings.animation_ms = (time.monotonic() - t0) * 1000
-    except PlaywrightError as exc:
-        timings.error = str(exc)
+                obs.observe(document, observeOpts);
+                observeShadowRoots(document);
+            }} catch (e) {{
+                clearTimeout(timer);
+                resolve(true);
+            }}
+        }});
+    }}"""
+    t0 = time.monotonic()
+    try:
+        await page.wait_for_function(dom_js, timeout=waits.dom_mutation_timeout_ms)
+    except PlaywrightTimeoutError:
+        timings.dom_quiet_timed_out = True
+    timings.dom_quiet_ms = (time.monotonic() - t0) * 1000
 
-    return timings
+
+async def _wait_for_animations(page: Page | Frame, waits: BrowserWaitConfig, timings: SettleTimings) -> None:
+    """Wait for short CSS animations to finish.
+
+    Only waits on animations with duration ≤ 1s (modal fades, slide-ins,
+    skeleton transitions).  Long/infinite animations are ignored.  The
+    whole phase is capped at ``animation_timeout_ms``.
+    """
+    anim_timeout_ms = max(0, waits.animation_timeout_ms)
+    anim_js = f"""async () => {{
+        try {{
+            const anims = document.getAnimations().filter(a => {{
+                try {{
+                    const d = a.effect?.getComputedTiming()?.duration;
+                    return typeof d === 'number' && d <= 1000;
+                }} catch {{ return false; }}
+            }});
+            if (anims.length > 0) {{
+                await Promise.race([
+                    Promise.allSettled(anims.map(a => a.finished)),
+                    new Promise(r => setTimeout(r, {anim_timeout_ms})),
+                ]);
+            }}
+        }} catch {{}}
+    }}"""
+    t0 = time.monotonic()
+    try:
+        await page.evaluate(anim_js)
+    except PlaywrightTimeoutError:
+        timings.animation_timed_out = True
+    timings.animation_ms = (time.monotonic() - t0) * 1000
 
 
 __all__ = ["SettleTimings", "wait_for_page_settle"]
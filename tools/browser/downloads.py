@@ -0,0 +1,39 @@
+"""Browser tool for waiting on a download that is still in progress."""
+
+from __future__ import annotations
+
+import logging
+
+from tools.browser.core import get_browser
+from tools.browser.core._file_detection import format_download_message
+from tools.browser.core.exceptions import BrowserToolError
+
+logger = logging.getLogger(__name__)
+
+
+async def wait_for_download(download_id: str, timeout_s: int = 120) -> str:
+    """Wait for an in-progress download to finish and return where it was saved.
+
+    Use when a tool response says ``Download in progress`` and you need the
+    complete file.  If the download is still running after ``timeout_s``,
+    the current progress is returned and you can call this again.
+
+    Args:
+        download_id: The id shown in the ``Download in progress`` message.
+        timeout_s: Maximum seconds to wait.
+
+    Returns:
+        The saved path, content type and size, or the current progress.
+    """
+    browser = await get_browser()
+    handle = browser.get_download(download_id)
+    if handle is None:
+        msg = f"No download with id {download_id!r}."
+        raise BrowserToolError(msg, tool="wait_for_download")
+
+    logger.info("Waiting up to %ds for download %s (%s)", timeout_s, download_id, handle.filename)
+    info = await handle.wait(timeout=max(timeout_s, 0))
+    return format_download_message(info)
+
+
+__all__ = ["wait_for_download"]
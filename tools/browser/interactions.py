@@ -18,6 +18,7 @@ if TYPE_CHECKING:
     from playwright.async_api import Response
 
 from config import load_config
+from logging_config import log_event
 from tools.browser.core import get_active_view, get_browser
 from tools.browser.core._formatting import format_page_view
 from tools.browser.core._selectors import _LocatorResolution, _resolve_locator
@@ -55,11 +56,10 @@ def _log_browser_panel(
     tool_name: str = "",
     resolution: _LocatorResolution | None = None,
 ) -> None:
-    """Emit a single Rich panel summarising a browser tool call."""
+    """Log a ``browser.interaction`` event (with a Rich panel) summarising a browser tool call."""
     if not logger.isEnabledFor(logging.INFO):
         return
 
-    from rich.console import Console
     from rich.panel import Panel
     from rich.table import Table
 
@@ -69,19 +69,32 @@ def _log_browser_panel(
     table.add_column("Status")
 
     if result.action_ms > 0:
-        table.add_row("interaction", f"{result.action_ms:.0f}ms", "")
+        input_status = result.input_stats.summary if result.input_stats else ""
+        table.add_row("interaction", f"{result.action_ms:.0f}ms", input_status)
 
     settle = result.settle_timings
     if settle is not None:
         for name, duration_ms, timed_out in settle.phases:
+            if name in settle.skipped_phases:
+                table.add_row(name, "", "[dim]skipped[/dim]")
+                continue
             status = "[yellow]timeout[/yellow]" if timed_out else "[green]ok[/green]"
             table.add_row(name, f"{duration_ms:.0f}ms", status)
+        if settle.blocked_requests or settle.cached_requests:
+            table.add_row(
+                "network",
+                f"{settle.bytes_saved / 1024:.0f}KB",
+                f"{settle.blocked_requests} blocked, {settle.cached_requests} cached",
+            )
         if settle.error:
             table.add_row("error", "", f"[red]{settle.error}[/red]")
 
     if snapshot is not None and snapshot.snapshot_nodes > 0:
         total_snap = snapshot.snapshot_js_ms + snapshot.snapshot_py_ms
-        table.add_row("snapshot", f"{total_snap:.0f}ms", f"{snapshot.snapshot_nodes} nodes")
+        nodes_status = f"{snapshot.snapshot_nodes} nodes"
+        if snapshot.snapshot_sent_nodes != snapshot.snapshot_nodes:
+            nodes_status += f" ({snapshot.snapshot_sent_nodes} sent)"
+        table.add_row("snapshot", f"{total_snap:.0f}ms", nodes_status)
 
     settle_total = settle.total_ms if settle else 0
     snap_total = (snapshot.snapshot_js_ms + snapshot.snapshot_py_ms) if snapshot else 0
@@ -106,14 +119,18 @@ def _log_browser_panel(
         parts.append(f"download: {result.download.filename}")
     subtitle = "  ".join(parts)
 
-    console = Console(stderr=True)
-    console.print(Panel(
-        table,
-        title=title,
-        subtitle=subtitle,
-        border_style="dim",
-        expand=False,
-    ))
+    log_event(
+        "browser.interaction", "%s: %.0fms total", tool_name or "browser", total_ms,
+        tool=tool_name or "browser", url=url, total_ms=round(total_ms, 1), action_ms=round(result.action_ms, 1),
+        settle_ms=round(settle_total, 1), snapshot_ms=round(snap_total, 1),
+        panel=Panel(
+            table,
+            title=title,
+            subtitle=subtitle,
+            border_style="dim",
+            expand=False,
+        ),
+    )
 
 
 async def _build_snapshot(
@@ -150,7 +167,7 @@ async def _format_result(
         url=snapshot.url,
         status_code=snapshot.status_code,
         viewport=snapshot.viewport,
-        content=snapshot.content,
+        content=snapshot.changes if snapshot.changes is not None else snapshot.content,
         truncated=snapshot.truncated,
     )
 
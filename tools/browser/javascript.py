@@ -9,17 +9,16 @@ from typing import Any
 
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from logging_config import log_event
 from tools.browser.core import get_active_view
 from tools.browser.core._formatting import format_javascript_result
 from tools.browser.core.exceptions import BrowserToolError
 from tools.browser.events import emit_screenshot
 
 logger = logging.getLogger(__name__)
-_console = Console(stderr=True)
 
 _CODE_PREVIEW_LEN = 120
 
@@ -172,7 +171,7 @@ def _print_js_panel(
     error: str | None = None,
     console_lines: list[str] | None = None,
 ) -> None:
-    """Print a Rich panel summarizing a JavaScript execution."""
+    """Log a ``browser.javascript`` event (with a Rich panel) summarizing a JavaScript execution."""
     status = "[bold green]OK[/bold green]" if success else "[bold red]FAIL[/bold red]"
     title = f"[bold yellow]execute_javascript[/bold yellow]  {status}"
 
@@ -199,13 +198,17 @@ def _print_js_panel(
     display_url = url if len(url) <= 80 else url[:77] + "…"
     subtitle = f"[bold]{elapsed_ms:.0f}ms[/bold]  {display_url}"
 
-    _console.print(Panel(
-        body,
-        title=title,
-        subtitle=subtitle,
-        border_style="yellow" if success else "red",
-        expand=False,
-    ))
+    log_event(
+        "browser.javascript", "execute_javascript %s in %.0fms", "ok" if success else "failed", elapsed_ms,
+        success=success, url=url, elapsed_ms=round(elapsed_ms, 1), error=error,
+        panel=Panel(
+            body,
+            title=title,
+            subtitle=subtitle,
+            border_style="yellow" if success else "red",
+            expand=False,
+        ),
+    )
 
 
 __all__ = ["execute_javascript"]
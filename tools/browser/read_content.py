@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from dataclasses import dataclass, field
+from typing import Any
 
+import cachetools
 from playwright.async_api import Error as PlaywrightError
 
 from tools.browser.core import get_active_view
@@ -16,6 +20,9 @@ logger = logging.getLogger(__name__)
 _READ_BUDGET = 20_000
 _QUERY_CONTEXT_LINES = 1
 
+# Converted pages kept for follow-up page_number / query calls.
+_CONTENT_CACHE_SIZE = 16
+
 # JS to find the best content root and return its outerHTML.
 # Prefers <article>, then <main>, then falls back to <body>.
 _CONTENT_ROOT_JS = """
@@ -28,53 +35,174 @@ _CONTENT_ROOT_JS = """
 }
 """
 
+# JS returning a key for the current document revision.  The first call on
+# a document installs a MutationObserver that bumps ``rev`` on every text or
+# structure change; ``doc`` is random per document so navigations and
+# reloads never collide.  Observer callbacks are delivered before the next
+# evaluate runs, so an unchanged key means the DOM is unchanged.
+_CONTENT_REVISION_JS = """
+() => {
+  const key = Symbol.for('computron.contentRevision');
+  let state = window[key];
+  if (!state) {
+    state = { doc: Math.random().toString(36).slice(2), rev: 0 };
+    Object.defineProperty(window, key, { value: state });
+    new MutationObserver(() => { state.rev += 1; }).observe(document, {
+      childList: true,
+      characterData: true,
+      subtree: true,
+      attributes: true,
+      attributeFilter: ['href'],
+    });
+  }
+  return { doc: state.doc, rev: state.rev };
+}
+"""
 
-def _filter_by_query(
-    content: str, query: str, page_number: int = 1
-) -> tuple[str, bool]:
-    """Filter markdown content to lines matching *query* with context.
 
-    Returns a ``(text, truncated)`` tuple.  *text* contains matching lines
-    with ``_QUERY_CONTEXT_LINES`` of surrounding context, grouped by
-    proximity and separated by ``---``.  *page_number* selects which
-    page of results to return (1-indexed).
+@dataclass(slots=True)
+class _PageContent:
+    """Converted markdown for one page revision, with precomputed offsets."""
+
+    markdown: str
+    lines: list[str]
+    lines_lower: list[str]
+    # Char offset where each ``_READ_BUDGET`` sized page starts.
+    page_offsets: list[int]
+    # Lower-cased query -> matching group texts.
+    query_groups: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_markdown(cls, markdown: str) -> _PageContent:
+        lines = markdown.split("\n")
+        return cls(
+            markdown=markdown,
+            lines=lines,
+            lines_lower=[line.lower() for line in lines],
+            page_offsets=_page_offsets(lines),
+        )
+
+    def page(self, page_number: int) -> tuple[str, bool]:
+        """Return ``(text, truncated)`` for a 1-indexed page of the markdown."""
+        if page_number > len(self.page_offsets):
+            return "", False
+        start = self.page_offsets[page_number - 1]
+        if page_number < len(self.page_offsets):
+            return self.markdown[start : self.page_offsets[page_number]], True
+        return self.markdown[start:], False
+
+
+def _page_offsets(lines: list[str]) -> list[int]:
+    """Split content into ``_READ_BUDGET`` pages, breaking on line boundaries.
+
+    Lines longer than the budget are split mid-line so no page exceeds it.
     """
+    offsets = [0]
+    pos = 0
+    used = 0
+    for line in lines:
+        cost = len(line) + 1  # the joining newline
+        if used and used + cost > _READ_BUDGET:
+            offsets.append(pos)
+            used = 0
+        while cost > _READ_BUDGET:
+            pos += _READ_BUDGET
+            cost -= _READ_BUDGET
+            offsets.append(pos)
+        pos += cost
+        used += cost
+    return offsets
+
+
+_content_cache: cachetools.LRUCache[tuple[str, str, int], _PageContent] = cachetools.LRUCache(
+    maxsize=_CONTENT_CACHE_SIZE
+)
+
+
+def _revision_key(url: str, revision: Any) -> tuple[str, str, int] | None:
+    """Build a cache key from the revision JS result, or None if unavailable."""
+    if not isinstance(revision, dict):
+        return None
+    doc, rev = revision.get("doc"), revision.get("rev")
+    if not isinstance(doc, str) or not isinstance(rev, int):
+        return None
+    return (url, doc, rev)
+
+
+async def _load_page_content(frame: Any) -> _PageContent:
+    """Return converted markdown for *frame*, reusing it while the DOM is unchanged."""
+    # Read the revision before the HTML so a mutation in between can only
+    # cause a spurious miss later, never a stale hit.
+    key = _revision_key(frame.url, await frame.evaluate(_CONTENT_REVISION_JS))
+    if key is not None:
+        cached = _content_cache.get(key)
+        if cached is not None:
+            return cached
+
+    raw_html: str = await frame.evaluate(_CONTENT_ROOT_JS)
+    content = await asyncio.to_thread(lambda: _PageContent.from_markdown(html_to_markdown(raw_html)))
+    if key is not None:
+        _content_cache[key] = content
+    return content
+
+
+def _query_groups(page: _PageContent, query: str) -> list[str]:
+    """Return matching line groups (with context) for *query*, memoized per page."""
     query_lower = query.lower()
-    lines = content.split("\n")
+    cached = page.query_groups.get(query_lower)
+    if cached is not None:
+        return cached
 
+    lines = page.lines
     matched_indices: set[int] = set()
-    for i, line in enumerate(lines):
-        if query_lower in line.lower():
+    for i, line in enumerate(page.lines_lower):
+        if query_lower in line:
             lo = max(0, i - _QUERY_CONTEXT_LINES)
             hi = min(len(lines), i + _QUERY_CONTEXT_LINES + 1)
             matched_indices.update(range(lo, hi))
 
-    if not matched_indices:
-        return "", False
+    group_texts: list[str] = []
+    if matched_indices:
+        # Group consecutive line indices
+        sorted_indices = sorted(matched_indices)
+        groups: list[list[int]] = []
+        current: list[int] = [sorted_indices[0]]
+        for idx in sorted_indices[1:]:
+            if idx > current[-1] + 1:
+                groups.append(current)
+                current = [idx]
+            else:
+                current.append(idx)
+        groups.append(current)
+
+        for group in groups:
+            text = "\n".join(lines[j] for j in group).strip()
+            if text:
+                group_texts.append(text)
+
+    page.query_groups[query_lower] = group_texts
+    return group_texts
 
-    # Group consecutive line indices
-    sorted_indices = sorted(matched_indices)
-    groups: list[list[int]] = []
-    current: list[int] = [sorted_indices[0]]
-    for idx in sorted_indices[1:]:
-        if idx > current[-1] + 1:
-            groups.append(current)
-            current = [idx]
-        else:
-            current.append(idx)
-    groups.append(current)
 
-    # Build all group texts
-    group_texts: list[str] = []
-    for group in groups:
-        text = "\n".join(lines[j] for j in group).strip()
-        if text:
-            group_texts.append(text)
+def _filter_by_query(
+    content: str | _PageContent, query: str, page_number: int = 1
+) -> tuple[str, bool]:
+    """Filter markdown content to lines matching *query* with context.
+
+    Returns a ``(text, truncated)`` tuple.  *text* contains matching lines
+    with ``_QUERY_CONTEXT_LINES`` of surrounding context, grouped by
+    proximity and separated by ``---``.  *page_number* selects which
+    page of results to return (1-indexed).
+    """
+    page = content if isinstance(content, _PageContent) else _PageContent.from_markdown(content)
+    group_texts = _query_groups(page, query)
+    if not group_texts:
+        return "", False
 
     # Paginate groups into pages that fit within the budget
     header = (
         f'[Filtered for "{query}" — {len(group_texts)} match(es) '
-        f"from {len(content):,} chars]\n"
+        f"from {len(page.markdown):,} chars]\n"
     )
     header_len = len(header)
 
@@ -140,26 +268,22 @@ async def read_page(
     _, view = await get_active_view("read_page")
 
     try:
-        raw_html: str = await view.frame.evaluate(_CONTENT_ROOT_JS)
-        full_content = html_to_markdown(raw_html)
+        page_content = await _load_page_content(view.frame)
 
         if query:
             # Filter mode — return only matching snippets
             content, truncated = _filter_by_query(
-                full_content, query, page_number
+                page_content, query, page_number
             )
             if not content:
                 content = (
                     f'No matches for "{query}" on this page '
-                    f"({len(full_content):,} chars)."
+                    f"({len(page_content.markdown):,} chars)."
                 )
                 truncated = False
         else:
-            # Pagination mode — slice to the requested page
-            start = (page_number - 1) * _READ_BUDGET
-            end = start + _READ_BUDGET
-            content = full_content[start:end]
-            truncated = end < len(full_content)
+            # Pagination mode — return the requested page
+            content, truncated = page_content.page(page_number)
 
             if not content and page_number > 1:
                 raise BrowserToolError(
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
@@ -42,7 +43,7 @@ async def save_page_content(filename: str) -> str:
 
     try:
         raw_html = await view.frame.content()
-        content = html_to_markdown(raw_html)
+        content = await asyncio.to_thread(html_to_markdown, raw_html)
         home_dir.mkdir(parents=True, exist_ok=True)
         dest.write_text(content, encoding="utf-8")
         size = dest.stat().st_size
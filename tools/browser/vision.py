@@ -26,6 +26,20 @@ _SCREENSHOT_TOOL_NAME = "inspect_page"
 _VISUAL_ACTION_TOOL_NAME = "browser_visual_action"
 
 
+def _inspect_screenshot_options() -> tuple[dict[str, object], str]:
+    """Playwright screenshot options for ``inspect_page`` and the resulting MIME type.
+
+    Captures at CSS-pixel scale (no device-pixel-ratio upscaling) and, unless
+    the media config asks for PNG, as JPEG, which Playwright encodes natively.
+    """
+    from config import load_config
+
+    media = load_config().media
+    if media.image_format == "png":
+        return {"type": "png", "scale": "css"}, "image/png"
+    return {"type": "jpeg", "quality": media.image_quality, "scale": "css"}, "image/jpeg"
+
+
 async def inspect_page(
     prompt: str,
     *,
@@ -70,13 +84,14 @@ async def inspect_page(
     # Screenshots require the Page object (not Frame)
     page = await _browser.current_page()
 
+    options, media_type = _inspect_screenshot_options()
     try:
         if normalized_mode == "selector":
-            screenshot_bytes = await _selector_screenshot(page, selector)
+            screenshot_bytes = await _selector_screenshot(page, selector, **options)
         elif normalized_mode == "full_page":
-            screenshot_bytes = await page.screenshot(type="png", full_page=True)
+            screenshot_bytes = await page.screenshot(full_page=True, **options)
         else:  # viewport
-            screenshot_bytes = await page.screenshot(type="png", full_page=False)
+            screenshot_bytes = await page.screenshot(full_page=False, **options)
     except BrowserToolError:
         raise
     except PlaywrightError as exc:
@@ -93,7 +108,7 @@ async def inspect_page(
     from sdk.providers import ProviderError, vision_generate
 
     try:
-        answer = await vision_generate(clean_prompt, encoded_image)
+        answer = await vision_generate(clean_prompt, encoded_image, media_type=media_type)
     except ValueError as exc:
         raise BrowserToolError(str(exc), tool=_SCREENSHOT_TOOL_NAME) from exc
     except ProviderError as exc:
@@ -210,7 +225,7 @@ async def browser_visual_action(task: str) -> str:
         raise BrowserToolError(msg, tool=_VISUAL_ACTION_TOOL_NAME) from exc
 
 
-async def _selector_screenshot(page: Page, selector: str | None) -> bytes:
+async def _selector_screenshot(page: Page, selector: str | None, **options: object) -> bytes:
     if selector is None:
         msg = "selector cannot be None when mode='selector'."
         raise BrowserToolError(msg, tool=_SCREENSHOT_TOOL_NAME)
@@ -232,7 +247,7 @@ async def _selector_screenshot(page: Page, selector: str | None) -> bytes:
         msg = f"No element matched selector handle '{clean_selector}'"
         raise BrowserToolError(msg, tool=_SCREENSHOT_TOOL_NAME)
     locator = resolution.locator
-    return await locator.screenshot(type="png")
+    return await locator.screenshot(**options)
 
 
 
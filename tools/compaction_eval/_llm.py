@@ -8,6 +8,7 @@ import re
 import time
 from typing import Any
 
+from sdk.providers import StopCondition, chat_until, json_complete
 from sdk.providers._ollama import OllamaProvider
 
 from ._prompts import (
@@ -23,6 +24,9 @@ logger = logging.getLogger(__name__)
 
 _CALL_TIMEOUT = 180.0
 
+# JSON answers are read only until the top-level value closes.
+_JSON_STOP = StopCondition(complete=json_complete)
+
 
 def _parse_json(text: str) -> Any:
     """Parse JSON from LLM output, stripping markdown fences if present."""
@@ -38,14 +42,17 @@ async def _call_llm(
     system_prompt: str,
     user_content: str,
     options: dict[str, Any] | None = None,
+    stop: StopCondition | None = None,
 ) -> tuple[str, float]:
-    """Call the LLM and return (response_text, elapsed_seconds)."""
+    """Call the LLM and return (response_text, elapsed_seconds), ending the stream early at *stop*."""
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_content},
     ]
     t0 = time.monotonic()
-    response = await provider.chat(
+    response = await chat_until(
+        provider,
+        stop,
         model=model,
         messages=messages,
         options=options,
@@ -68,7 +75,7 @@ async def extract_facts(
     # Step 1: Extract facts
     prompt = FACT_EXTRACTION_PROMPT.format(conversation_text=conversation_text)
     raw_facts, facts_elapsed = await _call_llm(
-        provider, model, "You extract facts from conversations.", prompt, options,
+        provider, model, "You extract facts from conversations.", prompt, options, stop=_JSON_STOP,
     )
     try:
         facts = _parse_json(raw_facts)
@@ -89,7 +96,7 @@ async def extract_facts(
         facts_json=facts_json,
     )
     raw_matches, match_elapsed = await _call_llm(
-        provider, model, "You check fact preservation.", match_prompt, options,
+        provider, model, "You check fact preservation.", match_prompt, options, stop=_JSON_STOP,
     )
     try:
         matches = _parse_json(raw_matches)
@@ -121,7 +128,7 @@ async def judge_summary(
         summary_text=summary_text,
     )
     raw, elapsed = await _call_llm(
-        provider, model, "You evaluate summary quality.", prompt, options,
+        provider, model, "You evaluate summary quality.", prompt, options, stop=_JSON_STOP,
     )
     try:
         scores = _parse_json(raw)
@@ -184,7 +191,7 @@ async def continuation_probe(
         conversation_text=conversation_text,
     )
     raw_questions, gen_elapsed = await _call_llm(
-        provider, model, "You generate test questions.", gen_prompt, options,
+        provider, model, "You generate test questions.", gen_prompt, options, stop=_JSON_STOP,
     )
     try:
         probes = _parse_json(raw_questions)
@@ -207,7 +214,7 @@ async def continuation_probe(
         questions_json=questions_json,
     )
     raw_answers, answer_elapsed = await _call_llm(
-        provider, model, "You answer questions from a summary.", answer_prompt, options,
+        provider, model, "You answer questions from a summary.", answer_prompt, options, stop=_JSON_STOP,
     )
     try:
         answers = _parse_json(raw_answers)
@@ -5,7 +5,7 @@ Public API:
 - mouse_click, mouse_double_click, mouse_drag,
   keyboard_type, keyboard_press, scroll — action tools.
 - ensure_desktop_running, is_desktop_running, start_desktop, stop_desktop — lifecycle.
-- capture_screenshot — raw screenshot capture.
+- capture_screenshot, grab_frame — screenshot capture.
 """
 
 from ._lifecycle import (
@@ -17,7 +17,7 @@ from ._lifecycle import (
     start_desktop,
     stop_desktop,
 )
-from ._screenshot import capture_screenshot
+from ._screenshot import Frame, capture_screenshot, grab_frame
 from ._tools import (
     describe_screen,
     desktop_shell,
@@ -32,11 +32,13 @@ from ._tools import (
 )
 
 __all__ = [
+    "Frame",
     "allocate_display",
     "capture_screenshot",
     "describe_screen",
     "desktop_shell",
     "ensure_desktop_running",
+    "grab_frame",
     "is_desktop_running",
     "keyboard_press",
     "keyboard_type",
@@ -0,0 +1,121 @@
+"""Client for the per-display accessibility tree daemon.
+
+``/opt/desktop/a11y_tree.py --serve SOCKET`` keeps an AT-SPI connection
+open for one display and re-walks an application only after it emitted a
+change event.  Querying it costs a Unix socket round-trip instead of an
+interpreter start, a ``pyatspi`` import and a full tree walk.
+
+The daemon is started on demand the first time a display is observed;
+until it answers, callers fall back to the one-shot script.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import shlex
+import time
+
+from tools.desktop._exec import DesktopExecError, _resolve_display, _run_desktop_cmd
+
+logger = logging.getLogger(__name__)
+
+A11Y_SCRIPT = "/usr/bin/python3.10 /opt/desktop/a11y_tree.py"
+
+_QUERY_TIMEOUT_S = 5.0
+# Don't try to start a daemon for the same display more often than this.
+_RESPAWN_INTERVAL_S = 30.0
+_MAX_REPLY_BYTES = 16 * 1024 * 1024
+
+# display → (rev, elements) of the last snapshot the daemon sent.
+_snapshots: dict[str, tuple[str, list[dict]]] = {}
+# display → monotonic time of the last daemon start attempt.
+_spawned_at: dict[str, float] = {}
+
+
+def _socket_path(display: str) -> str:
+    return f"/tmp/computron-a11y-{display.lstrip(':')}.sock"
+
+
+def daemon_kill_cmd(display: str) -> str:
+    """Shell command that stops the daemon serving *display*."""
+    pattern = f"a11y_tree.py --serve {_socket_path(display)}"
+    return f"pkill -f {shlex.quote(pattern)} || true"
+
+
+def forget_display(display: str) -> None:
+    """Drop cached state for *display* so a new daemon is started promptly."""
+    _snapshots.pop(display, None)
+    _spawned_at.pop(display, None)
+
+
+async def _request(path: str, payload: dict) -> dict:
+    reader, writer = await asyncio.open_unix_connection(path, limit=_MAX_REPLY_BYTES)
+    try:
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+    finally:
+        writer.close()
+    reply = json.loads(line)
+    if not isinstance(reply, dict):
+        msg = f"unexpected daemon reply: {reply!r}"
+        raise ValueError(msg)
+    return reply
+
+
+async def _spawn_daemon(display: str) -> None:
+    now = time.monotonic()
+    if now - _spawned_at.get(display, -_RESPAWN_INTERVAL_S) < _RESPAWN_INTERVAL_S:
+        return
+    _spawned_at[display] = now
+    logger.info("Starting a11y daemon for display %s", display)
+    try:
+        await _run_desktop_cmd(
+            f"nohup {A11Y_SCRIPT} --serve {shlex.quote(_socket_path(display))} > /dev/null 2>&1 &",
+            display=display,
+            timeout=5,
+        )
+    except DesktopExecError:
+        logger.warning("Failed to start a11y daemon for display %s", display)
+
+
+async def query_a11y_daemon(display: str | None = None) -> list[dict] | None:
+    """Return the interactive elements on *display* from its daemon.
+
+    Only the revision of the last snapshot is sent; the daemon replies with
+    the elements only when they changed since.  The returned list is shared
+    with the cache and must not be modified.
+
+    Args:
+        display: X11 display; defaults to the current agent's display.
+
+    Returns:
+        The element list, or ``None`` if the daemon is not (yet) available,
+        in which case a start is attempted in the background.
+    """
+    display = _resolve_display(display)
+    rev, elements = _snapshots.get(display, ("", []))
+    try:
+        reply = await asyncio.wait_for(
+            _request(_socket_path(display), {"op": "snapshot", "since": rev}),
+            timeout=_QUERY_TIMEOUT_S,
+        )
+    except (OSError, TimeoutError, ValueError) as exc:
+        logger.debug("a11y daemon for %s unavailable: %s", display, exc)
+        _snapshots.pop(display, None)
+        await _spawn_daemon(display)
+        return None
+
+    if "error" in reply:
+        logger.warning("a11y daemon for %s failed: %s", display, reply["error"])
+        return None
+    if reply.get("unchanged") and reply.get("rev") == rev:
+        return elements
+    elements = reply.get("elements")
+    if not isinstance(elements, list):
+        logger.warning("a11y daemon for %s sent no elements", display)
+        return None
+    _snapshots[display] = (str(reply.get("rev", "")), elements)
+    return elements
@@ -21,6 +21,13 @@ class DesktopExecError(Exception):
 _DEFAULT_TIMEOUT_S = 30.0
 
 
+def _resolve_display(display: str | None = None) -> str:
+    """Return *display*, else the ContextVar display, else the user display."""
+    if display is not None:
+        return display
+    return _current_display.get() or load_config().desktop.user_display
+
+
 async def _run_desktop_cmd(
     cmd: str,
     *,
@@ -44,9 +51,7 @@ async def _run_desktop_cmd(
     Raises:
         DesktopExecError: If the command fails or times out.
     """
-    config = load_config()
-    if display is None:
-        display = _current_display.get() or config.desktop.user_display
+    display = _resolve_display(display)
 
     inner_cmd = "export DISPLAY=%s; %s" % (display, cmd)
     if user == "root":
@@ -10,7 +10,9 @@ import logging
 from config import load_config
 from sdk.events import AgentEvent, publish_event
 from sdk.events._models import DesktopActivePayload
+from tools.desktop._a11y import daemon_kill_cmd, forget_display
 from tools.desktop._exec import DesktopExecError, _current_display, _run_desktop_cmd
+from tools.desktop._screenshot import close_grabber
 
 logger = logging.getLogger(__name__)
 
@@ -184,7 +186,8 @@ async def stop_desktop() -> None:
     """Stop the desktop environment processes in the container."""
     try:
         await _run_desktop_cmd(
-            "pkill -f websockify; pkill -f x11vnc; pkill -f startxfce4; pkill -f Xvfb; true",
+            "pkill -f 'a11y_tree.py --serve'; pkill -f websockify; pkill -f x11vnc;"
+            " pkill -f startxfce4; pkill -f Xvfb; true",
             user="root",
         )
         logger.info("Desktop environment stopped")
@@ -237,12 +240,15 @@ async def release_display(agent_id: str) -> None:
 
     display = ":%d" % display_num
     vnc_port = 5900 + (display_num - 99)
+    forget_display(display)
+    await close_grabber(display)
     try:
         await _run_desktop_cmd(
-            "pkill -f 'Xvfb %s' || true;"
+            "%s;"
+            " pkill -f 'Xvfb %s' || true;"
             " pkill -f 'x11vnc -display %s' || true;"
             " pkill -f 'websockify.*%d' || true"
-            % (display, display, vnc_port),
+            % (daemon_kill_cmd(display), display, display, vnc_port),
             display=display,
             user="root",
         )
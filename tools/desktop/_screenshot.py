@@ -1,43 +1,236 @@
-"""Screenshot capture from the desktop environment."""
+"""Screenshot capture from the desktop environment.
 
+Frames come from a persistent grabber process per display
+(``/opt/desktop/screen_grabber.py``) that reads the root window through
+MIT-SHM and encodes only when the caller needs pixels.  If the grabber
+cannot start, capture falls back to ``scrot``.
+"""
+
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
-from config import load_config
-from tools.desktop._exec import DesktopExecError, _current_display, _run_desktop_cmd
+from tools.desktop._exec import DesktopExecError, _resolve_display, _run_desktop_cmd
 
 logger = logging.getLogger(__name__)
 
+_GRABBER_SCRIPT = "/opt/desktop/screen_grabber.py"
+_START_TIMEOUT_S = 5.0
+_GRAB_TIMEOUT_S = 10.0
+# Don't try to restart a failed grabber for the same display more often than this.
+_RETRY_INTERVAL_S = 30.0
 
-async def capture_screenshot() -> bytes:
-    """Capture a screenshot of the desktop and return raw PNG bytes.
+_MEDIA_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
 
-    Uses a per-display filename to avoid collisions between parallel agents.
 
-    Returns:
-        Raw PNG image bytes.
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """One captured screen frame."""
 
-    Raises:
-        RuntimeError: If the screenshot capture fails.
-    """
-    config = load_config()
+    data: bytes
+    """Encoded image, empty when ``unchanged``."""
+
+    media_type: str
+    """MIME type of ``data``."""
+
+    width: int
+    height: int
+
+    digest: str
+    """Fingerprint of the captured pixels (before encoding or downscaling)."""
+
+    unchanged: bool = False
+    """True when the pixels match the ``since`` digest passed to ``grab_frame``."""
+
+
+class _Grabber:
+    """A running ``screen_grabber.py`` process for one display."""
+
+    def __init__(self, display: str) -> None:
+        self.display = display
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        self._failed_at: float | None = None
+
+    async def _start(self) -> asyncio.subprocess.Process:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, _GRABBER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={**os.environ, "DISPLAY": self.display},
+        )
+        try:
+            ready = json.loads(await asyncio.wait_for(proc.stdout.readline(), _START_TIMEOUT_S) or b"{}")
+        except (TimeoutError, ValueError) as exc:
+            ready = {"error": f"no ready line: {exc}"}
+        if not ready.get("ready"):
+            await _kill(proc)
+            msg = f"screen grabber for {self.display} failed to start: {ready.get('error', 'exited')}"
+            raise RuntimeError(msg)
+        logger.info(
+            "Screen grabber for %s ready (%dx%d, shm=%s)",
+            self.display, ready["width"], ready["height"], ready["shm"],
+        )
+        return proc
+
+    async def grab(self, request: dict) -> tuple[dict, bytes]:
+        """Send *request* and return the reply header and image bytes.
+
+        Raises:
+            RuntimeError: If the grabber is unavailable or the grab failed.
+        """
+        async with self._lock:
+            if self._proc is None or self._proc.returncode is not None:
+                if self._failed_at is not None and time.monotonic() - self._failed_at < _RETRY_INTERVAL_S:
+                    msg = f"screen grabber for {self.display} recently failed"
+                    raise RuntimeError(msg)
+                try:
+                    self._proc = await self._start()
+                except (OSError, RuntimeError):
+                    self._failed_at = time.monotonic()
+                    raise
+                self._failed_at = None
+            proc = self._proc
+            try:
+                proc.stdin.write(json.dumps(request).encode() + b"\n")
+                await proc.stdin.drain()
+                header = json.loads(await asyncio.wait_for(proc.stdout.readline(), _GRAB_TIMEOUT_S))
+                data = b""
+                if header.get("size"):
+                    data = await asyncio.wait_for(proc.stdout.readexactly(header["size"]), _GRAB_TIMEOUT_S)
+            except (OSError, TimeoutError, ValueError, asyncio.IncompleteReadError) as exc:
+                await self._stop()
+                msg = f"screen grabber for {self.display} died: {exc}"
+                raise RuntimeError(msg) from exc
+            if "error" in header:
+                msg = f"screen grab failed: {header['error']}"
+                raise RuntimeError(msg)
+            return header, data
+
+    async def _stop(self) -> None:
+        if self._proc is not None:
+            await _kill(self._proc)
+            self._proc = None
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._stop()
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+
+_grabbers: dict[str, _Grabber] = {}
 
-    display = _current_display.get() or config.desktop.user_display
+
+async def close_grabber(display: str) -> None:
+    """Stop the grabber process for *display*, if one is running."""
+    grabber = _grabbers.pop(display, None)
+    if grabber is not None:
+        await grabber.close()
+
+
+async def _scrot_frame(display: str, region: tuple[int, int, int, int] | None) -> Frame:
+    """Capture a PNG with scrot, for when the grabber is unavailable."""
     safe_display = display.replace(":", "")
-    screenshot_path = "/tmp/.desktop_screenshot_%s.png" % safe_display
+    screenshot_path = f"/tmp/.desktop_screenshot_{safe_display}.png"
+    area = f" -a {','.join(map(str, region))}" if region is not None else ""
 
     try:
-        await _run_desktop_cmd("scrot -o -p %s" % screenshot_path)
+        await _run_desktop_cmd(f"scrot -o -p{area} {screenshot_path}", display=display)
     except DesktopExecError as exc:
-        msg = "Screenshot capture failed: %s" % exc
+        msg = f"Screenshot capture failed: {exc}"
         logger.error(msg)
         raise RuntimeError(msg) from exc
 
     path = Path(screenshot_path)
     if not path.exists():
-        msg = "Screenshot file not found at %s" % screenshot_path
+        msg = f"Screenshot file not found at {screenshot_path}"
         raise RuntimeError(msg)
 
     data = path.read_bytes()
     path.unlink(missing_ok=True)
-    return data
+    width, height = int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+    return Frame(
+        data=data,
+        media_type="image/png",
+        width=width,
+        height=height,
+        digest=hashlib.blake2b(data, digest_size=16).hexdigest(),
+    )
+
+
+async def grab_frame(
+    *,
+    region: tuple[int, int, int, int] | None = None,
+    fmt: str = "png",
+    quality: int = 80,
+    max_side: int | None = None,
+    since: str | None = None,
+) -> Frame:
+    """Capture the current display, optionally only a region of it.
+
+    Args:
+        region: ``(x, y, width, height)`` in screen pixels; whole screen if ``None``.
+        fmt: ``"png"``, ``"jpeg"`` or ``"webp"``.  PNG is used when the
+            grabber cannot produce the requested format.
+        quality: JPEG/WebP quality.
+        max_side: Downscale so the longer side is at most this many pixels.
+        since: Digest of a previous frame.  When the pixels are identical,
+            the returned frame is ``unchanged`` and carries no data.
+
+    Returns:
+        The captured frame.
+
+    Raises:
+        RuntimeError: If neither the grabber nor scrot could capture.
+    """
+    display = _resolve_display()
+    grabber = _grabbers.get(display)
+    if grabber is None:
+        grabber = _grabbers[display] = _Grabber(display)
+    request = {
+        "region": list(region) if region is not None else None,
+        "format": fmt,
+        "quality": quality,
+        "max_side": max_side,
+        "since": since,
+    }
+    try:
+        header, data = await grabber.grab(request)
+    except RuntimeError as exc:
+        logger.debug("Falling back to scrot: %s", exc)
+        frame = await _scrot_frame(display, region)
+        if since is not None and frame.digest == since:
+            return Frame(b"", frame.media_type, frame.width, frame.height, frame.digest, unchanged=True)
+        return frame
+    return Frame(
+        data=data,
+        media_type=_MEDIA_TYPES.get(header.get("format", "png"), "image/png"),
+        width=header["width"],
+        height=header["height"],
+        digest=header["digest"],
+        unchanged=header["unchanged"],
+    )
+
+
+async def capture_screenshot() -> bytes:
+    """Capture a screenshot of the desktop and return raw PNG bytes.
+
+    Returns:
+        Raw full-resolution PNG image bytes.
+
+    Raises:
+        RuntimeError: If the screenshot capture fails.
+    """
+    return (await grab_frame()).data
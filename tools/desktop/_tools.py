@@ -17,30 +17,22 @@ import shlex
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from rich.console import Console
-
     from tools._grounding import GroundingResponse
 
-from tools.desktop._exec import _run_desktop_cmd
+from logging_config import log_event
+from tools.desktop._a11y import A11Y_SCRIPT, query_a11y_daemon
+from tools.desktop._exec import _resolve_display, _run_desktop_cmd
 from tools.desktop._lifecycle import ensure_desktop_running
-from tools.desktop._screenshot import capture_screenshot
+from tools.desktop._screenshot import capture_screenshot, grab_frame
 
 logger = logging.getLogger(__name__)
 
 # Post-action settle delay before observation
 _SETTLE_DELAY_S = 2.0
 
-# Lazy-initialised Rich console for panel logging.
-_console: Console | None = None
-
-
-def _get_console() -> Console:
-    global _console  # noqa: PLW0603
-    if _console is None:
-        from rich.console import Console
-        _console = Console(stderr=True)
-    return _console
-
+# display → (frame digest, answer) of the last describe_screen call, so an
+# unchanged screen is not sent to the vision model again.
+_last_description: dict[str, tuple[str, str]] = {}
 
 def _log_desktop_panel(
     tool_name: str,
@@ -49,7 +41,7 @@ def _log_desktop_panel(
     args: str = "",
     elapsed_ms: float = 0,
 ) -> None:
-    """Emit a Rich panel summarising a desktop tool call and its observation."""
+    """Log a ``desktop.observe`` event (with a Rich panel) summarising a desktop tool call."""
     if not logger.isEnabledFor(logging.INFO):
         return
 
@@ -93,21 +85,26 @@ def _log_desktop_panel(
     subtitle_parts.append("%d elements" % len(elements))
     subtitle = "  ".join(subtitle_parts)
 
-    _get_console().print(Panel(
-        body,
-        title=title,
-        subtitle=subtitle,
-        border_style="dim",
-        expand=False,
-    ))
+    log_event(
+        "desktop.observe", "%s: %d elements in %.0fms", tool_name, len(elements), elapsed_ms,
+        tool=tool_name, tool_args=args, elements=len(elements), elapsed_ms=round(elapsed_ms, 1),
+        panel=Panel(
+            body,
+            title=title,
+            subtitle=subtitle,
+            border_style="dim",
+            expand=False,
+        ),
+    )
 
 
 async def _get_a11y_tree() -> list[dict]:
-    """Get the accessibility tree from the container."""
+    """Get the accessibility tree, from the display's daemon when it is up."""
+    elements = await query_a11y_daemon()
+    if elements is not None:
+        return elements
     try:
-        raw = await _run_desktop_cmd(
-            "/usr/bin/python3.10 /opt/desktop/a11y_tree.py",
-        )
+        raw = await _run_desktop_cmd(A11Y_SCRIPT)
         start = raw.find("[")
         if start == -1:
             return []
@@ -213,22 +210,35 @@ async def describe_screen() -> str:
     Returns:
         Text description of the desktop from the vision model.
     """
+    from config import load_config
     from sdk.providers import ProviderError, vision_generate
     from settings import load_settings
 
     await ensure_desktop_running()
     t0 = asyncio.get_event_loop().time()
 
+    display = _resolve_display()
+    last_digest, last_answer = _last_description.get(display, (None, ""))
+    desktop_config = load_config().desktop
     try:
-        screenshot_bytes = await capture_screenshot()
+        frame = await grab_frame(
+            fmt=desktop_config.vision_image_format,
+            quality=desktop_config.vision_image_quality,
+            max_side=desktop_config.vision_image_max_side,
+            since=last_digest,
+        )
     except RuntimeError as exc:
         logger.exception("Failed to capture screenshot for describe_screen")
         return "Error: Failed to capture screenshot: %s" % exc
 
-    encoded = base64.b64encode(screenshot_bytes).decode("ascii")
+    if frame.unchanged:
+        logger.info("describe_screen: screen unchanged, reusing previous description")
+        return last_answer
+
+    encoded = base64.b64encode(frame.data).decode("ascii")
 
     try:
-        answer = await vision_generate(_DESCRIBE_PROMPT, encoded)
+        answer = await vision_generate(_DESCRIBE_PROMPT, encoded, media_type=frame.media_type)
     except ValueError as exc:
         return "Error: %s" % exc
     except ProviderError as exc:
@@ -237,6 +247,7 @@ async def describe_screen() -> str:
 
     if not answer:
         return "Error: Vision model returned an empty response."
+    _last_description[display] = (frame.digest, answer)
 
     from tools._vision_logging import log_vision_panel
 
@@ -650,10 +661,14 @@ def _log_visual_action_panel(
         subtitle_parts.append("[bold]%.0fms[/bold]" % elapsed_ms)
     subtitle = "  ".join(subtitle_parts) if subtitle_parts else None
 
-    _get_console().print(Panel(
-        body,
-        title="[bold magenta]perform_visual_action[/bold magenta]",
-        subtitle=subtitle,
-        border_style="magenta",
-        expand=False,
-    ))
+    log_event(
+        "desktop.visual_action", "perform_visual_action: %s", action_desc or "(no action)",
+        task=task, action=action_desc, elapsed_ms=round(elapsed_ms, 1),
+        panel=Panel(
+            body,
+            title="[bold magenta]perform_visual_action[/bold magenta]",
+            subtitle=subtitle,
+            border_style="magenta",
+            expand=False,
+        ),
+    )
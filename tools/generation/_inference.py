@@ -0,0 +1,283 @@
+"""Async client for the persistent inference server.
+
+Native counterpart of ``container/inference_client.py``: talks to
+``/generate-stream`` and ``/health`` over one reused aiohttp session and
+auto-starts the server the same way, so a generation no longer pays for a
+Python subprocess and a second round of JSON parsing. Callers fall back to
+the subprocess client when :func:`native_available` is false or a stream
+raises :class:`InferenceUnavailableError`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import subprocess
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+SERVER_URL = "http://127.0.0.1:18901"
+SERVER_SCRIPT = "/opt/computron/container/inference_server.py"
+
+_PID_FILE = "/tmp/inference_server.pid"
+_LOG_FILE = "/tmp/inference_server.log"
+_STARTUP_TIMEOUT_S = 120.0
+_HEALTH_TIMEOUT_S = 3.0
+# Base64 previews arrive as single JSONL lines well over aiohttp's 64 KiB default.
+_MAX_LINE_BYTES = 16 * 1024 * 1024
+_MAX_RESTARTS = 1
+
+
+class InferenceUnavailableError(RuntimeError):
+    """The server could not be reached before any event was produced."""
+
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+_server_proc: subprocess.Popen[bytes] | None = None
+_ensure_lock: asyncio.Lock | None = None
+
+
+def native_available() -> bool:
+    """Whether this process can start and reach the inference server itself."""
+    return os.path.isfile(SERVER_SCRIPT)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, recreating it for a new event loop."""
+    global _session, _session_loop, _ensure_lock
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            read_bufsize=_MAX_LINE_BYTES,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=5),
+        )
+        _session_loop = loop
+        _ensure_lock = asyncio.Lock()
+    return _session
+
+
+async def close() -> None:
+    """Close the shared session."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def health() -> dict[str, Any] | None:
+    """Return the server's ``/health`` payload, or ``None`` if it is down."""
+    try:
+        async with _get_session().get(
+            f"{SERVER_URL}/health", timeout=aiohttp.ClientTimeout(total=_HEALTH_TIMEOUT_S),
+        ) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
+    except (aiohttp.ClientError, TimeoutError, ValueError):
+        return None
+
+
+def _server_process_alive() -> bool:
+    """Return True if a server process is running (even if not yet healthy)."""
+    if _server_proc is not None:
+        _server_proc.poll()  # reap a server we started that has since exited
+    try:
+        with open(_PID_FILE) as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+        # Verify it's actually an inference server, not a recycled PID
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"inference_server" in f.read()
+    except (ValueError, OSError):
+        return False
+
+
+async def _kill_server(pid: int | None = None) -> None:
+    """Kill the running server and wait for GPU memory release.
+
+    Args:
+        pid: The server that asked for the restart.  When the PID file names
+            a different process, another caller has already restarted it and
+            nothing is killed.
+    """
+    try:
+        with open(_PID_FILE) as f:
+            current = int(f.read().strip())
+    except (ValueError, OSError):
+        current = None
+    if pid is not None and current != pid:
+        return
+    if current is not None:
+        with contextlib.suppress(OSError):
+            os.kill(current, 9)  # SIGKILL — NF4 weights prevent clean exit
+    with contextlib.suppress(OSError):
+        os.remove(_PID_FILE)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 10
+    while loop.time() < deadline and _server_process_alive():
+        await asyncio.sleep(0.5)
+    # Give the nvidia driver time to reclaim VRAM before a new server loads.
+    await asyncio.sleep(3)
+
+
+def _start_server() -> None:
+    global _server_proc
+    with open(_LOG_FILE, "a") as log_fh:
+        _server_proc = subprocess.Popen(
+            ["python3", SERVER_SCRIPT],
+            stdout=log_fh,
+            stderr=log_fh,
+            start_new_session=True,
+        )
+    with open(_PID_FILE, "w") as f:
+        f.write(str(_server_proc.pid))
+
+
+async def ensure_server() -> None:
+    """Make sure the server is healthy, starting it if needed.
+
+    Raises:
+        InferenceUnavailableError: If the server is down and its script is
+            not available here to start it.
+        RuntimeError: If the server did not become healthy in time.
+    """
+    if await health() is not None:
+        return
+    if not native_available():
+        msg = f"inference server not reachable and {SERVER_SCRIPT} not found"
+        raise InferenceUnavailableError(msg)
+    _get_session()
+    assert _ensure_lock is not None
+    async with _ensure_lock:
+        if await health() is not None:
+            return
+        # Don't spawn a new server if one is already starting up
+        if not _server_process_alive():
+            logger.info("Starting inference server")
+            _start_server()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _STARTUP_TIMEOUT_S
+        while loop.time() < deadline:
+            await asyncio.sleep(1)
+            if await health() is not None:
+                return
+    msg = f"Inference server did not become healthy within {_STARTUP_TIMEOUT_S:.0f}s"
+    raise RuntimeError(msg)
+
+
+async def _latest_previews(events: AsyncIterator[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Yield *events*, dropping preview images the consumer fell behind on.
+
+    Every event is forwarded, but when a newer preview arrives while older
+    ones are still queued, the older events lose their ``preview`` image,
+    so a slow consumer never works through a backlog of stale frames.
+    """
+    pending: deque[dict[str, Any]] = deque()
+    ready = asyncio.Event()
+    done = False
+    error: BaseException | None = None
+
+    async def _pump() -> None:
+        nonlocal done, error
+        try:
+            async for event in events:
+                if "preview" in event:
+                    for queued in pending:
+                        queued.pop("preview", None)
+                pending.append(event)
+                ready.set()
+        except Exception as exc:  # noqa: BLE001 — re-raised in the consumer
+            error = exc
+        finally:
+            done = True
+            ready.set()
+
+    task = asyncio.create_task(_pump())
+    try:
+        while True:
+            while pending:
+                yield pending.popleft()
+            if done:
+                if error is not None:
+                    raise error
+                return
+            ready.clear()
+            await ready.wait()
+    finally:
+        task.cancel()
+
+
+async def _read_events(resp: aiohttp.ClientResponse) -> AsyncIterator[dict[str, Any]]:
+    async for raw_line in resp.content:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            logger.debug("Skipping non-JSON line: %s", line[:100])
+
+
+async def generate_stream(
+    gen_type: str, description: str, *, _restarts: int = 0, **params: Any,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream progress events for one generation.
+
+    Yields the same dicts as ``inference_client.generate_stream``: a
+    ``loading``/``generating`` sequence ending in ``complete`` (with
+    ``path``) or ``failed``.  A ``restart_required`` reply restarts the
+    server for the requested model and resubmits transparently.
+
+    Raises:
+        InferenceUnavailableError: If the server could not be reached before
+            the first event; the caller may fall back to the subprocess client.
+    """
+    await ensure_server()
+    body = {"type": gen_type, "description": description, **params}
+    try:
+        resp = await _get_session().post(f"{SERVER_URL}/generate-stream", json=body)
+    except aiohttp.ClientError as exc:
+        raise InferenceUnavailableError(str(exc)) from exc
+
+    restart_model: str | None = None
+    restart_pid: int | None = None
+    async with resp:
+        if resp.status != 200:
+            try:
+                error_data = await resp.json(content_type=None)
+            except ValueError:
+                error_data = {"error": await resp.text()}
+            if error_data.get("restart_required"):
+                restart_model = error_data.get("model") or ""
+                restart_pid = error_data.get("pid")
+            else:
+                yield {"status": "failed", "message": error_data.get("error", f"HTTP {resp.status}")}
+                return
+        else:
+            async for event in _latest_previews(_read_events(resp)):
+                if event.get("status") == "restart_required":
+                    restart_model = event.get("model") or ""
+                    restart_pid = event.get("pid")
+                    break
+                if "queue_position" in event:
+                    logger.debug("Inference job %s queued at position %d", event.get("job_id"), event["queue_position"])
+                yield event
+
+    if restart_model is None:
+        return
+    if _restarts >= _MAX_RESTARTS:
+        yield {"status": "failed", "message": f"Inference server kept requesting a restart for {restart_model}"}
+        return
+    yield {"status": "loading", "message": f"Restarting server for {restart_model}..."}
+    await _kill_server(restart_pid)
+    async for event in generate_stream(gen_type, description, _restarts=_restarts + 1, **params):
+        yield event
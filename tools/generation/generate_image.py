@@ -21,6 +21,9 @@ from sdk.events import (
     GenerationPreviewPayload,
     publish_event,
 )
+from tools.generation import _inference
+from tools.generation._inference import InferenceUnavailableError
+
 logger = logging.getLogger(__name__)
 
 _STREAM_TIMEOUT: float = 900.0  # 15 minutes max for generation
@@ -45,7 +48,8 @@ async def generate_image(
     media_type = "image"
     gen_id = uuid.uuid4().hex[:12]
 
-    params_json = json.dumps({"model": model, "size": size})
+    image_params = {"model": model, "size": size}
+    params_json = json.dumps(image_params)
     script = (
         "import sys; sys.path.insert(0, '/opt/computron/container'); "
         "import json; "
@@ -57,63 +61,79 @@ async def generate_image(
     # Publish initial loading event
     _publish_preview(gen_id, media_type, status="loading", message="Starting generation...")
 
+    proc: asyncio.subprocess.Process | None = None
+    final_path: str | None = None
+    fail_message: str | None = None
+
+    def _on_event(event: dict) -> None:
+        nonlocal final_path, fail_message
+        status = event.get("status", "generating")
+
+        if status == "complete":
+            final_path = event.get("path")
+            _publish_preview(gen_id, media_type, status="generating",
+                             step=event.get("step"), total_steps=event.get("total_steps"),
+                             message="Finalizing...")
+        elif status == "failed":
+            fail_message = event.get("message", "Generation failed")
+            _publish_preview(gen_id, media_type, status="failed",
+                             message=fail_message)
+        else:
+            _publish_preview(
+                gen_id, media_type,
+                status=status,
+                step=event.get("step"),
+                total_steps=event.get("total_steps"),
+                preview=event.get("preview"),
+                message=event.get("message"),
+            )
+
+    async def _stream_native() -> None:
+        async for event in _inference.generate_stream(media_type, description, **image_params):
+            _on_event(event)
+
     try:
-        # Use a large buffer limit because TAESD preview images in base64
-        # can exceed the default 64KB asyncio StreamReader line limit.
-        proc = await asyncio.create_subprocess_exec(
-            "python3", "-c", script,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            limit=1024 * 1024,  # 1MB line buffer
-        )
-
-        final_path: str | None = None
-        fail_message: str | None = None
-
-        async def _read_stream() -> None:
-            nonlocal final_path, fail_message
-            assert proc.stdout is not None
-            while True:
-                raw_line = await proc.stdout.readline()
-                if not raw_line:
-                    break
-                line = raw_line.decode("utf-8", errors="replace").strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                except json.JSONDecodeError:
-                    logger.debug("Skipping non-JSON line: %s", line[:100])
-                    continue
-
-                status = event.get("status", "generating")
-
-                if status == "complete":
-                    final_path = event.get("path")
-                    _publish_preview(gen_id, media_type, status="generating",
-                                     step=event.get("step"), total_steps=event.get("total_steps"),
-                                     message="Finalizing...")
-                elif status == "failed":
-                    fail_message = event.get("message", "Generation failed")
-                    _publish_preview(gen_id, media_type, status="failed",
-                                     message=fail_message)
-                else:
-                    _publish_preview(
-                        gen_id, media_type,
-                        status=status,
-                        step=event.get("step"),
-                        total_steps=event.get("total_steps"),
-                        preview=event.get("preview"),
-                        message=event.get("message"),
-                    )
-
-        await asyncio.wait_for(_read_stream(), timeout=_STREAM_TIMEOUT)
-        await proc.wait()
+        streamed = False
+        if _inference.native_available():
+            try:
+                await asyncio.wait_for(_stream_native(), timeout=_STREAM_TIMEOUT)
+                streamed = True
+            except InferenceUnavailableError as exc:
+                logger.info("Falling back to the subprocess inference client: %s", exc)
+
+        if not streamed:
+            # Use a large buffer limit because TAESD preview images in base64
+            # can exceed the default 64KB asyncio StreamReader line limit.
+            proc = await asyncio.create_subprocess_exec(
+                "python3", "-c", script,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1024 * 1024,  # 1MB line buffer
+            )
+
+            async def _read_stream() -> None:
+                assert proc.stdout is not None
+                while True:
+                    raw_line = await proc.stdout.readline()
+                    if not raw_line:
+                        break
+                    line = raw_line.decode("utf-8", errors="replace").strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.debug("Skipping non-JSON line: %s", line[:100])
+                        continue
+                    _on_event(event)
+
+            await asyncio.wait_for(_read_stream(), timeout=_STREAM_TIMEOUT)
+            await proc.wait()
 
         if fail_message is not None:
             return {"status": "error", "message": fail_message}
 
-        if proc.returncode != 0 and final_path is None:
+        if proc is not None and proc.returncode != 0 and final_path is None:
             stderr_data = await proc.stderr.read() if proc.stderr else b""
             err_msg = stderr_data.decode("utf-8", errors="replace").strip()
             _publish_preview(gen_id, media_type, status="failed",
@@ -157,7 +177,8 @@ async def generate_image(
         return {"status": "ok", "path": ui_path, "media_type": media_type}
 
     except TimeoutError:
-        proc.kill()
+        if proc is not None:
+            proc.kill()
         _publish_preview(gen_id, media_type, status="failed",
                          message=f"Generation timed out after {_STREAM_TIMEOUT}s")
         return {"status": "error", "message": "Generation timed out"}
@@ -24,6 +24,9 @@ from sdk.events import (
     GenerationPreviewPayload,
     publish_event,
 )
+from tools.generation import _inference
+from tools.generation._inference import InferenceUnavailableError
+
 logger = logging.getLogger(__name__)
 
 _STREAM_TIMEOUT: float = 900.0  # 15 minutes max for generation
@@ -181,61 +184,77 @@ async def generate_music(
     # Publish initial loading event
     _publish_preview(gen_id, media_type, status="loading", message="Starting music generation with ACE-Step...")
 
+    proc: asyncio.subprocess.Process | None = None
+    final_path: str | None = None
+    fail_message: str | None = None
+
+    def _on_event(event: dict) -> None:
+        nonlocal final_path, fail_message
+        status = event.get("status", "generating")
+
+        if status == "complete":
+            final_path = event.get("path")
+            _publish_preview(gen_id, media_type, status="generating",
+                             step=event.get("step"), total_steps=event.get("total_steps"),
+                             message="Finalizing...")
+        elif status == "failed":
+            fail_message = event.get("message", "Generation failed")
+            _publish_preview(gen_id, media_type, status="failed",
+                             message=fail_message)
+        else:
+            _publish_preview(
+                gen_id, media_type,
+                status=status,
+                step=event.get("step"),
+                total_steps=event.get("total_steps"),
+                preview=event.get("preview"),
+                message=event.get("message"),
+            )
+
+    async def _stream_native() -> None:
+        async for event in _inference.generate_stream(media_type, prompt, **params):
+            _on_event(event)
+
     try:
-        proc = await asyncio.create_subprocess_exec(
-            "python3", "-c", script,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            limit=1024 * 1024,
-        )
-
-        final_path: str | None = None
-        fail_message: str | None = None
-
-        async def _read_stream() -> None:
-            nonlocal final_path, fail_message
-            assert proc.stdout is not None
-            while True:
-                raw_line = await proc.stdout.readline()
-                if not raw_line:
-                    break
-                line = raw_line.decode("utf-8", errors="replace").strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                except json.JSONDecodeError:
-                    logger.debug("Skipping non-JSON line: %s", line[:100])
-                    continue
-
-                status = event.get("status", "generating")
-
-                if status == "complete":
-                    final_path = event.get("path")
-                    _publish_preview(gen_id, media_type, status="generating",
-                                     step=event.get("step"), total_steps=event.get("total_steps"),
-                                     message="Finalizing...")
-                elif status == "failed":
-                    fail_message = event.get("message", "Generation failed")
-                    _publish_preview(gen_id, media_type, status="failed",
-                                     message=fail_message)
-                else:
-                    _publish_preview(
-                        gen_id, media_type,
-                        status=status,
-                        step=event.get("step"),
-                        total_steps=event.get("total_steps"),
-                        preview=event.get("preview"),
-                        message=event.get("message"),
-                    )
-
-        await asyncio.wait_for(_read_stream(), timeout=_STREAM_TIMEOUT)
-        await proc.wait()
+        streamed = False
+        if _inference.native_available():
+            try:
+                await asyncio.wait_for(_stream_native(), timeout=_STREAM_TIMEOUT)
+                streamed = True
+            except InferenceUnavailableError as exc:
+                logger.info("Falling back to the subprocess inference client: %s", exc)
+
+        if not streamed:
+            proc = await asyncio.create_subprocess_exec(
+                "python3", "-c", script,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1024 * 1024,
+            )
+
+            async def _read_stream() -> None:
+                assert proc.stdout is not None
+                while True:
+                    raw_line = await proc.stdout.readline()
+                    if not raw_line:
+                        break
+                    line = raw_line.decode("utf-8", errors="replace").strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.debug("Skipping non-JSON line: %s", line[:100])
+                        continue
+                    _on_event(event)
+
+            await asyncio.wait_for(_read_stream(), timeout=_STREAM_TIMEOUT)
+            await proc.wait()
 
         if fail_message is not None:
             return {"status": "error", "message": fail_message}
 
-        if proc.returncode != 0 and final_path is None:
+        if proc is not None and proc.returncode != 0 and final_path is None:
             stderr_data = await proc.stderr.read() if proc.stderr else b""
             err_msg = stderr_data.decode("utf-8", errors="replace").strip()
             _publish_preview(gen_id, media_type, status="failed",
@@ -279,7 +298,8 @@ async def generate_music(
         return {"status": "ok", "path": ui_path, "media_type": media_type}
 
     except TimeoutError:
-        proc.kill()
+        if proc is not None:
+            proc.kill()
         _publish_preview(gen_id, media_type, status="failed",
                          message=f"Generation timed out after {_STREAM_TIMEOUT}s")
         return {"status": "error", "message": "Generation timed out"}
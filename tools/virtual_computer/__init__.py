@@ -39,6 +39,7 @@ from .models import (
     MoveCopyResult,
     PathExistsResult,
     ReadFileError,
+    ReadFilesResult,
     ReadResult,
     ReadTextResult,
     RemovePathResult,
@@ -48,7 +49,7 @@ from .models import (
 )
 from .patching import apply_text_patch, apply_unified_diff
 from .play_audio import play_audio
-from .read_ops import head, read_file, tail
+from .read_ops import head, read_file, read_files, tail
 from .run_bash_cmd import BashCmdResult, run_bash_cmd
 from .search_ops import grep
 from .stat_ops import exists, is_dir, is_file
@@ -66,6 +67,7 @@ __all__ = [
     "MoveCopyResult",
     "PathExistsResult",
     "ReadFileError",
+    "ReadFilesResult",
     "ReadResult",
     "ReadTextResult",
     "RemovePathResult",
@@ -91,6 +93,7 @@ __all__ = [
     "play_audio",
     "prepend_to_file",
     "read_file",
+    "read_files",
     "remove_path",
     "replace_in_file",
     "run_bash_cmd",
@@ -21,6 +21,7 @@ __all__ = [
     "MoveCopyResult",
     "PathExistsResult",
     "ReadFileError",
+    "ReadFilesResult",
     "ReadResult",
     "ReadTextResult",
     "RemovePathResult",
@@ -208,6 +209,24 @@ class ReadTextResult(BaseModel):
     error: str | None = None
 
 
+class ReadFilesResult(BaseModel):
+    """Result model for reading several text files in one call.
+
+    Attributes:
+        success: True when at least one file was read successfully.
+        files: Per-file results in the same order as the requested paths.
+        total_chars: Total characters of content returned across all files.
+        budget_chars: Shared character budget applied across all files.
+        truncated: True when any file's content was cut to fit the budget.
+    """
+
+    success: bool
+    files: list[ReadTextResult]
+    total_chars: int = 0
+    budget_chars: int = 0
+    truncated: bool = False
+
+
 class GrepMatch(BaseModel):
     """Represents a single match found during grep search.
 
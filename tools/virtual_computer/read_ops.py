@@ -1,4 +1,4 @@
-"""Read operations: read range, head, tail.
+"""Read operations: read range, batched reads, head, tail.
 
 Simple, UTF-8 only helpers designed for LLM ergonomics.
 Content is returned with embedded line numbers (like ``cat -n``) so the model
@@ -7,13 +7,15 @@ sees line references in context.
 
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from ._fs_internal import is_binary_file
-from .models import ReadTextResult
+from .models import ReadFilesResult, ReadTextResult
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,12 @@ def _read_text_iter(path: Path) -> Iterable[str]:
 
 _MAX_LINES_DEFAULT: int = 2000
 
+# Shared character budget across all files returned by ``read_files``.
+_READ_FILES_BUDGET_DEFAULT: int = 60_000
+
+# Optional ``:start-end`` line range suffix on a ``read_files`` path spec.
+_RANGE_SUFFIX_RE = re.compile(r"^(?P<path>.+):(?P<start>\d*)-(?P<end>\d*)$")
+
 
 def _numbered_line(lineno: int, text: str) -> str:
     """Format a line with its number, like ``cat -n``."""
@@ -116,6 +124,103 @@ def read_file(path: str, start: int | None = None, end: int | None = None) -> Re
         return ReadTextResult(success=False, file_path=path, content=None, error="read failed")
 
 
+def _parse_path_spec(spec: str) -> tuple[str, int | None, int | None]:
+    """Split ``path:start-end`` into its parts; plain paths have no range."""
+    m = _RANGE_SUFFIX_RE.match(spec)
+    # A real file whose name happens to look like a range wins over the suffix
+    if m is None or Path(spec).exists():
+        return spec, None, None
+    start = int(m.group("start")) if m.group("start") else None
+    end = int(m.group("end")) if m.group("end") else None
+    return m.group("path"), start, end
+
+
+def _read_path_spec(spec: str) -> ReadTextResult:
+    path, start, end = _parse_path_spec(spec)
+    return read_file(path, start=start, end=end)
+
+
+def _truncate_to_chars(result: ReadTextResult, max_chars: int) -> ReadTextResult:
+    """Cut a successful read down to ``max_chars`` on a line boundary."""
+    content = result.content or ""
+    kept: list[str] = []
+    used = 0
+    for line in content.splitlines(keepends=True):
+        if used + len(line) > max_chars:
+            break
+        kept.append(line)
+        used += len(line)
+    # Always return something, even when the first line alone is over budget
+    if not kept and content and max_chars > 0:
+        kept.append(content[:max_chars])
+    first_line = result.start or 1
+    return result.model_copy(
+        update={
+            "content": "".join(kept),
+            "start": first_line,
+            "end": first_line + max(len(kept), 1) - 1,
+            "truncated": True,
+        }
+    )
+
+
+def _apply_budget(results: list[ReadTextResult], budget: int) -> bool:
+    """Share ``budget`` chars fairly across ``results``, truncating in place.
+
+    Smaller files are satisfied first; whatever they leave unused is split
+    evenly among the larger ones.
+
+    Returns:
+        bool: True when any result was truncated.
+    """
+    sized = sorted(
+        ((i, len(r.content)) for i, r in enumerate(results) if r.success and r.content),
+        key=lambda item: item[1],
+    )
+    remaining = max(0, budget)
+    truncated = False
+    for n, (idx, size) in enumerate(sized):
+        share = remaining // (len(sized) - n)
+        if size > share:
+            results[idx] = _truncate_to_chars(results[idx], share)
+            size = len(results[idx].content or "")
+            truncated = True
+        remaining -= size
+    return truncated
+
+
+async def read_files(paths: list[str], max_chars: int = _READ_FILES_BUDGET_DEFAULT) -> ReadFilesResult:
+    """Read several UTF-8 text files in one call.
+
+    Prefer this over repeated read_file calls when you already know which
+    files (or sections) you need. Content is returned with embedded line
+    numbers (``cat -n`` style). All files share one character budget; when
+    the total is too large each file is cut on a line boundary and marked
+    ``truncated`` with ``end`` set to the last line shown — use read_file
+    with ``start``/``end`` to read the rest.
+
+    Args:
+        paths: File paths to read. Append ``:start-end`` to read a 1-based
+            inclusive line range, e.g. ``src/app.py:40-120``. Either bound may
+            be omitted (``src/app.py:300-`` reads from line 300 to EOF).
+        max_chars: Shared character budget for the content of all files.
+            Defaults to 60000.
+
+    Returns:
+        ReadFilesResult: Per-file ``ReadTextResult`` items in request order,
+        plus the total characters returned and whether anything was truncated.
+    """
+    results = list(await asyncio.gather(*(asyncio.to_thread(_read_path_spec, spec) for spec in paths)))
+    truncated = _apply_budget(results, max_chars)
+    return ReadFilesResult(
+        success=any(r.success for r in results),
+        files=results,
+        total_chars=sum(len(r.content or "") for r in results),
+        budget_chars=max_chars,
+        truncated=truncated,
+    )
+
+
 def head(path: str, n: int = 200) -> ReadTextResult:
     """Read the first n lines of a UTF-8 text file.
 
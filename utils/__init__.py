@@ -5,7 +5,10 @@ This package provides utility functions such as async LRU caching and completion
 """
 
 from .cache import async_lru_cache
+from .file_cache import WatchedValue, atomic_write_text
 
 __all__ = [
+    "WatchedValue",
     "async_lru_cache",
+    "atomic_write_text",
 ]
@@ -0,0 +1,255 @@
+"""In-process caches of values parsed from files that reload only on change.
+
+``WatchedValue`` holds the result of parsing a file (or a directory of
+files) and re-runs the loader only after the file changed on disk.  On
+Linux, change detection uses one process-wide inotify descriptor: the
+kernel queues an event inside the writer's ``write``/``rename`` syscall,
+so a non-blocking read of the descriptor on each ``get`` sees every
+change that completed before it — without touching the filesystem.
+Elsewhere (or when inotify is unavailable) ``get`` compares a cheap
+``stat`` signature instead.
+
+In-process writers call ``WatchedValue.set`` after writing so the next
+read is served without a reload, and should write through
+``atomic_write_text`` so concurrent readers never parse half a file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Process-wide inotify descriptor counting changes per path.
+
+    ``generation(path)`` increases whenever something at *path* changed:
+    the file itself, an entry inside it (for a watched directory), or its
+    entry in the parent directory.  Only paths passed to ``generation``
+    are counted, so events for other files in a watched directory (such
+    as temp files) leave no trace.
+    """
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        # poll(0) is cheaper than a read() that fails with EAGAIN.
+        self._poller = select.poll()
+        self._poller.register(fd, select.POLLIN)
+        self._lock = threading.Lock()
+        self._dirs: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+        self._generations: dict[Path, int] = {}
+        # Bumped on queue overflow: every path must be treated as changed.
+        self._epoch = 0
+
+    def watch(self, directory: Path) -> bool:
+        """Start watching *directory*; return ``False`` if it cannot be watched."""
+        with self._lock:
+            if directory in self._watched:
+                return True
+            wd = self._add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                return False
+            self._dirs[wd] = directory
+            self._watched.add(directory)
+            return True
+
+    def generation(self, path: Path) -> tuple[str, int, int]:
+        """Drain pending events and return the change counter for *path*."""
+        with self._lock:
+            self._drain()
+            return "inotify", self._epoch, self._generations.setdefault(path, 0)
+
+    def _bump(self, path: Path) -> None:
+        if path in self._generations:
+            self._generations[path] += 1
+
+    def _drain(self) -> None:
+        while self._poller.poll(0):
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    self._epoch += 1
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                self._bump(directory)
+                if name:
+                    self._bump(directory / os.fsdecode(name))
+                if mask & _IN_IGNORED:
+                    # The directory itself went away; a later watch() re-adds it.
+                    del self._dirs[wd]
+                    self._watched.discard(directory)
+
+
+_inotify: _Inotify | None = None
+_inotify_failed = False
+_inotify_lock = threading.Lock()
+
+
+def _get_inotify() -> _Inotify | None:
+    global _inotify, _inotify_failed
+    if _inotify is not None or _inotify_failed:
+        return _inotify
+    with _inotify_lock:
+        if _inotify is None and not _inotify_failed:
+            if not sys.platform.startswith("linux"):
+                _inotify_failed = True
+            else:
+                try:
+                    _inotify = _Inotify()
+                except (OSError, AttributeError):
+                    logger.info("inotify unavailable, falling back to stat-based change detection")
+                    _inotify_failed = True
+    return _inotify
+
+
+def _stat_signature(path: Path, *, directory: bool) -> object:
+    """Cheap fingerprint of a file, or of a directory and its entries."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not directory:
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    try:
+        with os.scandir(path) as entries:
+            return frozenset(
+                (e.name, s.st_ino, s.st_mtime_ns, s.st_size)
+                for e in entries
+                if (s := e.stat())
+            )
+    except OSError:
+        # An entry vanished mid-scan: report a version that matches nothing.
+        return object()
+
+
+class WatchedValue[T]:
+    """A value parsed from *path*, reloaded only after *path* changes.
+
+    Args:
+        loader: Called as ``loader(path, previous)`` to (re)build the value;
+            *previous* is the last value loaded from the same path, or
+            ``None``.  Loaders that hit a half-written file can return
+            (parts of) *previous* instead of failing.
+        directory: Whether *path* is a directory whose entries feed the
+            value, rather than a single file.
+    """
+
+    def __init__(self, loader: Callable[[Path, T | None], T], *, directory: bool = False) -> None:
+        """Initialize with the loader for the value and the kind of path it reads."""
+        self._loader = loader
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._entry: tuple[Path, tuple[object, ...], T] | None = None
+
+    def _version(self, path: Path) -> tuple[object, ...]:
+        """Establish watches for *path* and return its current version."""
+        inotify = _get_inotify()
+        if inotify is not None and inotify.watch(path.parent) and (
+            not self._directory or not path.is_dir() or inotify.watch(path)
+        ):
+            return inotify.generation(path)
+        return ("stat", _stat_signature(path, directory=self._directory))
+
+    def get(self, path: Path) -> T:
+        """Return the value for *path*, reloading it if it changed."""
+        entry = self._entry
+        if entry is not None and entry[0] == path:
+            cached = entry[1]
+            if cached[0] == "inotify":
+                # Watches were in place when this version was taken; any
+                # change since — including a watch being dropped — bumps it.
+                version = _inotify.generation(path)  # type: ignore[union-attr]
+            else:
+                version = ("stat", _stat_signature(path, directory=self._directory))
+            if version == cached:
+                return entry[2]
+        with self._lock:
+            # Read the version *before* loading: a change that lands mid-load
+            # bumps it again, so the next get() reloads.
+            version = self._version(path)
+            entry = self._entry
+            if entry is not None and entry[0] == path and entry[1] == version:
+                return entry[2]
+            previous = entry[2] if entry is not None and entry[0] == path else None
+            value = self._loader(path, previous)
+            self._entry = (path, version, value)
+            return value
+
+    def set(self, path: Path, value: T) -> None:
+        """Record *value* as current after an in-process write to *path*."""
+        with self._lock:
+            self._entry = (path, self._version(path), value)
+
+    def invalidate(self) -> None:
+        """Drop the cached value."""
+        with self._lock:
+            self._entry = None
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write *text* to *path* via a temp file and ``os.replace``.
+
+    Readers see either the old or the new content, never a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_tmp_")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+__all__ = ["WatchedValue", "atomic_write_text"]
@@ -0,0 +1,338 @@
+"""Process-wide counters, gauges and histograms in Prometheus text format.
+
+Metrics are module-level objects created where they are recorded::
+
+    _TOOL_SECONDS = Histogram("computron_tool_duration_seconds", "Tool call latency.", ("tool",))
+    ...
+    _TOOL_SECONDS.observe(elapsed, tool_name)
+
+Writes take no lock.  Each thread updates its own shard (a plain dict,
+created on the thread's first write), so a write is a dict lookup and an
+add under the GIL; :func:`render_prometheus` sums the shards at scrape time.
+Gauges that mirror existing state can instead read it on scrape via
+:meth:`Gauge.set_function`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+LabelValues = tuple[str, ...]
+
+# Seconds: 5ms to 5min, enough to cover tool calls, model calls and tasks.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+
+class _Metric(ABC):
+    """Base class: name, help text, label names and per-thread shards."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        registry: Registry | None = None,
+    ) -> None:
+        """Initialize the metric and register it.
+
+        Args:
+            name: Metric name as exposed to Prometheus.
+            documentation: Help text.
+            labelnames: Names of the labels that identify a series.
+            registry: Registry to add the metric to; defaults to ``REGISTRY``.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: LabelValues = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict = {}
+            self._local.shard = shard
+            # list.append is atomic; the scrape side only ever copies the list.
+            self._shards.append(shard)
+            return shard
+
+    def _key(self, labels: tuple[str, ...]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            msg = f"{self.name} expects labels {self.labelnames}, got {labels!r}"
+            raise ValueError(msg)
+        return labels
+
+    def _snapshots(self) -> list[dict]:
+        return [dict(shard) for shard in list(self._shards)]
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return ``(sample name, labels, value)`` triples for exposition."""
+
+    def reset(self) -> None:
+        """Zero every series (for tests)."""
+        for shard in list(self._shards):
+            shard.clear()
+
+
+class Counter(_Metric):
+    """A monotonically increasing total, e.g. requests served."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add *amount* to the series identified by *labels* (positional, in ``labelnames`` order)."""
+        key = self._key(labels)
+        shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current total for *labels*, summed over threads."""
+        key = self._key(labels)
+        return sum(snapshot.get(key, 0.0) for snapshot in self._snapshots())
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return one ``_total`` sample per series, summed over threads."""
+        totals: dict[LabelValues, float] = {}
+        for snapshot in self._snapshots():
+            for key, value in snapshot.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [
+            (f"{self.name}_total", dict(zip(self.labelnames, key, strict=True)), value)
+            for key, value in sorted(totals.items())
+        ]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. queue depth.
+
+    ``inc``/``dec`` are sharded like counters; ``set`` overwrites a shared
+    value and suits single-writer gauges such as ones updated from the
+    event loop.  A gauge with a function reports only what it returns.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        registry: Registry | None = None,
+    ) -> None:
+        """Initialize the gauge; arguments are as for the other metrics."""
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self._values: dict[LabelValues, float] = {}
+        self._function: Callable[[], dict[LabelValues, float] | float] | None = None
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Raise the series identified by *labels* by *amount*."""
+        key = self._key(labels)
+        shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Lower the series identified by *labels* by *amount*."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the series identified by *labels*, discarding earlier ``inc``/``dec``."""
+        key = self._key(labels)
+        for shard in list(self._shards):
+            shard.pop(key, None)
+        self._values[key] = value
+
+    def set_function(self, fn: Callable[[], dict[LabelValues, float] | float]) -> None:
+        """Compute the gauge on each scrape.
+
+        Args:
+            fn: Returns the value, or for a labelled gauge a mapping of
+                label values to value.
+        """
+        self._function = fn
+
+    def value(self, *labels: str) -> float:
+        """Current value for *labels*."""
+        key = self._key(labels)
+        return self._collect().get(key, 0.0)
+
+    def _collect(self) -> dict[LabelValues, float]:
+        if self._function is not None:
+            result = self._function()
+            return result if isinstance(result, dict) else {(): float(result)}
+        totals = dict(self._values)
+        for snapshot in self._snapshots():
+            for key, value in snapshot.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return one sample per series, from the gauge's function if it has one."""
+        return [
+            (self.name, dict(zip(self.labelnames, key, strict=True)), value)
+            for key, value in sorted(self._collect().items())
+        ]
+
+    def reset(self) -> None:
+        """Zero every series, including ones set with ``set`` (for tests)."""
+        super().reset()
+        self._values.clear()
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, e.g. latencies in seconds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        registry: Registry | None = None,
+    ) -> None:
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name as exposed to Prometheus.
+            documentation: Help text.
+            labelnames: Names of the labels that identify a series.
+            buckets: Upper bounds of the buckets; ``+Inf`` is always added.
+            registry: Registry to add the metric to; defaults to ``REGISTRY``.
+        """
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets: tuple[float, ...] = tuple(sorted(b for b in buckets if not math.isinf(b)))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record *value* in the series identified by *labels*."""
+        key = self._key(labels)
+        shard = self._shard()
+        # Per-bucket (not cumulative) counts, then sum and count.
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        """Number of observations for *labels*."""
+        state = self._merged().get(self._key(labels))
+        return int(state[-1]) if state else 0
+
+    def _merged(self) -> dict[LabelValues, list[float]]:
+        merged: dict[LabelValues, list[float]] = {}
+        for shard in list(self._shards):
+            for key, state in list(shard.items()):
+                state = list(state)
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = state
+                else:
+                    merged[key] = [a + b for a, b in zip(total, state, strict=True)]
+        return merged
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return cumulative ``_bucket`` samples plus ``_sum`` and ``_count`` per series."""
+        out: list[tuple[str, dict[str, str], float]] = []
+        for key, state in sorted(self._merged().items()):
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), state, strict=False):
+                cumulative += count
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, state[-2]))
+            out.append((f"{self.name}_count", labels, state[-1]))
+        return out
+
+
+class Registry:
+    """A set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        """Add *metric*; a second metric with the same name replaces the first."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric | None:
+        """Return the metric registered as *name*, if any."""
+        return self._metrics.get(name)
+
+    def metrics(self) -> list[_Metric]:
+        """Registered metrics, ordered by name."""
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+
+REGISTRY = Registry()
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def render_prometheus(registry: Registry | None = None) -> str:
+    """Render every metric in the Prometheus text exposition format (0.0.4)."""
+    lines: list[str] = []
+    for metric in (registry if registry is not None else REGISTRY).metrics():
+        try:
+            samples = metric.samples()
+        except Exception:  # a failing gauge function must not break the scrape
+            logger.exception("Failed to collect metric %s", metric.name)
+            continue
+        lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample_name, labels, value in samples:
+            if labels:
+                rendered = ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items())
+                lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{sample_name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "render_prometheus",
+]